@@ -13,6 +13,7 @@ from apps.blender.blenderenvironment import BlenderEnvironment, \
     BlenderNVGPUEnvironment
 from apps.core.task.coretask import CoreTaskTypeInfo
 from apps.rendering.resources.imgrepr import OpenCVImgRepr
+from apps.rendering.resources.previewcanvas import PreviewCanvas
 from apps.rendering.resources.renderingtaskcollector import \
     RenderingTaskCollector
 from apps.rendering.resources.utils import handle_opencv_image_error
@@ -42,6 +43,8 @@ class PreviewUpdater(object):
         self.preview_res_y = preview_res_y
         self.preview_file_path = preview_file_path
         self.expected_offsets = expected_offsets
+        self.canvas = PreviewCanvas(preview_file_path, preview_res_x,
+                                    preview_res_y, extension=PREVIEW_EXT)
 
         # where the match ends - since the chunks have unexpectable sizes, we
         # don't know where to paste new chunk unless all of the above are in
@@ -49,6 +52,13 @@ class PreviewUpdater(object):
         self.perfect_match_area_y = 0
         self.perfectly_placed_subtasks = 0
 
+    def __setstate__(self, state):
+        self.__dict__ = state
+        if 'canvas' not in state:
+            self.canvas = PreviewCanvas(
+                self.preview_file_path, self.preview_res_x,
+                self.preview_res_y, extension=PREVIEW_EXT)
+
     def get_offset(self, subtask_number):
         return self.expected_offsets.get(subtask_number, self.preview_res_y)
 
@@ -70,21 +80,17 @@ class PreviewUpdater(object):
             subtask_img_resized = subtask_img.resize(self.preview_res_x,
                                                      chunk_height)
 
-            def open_or_create_image():
-                if not os.path.exists(self.preview_file_path) \
-                        or len(self.chunks) == 1:
-                    chunk_channels = subtask_img.get_channels()
-                    return OpenCVImgRepr.empty(self.preview_res_x,
-                                               self.preview_res_y,
-                                               channels=chunk_channels)
-                return OpenCVImgRepr.from_image_file(self.preview_file_path)
-
-            preview_img = open_or_create_image()
+            if len(self.chunks) == 1:
+                self.canvas.reset(channels=subtask_img.get_channels())
 
             subtask_img_resized.try_adjust_type(OpenCVImgRepr.IMG_U8)
 
-            preview_img.paste_image(subtask_img_resized, 0, offset)
-            preview_img.save_with_extension(self.preview_file_path, PREVIEW_EXT)
+            self.canvas.paste(subtask_img_resized, 0, offset)
+            # expected_offsets holds one more entry: the preview's height
+            if len(self.chunks) >= len(self.expected_offsets) - 1:
+                self.canvas.flush()
+            else:
+                self.canvas.save()
 
         if not handler_result.success:
             return
@@ -94,14 +100,18 @@ class PreviewUpdater(object):
             self.update_preview(self.chunks[subtask_number + 1],
                                 subtask_number + 1)
 
+    def flush(self):
+        with handle_opencv_image_error(logger):
+            self.canvas.flush()
+
     def restart(self):
         self.chunks = {}
         self.perfect_match_area_y = 0
         self.perfectly_placed_subtasks = 0
         if os.path.exists(self.preview_file_path):
             with handle_opencv_image_error(logger):
-                OpenCVImgRepr.empty(self.preview_res_x, self.preview_res_y) \
-                    .save_with_extension(self.preview_file_path, PREVIEW_EXT)
+                self.canvas.reset(channels=OpenCVImgRepr.RGB)
+                self.canvas.flush()
 
     def _get_height(self, subtask_number):
         next_offset = \
@@ -504,6 +514,15 @@ class BlenderRenderTask(FrameRenderingTask):
 
         return return_data
 
+    def update_task_state(self, task_state):
+        # Write previews postponed by the updaters before they are read
+        if self.use_frames:
+            for preview in self.preview_updaters or []:
+                preview.flush()
+        elif self.preview_updater:
+            self.preview_updater.flush()
+        super().update_task_state(task_state)
+
     def _update_preview(self, new_chunk_file_path, num_start):
         self.preview_updater.update_preview(new_chunk_file_path, num_start)
 
@@ -522,8 +541,9 @@ class BlenderRenderTask(FrameRenderingTask):
                 img.try_adjust_type(OpenCVImgRepr.IMG_U8)
 
                 img.save_with_extension(preview_task_file_path, PREVIEW_EXT)
-                img.save_with_extension(self._get_preview_file_path(num),
-                                        PREVIEW_EXT)
+                canvas = self.preview_updaters[num].canvas
+                canvas.replace(img)
+                canvas.flush()
         else:
             self.preview_updaters[num].update_preview(new_chunk_file_path, part)
             self._update_frame_task_preview()
@@ -35,6 +35,7 @@ from golem.verifier.subtask_verification_state import SubtaskVerificationState
 from golem.verifier.core_verifier import CoreVerifier
 
 from .coretaskstate import RunVerification
+from .subtasksgiven import SubtasksGiven
 
 
 if TYPE_CHECKING:
@@ -171,7 +172,7 @@ class CoreTask(Task):
         self.last_task = 0
 
         self.num_tasks_received = 0
-        self.subtasks_given: Dict[str, Dict[str, Any]] = {}
+        self._subtasks_given = SubtasksGiven()
         self.num_failed_subtasks = 0
 
         self.timeout = task_timeout
@@ -188,6 +189,21 @@ class CoreTask(Task):
         self.res_files = {}
         self.tmp_dir = None
 
+    def __setstate__(self, state):
+        # Tasks pickled before subtasks were indexed by node
+        if 'subtasks_given' in state:
+            state['_subtasks_given'] = SubtasksGiven(
+                state.pop('subtasks_given'))
+        super().__setstate__(state)
+
+    @property
+    def subtasks_given(self) -> SubtasksGiven:
+        return self._subtasks_given
+
+    @subtasks_given.setter
+    def subtasks_given(self, value: Dict[str, Dict[str, Any]]) -> None:
+        self._subtasks_given = SubtasksGiven(value)
+
     @staticmethod
     def create_task_id(public_key: bytes) -> str:
         return idgenerator.generate_id(public_key)
@@ -474,11 +490,9 @@ class CoreTask(Task):
         self.num_failed_subtasks += 1
 
     def get_finishing_subtasks(self, node_id: str) -> List[dict]:
-        return [
-            subtask for subtask in self.subtasks_given.values()
-            if subtask['status'].is_finishing()
-            and subtask['node_id'] == node_id
-        ]
+        subtask_ids = self.subtasks_given.subtask_ids(
+            node_id, [SubtaskStatus.downloading, SubtaskStatus.verifying])
+        return [self.subtasks_given[s_id] for s_id in subtask_ids]
 
     def get_resources(self):
         return self.task_resources
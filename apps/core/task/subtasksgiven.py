@@ -0,0 +1,151 @@
+from collections import defaultdict
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+
+from golem.task.taskstate import SubtaskStatus
+
+_INDEXED_KEYS = ('node_id', 'status')
+
+
+class SubtaskInfo(dict):
+    """ Information about a single subtask given to a provider. Changes of
+    'node_id' and 'status' are reported to the owning SubtasksGiven, so that
+    its per-node index stays up to date. """
+
+    def __init__(self, owner: 'SubtasksGiven', subtask_id: str,
+                 data: Dict[str, Any]) -> None:
+        super().__init__(data)
+        self._owner = owner
+        self._subtask_id = subtask_id
+
+    def __setitem__(self, key, value):
+        if not self._is_indexed(key):
+            super().__setitem__(key, value)
+            return
+        self._owner._unindex(self._subtask_id, self)
+        super().__setitem__(key, value)
+        self._owner._index(self._subtask_id, self)
+
+    def __delitem__(self, key):
+        if not self._is_indexed(key):
+            super().__delitem__(key)
+            return
+        self._owner._unindex(self._subtask_id, self)
+        super().__delitem__(key)
+        self._owner._index(self._subtask_id, self)
+
+    def _is_indexed(self, key) -> bool:
+        # Entries replaced in or removed from the owner are no longer indexed
+        return key in _INDEXED_KEYS \
+            and dict.get(self._owner, self._subtask_id) is self
+
+    def pop(self, key, *default):
+        if self._is_indexed(key) and key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return super().pop(key, *default)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __reduce__(self):
+        # Pickle and copy as a plain dict; SubtasksGiven wraps it back
+        return dict, (dict(self),)
+
+
+class SubtasksGiven(dict):
+    """ Subtask id to SubtaskInfo mapping which maintains an index of
+    subtask ids by node id and status. """
+
+    def __init__(self, data: Optional[Dict[str, Dict[str, Any]]] = None) \
+            -> None:
+        super().__init__()
+        self._by_node: DefaultDict[
+            Optional[str], DefaultDict[Optional[SubtaskStatus], Set[str]]
+        ] = defaultdict(lambda: defaultdict(set))
+        if data:
+            self.update(data)
+
+    def __setitem__(self, subtask_id, info):
+        if subtask_id in self:
+            self._unindex(subtask_id, self[subtask_id])
+        info = SubtaskInfo(self, subtask_id, info)
+        super().__setitem__(subtask_id, info)
+        self._index(subtask_id, info)
+
+    def __delitem__(self, subtask_id):
+        self._unindex(subtask_id, self[subtask_id])
+        super().__delitem__(subtask_id)
+
+    def pop(self, subtask_id, *default):
+        if subtask_id in self:
+            info = self[subtask_id]
+            del self[subtask_id]
+            return info
+        return super().pop(subtask_id, *default)
+
+    def popitem(self):
+        subtask_id, info = super().popitem()
+        self._unindex(subtask_id, info)
+        return subtask_id, info
+
+    def clear(self):
+        super().clear()
+        self._by_node.clear()
+
+    def setdefault(self, subtask_id, default=None):
+        if subtask_id not in self:
+            self[subtask_id] = default if default is not None else {}
+        return self[subtask_id]
+
+    def update(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        for subtask_id, info in dict(*args, **kwargs).items():
+            self[subtask_id] = info
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def subtask_ids(self, node_id: str,
+                    statuses: Optional[Iterable[SubtaskStatus]] = None) \
+            -> List[str]:
+        """ Return ids of subtasks given to `node_id`, optionally only the ones
+        having one of `statuses` """
+        by_status = self._by_node.get(node_id)
+        if not by_status:
+            return []
+        if statuses is None:
+            statuses = list(by_status.keys())
+        return [
+            subtask_id
+            for status in statuses
+            for subtask_id in by_status.get(status, ())
+        ]
+
+    def _index(self, subtask_id: str, info: Dict[str, Any]) -> None:
+        self._by_node[info.get('node_id')][info.get('status')].add(subtask_id)
+
+    def _unindex(self, subtask_id: str, info: Dict[str, Any]) -> None:
+        node_id = info.get('node_id')
+        status = info.get('status')
+        by_status = self._by_node.get(node_id)
+        if by_status is None or status not in by_status:
+            return
+        by_status[status].discard(subtask_id)
+        if not by_status[status]:
+            del by_status[status]
+        if not by_status:
+            del self._by_node[node_id]
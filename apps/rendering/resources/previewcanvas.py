@@ -0,0 +1,96 @@
+import os
+import time
+from typing import Optional
+
+from apps.rendering.resources.imgrepr import OpenCVImgRepr
+
+# Minimal time between consecutive writes of a preview file (in seconds)
+PREVIEW_SAVE_INTERVAL = 2.0
+
+
+class PreviewCanvas:
+    """ Downscaled preview image kept in memory. Chunks are pasted directly
+    into the canvas and the preview file is written at most once every
+    `save_interval` seconds; call `flush` to write pending changes. """
+
+    def __init__(self, file_path: str, width: int, height: int,
+                 channels: int = OpenCVImgRepr.RGB,
+                 extension: str = 'PNG',
+                 save_interval: float = PREVIEW_SAVE_INTERVAL) -> None:
+        self.file_path = file_path
+        self.extension = extension
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.save_interval = save_interval
+        self._img: Optional[OpenCVImgRepr] = None
+        self._dirty = False
+        self._last_save: Optional[float] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The image is restored from the preview file when needed
+        state['_img'] = None
+        state['_dirty'] = False
+        state['_last_save'] = None
+        return state
+
+    @property
+    def img(self) -> OpenCVImgRepr:
+        if self._img is None:
+            if self.file_path and os.path.exists(self.file_path):
+                self._img = OpenCVImgRepr.from_image_file(self.file_path)
+            else:
+                self._img = OpenCVImgRepr.empty(
+                    self.width, self.height, channels=self.channels)
+        return self._img
+
+    def reset(self, channels: Optional[int] = None) -> None:
+        if channels is not None:
+            self.channels = channels
+        self._img = OpenCVImgRepr.empty(
+            self.width, self.height, channels=self.channels)
+        self._dirty = True
+
+    def replace(self, img: OpenCVImgRepr) -> None:
+        self._img = img
+        self._dirty = True
+
+    def paste(self, chunk: OpenCVImgRepr, x: int, y: int) -> None:
+        """ Paste `chunk` at (x, y), cropping it to the canvas size """
+        canvas = self.img
+        height = min(chunk.get_height(), canvas.get_height() - y)
+        width = min(chunk.get_width(), canvas.get_width() - x)
+        if height <= 0 or width <= 0:
+            return
+        if chunk.get_height() != height or chunk.get_width() != width:
+            cropped = OpenCVImgRepr()
+            cropped.img = chunk.img[:height, :width]
+            chunk = cropped
+        canvas.paste_image(chunk, x, y)
+        self._dirty = True
+
+    @property
+    def loaded(self) -> bool:
+        return self._img is not None
+
+    def release(self) -> None:
+        """ Write pending changes and drop the image from memory; it is
+        reloaded from the preview file when needed """
+        self.flush()
+        self._img = None
+
+    def save(self) -> None:
+        """ Write the preview file unless it has been written recently """
+        if self._last_save is not None \
+                and time.monotonic() - self._last_save < self.save_interval:
+            return
+        self.flush()
+
+    def flush(self) -> None:
+        """ Write pending changes to the preview file """
+        if not self._dirty or self._img is None:
+            return
+        self._img.save_with_extension(self.file_path, self.extension)
+        self._dirty = False
+        self._last_save = time.monotonic()
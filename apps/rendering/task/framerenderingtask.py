@@ -17,6 +17,7 @@ from copy import deepcopy
 from apps.core.task.coretask import CoreTask
 from apps.core.task.coretaskstate import Options
 from apps.rendering.resources.imgrepr import OpenCVImgRepr
+from apps.rendering.resources.previewcanvas import PreviewCanvas
 from apps.rendering.resources.renderingtaskcollector import \
     RenderingTaskCollector
 from apps.rendering.resources.utils import handle_opencv_image_error
@@ -38,6 +39,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("apps.rendering")
 
+# Number of frame previews kept decoded in memory, the least recently updated
+# ones are reloaded from their preview files when needed
+PREVIEW_CANVAS_CACHE_SIZE = 8
+
 DEFAULT_PADDING = 4
 
 
@@ -143,6 +148,15 @@ class FrameRenderingTask(RenderingTask):
             self.preview_file_path = [None] * len(self.frames)
             self.preview_task_file_path = [None] * len(self.frames)
         self.last_preview_path = None
+        # frame index -> in-memory preview of that frame, in the order of
+        # use
+        self.preview_canvases: 'OrderedDict[int, PreviewCanvas]' = \
+            OrderedDict()
+
+    def __setstate__(self, state):
+        state['preview_canvases'] = OrderedDict(
+            state.get('preview_canvases', {}))
+        super().__setstate__(state)
 
     @CoreTask.handle_key_error
     def computation_failed(self, subtask_id: str, ban_node: bool = True):
@@ -260,29 +274,53 @@ class FrameRenderingTask(RenderingTask):
                               final=False):
         num = self.frames.index(frame_num)
         preview_task_file_path = self._get_preview_task_file_path(num)
+        canvas = self._get_preview_canvas(num)
 
         with handle_opencv_image_error(logger):
             logger.debug('new_chunk_file_path = {}'.format(new_chunk_file_path))
             img = OpenCVImgRepr.from_image_file(new_chunk_file_path)
-
-            def resize_and_save(img):
-                img.resize(int(round(self.scale_factor * img.get_width())),
-                           int(round(self.scale_factor * img.get_height())))
-
-                img.save_with_extension(self._get_preview_file_path(num),
-                                        PREVIEW_EXT)
+            img.resize(int(round(self.scale_factor * img.get_width())),
+                       int(round(self.scale_factor * img.get_height())))
 
             if not final:
-                img_pasted = self._paste_new_chunk(
-                    img, self._get_preview_file_path(num), part,
-                    int(self.get_total_tasks() / len(self.frames))
-                )
-                resize_and_save(img_pasted)
+                all_chunks_num = int(self.get_total_tasks() / len(self.frames))
+                offset = int(math.floor((part - 1) * canvas.height
+                                        / all_chunks_num))
+                canvas.paste(img, 0, offset)
+                canvas.save()
             else:
-                resize_and_save(img)
+                canvas.replace(img)
+                # The frame is complete, its preview is only read from now on
+                canvas.release()
 
         self.last_preview_path = preview_task_file_path
 
+    def _get_preview_canvas(self, num) -> PreviewCanvas:
+        if num not in self.preview_canvases:
+            self.preview_canvases[num] = PreviewCanvas(
+                self._get_preview_file_path(num),
+                int(round(self.res_x * self.scale_factor)),
+                int(round(self.res_y * self.scale_factor)),
+                extension=PREVIEW_EXT,
+            )
+        self.preview_canvases.move_to_end(num)
+        self._release_preview_canvases()
+        return self.preview_canvases[num]
+
+    def _release_preview_canvases(self) -> None:
+        loaded = [canvas for canvas in self.preview_canvases.values()
+                  if canvas.loaded]
+        for canvas in loaded[:-PREVIEW_CANVAS_CACHE_SIZE]:
+            with handle_opencv_image_error(logger):
+                canvas.release()
+
+    def update_task_state(self, task_state):
+        # Write previews postponed by the canvases before they are read
+        for canvas in self.preview_canvases.values():
+            with handle_opencv_image_error(logger):
+                canvas.flush()
+        super().update_task_state(task_state)
+
     @CoreTask.handle_key_error
     def _update_subtask_frame_status(self, subtask_id):
         frames = self.subtasks_given[subtask_id]['frames']
@@ -315,31 +353,6 @@ class FrameRenderingTask(RenderingTask):
             state.status = TaskStatus.aborted
         # Otherwise, do not change frame's status.
 
-    def _paste_new_chunk(self, img_chunk, preview_file_path, chunk_num,
-                         all_chunks_num):
-
-        try:
-            img_offset = OpenCVImgRepr.empty(int(round(self.res_x *
-                                                       self.scale_factor)),
-                                             int(round(self.res_y
-                                                       * self.scale_factor)))
-            offset = int(math.floor((chunk_num - 1) * self.res_y
-                                    * self.scale_factor / all_chunks_num))
-            img_offset.paste_image(img_chunk, 0, offset)
-
-        except Exception as e:
-            logger.error("Can't generate preview {}".format(e))
-            img_offset = None
-
-        with handle_opencv_image_error(logger):
-            existing_frame_preview = OpenCVImgRepr.from_image_file(
-                preview_file_path)
-            if img_offset:
-                existing_frame_preview.add(img_offset)
-            return existing_frame_preview
-        logger.error("Can't add new chunk to preview")
-        return img_offset
-
     def _update_frame_task_preview(self):
         sent_color = (0, 255, 0)
         failed_color = (255, 0, 0)
@@ -34,6 +34,7 @@ from golem.marketplace.wasm_marketplace import (
     UsageReport
 )
 import golem.model
+from golem.core.simplehash import SimpleHash
 from golem.task.taskbase import Task, AcceptClientVerdict, TaskResult
 from golem.task.taskstate import SubtaskStatus
 from golem.task.taskclient import TaskClient
@@ -58,6 +59,23 @@ class SubtaskInstance:
     results: Optional[TaskResult]
 
 
+@dataclass
+class DigestedResult:
+    """Result files of a single subtask instance along with their digests.
+    Digests are computed once, when the result arrives, so that redundancy
+    comparison does not need to re-read the files.
+    """
+    files: List[str]
+    digests: Tuple[bytes, ...]
+
+    @classmethod
+    def from_files(cls, files: List[str]) -> 'DigestedResult':
+        return cls(
+            files=files,
+            digests=tuple(SimpleHash.hash_file(f) for f in files),
+        )
+
+
 class VbrSubtask:
     """Encapsulating subtask handling behavior for Verification by
     Redundancy. This class hides result handling, subtask spawning
@@ -109,9 +127,9 @@ class VbrSubtask:
         return list(self.subtasks.keys())
 
     def add_result(self, s_id: str, task_result: Optional[TaskResult]):
-        result_files = task_result.files if task_result else None
-        self.verifier.add_result(
-            self.subtasks[s_id].actor, result_files)
+        result = DigestedResult.from_files(task_result.files) \
+            if task_result else None
+        self.verifier.add_result(self.subtasks[s_id].actor, result)
         self.subtasks[s_id].results = task_result
 
     def get_result(self) -> Optional[TaskResult]:
@@ -124,7 +142,7 @@ class VbrSubtask:
         verdicts = []
         for actor, result, verdict in self.verifier.get_verdicts():
             if verdict == VerificationResult.SUCCESS and not self.result:
-                self.result = TaskResult(files=result)
+                self.result = TaskResult(files=result.files)
 
             verdicts.append((actor, verdict))
 
@@ -245,6 +263,7 @@ class WasmTask(CoreTask):  # pylint: disable=too-many-public-methods
         self.task_definition: WasmTaskDefinition = task_definition
         self.options: WasmTaskOptions = task_definition.options
         self.subtasks: List[VbrSubtask] = []
+        self._vbr_subtasks_by_id: Dict[str, VbrSubtask] = {}
 
         for s_name, s_params in self.options.get_subtask_iterator():
             s_params = {
@@ -268,6 +287,7 @@ class WasmTask(CoreTask):  # pylint: disable=too-many-public-methods
             next_subtask = s.new_instance(node_id)
             if next_subtask:
                 s_id, s_params = next_subtask
+                self._vbr_subtasks_by_id[s_id] = s
                 self.subtasks_given[s_id] = dict(
                     status=SubtaskStatus.starting, node_id=node_id)
                 ctd = self._new_compute_task_def(s_id, s_params, perf_index)
@@ -276,22 +296,13 @@ class WasmTask(CoreTask):  # pylint: disable=too-many-public-methods
         raise RuntimeError()
 
     def _find_vbrsubtask_by_id(self, subtask_id) -> VbrSubtask:
-        for subtask in self.subtasks:
-            if subtask.contains(subtask_id):
-                return subtask
-        raise KeyError()
+        return self._vbr_subtasks_by_id[subtask_id]
 
     @staticmethod
-    def cmp_results(result_list_a: List[Any],
-                    result_list_b: List[Any]) -> bool:
-        logger.debug("Comparing: %s and %s", result_list_a, result_list_b)
-        for r1, r2 in zip(result_list_a, result_list_b):
-            with open(r1, 'rb') as f1, open(r2, 'rb') as f2:
-                b1 = f1.read()
-                b2 = f2.read()
-                if b1 != b2:
-                    return False
-        return True
+    def cmp_results(result_a: DigestedResult,
+                    result_b: DigestedResult) -> bool:
+        logger.debug("Comparing: %s and %s", result_a.files, result_b.files)
+        return result_a.digests == result_b.digests
 
     def _resolve_subtasks_statuses(self, subtask: VbrSubtask):
         verdicts = subtask.get_verdicts()
@@ -540,11 +551,9 @@ class WasmTask(CoreTask):  # pylint: disable=too-many-public-methods
             cpu_usage * NANOSECOND)
 
     def restart_subtask(self, subtask_id: str):
-        for vbr_subtask in self.subtasks:
-            try:
-                vbr_subtask.restart_subtask(subtask_id)
-            except KeyError:
-                pass
+        vbr_subtask = self._vbr_subtasks_by_id.get(subtask_id)
+        if vbr_subtask is not None:
+            vbr_subtask.restart_subtask(subtask_id)
         self.subtasks_given[subtask_id]['status'] = SubtaskStatus.restarted
 
 
@@ -22,6 +22,11 @@ TOTAL_MEMORY_CAP = 0.75
 
 DEFAULT_HARDWARE_PRESET_NAME = "default"
 CUSTOM_HARDWARE_PRESET_NAME = "custom"
+# Whether cores and memory are sized to the load of the machine at runtime,
+# within the limits of the hardware preset
+HARDWARE_AUTOSIZE = 0
+# How frequently the load is measured for hardware autosizing (in seconds)
+HARDWARE_AUTOSIZE_INTERVAL = 30
 
 CONFIG_FILENAME = "app_cfg.ini"
 
@@ -50,10 +55,20 @@ NETWORK_CHECK_INTERVAL = 10.0
 MASK_UPDATE_INTERVAL = 30.0
 MAX_SENDING_DELAY = 360
 OFFER_POOLING_INTERVAL = 15.0
+# How frequently in-memory stats should be written to the database (in seconds)
+STATS_FLUSH_INTERVAL = 10
+# How frequently disk usage of resource directories should be recalculated
+# to correct the drift of recorded sizes (in seconds)
+DISK_USAGE_RECONCILE_INTERVAL = 30 * 60
+# How frequently database statistics should be refreshed and the WAL file
+# checkpointed (in seconds)
+DB_MAINTENANCE_INTERVAL = 60 * 60
 # How frequently task archive should be saved to disk (in seconds)
 TASKARCHIVE_MAINTENANCE_INTERVAL = 30
 # Filename for task archive disk file
 TASKARCHIVE_FILENAME = "task_archive.pickle"
+# Size of task archive journal file (in bytes) which triggers its compaction
+TASKARCHIVE_JOURNAL_MAX_SIZE = 4 * 1024 * 1024
 # Number of past days task archive will store aggregated information for
 TASKARCHIVE_NUM_INTERVALS = 365
 # Limit of the number  of non-expired tasks stored in task archive at any moment
@@ -158,6 +173,7 @@ class AppConfig:
             enable_monitor=ENABLE_MONITOR,
             # hardware
             hardware_preset_name=CUSTOM_HARDWARE_PRESET_NAME,
+            hardware_autosize=HARDWARE_AUTOSIZE,
             # price and trust
             min_price=MIN_PRICE,
             max_price=MAX_PRICE,
@@ -3,7 +3,7 @@ import ipaddress
 import click
 
 from golem.core.common import to_unicode
-from golem.network.transport.tcpnetwork import SocketAddress
+from golem.network.transport.tcpnetwork_helpers import SocketAddress
 
 
 def enforce_start_geth_used(ctx, param, value):
@@ -32,11 +32,18 @@ from twisted.internet.threads import deferToThread
 
 from apps.appsmanager import AppsManager
 import golem
-from golem import model
-from golem.appconfig import TASKARCHIVE_MAINTENANCE_INTERVAL, AppConfig
+from golem import hardware, model
+from golem.appconfig import (
+    DB_MAINTENANCE_INTERVAL,
+    DISK_USAGE_RECONCILE_INTERVAL,
+    HARDWARE_AUTOSIZE_INTERVAL,
+    STATS_FLUSH_INTERVAL,
+    TASKARCHIVE_MAINTENANCE_INTERVAL,
+    AppConfig,
+)
 from golem.apps.default import APPS
 from golem.clientconfigdescriptor import ConfigApprover, ClientConfigDescriptor
-from golem.core import variables
+from golem.core import statskeeper, variables
 from golem.core.common import (
     get_timestamp_utc,
     node_info_str,
@@ -44,7 +51,6 @@ from golem.core.common import (
     to_unicode,
 )
 from golem.core.deferred import deferred_from_future
-from golem.core.fileshelper import du
 from golem.core.keysauth import KeysAuth
 from golem.core.service import LoopingCallService
 from golem.core.simpleserializer import DictSerializer
@@ -55,6 +61,7 @@ from golem.environments.environmentsmanager import EnvironmentsManager
 from golem.ethereum import exceptions as eth_exceptions
 from golem.ethereum.fundslocker import FundsLocker
 from golem.ethereum.transactionsystem import TransactionSystem
+from golem.hardware import autosize
 from golem.hardware.presets import HardwarePresets
 from golem.manager.nodestatesnapshot import ComputingSubtaskStateSnapshot
 from golem.monitor.model.nodemetadatamodel import NodeMetadataModel
@@ -63,6 +70,7 @@ from golem.monitorconfig import MONITOR_CONFIG
 from golem.network import broadcast
 from golem.network import nodeskeeper
 from golem.network.concent.client import ConcentClientService
+from golem.network.connectivity import ConnectivityDiscovery, ExternalAddress
 from golem.network.concent.filetransfers import ConcentFiletransferService
 from golem.network.history import MessageHistoryService
 from golem.network.hyperdrive.daemon_manager import HyperdriveDaemonManager
@@ -74,6 +82,7 @@ from golem.network.transport.tcpnetwork import SocketAddress
 from golem.network.upnp.mapper import PortMapperManager
 from golem.ranking.ranking import Ranking
 from golem.report import Component, Stage, StatusPublisher, report_calls
+from golem.resource import diskusage
 from golem.resource.base.resourceserver import BaseResourceServer
 from golem.resource.dirmanager import DirManager, DirectoryType
 from golem.resource.hyperdrive.resourcesmanager import HyperdriveResourceManager
@@ -83,7 +92,9 @@ from golem.task import taskpreset, taskstate
 from golem.task.helpers import calculate_subtask_payment
 from golem.task.taskarchiver import TaskArchiver
 from golem.task.taskserver import TaskServer
+from golem.task.tasksummary import DEFAULT_PAGE_SIZE, TaskSummaries
 from golem.task.tasktester import TaskTester
+from golem.tools.memoryhelper import dir_size_to_display
 from golem.tools.os_info import OSInfo
 from golem.tools.talkback import enable_sentry_logger
 
@@ -183,6 +194,10 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
         self.task_server: Optional[TaskServer] = None
         self.port_mapper = None
+        self.connectivity = ConnectivityDiscovery(
+            use_ipv6=self.config_desc.use_ipv6,
+            address_changed=self._external_address_changed,
+        )
 
         self.nodes_manager_client = None
 
@@ -190,11 +205,18 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             NetworkConnectionPublisherService(
                 self,
                 int(self.config_desc.network_check_interval)),
+            ConnectivityDiscoveryService(
+                self.connectivity,
+                max(1, int(self.config_desc.network_check_interval))),
             TaskArchiverService(self.task_archiver),
+            HardwareAutosizeService(self),
+            StatsFlushService(),
             MessageHistoryService(),
             DoWorkService(self),
             DailyJobsService(self),
         ]
+        if self.db:
+            self._services.append(DatabaseMaintenanceService(self.db))
 
         clean_resources_older_than = \
             self.config_desc.clean_resources_older_than_seconds
@@ -248,6 +270,10 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             self.taskserver_listener,
             signal='golem.taskserver'
         )
+        self._task_summaries = TaskSummaries(
+            self._get_task_summary,
+            self._get_indexed_task_summary,
+        )
 
         logger.debug('Client init completed')
 
@@ -507,6 +533,12 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         logger.info("Restoring resources ...")
         self.task_server.restore_resources()
 
+        for res_dir in self.get_res_dirs().values():
+            diskusage.ledger.track(res_dir)
+        disk_usage_service = DiskUsageService()
+        disk_usage_service.start()
+        self._services.append(disk_usage_service)
+
         # Start service after restore_resources() to avoid race conditions
         if cleaning_enabled and clean_tasks_older_than > 0:
             logger.debug('Starting task cleaner service ...')
@@ -593,23 +625,23 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
     def _restore_locks(self) -> None:
         assert self.task_server is not None
         tm = self.task_server.task_manager
-        for task_id, task_state in tm.tasks_states.items():
-            if not task_state.status.is_completed():
-                task = tm.tasks[task_id]
-                unfinished_subtasks = task.get_total_tasks()
-                for subtask_state in task_state.subtask_states.values():
-                    if subtask_state.status is not None and\
-                            subtask_state.status.is_finished():
-                        unfinished_subtasks -= 1
-                try:
-                    self.funds_locker.lock_funds(
-                        task_id,
-                        task.subtask_price,
-                        unfinished_subtasks,
-                    )
-                except eth_exceptions.NotEnoughFunds as e:
-                    # May happen when gas prices increase, not much we can do
-                    logger.info("Not enough funds to restore old locks: %r", e)
+        for task_id in tm.get_unfinished_task_ids():
+            task_state = tm.tasks_states[task_id]
+            task = tm.tasks[task_id]
+            unfinished_subtasks = task.get_total_tasks()
+            for subtask_state in task_state.subtask_states.values():
+                if subtask_state.status is not None and\
+                        subtask_state.status.is_finished():
+                    unfinished_subtasks -= 1
+            try:
+                self.funds_locker.lock_funds(
+                    task_id,
+                    task.subtask_price,
+                    unfinished_subtasks,
+                )
+            except eth_exceptions.NotEnoughFunds as e:
+                # May happen when gas prices increase, not much we can do
+                logger.info("Not enough funds to restore old locks: %r", e)
 
     def start_upnp(self, ports):
         logger.debug("Starting upnp ...")
@@ -620,6 +652,14 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             for port in ports:
                 self.port_mapper.create_mapping(port)
             self.port_mapper.update_node(self.node)
+            self.connectivity.port_mapper = self.port_mapper
+
+    def _external_address_changed(self, address: ExternalAddress) -> None:
+        if self.node.pub_addr == address.ip:
+            return
+        logger.info('Public address changed. old=%r, new=%r, source=%s',
+                    self.node.pub_addr, address.ip, address.source)
+        self.node.pub_addr = address.ip
 
     def stop_network(self):
         logger.info("Stopping network ...")
@@ -707,6 +747,8 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
         dispatcher.send(signal='golem.monitor', event='shutdown')
 
+        statskeeper.flush_all()
+
         if self.db:
             self.db.close()
 
@@ -906,71 +948,11 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         if not task_dict:
             # NEW taskmanager
             logger.debug('get_task(task_id=%r) - NEW', task_id)
-            rtm = self.task_server.requested_task_manager
-            task = rtm.get_requested_task(task_id)
-            if not task:
+            task_dict = self._get_requested_task_dict(task_id)
+            if not task_dict:
                 return None
+            rtm = self.task_server.requested_task_manager
             subtask_ids = rtm.get_requested_task_subtask_ids(task_id)
-            # time_started
-            if task.start_time is None:
-                time_started = get_timestamp_utc()
-                if task.status == taskstate.TaskStatus.errorCreating:
-                    time_started -= 1
-            else:
-                time_started = task.start_time.timestamp()
-            # proress and time_remaining
-            finished_subtasks = rtm.count_finished_subtasks(task.task_id)
-            progress = finished_subtasks / task.max_subtasks
-            time_remaining = None
-            if progress > 0.0 and not task.status.is_completed():
-                elapsed = task.elapsed_seconds
-                time_remaining = (elapsed / progress) - elapsed
-            # type
-            app_name = 'Unknown'
-            if task.app_id in APPS:
-                app = APPS[task.app_id]
-                app_name = app.name
-            # last_updated
-            if task.end_time is None:
-                last_updated = get_timestamp_utc()
-            else:
-                last_updated = task.end_time.timestamp()
-            # compute_on
-            compute_on = 'cpu'
-            if task.env_id == DOCKER_GPU_ENV_ID:
-                compute_on = 'gpu'
-            # estimated_cost and estimated_fee
-            subtask_price = calculate_subtask_payment(
-                task.max_price_per_hour,
-                task.subtask_timeout
-            )
-            estimated_cost = subtask_price * task.max_subtasks
-            estimated_fee = self.transaction_system.eth_for_batch_payment(
-                task.max_subtasks
-            )
-            task_dict = {
-                'id': task.task_id,
-                'time_remaining': time_remaining,
-                'subtasks_count': task.max_subtasks,
-                'status': task.status.value,
-                'progress': progress,
-                'time_started': time_started,
-                'last_updated': last_updated,
-                'name': task.name,
-                'bid': float(task.max_price_per_hour) / denoms.ether,
-                'compute_on': compute_on,
-                'concent_enabled': task.concent_enabled,
-                'subtask_timeout': str(
-                    datetime.timedelta(seconds=task.subtask_timeout),
-                ),
-                'timeout': str(datetime.timedelta(seconds=task.task_timeout)),
-                'type': app_name,
-                'options': {
-                    'output_path': task.output_directory
-                },
-                'estimated_cost': estimated_cost,
-                'estimated_fee': estimated_fee,
-            }
         else:
             # OLD taskmanager
             logger.debug('get_task(task_id=%r) - OLD', task_id)
@@ -1000,6 +982,77 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
                     if p.wallet_operation.gas_cost
                 )
 
+        return self._stringify_task_dict(task_dict)
+
+    def _get_requested_task_dict(self, task_id: str) -> Optional[dict]:
+        rtm = self.task_server.requested_task_manager
+        task = rtm.get_requested_task(task_id)
+        if not task:
+            return None
+        # time_started
+        if task.start_time is None:
+            time_started = get_timestamp_utc()
+            if task.status == taskstate.TaskStatus.errorCreating:
+                time_started -= 1
+        else:
+            time_started = task.start_time.timestamp()
+        # proress and time_remaining
+        finished_subtasks = rtm.count_finished_subtasks(task.task_id)
+        progress = finished_subtasks / task.max_subtasks
+        time_remaining = None
+        if progress > 0.0 and not task.status.is_completed():
+            elapsed = task.elapsed_seconds
+            time_remaining = (elapsed / progress) - elapsed
+        # type
+        app_name = 'Unknown'
+        if task.app_id in APPS:
+            app = APPS[task.app_id]
+            app_name = app.name
+        # last_updated
+        if task.end_time is None:
+            last_updated = get_timestamp_utc()
+        else:
+            last_updated = task.end_time.timestamp()
+        # compute_on
+        compute_on = 'cpu'
+        if task.env_id == DOCKER_GPU_ENV_ID:
+            compute_on = 'gpu'
+        # estimated_cost and estimated_fee
+        subtask_price = calculate_subtask_payment(
+            task.max_price_per_hour,
+            task.subtask_timeout
+        )
+        estimated_cost = subtask_price * task.max_subtasks
+        estimated_fee = self.transaction_system.eth_for_batch_payment(
+            task.max_subtasks
+        )
+        return {
+            'id': task.task_id,
+            'time_remaining': time_remaining,
+            'subtasks_count': task.max_subtasks,
+            'status': task.status.value,
+            'progress': progress,
+            'time_started': time_started,
+            'time_created': task.created_date.timestamp(),
+            'last_updated': last_updated,
+            'name': task.name,
+            'bid': float(task.max_price_per_hour) / denoms.ether,
+            'compute_on': compute_on,
+            'concent_enabled': task.concent_enabled,
+            'subtask_timeout': str(
+                datetime.timedelta(seconds=task.subtask_timeout),
+            ),
+            'timeout': str(datetime.timedelta(seconds=task.task_timeout)),
+            'type': app_name,
+            'options': {
+                'output_path': task.output_directory
+            },
+            'estimated_cost': estimated_cost,
+            'estimated_fee': estimated_fee,
+        }
+
+    @staticmethod
+    def _stringify_task_dict(task_dict: dict) -> dict:
         # Convert to string because RPC serializer fails on big numbers
         # and enums
         for k in ('cost', 'fee', 'estimated_cost', 'estimated_fee',
@@ -1009,6 +1062,23 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
         return task_dict
 
+    def _get_task_ids(self) -> Set[str]:
+        assert self.task_server is not None
+        task_ids: Set[str] = set(self.task_server.task_manager.tasks.keys())
+        task_ids.update(
+            self.task_server.requested_task_manager.get_requested_task_ids())
+        return task_ids
+
+    def _get_indexed_task_summary(self, task_id: str) -> Optional[dict]:
+        assert self.task_server is not None
+        return self.task_server.task_manager.get_indexed_task_summary(task_id)
+
+    def _get_task_summary(self, task_id: str) -> Optional[dict]:
+        summary = self.task_server.task_manager.get_task_summary(task_id)
+        if not summary:
+            summary = self._get_requested_task_dict(task_id)
+        return summary
+
     @rpc_utils.expose('comp.tasks')
     def get_tasks(
             self,
@@ -1037,6 +1107,46 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         filtered_tasks = list(filter(filter_fn, tasks))
         return sorted(filtered_tasks, key=lambda task: task['time_started'])
 
+    @rpc_utils.expose('comp.tasks.summary')
+    def get_tasks_summary(  # pylint: disable=too-many-arguments
+            self,
+            cursor: Optional[str] = None,
+            limit: int = DEFAULT_PAGE_SIZE,
+            statuses: Optional[List[str]] = None,
+            task_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Lightweight, paginated alternative to `comp.tasks`. Task summaries
+        don't include previews; payment totals of a page are fetched in
+        a single query.
+        :param cursor: `next_cursor` returned with the previous page
+        :param limit: maximum number of tasks in a page
+        :param statuses: only list tasks with one of these status values
+        :param task_type: only list tasks of this type
+        :return: {'tasks': [...], 'next_cursor': str or None}
+        """
+        if not self.task_server:
+            return {'tasks': [], 'next_cursor': None}
+
+        summaries, next_cursor = self._task_summaries.get_page(
+            self._get_task_ids(),
+            cursor=cursor,
+            limit=limit,
+            statuses=statuses,
+            task_type=task_type,
+        )
+        payments = self.transaction_system.get_tasks_payments_totals(
+            summary['id'] for summary in summaries
+        )
+
+        tasks = []
+        for summary in summaries:
+            task_dict = dict(summary)
+            task_dict['cost'], task_dict['fee'] = \
+                payments.get(summary['id'], (None, None))
+            tasks.append(self._stringify_task_dict(task_dict))
+        return {'tasks': tasks, 'next_cursor': next_cursor}
+
     @staticmethod
     def _filter_task_created_status(task: Dict) -> bool:
         return bool(task) and task['status'] not in (
@@ -1276,8 +1386,14 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
     @rpc_utils.expose('res.dirs.size')
     def get_res_dirs_sizes(self):
-        return {str(name): str(du(d))
-                for name, d in list(self.get_res_dirs().items())}
+        sizes = {}
+        for name, d in list(self.get_res_dirs().items()):
+            size = diskusage.ledger.size(d)
+            if size is None:
+                # Directories are walked only until their size is reconciled
+                size = diskusage.path_size(d)
+            sizes[str(name)] = dir_size_to_display(size)
+        return sizes
 
     @rpc_utils.expose('res.dir')
     def get_res_dir(self, dir_type):
@@ -1316,8 +1432,14 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
     def clean_old_tasks(self):
         logger.debug('Cleaning old tasks ...')
+        if not self.task_server:
+            return
         now = get_timestamp_utc()
-        for task in self.get_tasks():
+        # Summaries of completed tasks are read without unpickling them
+        for task_id in sorted(self._get_task_ids()):
+            task = self._get_task_summary(task_id)
+            if not task:
+                continue
             deadline = task['time_started'] \
                 + string_to_timeout(task['timeout'])\
                 + self.config_desc.clean_tasks_older_than_seconds
@@ -1651,6 +1773,76 @@ class NetworkConnectionPublisherService(LoopingCallService):
         return self._client.connection_status()
 
 
+class ConnectivityDiscoveryService(LoopingCallService):
+    def __init__(self,
+                 connectivity: ConnectivityDiscovery,
+                 interval_seconds: int) -> None:
+        super().__init__(interval_seconds)
+        self._connectivity = connectivity
+
+    def _run(self):
+        self._connectivity.check_network()
+
+
+class HardwareAutosizeService(LoopingCallService):
+    """ Sizes the cores and memory used for computations and advertised in
+    offers to the load of the machine, if enabled in the config. The load is
+    measured and the limits are changed only while no subtask is computed,
+    so the VM is never reconfigured. """
+
+    def __init__(self, client: 'Client') -> None:
+        super().__init__(interval_seconds=HARDWARE_AUTOSIZE_INTERVAL)
+        self._client = client
+        self._monitor: Optional[autosize.LoadMonitor] = None
+        self._autosizer: Optional[autosize.Autosizer] = None
+        # Whether the load measured since the last run includes computations
+        self._computed = False
+        dispatcher.connect(self._subtask_finished, signal='golem.taskcomputer')
+
+    def _subtask_finished(self, event='default', **_kwargs) -> None:
+        if event == 'subtask_finished':
+            self._computed = True
+
+    def _run(self) -> None:
+        task_server = self._client.task_server
+        if task_server is None:
+            return
+        if task_server.task_computer.has_assigned_task():
+            self._computed = True
+            return
+
+        config_desc = self._client.config_desc
+        if not config_desc.hardware_autosize:
+            self._monitor = None
+            self._autosizer = None
+            if task_server.hardware_limits is not None:
+                task_server.set_hardware_limits(None)
+            return
+
+        max_limits = autosize.Limits(
+            num_cores=config_desc.num_cores,
+            max_memory_size=config_desc.max_memory_size,
+        )
+        if self._autosizer is None or self._autosizer.max_limits != max_limits:
+            self._autosizer = autosize.Autosizer(
+                max_limits, total_cores=len(hardware.cpus()))
+        if self._monitor is None:
+            self._monitor = autosize.LoadMonitor()
+            self._computed = False
+            return
+
+        sample = self._monitor.sample()
+        if self._computed:
+            self._computed = False
+            return
+        self._autosizer.update(sample)
+
+        # Limits are also reset when the config changes
+        applied = task_server.hardware_limits or max_limits
+        if self._autosizer.limits != applied:
+            task_server.set_hardware_limits(self._autosizer.limits)
+
+
 class TaskArchiverService(LoopingCallService):
     def __init__(self,
                  task_archiver: TaskArchiver) -> None:
@@ -1662,6 +1854,34 @@ class TaskArchiverService(LoopingCallService):
         self._task_archiver.do_maintenance()
 
 
+class StatsFlushService(LoopingCallService):
+    def __init__(self) -> None:
+        super().__init__(interval_seconds=STATS_FLUSH_INTERVAL,
+                         run_in_thread=True)
+
+    def _run(self):
+        statskeeper.flush_all()
+
+
+class DiskUsageService(LoopingCallService):
+    def __init__(self) -> None:
+        super().__init__(interval_seconds=DISK_USAGE_RECONCILE_INTERVAL,
+                         run_in_thread=True)
+
+    def _run(self):
+        diskusage.ledger.reconcile()
+
+
+class DatabaseMaintenanceService(LoopingCallService):
+    def __init__(self, database: Database) -> None:
+        super().__init__(interval_seconds=DB_MAINTENANCE_INTERVAL,
+                         run_in_thread=True)
+        self.database = database
+
+    def _run(self):
+        self.database.maintain()
+
+
 class ResourceCleanerService(LoopingCallService):
     def __init__(self,
                  client: Client,
@@ -1707,10 +1927,10 @@ class MaskUpdateService(LoopingCallService):
         logger.debug('Updating masks')
         old_task_manager = self._old_task_manager
         requested_task_manager = self._requested_task_manager
-        # Using list() because tasks could be changed by another thread
-        for task_id, task in list(old_task_manager.tasks.items()):
+        for task_id in old_task_manager.get_unfinished_task_ids():
             if not old_task_manager.task_needs_computation(task_id):
                 continue
+            task = old_task_manager.tasks[task_id]
             task_state = old_task_manager.query_task_state(task_id)
             if task_state.elapsed_time < self._interval:
                 continue
@@ -49,6 +49,7 @@ class ClientConfigDescriptor(object):
         self.max_resource_size = 0  # KiB
         self.max_memory_size = 0  # KiB
         self.hardware_preset_name = ""
+        self.hardware_autosize = 0
 
         self.requesting_trust = 0.0
         self.computing_trust = 0.0
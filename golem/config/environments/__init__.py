@@ -2,7 +2,6 @@ import os
 import sys
 from importlib import reload
 
-from golem_sci import contracts
 from golem.core.variables import CONCENT_CHOICES
 
 GOLEM_ENVIRONMENT_VARIABLE = 'GOLEM_ENVIRONMENT'
@@ -29,5 +28,6 @@ def init_concent_config(config):
         config.CONCENT_VARIANT.get('deposit_contract_address')
 
     if config.deposit_contract_address:
+        from golem_sci import contracts
         config.CONTRACT_ADDRESSES[contracts.GNTDeposit] = \
             config.deposit_contract_address
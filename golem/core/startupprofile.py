@@ -0,0 +1,135 @@
+import builtins
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FILENAME = 'startup_profile.json'
+# Imports taking less time (in seconds) are not recorded
+IMPORT_THRESHOLD = 0.01
+
+
+class StartupProfiler:
+    """ Records wall time of startup phases and of imports of modules which
+    take at least IMPORT_THRESHOLD seconds to load. Import times include
+    the time of nested imports. Does nothing until enabled. """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._started = 0.
+        # phase name -> start time relative to `_started`, duration
+        self._phases: Dict[str, Dict[str, Optional[float]]] = {}
+        # module name -> import time
+        self._imports: Dict[str, float] = {}
+        self._original_import: Optional[Callable] = None
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self._started = time.monotonic()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+        self.enabled = False
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original_import
+
+    def start_phase(self, name: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._phases[name] = {
+                'start': time.monotonic() - self._started,
+                'duration': None,
+            }
+
+    def end_phase(self, name: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            phase = self._phases.get(name)
+            if phase is not None and phase['duration'] is None:
+                phase['duration'] = \
+                    time.monotonic() - self._started - phase['start']
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.start_phase(name)
+        try:
+            yield
+        finally:
+            self.end_phase(name)
+
+    def track(self, name: str, deferred):
+        """ Record a phase lasting until the deferred fires """
+        if not self.enabled or deferred is None:
+            return deferred
+        self.start_phase(name)
+
+        def _end(result):
+            self.end_phase(name)
+            return result
+
+        return deferred.addBoth(_end)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            phases: List[Dict[str, Any]] = [
+                dict(name=name, **phase)
+                for name, phase in self._phases.items()
+            ]
+            imports = sorted(self._imports.items(), key=lambda i: -i[1])
+        phases.sort(key=lambda phase: phase['start'])
+        return {
+            'total': time.monotonic() - self._started,
+            'phases': phases,
+            'imports': [
+                {'module': module, 'duration': duration}
+                for module, duration in imports
+            ],
+        }
+
+    def finish(self, datadir: str) -> None:
+        """ Stop recording imports and save the report in `datadir` """
+        if not self.enabled:
+            return
+        self.disable()
+        path = os.path.join(datadir, PROFILE_FILENAME)
+        report = self.report()
+        try:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            logger.warning("Couldn't save startup profile to %r: %s", path, e)
+            return
+        logger.info("Startup took %.2f s, profile saved to %r",
+                    report['total'], path)
+
+    def _import(self, name, *args, **kwargs):
+        # pylint: disable=not-callable
+        level = args[3] if len(args) > 3 else kwargs.get('level', 0)
+        if level or name in sys.modules:
+            return self._original_import(name, *args, **kwargs)
+
+        started = time.monotonic()
+        try:
+            return self._original_import(name, *args, **kwargs)
+        finally:
+            duration = time.monotonic() - started
+            if duration >= IMPORT_THRESHOLD:
+                with self._lock:
+                    self._imports.setdefault(name, duration)
+
+
+startup_profiler = StartupProfiler()
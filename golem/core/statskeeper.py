@@ -1,35 +1,56 @@
 import functools
 import logging
+import time
+import weakref
 from threading import Lock
-from typing import Type, Any, Optional
+from typing import Type, Any, Dict, Optional
 
 from peewee import DatabaseError
 
 from golem.core.common import HandleAttributeError, HandleError
-from golem.model import Stats
+from golem.model import db, Stats
 
 logger = logging.getLogger(__name__)
 
+_keepers: 'weakref.WeakSet[StatsKeeper]' = weakref.WeakSet()
+
 
 def log_error(*args, **_kwargs):
     logger.warning("Unknown stats %r", args[1])
 
 
+def flush_all() -> None:
+    """ Write pending changes of every live StatsKeeper to the database """
+    for keeper in list(_keepers):
+        keeper.flush()
+
+
 class StatsKeeper:
+    """ Keeps session and global stats in memory. Changes are accumulated
+    and written to the database in a single transaction by `flush`, which
+    is called periodically and at shutdown (see `flush_all`).
+    """
 
     handle_attribute_error = HandleAttributeError(log_error)
 
     def __init__(self, stat_class: Type, default_value: str = '') -> None:
         self._lock = Lock()
+        self._flush_lock = Lock()
         self.session_stats = stat_class()
         self.global_stats = stat_class()
         self.default_value = default_value
+        # Increments not yet written to the database
+        self._pending_increments: Dict[str, Any] = {}
+        # Values set with `set_stat` not yet written to the database
+        self._pending_values: Dict[str, Any] = {}
 
         for stat in vars(self.global_stats):
             val = self._get_or_create(stat)
             if val is not None:
                 setattr(self.global_stats, stat, val)
 
+        _keepers.add(self)
+
     @HandleError(error=(TypeError, AttributeError), handle_error=log_error)
     def increase_stat(self, name: str, increment: Any = 1) -> None:
         with self._lock:
@@ -37,11 +58,15 @@ class StatsKeeper:
             session_val = self._cast_type(session_val + increment, name)
             setattr(self.session_stats, name, session_val)
 
-            global_val = self._get_or_create(name)
+            global_val = getattr(self.global_stats, name)
             global_val = self._cast_type(global_val + increment, name)
             setattr(self.global_stats, name, global_val)
 
-            self._update_stat(name, global_val)
+            if name in self._pending_values:
+                self._pending_values[name] = global_val
+            else:
+                self._pending_increments[name] = \
+                    self._pending_increments.get(name, 0) + increment
 
     @handle_attribute_error
     def set_stat(self, name: str, value: Any) -> None:
@@ -49,17 +74,79 @@ class StatsKeeper:
             setattr(self.session_stats, name, value)
             setattr(self.global_stats, name, value)
 
-            self._update_stat(name, value)
+            self._pending_increments.pop(name, None)
+            self._pending_values[name] = value
+
+    def flush(self) -> None:
+        """ Write accumulated changes to the database in one transaction.
+        Increments are added to the values currently stored, so that several
+        keepers of the same stats do not overwrite each other. """
+        with self._flush_lock:
+            with self._lock:
+                increments = self._pending_increments
+                values = self._pending_values
+                self._pending_increments = {}
+                self._pending_values = {}
+
+            if not increments and not values:
+                return
+
+            started = time.monotonic()
+            stored: Dict[str, Any] = {}
+            try:
+                with db.atomic():
+                    for name, value in values.items():
+                        self._update_stat(name, value)
+                    for name, increment in increments.items():
+                        value = self._get_or_create(name)
+                        if value is None:
+                            continue
+                        stored[name] = self._cast_type(value + increment, name)
+                        self._update_stat(name, stored[name])
+            except DatabaseError as err:
+                logger.error("Exception occurred while flushing stats: %r",
+                             err)
+                self._restore_pending(increments, values)
+                return
+
+            logger.debug("Flushed %d stats in %.3f s",
+                         len(stored) + len(values),
+                         time.monotonic() - started)
+
+            self._restore_pending(
+                {name: increment for name, increment in increments.items()
+                 if name not in stored},
+                {})
+
+            with self._lock:
+                for name, value in stored.items():
+                    if name in self._pending_values:
+                        continue
+                    # Include increments made while flushing
+                    value += self._pending_increments.get(name, 0)
+                    setattr(self.global_stats, name, value)
+
+    def _restore_pending(self, increments: Dict[str, Any],
+                         values: Dict[str, Any]) -> None:
+        with self._lock:
+            for name, increment in increments.items():
+                if name in self._pending_values:
+                    continue
+                self._pending_increments[name] = \
+                    self._pending_increments.get(name, 0) + increment
+            for name in values:
+                if name in self._pending_values:
+                    continue
+                # The in-memory value already includes later increments
+                self._pending_increments.pop(name, None)
+                self._pending_values[name] = getattr(self.global_stats, name)
 
     @staticmethod
     def _update_stat(name: str, value: Any) -> None:
-        try:
-            Stats.update(value=f"{value}") \
-                .where(Stats.name == name) \
-                .execute()
-        except DatabaseError as err:
-            logger.error("Exception occurred while updating stat %r: "
-                         "%r", name, err)
+        """ Errors are raised to abort the transaction in flush() """
+        Stats.update(value=f"{value}") \
+            .where(Stats.name == name) \
+            .execute()
 
     def get_stats(self, name):
         return self._get_stats(name) or (None, None)
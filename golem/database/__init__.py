@@ -1,6 +1,7 @@
 __all__ = [
     'Database',
-    'GolemSqliteDatabase'
+    'GolemSqliteDatabase',
+    'TuningProfile',
 ]
 
-from .database import Database, GolemSqliteDatabase
+from .database import Database, GolemSqliteDatabase, TuningProfile
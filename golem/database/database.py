@@ -3,7 +3,7 @@ import logging
 import os
 import sqlite3
 import time
-from typing import Optional, Type, Sequence
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Type
 
 import peewee
 
@@ -13,12 +13,59 @@ from golem.database.migration.migrate import migrate_schema, MigrationError
 logger = logging.getLogger('golem.db')
 
 
+class TuningProfile(NamedTuple):
+    """ SQLite settings applied to every connection to the database """
+    journal_mode: str = 'WAL'
+    # NORMAL is durable in WAL mode, except for the last transactions
+    # before a power loss
+    synchronous: str = 'NORMAL'
+    # How long should a statement wait for a lock (in milliseconds)?
+    busy_timeout: int = 10000
+    # Page cache size; negative values are in KiB
+    cache_size: int = -16 * 1024
+    # Size of the memory-mapped part of the database file (in bytes)
+    mmap_size: int = 64 * 1024 * 1024
+    temp_store: str = 'MEMORY'
+    # WAL size (in pages) which triggers an automatic checkpoint
+    wal_autocheckpoint: int = 1000
+
+    def pragmas(self) -> List[Tuple[str, Any]]:
+        return list(self._asdict().items())
+
+
+DEFAULT_TUNING = TuningProfile()
+# Settings used before tuning profiles were introduced
+LEGACY_TUNING = TuningProfile(
+    synchronous='FULL',
+    busy_timeout=1000,
+    cache_size=-2000,
+    mmap_size=0,
+    temp_store='DEFAULT',
+)
+
+
 class GolemSqliteDatabase(peewee.SqliteDatabase):
     RETRY_TIMEOUT = datetime.timedelta(minutes=1)
+    # Delay before the first retry of a failed statement, doubled after each
+    # following failure up to MAX_RETRY_DELAY (in seconds)
+    RETRY_DELAY = 0.01
+    MAX_RETRY_DELAY = 1.
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Number of statements retried since the database was created
+        self.retries = 0
 
     def sequence_exists(self, seq):
         raise NotImplementedError()
 
+    def set_pragmas(self, pragmas: List[Tuple[str, Any]]) -> None:
+        """ Set pragmas applied to new connections, overriding the ones
+        with the same names """
+        merged = dict(self._pragmas)
+        merged.update(pragmas)
+        self._pragmas = list(merged.items())
+
     def execute_sql(self, sql, params=None, require_commit=True):
         # Loosely based on
         # https://github.com/coleifer/peewee/blob/2.10.2/playhouse/shortcuts.py#L206-L219
@@ -55,13 +102,15 @@ class GolemSqliteDatabase(peewee.SqliteDatabase):
                     iterations,
                     e,
                 )
+                self.retries += 1
                 if not self.is_closed():
                     self.close()
-                time.sleep(0)
+                time.sleep(min(self.RETRY_DELAY * 2 ** (iterations - 1),
+                               self.MAX_RETRY_DELAY))
 
 
 class Database:
-    SCHEMA_VERSION = 48
+    SCHEMA_VERSION = 50
 
     def __init__(self,  # noqa pylint: disable=too-many-arguments
                  db: peewee.Database,
@@ -69,7 +118,8 @@ class Database:
                  models: Sequence[Type[peewee.Model]],
                  db_dir: str,
                  db_name: str = 'golem.db',
-                 schemas_dir: Optional[str] = default_migrate_dir()) -> None:
+                 schemas_dir: Optional[str] = default_migrate_dir(),
+                 tuning: Optional[TuningProfile] = DEFAULT_TUNING) -> None:
 
         self.fields = fields
         self.models = models
@@ -79,6 +129,8 @@ class Database:
             os.makedirs(db_dir)
 
         self.db = db
+        if tuning and isinstance(db, GolemSqliteDatabase):
+            db.set_pragmas(tuning.pragmas())
         self.db.init(os.path.join(db_dir, db_name))
         self.db.connect()
 
@@ -93,6 +145,12 @@ class Database:
         if not self.db.is_closed():
             self.db.close()
 
+    def maintain(self) -> None:
+        """ Refresh query planner statistics and move the content of the WAL
+        file to the database without blocking other connections """
+        self.db.execute_sql('PRAGMA optimize')
+        self.db.execute_sql('PRAGMA wal_checkpoint(PASSIVE)')
+
     def get_user_version(self) -> int:
         cursor = self.db.execute_sql('PRAGMA user_version').fetchone()
         return int(cursor[0])
@@ -0,0 +1,18 @@
+# pylint: disable=no-member
+# pylint: disable=unused-argument
+import peewee as pw
+
+SCHEMA_VERSION = 49
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.add_fields(
+        'networkmessage',
+        msg_version=pw.CharField(null=True),
+    )
+    migrator.add_index('networkmessage', 'msg_date', unique=False)
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.drop_index('networkmessage', 'msg_date')
+    migrator.remove_fields('networkmessage', 'msg_version')
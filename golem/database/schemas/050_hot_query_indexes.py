@@ -0,0 +1,50 @@
+# pylint: disable=no-member
+# pylint: disable=unused-argument
+
+SCHEMA_VERSION = 50
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.add_index('requestedsubtask', 'subtask_id', unique=False)
+    migrator.add_index('requestedsubtask', 'status', unique=False)
+    migrator.add_index('requestedsubtask', 'task', 'status', unique=False)
+    migrator.add_index('requestedsubtask', 'computing_node', 'task', 'status',
+                       unique=False)
+
+    # Missing in databases created before the message queue was added
+    migrator.sql('DROP INDEX IF EXISTS queuedmessage_node')
+    migrator.add_index('queuedmessage', 'node', 'created_date', unique=False)
+    migrator.add_index('queuedmessage', 'deadline', unique=False)
+
+    migrator.drop_index('networkmessage', 'subtask')
+    migrator.add_index('networkmessage', 'subtask', 'msg_cls', 'node',
+                       unique=False)
+
+    migrator.add_index('walletoperation', 'tx_hash', unique=False)
+    migrator.add_index('walletoperation', 'sender_address', 'tx_hash',
+                       unique=False)
+
+    migrator.add_index('taskpayment', 'subtask', 'node', unique=False)
+    migrator.add_index('taskpayment', 'task', unique=False)
+    migrator.add_index('taskpayment', 'accepted_ts', unique=False)
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.drop_index('taskpayment', 'accepted_ts')
+    migrator.drop_index('taskpayment', 'task')
+    migrator.drop_index('taskpayment', 'subtask', 'node')
+
+    migrator.drop_index('walletoperation', 'sender_address', 'tx_hash')
+    migrator.drop_index('walletoperation', 'tx_hash')
+
+    migrator.drop_index('networkmessage', 'subtask', 'msg_cls', 'node')
+    migrator.add_index('networkmessage', 'subtask', unique=False)
+
+    migrator.drop_index('queuedmessage', 'deadline')
+    migrator.drop_index('queuedmessage', 'node', 'created_date')
+    migrator.add_index('queuedmessage', 'node', unique=False)
+
+    migrator.drop_index('requestedsubtask', 'computing_node', 'task', 'status')
+    migrator.drop_index('requestedsubtask', 'task', 'status')
+    migrator.drop_index('requestedsubtask', 'status')
+    migrator.drop_index('requestedsubtask', 'subtask_id')
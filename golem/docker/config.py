@@ -56,23 +56,29 @@ class DockerConfigManager(object):
         self.hypervisor: Optional['Hypervisor'] = None
 
     def build_config(self, config_desc) -> None:
+        if config_desc:
+            self.set_container_limits(config_desc.num_cores,
+                                      config_desc.max_memory_size)
+
+    def set_container_limits(self, num_cores: int,
+                             max_memory_size: int) -> None:
+        """
+        Limits CPU cores and memory (in KiB) of containers started from now
+        on. Unlike the VM constraints, doesn't require restarting the VM.
+        """
         host_config = dict()
 
-        if config_desc:
-            num_cores = config_desc.num_cores
-            max_memory_size = config_desc.max_memory_size
-
-            try:
-                cpu_cores = hardware.cpus()
-                cpu_set = [str(c) for c in cpu_cores[:num_cores]]
-                host_config['cpuset_cpus'] = ','.join(cpu_set)
-            except Exception as exc:  # pylint: disable=broad-except
-                logger.warning('Cannot set the CPU set: %r', exc)
-
-            try:
-                host_config['mem_limit'] = str(int(max_memory_size) * 1024)
-            except (TypeError, ValueError) as exc:
-                logger.warning('Cannot set the memory limit: %r', exc)
+        try:
+            cpu_cores = hardware.cpus()
+            cpu_set = [str(c) for c in cpu_cores[:num_cores]]
+            host_config['cpuset_cpus'] = ','.join(cpu_set)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning('Cannot set the CPU set: %r', exc)
+
+        try:
+            host_config['mem_limit'] = str(int(max_memory_size) * 1024)
+        except (TypeError, ValueError) as exc:
+            logger.warning('Cannot set the memory limit: %r', exc)
 
         self._container_host_config.update(host_config)
 
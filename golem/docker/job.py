@@ -9,6 +9,7 @@ import docker.errors
 
 from golem.core.common import nt_path_to_posix_path, is_windows
 from golem.docker.image import DockerImage
+from golem.docker.logs import LogCapture
 from .client import local_client
 
 __all__ = ['DockerJob']
@@ -283,6 +284,27 @@ class DockerJob:
             logger.error("Couldn't kill container %s: %s",
                          self.container_id, exc)
 
+    def follow_logs(self,
+                    stdout: Optional[LogCapture] = None,
+                    stderr: Optional[LogCapture] = None) -> None:
+        """Stream container output to the given captures in background
+        threads until the container exits.
+        """
+        if not self.container:
+            return
+        client = local_client()
+
+        if stdout:
+            stdout.follow(
+                client.logs(self.container_id, stream=True, follow=True,
+                            stdout=True, stderr=False),
+                name="ContainerStdoutThread")
+        if stderr:
+            stderr.follow(
+                client.logs(self.container_id, stream=True, follow=True,
+                            stdout=False, stderr=True),
+                name="ContainerStderrThread")
+
     def dump_logs(self, stdout_file=None, stderr_file=None):
         if not self.container:
             return
@@ -0,0 +1,179 @@
+import logging
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Size at which a captured log file is rotated
+LOG_FILE_MAX_SIZE = 32 * 1024 * 1024
+# Number of rotated files kept next to the current one
+LOG_FILE_BACKUP_COUNT = 1
+# Number of the last lines kept in memory for diagnostics
+LOG_TAIL_LINES = 21
+# Longer lines are truncated in the in-memory tail
+LOG_LINE_MAX_LENGTH = 4096
+# Matches lines reporting progress, e.g. "PROGRESS: 42.5%"
+PROGRESS_PATTERN = re.compile(r'^\s*PROGRESS:?\s*(\d+(?:\.\d+)?)\s*%')
+
+
+class RotatingLogFile:
+    """ Writes bytes to `path`, moving it to `path.1` (and older files to
+    `path.2`, ...) once it reaches `max_size` bytes. """
+
+    def __init__(
+            self,
+            path: Path,
+            max_size: int = LOG_FILE_MAX_SIZE,
+            backup_count: int = LOG_FILE_BACKUP_COUNT,
+    ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.backup_count = backup_count
+        self._file = path.open('wb')
+        self._size = 0
+
+    @property
+    def paths(self) -> List[Path]:
+        """ Current file followed by the existing rotated files """
+        backups = (self._backup_path(i)
+                   for i in range(1, self.backup_count + 1))
+        return [self.path] + [path for path in backups if path.exists()]
+
+    def write(self, data: bytes) -> None:
+        while data:
+            if self._size >= self.max_size:
+                self._rotate()
+            chunk = data[:self.max_size - self._size]
+            self._file.write(chunk)
+            self._size += len(chunk)
+            data = data[len(chunk):]
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                backup = self._backup_path(i)
+                if backup.exists():
+                    backup.replace(self._backup_path(i + 1))
+            self.path.replace(self._backup_path(1))
+        self._file = self.path.open('wb')
+        self._size = 0
+
+    def _backup_path(self, index: int) -> Path:
+        return self.path.with_name('{}.{}'.format(self.path.name, index))
+
+
+class LogTail:
+    """ Keeps the last `max_lines` lines of a byte stream fed in arbitrary
+    chunks, each line truncated to `max_line_length` characters. """
+
+    def __init__(
+            self,
+            max_lines: int = LOG_TAIL_LINES,
+            max_line_length: int = LOG_LINE_MAX_LENGTH,
+            encoding: str = 'utf-8',
+    ) -> None:
+        self.max_line_length = max_line_length
+        self.encoding = encoding
+        self._lines: Deque[str] = deque(maxlen=max_lines)
+        self._partial = b''
+        self._lock = threading.Lock()
+
+    def feed(self, data: bytes) -> List[str]:
+        """ Returns the lines completed by `data` """
+        lines = (self._partial + data).split(b'\n')
+        # The partial line is bounded too, output may contain no newlines
+        self._partial = lines.pop()[:self.max_line_length * 4]
+        decoded = [self._decode(line) for line in lines]
+        with self._lock:
+            self._lines.extend(decoded)
+        return decoded
+
+    def flush(self) -> List[str]:
+        """ Completes the last line if it didn't end with a newline """
+        if not self._partial:
+            return []
+        return self.feed(b'\n')
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            return list(self._lines)
+
+    def text(self) -> str:
+        return '\n'.join(self.lines())
+
+    def _decode(self, line: bytes) -> str:
+        text = line.decode(self.encoding, errors='replace').rstrip('\r')
+        return text[:self.max_line_length]
+
+
+class LogCapture:
+    """ Captures one output stream of a container into a size-capped
+    rotating file and a bounded in-memory tail. `on_line` is called with
+    each complete line. """
+
+    def __init__(
+            self,
+            path: Path,
+            on_line: Optional[Callable[[str], None]] = None,
+            max_size: int = LOG_FILE_MAX_SIZE,
+            backup_count: int = LOG_FILE_BACKUP_COUNT,
+            tail_lines: int = LOG_TAIL_LINES,
+    ) -> None:
+        self.file = RotatingLogFile(path, max_size, backup_count)
+        self.tail = LogTail(tail_lines)
+        self.on_line = on_line
+        self._thread: Optional[threading.Thread] = None
+
+    def feed(self, data: bytes) -> None:
+        self.file.write(data)
+        self._lines(self.tail.feed(data))
+
+    def close(self) -> None:
+        self._lines(self.tail.flush())
+        self.file.close()
+
+    def follow(self, stream: Iterable[bytes], name: str) -> None:
+        """ Consumes `stream` in a background thread until it ends, then
+        closes the capture """
+        self._thread = threading.Thread(
+            target=self._consume, args=(stream,), name=name, daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """ Waits for the followed stream to end """
+        if self._thread is None:
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning('Container log stream did not end. thread=%s',
+                           self._thread.name)
+
+    def _consume(self, stream: Iterable[bytes]) -> None:
+        try:
+            for chunk in stream:
+                self.feed(chunk)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning('Cannot read container logs: %r', e)
+        finally:
+            self.close()
+
+    def _lines(self, lines: List[str]) -> None:
+        if self.on_line is None:
+            return
+        for line in lines:
+            self.on_line(line)
+
+
+def parse_progress(line: str) -> Optional[float]:
+    """ Returns progress in the [0, 1] range reported by the line, if any """
+    match = PROGRESS_PATTERN.match(line)
+    if match is None:
+        return None
+    return min(float(match.group(1)), 100.) / 100.
@@ -8,6 +8,7 @@ import requests
 
 from golem.docker.image import DockerImage
 from golem.docker.job import DockerJob
+from golem.docker.logs import LogCapture, parse_progress
 from golem.environments.environmentsmanager import EnvironmentsManager
 from golem.envs.docker import DockerBind
 from golem.task.taskthread import TaskThread, JobException, TimeoutException, \
@@ -70,6 +71,8 @@ class DockerTaskThread(TaskThread):
     # and will contain dumps of the task script's stdout and stderr.
     STDOUT_FILE = "stdout.log"
     STDERR_FILE = "stderr.log"
+    # Seconds to wait for the output streams to end after the job exits
+    LOG_STREAM_TIMEOUT = 10
 
     docker_manager: ClassVar[Optional['DockerManager']] = None
 
@@ -103,6 +106,7 @@ class DockerTaskThread(TaskThread):
         self.check_mem = check_mem
         self.dir_mapping = dir_mapping
         self.cpu_limit = cpu_limit
+        self._progress = 0.0
 
     # pylint:disable=too-many-arguments
     @staticmethod
@@ -212,20 +216,21 @@ class DockerTaskThread(TaskThread):
             self.job = job
             job.start()
 
+            stdout = LogCapture(self.dir_mapping.logs / self.STDOUT_FILE,
+                                on_line=self._update_progress)
+            stderr = LogCapture(self.dir_mapping.logs / self.STDERR_FILE)
+            job.follow_logs(stdout, stderr)
+
             exit_code = job.wait()
             estm_mem = mc.estm_mem
 
-            job.dump_logs(str(self.dir_mapping.logs / self.STDOUT_FILE),
-                          str(self.dir_mapping.logs / self.STDERR_FILE))
+            stdout.join(self.LOG_STREAM_TIMEOUT)
+            stderr.join(self.LOG_STREAM_TIMEOUT)
 
             if exit_code != 0:
-                std_err = (self.dir_mapping.logs / self.STDERR_FILE).read_text()
-                with (self.dir_mapping.logs / self.STDOUT_FILE).open() as f:
-                    lines = f.readlines()
-                    std_out = "".join(lines[-21:])
                 logger.warning(f'Task error - exit_code={exit_code}\n'
-                               f'stderr:\n{std_err}\n'
-                               f'tail of stdout:\n{std_out}\n')
+                               f'tail of stderr:\n{stderr.tail.text()}\n'
+                               f'tail of stdout:\n{stdout.tail.text()}\n')
 
                 if exit_code == EXIT_CODE_BUDGET_EXCEEDED:
                     raise BudgetExceededException(
@@ -249,8 +254,12 @@ class DockerTaskThread(TaskThread):
         self._deferred.callback(self)
 
     def get_progress(self):
-        # TODO: make the container update some status file? Issue #56
-        return 0.0
+        return self._progress
+
+    def _update_progress(self, line: str) -> None:
+        progress = parse_progress(line)
+        if progress is not None:
+            self._progress = progress
 
     def get_stats(self) -> Dict:
         stats_file: Path = self.dir_mapping.stats / DockerJob.STATS_FILE
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import logging
 import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List
 
 from ethereum.utils import denoms
 from pydispatch import dispatcher
@@ -10,6 +12,25 @@ from golem.core.variables import PAYMENT_DEADLINE
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of rows updated by a single statement; keeps queries below
+# SQLite's host parameter limit
+UPDATE_CHUNK_SIZE = 500
+
+
+def _chunks(ids: List[int]) -> Iterator[List[int]]:
+    for i in range(0, len(ids), UPDATE_CHUNK_SIZE):
+        yield ids[i:i + UPDATE_CHUNK_SIZE]
+
+
+def _incomes_with_operations(*clauses):
+    """ Incomes matching the clauses, fetched together with their wallet
+    operations in a single query """
+    return list(
+        model.TaskPayment.incomes()
+        .select(model.TaskPayment, model.WalletOperation)
+        .where(*clauses)
+    )
+
 
 class IncomesKeeper:
     """Keeps information about payments received from other nodes
@@ -44,7 +65,7 @@ class IncomesKeeper:
             charged_from_deposit: bool = False,
     ) -> None:
 
-        expected = model.TaskPayment.incomes().where(
+        expected = _incomes_with_operations(
             model.WalletOperation.sender_address == sender,
             model.TaskPayment.accepted_ts > 0,
             model.TaskPayment.accepted_ts <= closure_time,
@@ -52,7 +73,7 @@ class IncomesKeeper:
             model.TaskPayment.settled_ts.is_null(),
         )
 
-        expected_value = sum([e.missing_amount for e in expected])
+        expected_value = sum(e.missing_amount for e in expected)
         if expected_value == 0:
             # Probably already handled event
             return
@@ -63,25 +84,41 @@ class IncomesKeeper:
                 expected_value / denoms.ether,
                 amount / denoms.ether)
 
+        # Allocate the amount in memory, then update wallet operations
+        # grouped by their new amount
         amount_left = amount
-
+        by_amount: Dict[int, List[int]] = defaultdict(list)
         for e in expected:
             received = min(amount_left, e.expected_amount)
             e.wallet_operation.amount += received
             amount_left -= received
             e.wallet_operation.tx_hash = tx_hash
             e.wallet_operation.status = model.WalletOperation.STATUS.confirmed
-            e.wallet_operation.save()
             e.charged_from_deposit = charged_from_deposit
-            e.save()
+            by_amount[e.wallet_operation.amount].append(e.wallet_operation.id)
 
-            if e.missing_amount == 0:
-                dispatcher.send(
-                    signal='golem.income',
-                    event='confirmed',
-                    node_id=e.wallet_operation.sender_address,
-                    amount=e.wallet_operation.amount,
-                )
+        with model.db.atomic():
+            for new_amount, operation_ids in by_amount.items():
+                for chunk in _chunks(operation_ids):
+                    model.WalletOperation.update(
+                        amount=new_amount,
+                        tx_hash=tx_hash,
+                        status=model.WalletOperation.STATUS.confirmed,
+                    ).where(model.WalletOperation.id << chunk).execute()
+            for chunk in _chunks([e.id for e in expected]):
+                model.TaskPayment.update(
+                    charged_from_deposit=charged_from_deposit,
+                ).where(model.TaskPayment.id << chunk).execute()
+
+        paid = [e for e in expected if e.missing_amount == 0]
+        if paid:
+            dispatcher.send(
+                signal='golem.income',
+                event='confirmed',
+                node_id=sender,
+                amount=sum(e.wallet_operation.amount for e in paid),
+                count=len(paid),
+            )
 
     def received_forced_payment(
             self,
@@ -197,29 +234,37 @@ class IncomesKeeper:
         """
         accepted_ts_deadline = int(time.time()) - PAYMENT_DEADLINE
 
-        incomes = list(model.TaskPayment.incomes().where(
+        incomes = _incomes_with_operations(
             model.WalletOperation.status !=
             model.WalletOperation.STATUS.overdue,
             model.WalletOperation.tx_hash.is_null(True),
             model.TaskPayment.accepted_ts < accepted_ts_deadline,
-        ))
+        )
 
         if not incomes:
             return
 
+        with model.db.atomic():
+            for chunk in _chunks([i.wallet_operation.id for i in incomes]):
+                model.WalletOperation.update(
+                    status=model.WalletOperation.STATUS.overdue,
+                ).where(model.WalletOperation.id << chunk).execute()
+
         for income in incomes:
-            logger.debug(
-                "Marking payment as overdue. sender=%s, amount=%s",
-                income.wallet_operation.sender_address,
-                income.wallet_operation.amount,
-            )
             income.wallet_operation.status = \
                 model.WalletOperation.STATUS.overdue
-            income.wallet_operation.save()
+
+        for node_id, count in Counter(i.node for i in incomes).items():
+            logger.debug(
+                "Marking payments as overdue. node_id=%s, count=%d",
+                node_id,
+                count,
+            )
             dispatcher.send(
                 signal='golem.income',
                 event='overdue_single',
-                node_id=income.node,
+                node_id=node_id,
+                count=count,
             )
 
         dispatcher.send(
@@ -1,6 +1,6 @@
 import datetime
 import logging
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from golem import model
 from golem.core.common import to_unicode, datetime_to_timestamp_utc
@@ -13,6 +13,9 @@ class PaymentsDatabase(object):
        about payments that this node has to make / made
     """
 
+    # Task ids per query; keeps queries below SQLite's host parameter limit
+    STATEMENT_SIZE = 100
+
     @staticmethod
     def get_payment_value(subtask_id: str):
         """Returns value of a payment
@@ -41,6 +44,48 @@ class PaymentsDatabase(object):
             )
         )
 
+    @classmethod
+    def get_tasks_payments_totals(
+            cls,
+            task_ids: Iterable[str],
+    ) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+        """ Total value and fee of outgoing payments for each of the given
+        tasks, fetched in one query per STATEMENT_SIZE tasks. Both are None
+        unless all payments of the task have been sent. Tasks without
+        payments are omitted. """
+        statuses_of_interest = (
+            model.WalletOperation.STATUS.sent,
+            model.WalletOperation.STATUS.confirmed,
+        )
+        task_ids = list(task_ids)
+
+        # Amounts are stored as hex strings, so they're summed up here
+        totals: Dict[str, List] = {}
+        for start in range(0, len(task_ids), cls.STATEMENT_SIZE):
+            query = model.TaskPayment.select(
+                model.TaskPayment.task,
+                model.WalletOperation.status,
+                model.WalletOperation.amount,
+                model.WalletOperation.gas_cost,
+            ).join(model.WalletOperation).where(
+                model.WalletOperation.operation_type
+                == model.WalletOperation.TYPE.task_payment,
+                model.WalletOperation.direction
+                == model.WalletOperation.DIRECTION.outgoing,
+                model.TaskPayment.task.in_(
+                    task_ids[start:start + cls.STATEMENT_SIZE]),
+            )
+            for payment in query:
+                operation = payment.wallet_operation
+                total = totals.setdefault(payment.task, [0, 0, True])
+                total[0] += operation.amount
+                total[1] += operation.gas_cost
+                total[2] &= operation.status in statuses_of_interest
+        return {
+            task_id: (cost, fee) if all_sent else (None, None)
+            for task_id, (cost, fee, all_sent) in totals.items()
+        }
+
     @staticmethod
     def get_newest_payment(num: Optional[int] = None,
                            interval: Optional[datetime.timedelta] = None):
@@ -106,6 +151,12 @@ class PaymentsKeeper:
             subtask_ids: Iterable[str]) -> List[model.TaskPayment]:
         return self.db.get_subtasks_payments(subtask_ids)
 
+    def get_tasks_payments_totals(
+            self,
+            task_ids: Iterable[str],
+    ) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+        return self.db.get_tasks_payments_totals(task_ids)
+
     @staticmethod
     def confirmed_transfer(
             tx_hash: str,
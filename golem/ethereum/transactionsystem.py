@@ -480,6 +480,12 @@ class TransactionSystem(LoopingCallService, MemCacheMixin):
             subtask_ids: Iterable[str]) -> List[model.TaskPayment]:
         return self._payments_keeper.get_subtasks_payments(subtask_ids)
 
+    def get_tasks_payments_totals(
+            self,
+            task_ids: Iterable[str],
+    ) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+        return self._payments_keeper.get_tasks_payments_totals(task_ids)
+
     def get_incomes_list(self):
         return self._incomes_keeper.get_list_of_all_incomes()
 
@@ -1,10 +1,12 @@
+import functools
 import logging
 import sys
 from enum import Enum
 from multiprocessing import cpu_count
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 
 import psutil
+from cpuinfo import get_cpu_info
 from psutil import virtual_memory
 
 from golem.appconfig import MIN_MEMORY_SIZE, TOTAL_MEMORY_CAP, MIN_CPU_CORES, \
@@ -51,6 +53,34 @@ def defaults() -> Dict[str, int]:
     }
 
 
+def fingerprint(num_cores: int, max_memory_size: int) -> Dict[str, Any]:
+    """
+    Describes the hardware and configuration benchmark scores depend on.
+    :param num_cores: number of CPU cores assigned to computations
+    :param max_memory_size: memory assigned to computations in KiB
+    :return dict: JSON-serializable fingerprint
+    """
+    return {
+        'cpu_model': cpu_model(),
+        'cpu_count': cpu_count(),
+        'num_cores': num_cores,
+        'max_memory_size': max_memory_size,
+    }
+
+
+@functools.lru_cache()
+def cpu_model() -> str:
+    """
+    :return str: CPU brand name, read once since reading it takes a while
+    """
+    try:
+        info = get_cpu_info()
+    except Exception as e:  # pylint: disable=broad-except
+        logger.debug("Couldn't read CPU info: %r", e)
+        return ''
+    return info.get('brand_raw') or info.get('brand') or ''
+
+
 def scale_memory(amount: int, unit: MemSize, to_unit: MemSize) -> int:
     diff = to_unit.value - unit.value
     scaled = int(amount / (MEM_MULTIPLE ** diff))
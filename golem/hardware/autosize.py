@@ -0,0 +1,146 @@
+import logging
+import time
+from typing import Dict, NamedTuple, Optional
+
+import psutil
+
+from golem import hardware
+from golem.appconfig import MIN_CPU_CORES, MIN_MEMORY_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the moving averages of the load
+SMOOTHING = 0.3
+# Fraction of the available memory which may be assigned to computations
+MEMORY_HEADROOM = 0.8
+# Memory limit is changed when it differs by more than this fraction
+MEMORY_STEP = 0.1
+# Fraction of time a disk is busy above which fewer cores are used, since
+# computations are limited by the disk rather than by the CPU
+DISK_BUSY_THRESHOLD = 0.8
+
+
+class LoadSample(NamedTuple):
+    # Number of cores (out of hardware.cpus()) busy with other processes
+    busy_cores: float
+    # Memory available to new processes in KiB
+    memory_available: int
+    # Fraction of time the busiest disk was busy, in the [0, 1] range
+    disk_busy: float
+
+
+class Limits(NamedTuple):
+    num_cores: int
+    # KiB
+    max_memory_size: int
+
+
+class LoadMonitor:
+    """ Measures the load of the machine since the previous sample """
+
+    def __init__(self) -> None:
+        # The first call to cpu_percent only starts the measurement
+        psutil.cpu_percent(percpu=True)
+        self._disk_busy_time = self._read_disk_busy_time()
+        self._disk_checked = time.monotonic()
+
+    def sample(self) -> LoadSample:
+        percents = psutil.cpu_percent(percpu=True)
+        busy_cores = sum(
+            percents[cpu] for cpu in hardware.cpus() if cpu < len(percents)
+        ) / 100.
+
+        now = time.monotonic()
+        busy_time = self._read_disk_busy_time()
+        elapsed_ms = (now - self._disk_checked) * 1000.
+        disk_busy = 0.
+        if elapsed_ms > 0:
+            disk_busy = max([
+                (busy - self._disk_busy_time.get(disk, busy)) / elapsed_ms
+                for disk, busy in busy_time.items()
+            ] or [0.])
+        self._disk_busy_time = busy_time
+        self._disk_checked = now
+
+        return LoadSample(
+            busy_cores=busy_cores,
+            memory_available=hardware.memory_available(),
+            disk_busy=min(max(disk_busy, 0.), 1.),
+        )
+
+    @staticmethod
+    def _read_disk_busy_time() -> Dict[str, int]:
+        """ Busy time of each disk in milliseconds; available on Linux """
+        try:
+            counters = psutil.disk_io_counters(perdisk=True) or {}
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Couldn't read disk I/O counters: %r", e)
+            return {}
+        return {
+            disk: counter.busy_time for disk, counter in counters.items()
+            if hasattr(counter, 'busy_time')
+        }
+
+
+class Autosizer:
+    """ Sizes the cores and memory used for computations to the load of the
+    machine, within the operator's limits. Samples should be taken while no
+    subtask is computed, so they reflect the load of other processes only. """
+
+    def __init__(self, max_limits: Limits, total_cores: int) -> None:
+        """
+        :param max_limits: cores and memory set by the operator, never exceeded
+        :param total_cores: number of cores computations may be assigned to
+        """
+        self.max_limits = max_limits
+        self.min_limits = Limits(
+            num_cores=min(MIN_CPU_CORES, max_limits.num_cores),
+            max_memory_size=min(MIN_MEMORY_SIZE, max_limits.max_memory_size),
+        )
+        self.total_cores = total_cores
+        self.limits = max_limits
+        self._load: Optional[LoadSample] = None
+
+    def update(self, sample: LoadSample) -> Optional[Limits]:
+        """ Returns new limits if they have changed """
+        self._load = self._smooth(sample)
+        limits = Limits(
+            num_cores=self._num_cores(self._load),
+            max_memory_size=self._max_memory_size(self._load),
+        )
+        if limits == self.limits:
+            return None
+        logger.info('Autosized hardware limits. old=%r, new=%r, load=%r',
+                    self.limits, limits, self._load)
+        self.limits = limits
+        return limits
+
+    def _smooth(self, sample: LoadSample) -> LoadSample:
+        if self._load is None:
+            return sample
+        return LoadSample(*(
+            SMOOTHING * new + (1 - SMOOTHING) * old
+            for new, old in zip(sample, self._load)
+        ))
+
+    def _num_cores(self, load: LoadSample) -> int:
+        free_cores = self.total_cores - load.busy_cores
+        if load.disk_busy > DISK_BUSY_THRESHOLD:
+            free_cores *= (1 - load.disk_busy) / (1 - DISK_BUSY_THRESHOLD)
+        return self._clamp(int(round(free_cores)), 'num_cores')
+
+    def _max_memory_size(self, load: LoadSample) -> int:
+        memory = self._clamp(int(load.memory_available * MEMORY_HEADROOM),
+                             'max_memory_size')
+        current = self.limits.max_memory_size
+        bounds = (self.min_limits.max_memory_size,
+                  self.max_limits.max_memory_size)
+        # Small changes are skipped, unless the limit reaches a bound
+        if abs(memory - current) <= current * MEMORY_STEP \
+                and memory not in bounds:
+            return current
+        return hardware.pad_memory(memory)
+
+    def _clamp(self, value: int, name: str) -> int:
+        return min(max(value, getattr(self.min_limits, name)),
+                   getattr(self.max_limits, name))
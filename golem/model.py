@@ -1,5 +1,7 @@
+import copy
 import datetime
 import enum
+import functools
 import hashlib
 import inspect
 import json
@@ -300,6 +302,10 @@ class WalletOperation(BaseModel):
 
     class Meta:
         database = db
+        indexes = (
+            (('tx_hash', ), False),
+            (('sender_address', 'tx_hash'), False),
+        )
 
     def __repr__(self):
         return (
@@ -367,6 +373,11 @@ class TaskPayment(BaseModel):
 
     class Meta:
         database = db
+        indexes = (
+            (('subtask', 'node'), False),
+            (('task', ), False),
+            (('accepted_ts', ), False),
+        )
 
     def __repr__(self):
         return (
@@ -639,18 +650,40 @@ class NetworkMessage(BaseModel):
     # which is determined by local_role, remote_role and msg_cls.
     node = CharField(null=False)
     task = CharField(null=True, index=True)
-    subtask = CharField(null=True, index=True)
+    subtask = CharField(null=True)
 
-    msg_date = DateTimeField(null=False)
+    msg_date = DateTimeField(null=False, index=True)
     msg_cls = CharField(null=False)
     msg_data = BlobField(null=False)
+    # Version of golem-messages that serialized msg_data;
+    # None for messages pickled by older versions of Golem
+    msg_version = VersionField(null=True)
 
     class Meta:
         database = db
+        indexes = (
+            # Used by history.get()
+            (('subtask', 'msg_cls', 'node'), False),
+        )
 
     def as_message(self) -> message.base.Message:
-        msg = pickle.loads(self.msg_data)
-        return msg
+        if self.msg_version is None:
+            return pickle.loads(self.msg_data)
+        message.base.verify_version(str(self.msg_version))
+        # Messages are shared by the cache; nested messages and dicts
+        # are mutable too, hence the deep copy
+        return copy.deepcopy(_load_network_message(self.msg_cls,
+                                                   bytes(self.msg_data)))
+
+
+@functools.lru_cache(maxsize=256)
+def _load_network_message(msg_cls: str, msg_data: bytes) \
+        -> message.base.Message:
+    msg = golem_messages.load(msg_data, None, None, check_time=False)
+    if msg.__class__.__name__ != msg_cls:
+        raise golem_messages.exceptions.MessageError(
+            'Expected {}, got {}'.format(msg_cls, msg.__class__.__name__))
+    return msg
 
 
 def default_msg_deadline() -> datetime.datetime:
@@ -658,7 +691,7 @@ def default_msg_deadline() -> datetime.datetime:
 
 
 class QueuedMessage(BaseModel):
-    node = CharField(null=False, index=True)
+    node = CharField(null=False)
     msg_version = VersionField(null=False)
     msg_cls = CharField(null=False)
     msg_data = BlobField(null=False)
@@ -669,6 +702,10 @@ class QueuedMessage(BaseModel):
 
     class Meta:
         database = db
+        indexes = (
+            (('node', 'created_date'), False),
+            (('deadline', ), False),
+        )
 
     @classmethod
     def from_message(
@@ -838,6 +875,12 @@ class RequestedSubtask(BaseModel):
     class Meta:
         database = db
         primary_key = CompositeKey('task', 'subtask_id')
+        indexes = (
+            (('subtask_id', ), False),
+            (('status', ), False),
+            (('task', 'status'), False),
+            (('computing_node', 'task', 'status'), False),
+        )
 
 
 class QueuedVerification(BaseModel):
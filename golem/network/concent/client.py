@@ -1,10 +1,12 @@
 import calendar
+import collections
 import datetime
 import logging
 import queue
 import threading
 import time
 import typing
+from concurrent import futures
 from urllib.parse import urljoin
 
 from pydispatch import dispatcher
@@ -19,7 +21,6 @@ from golem import utils
 from golem.core import keysauth
 from golem.core import variables
 from golem.network.concent import exceptions
-from golem.network.concent.handlers_library import library
 from golem.terms import ConcentTermsOfUse
 
 from . import soft_switch
@@ -76,12 +77,30 @@ def verify_response(response: requests.Response) -> None:
         )
 
 
+def new_session(pool_size: int) -> requests.Session:
+    """Creates a session keeping up to `pool_size` connections to Concent
+    alive, so that consecutive requests don't pay for TCP and TLS handshakes
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 def send_to_concent(
         msg: message.base.Message,
         signing_key: bytes,
-        concent_variant: dict) -> typing.Optional[bytes]:
+        concent_variant: dict,
+        session: typing.Optional[requests.Session] = None) \
+        -> typing.Optional[bytes]:
     """Sends a message to the concent server
 
+    :param session: Session to send the message with; a new connection
+                    is made if not given
     :return: Raw reply message, None or exception
     :rtype: Bytes|None
     """
@@ -120,7 +139,7 @@ def send_to_concent(
             concent_post_url,
             headers,
         )
-        response = requests.post(
+        response = (session or requests).post(
             concent_post_url,
             data=data,
             headers=headers,
@@ -138,7 +157,9 @@ def receive_from_concent(
         signing_key,
         public_key,
         concent_variant: dict,
-        path: str = '/api/v1/receive/') -> typing.Optional[bytes]:
+        path: str = '/api/v1/receive/',
+        session: typing.Optional[requests.Session] = None) \
+        -> typing.Optional[bytes]:
     concent_receive_url = urljoin(concent_variant['url'], path)
     headers = {
         'Content-Type': 'application/octet-stream',
@@ -155,7 +176,7 @@ def receive_from_concent(
             concent_receive_url,
             headers,
         )
-        response = requests.post(
+        response = (session or requests).post(
             concent_receive_url,
             data=data,
             headers=headers,
@@ -185,6 +206,7 @@ class ConcentClientService(threading.Thread):
     MIN_GRACE_TIME = 5  # s
     MAX_GRACE_TIME = 5 * 60  # s
     GRACE_FACTOR = 2  # n times on each failure
+    MAX_IN_FLIGHT = 4  # requests sent to Concent at the same time
 
     def __init__(self, keys_auth: keysauth.KeysAuth, variant: dict) -> None:
         super().__init__(daemon=True)
@@ -195,9 +217,32 @@ class ConcentClientService(threading.Thread):
         self._stop_event = threading.Event()
 
         self._queue: queue.Queue = queue.Queue()
+        # Grace time of receiving messages from Concent
         self._grace_time: int = self.MIN_GRACE_TIME
 
+        # Messages taken from the queue and waiting to be sent
+        self._pending: typing.Deque[message.base.Message] = \
+            collections.deque()
+        # Requests being sent, as (future, message) pairs
+        self._sending: typing.List[
+            typing.Tuple[futures.Future, message.base.Message]] = []
+        # Message class -> (grace time, time.monotonic() of the next attempt)
+        self._backoff: typing.Dict[type, typing.Tuple[int, float]] = {}
+        # Sending workers only share the session's thread-safe connection
+        # pool. The receiver thread has a session of its own
+        self._session = new_session(self.MAX_IN_FLIGHT)
+        self._receive_session = new_session(1)
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=self.MAX_IN_FLIGHT,
+        )
+        self._receiver = threading.Thread(
+            target=self._receive_loop,
+            daemon=True,
+        )
+
         self._delayed: dict = dict()
+        # (message, message it responds to or None) pairs, interpreted by
+        # golem.task.server.concent on the reactor thread
         self.received_messages: queue.Queue = queue.Queue(maxsize=100)
 
         dispatcher.connect(
@@ -228,13 +273,23 @@ class ConcentClientService(threading.Thread):
         return soft_switch.is_required_as_provider()
 
     def run(self) -> None:
-        last_receive = 0.0
+        self._receiver.start()
         while not self._stop_event.isSet():
             self._loop()
-            if time.time() - last_receive > variables.CONCENT_PULL_INTERVAL:
-                last_receive = time.time()
-                self.receive()
-            time.sleep(1)
+            if self._sending:
+                futures.wait(
+                    [future for future, _ in self._sending],
+                    timeout=1,
+                    return_when=futures.FIRST_COMPLETED,
+                )
+            else:
+                time.sleep(1)
+        self._executor.shutdown(wait=False)
+
+    def _receive_loop(self) -> None:
+        while not self._stop_event.isSet():
+            self.receive()
+            self._stop_event.wait(variables.CONCENT_PULL_INTERVAL)
 
     def stop(self) -> None:
         self._stop_event.set()
@@ -325,33 +380,69 @@ class ConcentClientService(threading.Thread):
 
     def _loop(self) -> None:
         """
-        Main service loop. Requests from the queue are sent one by one (FIFO).
-        In case of failure, service enters a grace period.
+        Main service loop. Requests from the queue are sent in FIFO order,
+        at most MAX_IN_FLIGHT at a time. When a request fails, messages
+        of the same type are held back for a grace period.
         """
-        try:
-            msg = self._queue.get_nowait()
-        except queue.Empty:
-            return
-
-        if not self.available:
-            logger.debug('Concent disabled. Dropping %r', msg)
-            return
-
-        try:
-            res = send_to_concent(
+        self._collect_responses()
+
+        while True:
+            try:
+                self._pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        now = time.monotonic()
+        held_back: typing.Deque[message.base.Message] = collections.deque()
+        while self._pending:
+            msg = self._pending.popleft()
+            if not self.available:
+                logger.debug('Concent disabled. Dropping %r', msg)
+                continue
+            _, next_attempt = self._backoff.get(msg.__class__, (None, now))
+            if next_attempt > now:
+                held_back.append(msg)
+                continue
+            if len(self._sending) >= self.MAX_IN_FLIGHT:
+                held_back.append(msg)
+                held_back.extend(self._pending)
+                self._pending.clear()
+                break
+            future = self._executor.submit(
+                send_to_concent,
                 msg,
                 self.keys_auth._private_key,  # pylint: disable=protected-access
                 concent_variant=self.variant,
+                session=self._session,
             )
-        except exceptions.ConcentError as e:
-            logger.info('send_to_concent error: %s', e)
-            self._grace_sleep()
-        except Exception:  # pylint: disable=broad-except
-            logger.exception('send_to_concent(%r) failed', msg)
-            self._grace_sleep()
-        else:
-            self._grace_time = self.MIN_GRACE_TIME
-            self.react_to_concent_message(res, response_to=msg)
+            self._sending.append((future, msg))
+        self._pending = held_back
+
+    def _collect_responses(self) -> None:
+        sending = []
+        for future, msg in self._sending:
+            if not future.done():
+                sending.append((future, msg))
+                continue
+            try:
+                res = future.result()
+            except exceptions.ConcentError as e:
+                logger.info('send_to_concent error: %s', e)
+                self._back_off(msg.__class__)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('send_to_concent(%r) failed', msg)
+                self._back_off(msg.__class__)
+            else:
+                self._backoff.pop(msg.__class__, None)
+                self.react_to_concent_message(res, response_to=msg)
+        self._sending = sending
+
+    def _back_off(self, msg_cls: type) -> None:
+        grace_time, _ = self._backoff.get(msg_cls, (self.MIN_GRACE_TIME, 0.))
+        grace_time = min(grace_time * self.GRACE_FACTOR, self.MAX_GRACE_TIME)
+        logger.debug('Concent grace time for %s: %r',
+                     msg_cls.__name__, grace_time)
+        self._backoff[msg_cls] = (grace_time, time.monotonic() + grace_time)
 
     def receive(self) -> None:
         if not self.available:
@@ -362,6 +453,7 @@ class ConcentClientService(threading.Thread):
                 signing_key=self.keys_auth._private_key,  # noqa pylint: disable=protected-access
                 public_key=self.keys_auth.public_key,
                 concent_variant=self.variant,
+                session=self._receive_session,
             )
         except exceptions.ConcentError as e:
             logger.warning("Can't receive message from Concent: %s", e)
@@ -371,17 +463,9 @@ class ConcentClientService(threading.Thread):
             logger.exception('receive_from_concent() failed')
             self._grace_sleep()
             return
+        self._grace_time = self.MIN_GRACE_TIME
         self.react_to_concent_message(res)
 
-    @staticmethod
-    def process_synchronous_response(
-            msg, response_to: message.Message):
-        try:
-            library.interpret(msg, response_to=response_to)
-        except Exception as e:   # pylint: disable=broad-except
-            logger.debug("Error interpreting synchronous response: %r, "
-                         "error: %r", msg, e)
-
     def react_to_concent_message(self, data: typing.Optional[bytes],
                                  response_to: message.Message = None):
         if data is None:
@@ -399,17 +483,16 @@ class ConcentClientService(threading.Thread):
             logger.debug('Problem parsing msg', exc_info=True)
             return
 
-        if not response_to:
-            self.received_messages.put(msg)
-        else:
-            self.process_synchronous_response(msg, response_to)
+        # Received messages and synchronous responses are both handled
+        # on the reactor thread, so handlers never run concurrently
+        self.received_messages.put((msg, response_to))
 
     def _grace_sleep(self):
         self._grace_time = min(self._grace_time * self.GRACE_FACTOR,
                                self.MAX_GRACE_TIME)
 
         logger.debug('Concent grace time: %r', self._grace_time)
-        time.sleep(self._grace_time)
+        self._stop_event.wait(self._grace_time)
 
     def _enqueue(self, key, msg):
         logger.debug("_enqueue(%r, %r)", key, msg)
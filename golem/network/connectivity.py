@@ -0,0 +1,182 @@
+import ipaddress
+import logging
+from typing import Callable, List, NamedTuple, Optional, Sequence, Set, \
+    Tuple
+
+from twisted.internet import defer, threads
+from twisted.python.failure import Failure
+
+from golem.core import hostaddress
+from golem.network.stun import pystun
+from golem.network.upnp.mapper import IPortMapper
+
+logger = logging.getLogger(__name__)
+
+# Seconds a discovered external address is considered up to date
+EXTERNAL_ADDRESS_TTL = 15 * 60
+
+
+class ExternalAddress(NamedTuple):
+    ip: str
+    port: Optional[int]
+    # 'STUN' or 'UPnP'
+    source: str
+
+
+def is_public_address(ip: Optional[str]) -> bool:
+    try:
+        address = ipaddress.ip_address(str(ip))
+    except ValueError:
+        return False
+    return hostaddress.is_ip_address_allowed(address) \
+        and not address.is_private
+
+
+class ConnectivityDiscovery:
+    """ Discovers the external address of this node. Probes all STUN servers
+    and the port mapper at the same time on the reactor and takes the first
+    public address returned. The result is cached for `ttl` seconds;
+    `check_network` probes again in the background when the host addresses
+    change or the cached address expires. """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            port_mapper: Optional[IPortMapper] = None,
+            stun_servers: Optional[Sequence[Tuple[str, int]]] = None,
+            ttl: float = EXTERNAL_ADDRESS_TTL,
+            timeout: float = pystun.STUN_TIMEOUT,
+            use_ipv6: bool = False,
+            address_changed: Optional[Callable[[ExternalAddress], None]] = None,
+            reactor=None,
+    ) -> None:
+        if reactor is None:
+            from twisted.internet import reactor
+        self.port_mapper = port_mapper
+        self.stun_servers = stun_servers
+        self.ttl = ttl
+        self.timeout = timeout
+        self.use_ipv6 = use_ipv6
+        self.address_changed = address_changed
+        self._reactor = reactor
+
+        self._address: Optional[ExternalAddress] = None
+        self._discovered_at: float = 0.
+        self._host_addresses: Optional[Set[str]] = None
+        self._waiting: List[defer.Deferred] = []
+
+    @property
+    def address(self) -> Optional[ExternalAddress]:
+        """ The cached address if it hasn't expired yet """
+        if self._address is None:
+            return None
+        if self._reactor.seconds() - self._discovered_at > self.ttl:
+            return None
+        return self._address
+
+    @property
+    def discovering(self) -> bool:
+        return bool(self._waiting)
+
+    def discover(self, force: bool = False) -> defer.Deferred:
+        """ Returns a Deferred fired with an ExternalAddress or None if no
+        probe returned a public address. Concurrent calls share probes. """
+        if not force and self.address is not None:
+            return defer.succeed(self.address)
+
+        deferred = defer.Deferred()
+        self._waiting.append(deferred)
+        if len(self._waiting) == 1:
+            self._probe().addBoth(self._discovered)
+        return deferred
+
+    def check_network(self) -> Optional[defer.Deferred]:
+        """ Probes again if host addresses have changed since the last check
+        or the cached address has expired """
+        host_addresses = set(hostaddress.get_host_addresses(self.use_ipv6))
+        changed = self._host_addresses is not None \
+            and host_addresses != self._host_addresses
+        self._host_addresses = host_addresses
+
+        if changed:
+            logger.info('Network change detected. addresses=%r',
+                        sorted(host_addresses))
+        elif self.address is not None or self.discovering:
+            return None
+        return self.discover(force=True)
+
+    def _probe(self) -> defer.Deferred:
+        result = defer.Deferred()
+        probes = [self._probe_stun()]
+        if self.port_mapper is not None:
+            probes.append(self._probe_port_mapper())
+
+        def answered(address: Optional[ExternalAddress]):
+            if address is not None and not result.called:
+                result.callback(address)
+
+        for probe in probes:
+            probe.addCallback(answered)
+            probe.addErrback(lambda failure: logger.debug(
+                'Connectivity probe failed: %r', failure.value))
+
+        def finished(_):
+            if not result.called:
+                result.callback(None)
+
+        defer.DeferredList(probes).addCallback(finished)
+        return result
+
+    def _probe_stun(self) -> defer.Deferred:
+        deferred = pystun.get_ip_info_async(
+            servers=self.stun_servers,
+            timeout=self.timeout,
+            reactor=self._reactor)
+
+        def answered(info):
+            ip, port = info
+            if not is_public_address(ip):
+                logger.debug('STUN probe: no public address. ip=%r', ip)
+                return None
+            return ExternalAddress(ip, port, 'STUN')
+
+        return deferred.addCallback(answered)
+
+    def _probe_port_mapper(self) -> defer.Deferred:
+        port_mapper = self.port_mapper
+
+        def probe():
+            if not port_mapper.available:
+                port_mapper.discover()
+            if not port_mapper.available:
+                return None
+            return port_mapper.network.get('external_ip_address')
+
+        def answered(ip):
+            if not is_public_address(ip):
+                logger.debug('UPnP probe: no public address. ip=%r', ip)
+                return None
+            return ExternalAddress(ip, None, 'UPnP')
+
+        deferred = threads.deferToThreadPool(
+            self._reactor, self._reactor.getThreadPool(), probe)
+        return deferred.addCallback(answered)
+
+    def _discovered(self, result) -> None:
+        waiting, self._waiting = self._waiting, []
+        if isinstance(result, Failure):
+            logger.warning('Connectivity discovery failed: %r', result.value)
+            result = None
+
+        if result is not None:
+            previous = self._address
+            self._address = result
+            self._discovered_at = self._reactor.seconds()
+            logger.info('External address discovered. address=%r', result)
+            changed = previous is None or previous.ip != result.ip
+            if changed and self.address_changed:
+                self.address_changed(result)
+        else:
+            logger.warning('External address was not discovered')
+
+        for deferred in waiting:
+            deferred.callback(result)
@@ -1,19 +1,22 @@
 import datetime
 import logging
 import operator
-import pickle
 import queue
 import threading
+from collections import defaultdict
 from functools import reduce, wraps
 from typing import List
 from typing import Optional
+from typing import Tuple
 
+import golem_messages
 from golem_messages import message
 from peewee import (PeeweeException, DataError, ProgrammingError,
                     NotSupportedError, Field, IntegrityError)
+import semantic_version
 
 from golem.core.service import IService
-from golem.model import NetworkMessage, Actor
+from golem.model import NetworkMessage, Actor, db
 
 logger = logging.getLogger('golem.network.history')
 
@@ -42,6 +45,10 @@ class MessageHistoryService(IService):
     MESSAGE_LIFETIME = datetime.timedelta(days=7)
     SWEEP_INTERVAL = datetime.timedelta(hours=12)
     QUEUE_TIMEOUT = datetime.timedelta(seconds=2).total_seconds()
+    # Maximum number of queued operations written in a single transaction
+    MAX_BATCH_SIZE = 1000
+    # Rows per statement; keeps queries below SQLite's host parameter limit
+    STATEMENT_SIZE = 100
 
     # Decorators (at the end of this file) need to access an instance
     # of MessageHistoryService
@@ -121,7 +128,7 @@ class MessageHistoryService(IService):
         db_msg = db_result[0]
         try:
             return db_msg.as_message()
-        except AttributeError:
+        except (AttributeError, golem_messages.exceptions.MessageError):
             # in case an incompatible message from an earlier version of
             # golem-messages is retrieved, just treat it the same
             # as if the message was not found
@@ -153,6 +160,19 @@ class MessageHistoryService(IService):
             logger.warning("Message '%s' save queued", msg_dict.get('msg_cls'))
             self._save_queue.put(msg_dict)
 
+    @classmethod
+    def insert_many(cls, msg_dicts: List[dict]) -> None:
+        """
+        Saves messages in the database synchronously, in a single
+        transaction. Database errors are raised to the caller.
+        :param msg_dicts: Messages to save
+        """
+        with db.atomic():
+            for start in range(0, len(msg_dicts), cls.STATEMENT_SIZE):
+                NetworkMessage.insert_many(
+                    msg_dicts[start:start + cls.STATEMENT_SIZE],
+                ).execute()
+
     def remove(self, task: str, **properties) -> None:
         """
         Appends task id to the removal queue. Has lower priority than adding
@@ -209,8 +229,8 @@ class MessageHistoryService(IService):
         """
         Main service loop.
         - calls _sweep every SWEEP_INTERVAL
-        - saves queued (1) messages to database (FIFO)
-        - removes queued (2) messages from database
+        - drains queued (1) messages to save and (2) messages to remove
+        - writes them to the database in a single transaction
         """
 
         # Sweep messages.
@@ -220,21 +240,67 @@ class MessageHistoryService(IService):
             self._sweep()
             self._sweep_ts = now + self.SWEEP_INTERVAL
 
-        # Remove messages
+        removals = self._drain(self._remove_queue)
+
+        # Wait for messages to save only when there's nothing else to do
         try:
-            task, parameters = self._remove_queue.get(False)
+            msg_dict = self._save_queue.get(not removals, self._queue_timeout)
         except queue.Empty:
-            pass
+            msg_dicts = []
         else:
-            self.remove_sync(task, **parameters)
+            msg_dicts = [msg_dict] + self._drain(self._save_queue)
+
+        if msg_dicts or removals:
+            self._write(msg_dicts, removals)
+
+    def _drain(self, q: queue.Queue) -> list:
+        items: list = []
+        while len(items) < self.MAX_BATCH_SIZE:
+            try:
+                items.append(q.get(False))
+            except queue.Empty:
+                break
+        return items
+
+    def _write(self,
+               msg_dicts: List[dict],
+               removals: List[Tuple[str, dict]]) -> None:
+        """
+        Saves and removes messages in a single transaction. Falls back
+        to the *_sync methods if any of the operations is invalid.
+        """
+        # Group removals with the same properties into single statements
+        tasks_by_properties: dict = defaultdict(list)
+        for task, properties in removals:
+            tasks_by_properties[tuple(sorted(properties.items()))].append(task)
 
-        # Save messages
         try:
-            msg_dict = self._save_queue.get(True, self._queue_timeout)
-        except queue.Empty:
-            pass
-        else:
-            self.add_sync(msg_dict)
+            with db.atomic():
+                self.insert_many(msg_dicts)
+                for properties, tasks in tasks_by_properties.items():
+                    clauses = self.build_clauses(**dict(properties))
+                    for start in range(0, len(tasks), self.STATEMENT_SIZE):
+                        task_clause = NetworkMessage.task << \
+                            tasks[start:start + self.STATEMENT_SIZE]
+                        NetworkMessage.delete() \
+                            .where(reduce(operator.and_,
+                                          clauses + [task_clause])) \
+                            .execute()
+        except (DataError, ProgrammingError, NotSupportedError,
+                TypeError, IntegrityError) as exc:
+            logger.debug("Batch write failed, retrying one by one: %r", exc)
+            for msg_dict in msg_dicts:
+                self.add_sync(msg_dict)
+            for task, properties in removals:
+                self.remove_sync(task, **properties)
+        except PeeweeException:
+            # Temporary error
+            logger.warning("%d message(s) save and %d removal(s) queued",
+                           len(msg_dicts), len(removals))
+            for msg_dict in msg_dicts:
+                self._save_queue.put(msg_dict)
+            for removal in removals:
+                self._remove_queue.put(removal)
 
     def _sweep(self) -> None:
         """
@@ -277,7 +343,8 @@ def message_to_model(msg: message.base.Message,
         'node': node_id,
         'msg_date': datetime.datetime.now(),
         'msg_cls': msg.__class__.__name__,
-        'msg_data': pickle.dumps(msg),
+        'msg_data': golem_messages.dump(msg, None, None),
+        'msg_version': semantic_version.Version(golem_messages.__version__),
         'local_role': local_role,
         'remote_role': remote_role,
     }
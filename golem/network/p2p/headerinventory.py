@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from golem_messages.datastructures import tasks as dt_tasks
+
+# How many task headers known to a single peer should be remembered?
+INVENTORY_SIZE = 10000
+# Peers may drop headers without telling us (e.g. when their task keeper is
+# full), so headers known for longer than this many seconds are sent again
+INVENTORY_TTL = 10 * 60
+
+HeaderDigest = Tuple[int, Optional[bytes]]  # timestamp, signature
+
+
+class HeaderInventory:
+    """ Versions of task headers which a peer is known to have, because they
+    were sent to or received from it. Lets `GetTasks` replies skip headers
+    the peer already has, so they are neither transmitted nor verified
+    again. The oldest entries are evicted after `max_size` task ids, entries
+    expire after `ttl` seconds. """
+
+    def __init__(
+            self,
+            max_size: int = INVENTORY_SIZE,
+            ttl: float = INVENTORY_TTL,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        # task id -> digest of the latest known header version, time it
+        # became known
+        self._digests: 'OrderedDict[str, Tuple[HeaderDigest, float]]' = \
+            OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def add(self, header: dt_tasks.TaskHeader) -> None:
+        task_id = header.task_id
+        known = self._get(task_id)
+        self._digests.pop(task_id, None)
+        digest = _digest(header)
+        if known is not None and known[0] > digest[0]:
+            digest = known
+        self._digests[task_id] = digest, time.monotonic()
+        while len(self._digests) > self.max_size:
+            self._digests.popitem(last=False)
+
+    def update(self, headers: Iterable[dt_tasks.TaskHeader]) -> None:
+        for header in headers:
+            self.add(header)
+
+    def discard(self, task_id: str) -> None:
+        """ Forget the header, e.g. when the peer has removed it """
+        self._digests.pop(task_id, None)
+
+    def missing(self, headers: Iterable[dt_tasks.TaskHeader]) \
+            -> List[dt_tasks.TaskHeader]:
+        """ Headers which the peer doesn't have or has a different
+        version of, unless its version is newer """
+        return [header for header in headers if self._is_missing(header)]
+
+    def _get(self, task_id: str) -> Optional[HeaderDigest]:
+        entry = self._digests.get(task_id)
+        if entry is None:
+            return None
+        digest, known_since = entry
+        if time.monotonic() - known_since > self.ttl:
+            del self._digests[task_id]
+            return None
+        return digest
+
+    def _is_missing(self, header: dt_tasks.TaskHeader) -> bool:
+        known = self._get(header.task_id)
+        if known is None:
+            return True
+        timestamp, signature = _digest(header)
+        return timestamp > known[0] or \
+            (timestamp == known[0] and signature != known[1])
+
+
+def _digest(header: dt_tasks.TaskHeader) -> HeaderDigest:
+    return header.timestamp, header.signature
@@ -1,7 +1,6 @@
 import ipaddress
 import itertools
 import logging
-import socket
 import random
 import time
 from collections import deque
@@ -11,11 +10,13 @@ from typing import (
     Callable,
     Dict,
     List,
+    Optional,
 )
 
 from golem_messages import message
 from golem_messages.datastructures import p2p as dt_p2p
 from golem_messages.datastructures import tasks as dt_tasks
+from twisted.internet import defer
 
 from golem.config.active import P2P_SEEDS
 from golem.core import simplechallenge
@@ -24,6 +25,8 @@ from golem.core.common import node_info_str
 from golem.diag.service import DiagnosticsProvider
 from golem.model import KnownHosts, db
 from golem.network.p2p.peersession import PeerSession, PeerSessionInfo
+from golem.network.p2p.performanceindex import PerformanceIndex
+from golem.network.p2p.seedresolver import SeedResolver
 from golem.network.transport import tcpnetwork
 from golem.network.transport import tcpserver
 from golem.network.transport.network import ProtocolFactory, SessionFactory
@@ -86,6 +89,8 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         self.peer_keeper = PeerKeeper(keys_auth.key_id)
         self.task_server = None
         self.metadata_manager = None
+        # Built from KnownHosts when needed, see _get_performance_index
+        self._performance_index: Optional[PerformanceIndex] = None
         self.resource_port = 0
         self.suggested_address = {}
         self.suggested_conn_reverse = {}
@@ -113,6 +118,10 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         self.seeds = set()
         self.used_seeds = set()
         self.bootstrap_seeds = P2P_SEEDS
+        self._seed_resolver = SeedResolver()
+        self._seeds_sync_count = 0
+        # Set when connect_to_seeds had no seeds to connect to
+        self._awaiting_seeds = False
 
         self._peer_lock = Lock()
 
@@ -168,6 +177,8 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         if not self.connect_to_known_hosts:
             return
 
+        # Seeds may still be resolving, connect when they become available
+        self._awaiting_seeds = not self.seeds
         for _ in range(len(self.seeds)):
             ip_address, port = self._get_next_random_seed()
             logger.debug("Connecting to %s:%s ...", ip_address, port)
@@ -219,6 +230,9 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                 host.metadata = metadata or {}
                 host.save()
 
+            if self._performance_index is not None:
+                self._performance_index.update(
+                    (ip_address, port), host.metadata)
             self.__remove_redundant_hosts_from_db()
             self._sync_seeds()
 
@@ -288,24 +302,27 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         logger.info('Estimated network size: %r', size)
         return size
 
-    @staticmethod
-    def get_performance_percentile_rank(perf: float, env_id: str) -> float:
-        # Hosts which don't support the given env at all shouldn't be counted
-        # even if perf equals 0. Therefore -1 is the default value.
-        hosts_perf = [
-            host.metadata['performance'].get(env_id, -1.0)
-            for host in KnownHosts.select()
-            if 'performance' in host.metadata
-        ]
-        if not hosts_perf:
+    def get_performance_percentile_rank(self, perf: float, env_id: str) \
+            -> float:
+        # Hosts which don't support the given env at all are counted
+        # as if their performance was -1.
+        rank = self._get_performance_index().percentile_rank(perf, env_id)
+        if rank is None:
             logger.warning('Cannot compute percentile rank. No host '
                            'performance info is available')
             return 1.0
 
-        rank = sum(1 for x in hosts_perf if x < perf) / len(hosts_perf)
         logger.info(f'Performance for env `{env_id}`: rank({perf}) = {rank}')
         return rank
 
+    def _get_performance_index(self) -> PerformanceIndex:
+        if self._performance_index is None:
+            self._performance_index = PerformanceIndex.from_hosts(
+                ((host.ip_address, host.port), host.metadata)
+                for host in KnownHosts.select()
+            )
+        return self._performance_index
+
     def ping_peers(self, interval):
         """ Send ping to all peers with whom this peer has open connection
         :param int interval: will send ping only if time from last ping
@@ -957,12 +974,17 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         if peers_to_find:
             self.send_find_nodes(peers_to_find)
 
-    def _sync_seeds(self, known_hosts=None):
+    def _sync_seeds(self, known_hosts=None) -> defer.Deferred:
+        """ Resolve seed addresses without blocking the reactor. Addresses
+        are added to self.seeds as they are resolved; the returned deferred
+        fires when all seeds are resolved and self.seeds is up to date. """
         self.last_seeds_sync = time.time()
+        self._seeds_sync_count += 1
+        sync_count = self._seeds_sync_count
         if not known_hosts:
             known_hosts = KnownHosts.select().where(KnownHosts.is_seed)
 
-        def _resolve_hostname(host, port):
+        def _parse_seed(host, port):
             try:
                 port = int(port)
             except ValueError:
@@ -971,30 +993,20 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                     host,
                     port,
                 )
-                return
+                return None
             if not (host and port):
                 logger.debug(
                     "Ignoring incomplete seed. host=%r port=%r",
                     host,
                     port,
                 )
-                return
-            try:
-                for addrinfo in socket.getaddrinfo(host, port):
-                    yield addrinfo[4]  # (ip, port)
-            except OSError as e:
-                logger.error(
-                    "Can't resolve %s:%s. %s",
-                    host,
-                    port,
-                    e,
-                )
-
-        self.seeds = set()
+                return None
+            return host, port
 
         ip_address = self.config_desc.seed_host or ''
         port = self.config_desc.seed_port
 
+        deferreds = []
         for hostport in itertools.chain(
                 ((kh.ip_address, kh.port) for kh in known_hosts if kh.is_seed),
                 self.bootstrap_seeds,
@@ -1004,7 +1016,27 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                         None,
                     )
                 )):
-            self.seeds.update(_resolve_hostname(*hostport))
+            seed = _parse_seed(*hostport)
+            if seed:
+                deferred = self._seed_resolver.resolve(*seed)
+                deferred.addCallback(self._add_seeds, sync_count)
+                deferreds.append(deferred)
+
+        return defer.gatherResults(deferreds) \
+            .addCallback(self._replace_seeds, sync_count)
+
+    def _add_seeds(self, addresses, sync_count):
+        # Results of an outdated sync are dropped
+        if sync_count != self._seeds_sync_count:
+            return addresses
+        self.seeds.update(addresses)
+        if addresses and self._awaiting_seeds and not self.peers:
+            self.connect_to_seeds()
+        return addresses
+
+    def _replace_seeds(self, resolved, sync_count):
+        if sync_count == self._seeds_sync_count:
+            self.seeds = set(itertools.chain.from_iterable(resolved))
 
     def _get_next_random_seed(self):
         # this loop won't execute more than twice
@@ -1034,14 +1066,22 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                 message.base.Disconnect.REASON.Refresh
             )
 
-    @staticmethod
-    def __remove_redundant_hosts_from_db():
-        to_delete = KnownHosts.select() \
-            .order_by(KnownHosts.last_connected.desc()) \
+    def __remove_redundant_hosts_from_db(self):
+        to_delete = list(
+            KnownHosts.select(KnownHosts.id,
+                              KnownHosts.ip_address,
+                              KnownHosts.port)
+            .order_by(KnownHosts.last_connected.desc())
             .offset(MAX_STORED_HOSTS)
+        )
+        if not to_delete:
+            return
         KnownHosts.delete() \
-            .where(KnownHosts.id << to_delete) \
+            .where(KnownHosts.id << [host.id for host in to_delete]) \
             .execute()
+        if self._performance_index is not None:
+            for host in to_delete:
+                self._performance_index.remove((host.ip_address, host.port))
 
 
 class P2PConnTypes(object):
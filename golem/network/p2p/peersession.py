@@ -12,6 +12,7 @@ import golem
 from golem import constants as gconst
 from golem.appconfig import SEND_PEERS_NUM
 from golem.core import variables
+from golem.network.p2p.headerinventory import HeaderInventory
 from golem.network.transport.session import BasicSafeSession
 from golem.network.transport.tcpnetwork import SafeProtocol
 
@@ -82,6 +83,8 @@ class PeerSession(BasicSafeSession):
         self.listen_port = None
         self.conn_id = None
         self.metadata = None
+        # Task headers which the peer already has
+        self.known_headers = HeaderInventory()
 
         # Verification by challenge not a random value
         self.solve_challenge = False
@@ -331,8 +334,11 @@ class PeerSession(BasicSafeSession):
             self.p2p_service.try_to_add_peer(pi)
 
     def _react_to_get_tasks(self, msg):
-        my_tasks = self.p2p_service.get_own_tasks_headers()
-        other_tasks = self.p2p_service.get_others_tasks_headers()
+        # Only send headers which are missing or outdated on the peer's side
+        my_tasks = self.known_headers.missing(
+            self.p2p_service.get_own_tasks_headers() or [])
+        other_tasks = self.known_headers.missing(
+            self.p2p_service.get_others_tasks_headers() or [])
         if not my_tasks and not other_tasks:
             return
 
@@ -343,26 +349,27 @@ class PeerSession(BasicSafeSession):
                 my_tasks, variables.TASK_HEADERS_LIMIT // 2)
         except ValueError:
             tasks_to_send.extend(my_tasks)
-        except TypeError:
-            logger.debug("Unexpected format of my task list %r", my_tasks)
 
         reminder = variables.TASK_HEADERS_LIMIT - len(tasks_to_send)
         try:
             tasks_to_send.extend(random.sample(other_tasks, reminder))
         except ValueError:
             tasks_to_send.extend(other_tasks)
-        except TypeError:
-            logger.debug("Unexpected format of other task list %r", other_tasks)
 
+        self.known_headers.update(tasks_to_send)
         self.send(message.p2p.Tasks(tasks=tasks_to_send))
 
     def _react_to_tasks(self, msg):
         logger.debug("Running handler for `Tasks`. msg=%r", msg)
         for t in msg.tasks:
             logger.debug("Task information received. task header: %r", t)
+            self.known_headers.add(t)
             self.p2p_service.add_task_header(t)
 
     def _react_to_remove_task(self, msg):
+        # The peer doesn't have the header anymore, offer it again if it's
+        # still known here
+        self.known_headers.discard(msg.task_id)
         if not self._verify_remove_task(msg):
             return
         self._handle_remove_task(msg)
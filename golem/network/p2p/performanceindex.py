@@ -0,0 +1,77 @@
+import bisect
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Performance of hosts which don't support the given environment
+UNSUPPORTED_PERFORMANCE = -1.0
+
+
+class PerformanceIndex:
+    """ Sorted performance values of known hosts, per environment. Keeps
+    percentile rank lookups at O(log n); updated whenever host metadata
+    changes. """
+
+    def __init__(self) -> None:
+        # host key -> env id -> performance
+        self._hosts: Dict[Hashable, Dict[str, float]] = {}
+        # env id -> sorted performance of hosts supporting the env
+        self._sorted: Dict[str, List[float]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    @classmethod
+    def from_hosts(cls, hosts: Iterable[Tuple[Hashable, dict]]) \
+            -> 'PerformanceIndex':
+        """ Build the index from (host key, host metadata) pairs """
+        index = cls()
+        for key, metadata in hosts:
+            performance = cls._get_performance(metadata)
+            if performance is not None:
+                index._hosts[key] = performance
+                for env_id, perf in performance.items():
+                    index._sorted[env_id].append(perf)
+        for values in index._sorted.values():
+            values.sort()
+        return index
+
+    def update(self, key: Hashable, metadata: Optional[dict]) -> None:
+        """ Set host metadata; hosts without performance info are removed """
+        self.remove(key)
+        performance = self._get_performance(metadata)
+        if performance is None:
+            return
+        self._hosts[key] = performance
+        for env_id, perf in performance.items():
+            bisect.insort(self._sorted[env_id], perf)
+
+    def remove(self, key: Hashable) -> None:
+        performance = self._hosts.pop(key, None)
+        if performance is None:
+            return
+        for env_id, perf in performance.items():
+            values = self._sorted[env_id]
+            del values[bisect.bisect_left(values, perf)]
+            if not values:
+                del self._sorted[env_id]
+
+    def percentile_rank(self, perf: float, env_id: str) -> Optional[float]:
+        """ Fraction of hosts with lower performance than `perf` in the given
+        environment or None if no host performance info is available """
+        if not self._hosts:
+            return None
+        values = self._sorted.get(env_id, [])
+        lower = bisect.bisect_left(values, perf)
+        if UNSUPPORTED_PERFORMANCE < perf:
+            lower += len(self._hosts) - len(values)
+        return lower / len(self._hosts)
+
+    @staticmethod
+    def _get_performance(metadata: Optional[dict]) \
+            -> Optional[Dict[str, float]]:
+        if not metadata or 'performance' not in metadata:
+            return None
+        return {
+            env_id: float(perf)
+            for env_id, perf in metadata['performance'].items()
+        }
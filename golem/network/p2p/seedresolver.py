@@ -0,0 +1,87 @@
+import ipaddress
+import logging
+import socket
+import time
+from typing import Callable, Dict, List, Set, Tuple
+
+from twisted.internet import defer
+from twisted.internet.threads import deferToThread
+from twisted.python.failure import Failure
+
+logger = logging.getLogger(__name__)
+
+RESOLVED_TTL = 10 * 60  # How long should we remember resolved seed addresses?
+FAILED_TTL = 60  # After how many seconds should we retry a failed lookup?
+
+SeedAddress = Tuple  # getaddrinfo sockaddr, i.e. (ip, port[, ...])
+
+
+class SeedResolver:
+    """ Resolves seed host names in the reactor thread pool, so that slow DNS
+    doesn't block the reactor. Results are cached for `ttl` seconds, failed
+    lookups for `failed_ttl` seconds. IP addresses are resolved in place. """
+
+    def __init__(
+            self,
+            ttl: float = RESOLVED_TTL,
+            failed_ttl: float = FAILED_TTL,
+            getaddrinfo: Callable = socket.getaddrinfo,
+    ) -> None:
+        self.ttl = ttl
+        self.failed_ttl = failed_ttl
+        self._getaddrinfo = getaddrinfo
+        # (host, port) -> (expiration time, addresses)
+        self._cache: Dict[Tuple[str, int], Tuple[float, Set[SeedAddress]]] = {}
+        # (host, port) -> deferreds waiting for a pending lookup
+        self._waiting: Dict[Tuple[str, int], List[defer.Deferred]] = {}
+
+    def resolve(self, host: str, port: int) -> defer.Deferred:
+        """ Returns a deferred firing with a set of resolved addresses, which
+        is empty if the host can't be resolved. Never fails. """
+        key = (host, port)
+        if _is_ip_address(host):
+            return defer.succeed(
+                self._resolve(host, port, socket.AI_NUMERICHOST))
+
+        expires, addresses = self._cache.get(key, (0., set()))
+        if time.monotonic() < expires:
+            return defer.succeed(addresses)
+
+        if key not in self._waiting:
+            self._waiting[key] = []
+            deferred = deferToThread(self._resolve, host, port)
+            deferred.addBoth(self._resolved, key)
+
+        result = defer.Deferred()
+        self._waiting[key].append(result)
+        return result
+
+    def _resolve(self, host: str, port: int, flags: int = 0) \
+            -> Set[SeedAddress]:
+        try:
+            return {
+                addrinfo[4]  # (ip, port)
+                for addrinfo in self._getaddrinfo(host, port, flags=flags)
+            }
+        except OSError as e:
+            logger.error("Can't resolve %s:%s. %s", host, port, e)
+            return set()
+
+    def _resolved(self, result, key: Tuple[str, int]) -> None:
+        if isinstance(result, Failure):
+            logger.error("Can't resolve %s:%s. %s",
+                         *key, result.getErrorMessage())
+            result = set()
+
+        ttl = self.ttl if result else self.failed_ttl
+        self._cache[key] = (time.monotonic() + ttl, result)
+        for deferred in self._waiting.pop(key):
+            deferred.callback(result)
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
@@ -23,6 +23,10 @@ import binascii
 import logging
 import random
 import socket
+import time
+
+from twisted.internet.defer import Deferred
+from twisted.internet.protocol import DatagramProtocol
 
 __version__ = '0.1.0'
 
@@ -39,6 +43,11 @@ STUN_SERVERS = (
 
 stun_servers_list = STUN_SERVERS
 
+# Seconds to wait for the first response from any of the STUN servers
+STUN_TIMEOUT = 8
+# Seconds between retransmissions of unanswered binding requests
+STUN_RETRANSMIT_INTERVAL = 0.5
+
 DEFAULTS = {
     'stun_port': 3478,
     'source_ip': '0.0.0.0',
@@ -123,16 +132,59 @@ def gen_tran_id():
     return a
 
 
+def build_request(tranid, send_data=""):
+    str_len = "%#04d" % (len(send_data) / 2)
+    str_data = ''.join([BindRequestMsg, str_len, tranid, send_data])
+    return binascii.a2b_hex(str_data)
+
+
+def _parse_address(buf, base):
+    port = int(binascii.b2a_hex(buf[base + 6:base + 8]), 16)
+    ip = ".".join(str(b) for b in buf[base + 8:base + 12])
+    return ip, port
+
+
+def parse_response(buf, tranids):
+    """ Returns a result dict if buf is a binding response to one of the
+    transaction ids (upper case hex strings), None otherwise """
+    msgtype = binascii.b2a_hex(buf[0:2]).decode()
+    msgtranid = binascii.b2a_hex(buf[4:20]).decode()
+    bind_resp_msg = msgtype == BindResponseMsg
+    if not bind_resp_msg or msgtranid.upper() not in tranids:
+        return None
+
+    retVal = {'Resp': True, 'ExternalIP': None, 'ExternalPort': None,
+              'SourceIP': None, 'SourcePort': None, 'ChangedIP': None,
+              'ChangedPort': None}
+    len_message = int(binascii.b2a_hex(buf[2:4]), 16)
+    len_remain = len_message
+    base = 20
+    while len_remain:
+        attr_type = binascii.b2a_hex(buf[base:(base + 2)]).decode()
+        attr_len = int(binascii.b2a_hex(buf[(base + 2):(base + 4)]), 16)
+        if attr_type == MappedAddress:
+            retVal['ExternalIP'], retVal['ExternalPort'] = \
+                _parse_address(buf, base)
+        if attr_type == SourceAddress:
+            retVal['SourceIP'], retVal['SourcePort'] = \
+                _parse_address(buf, base)
+        if attr_type == ChangedAddress:
+            retVal['ChangedIP'], retVal['ChangedPort'] = \
+                _parse_address(buf, base)
+        # if attr_type == ServerName:
+            # serverName = buf[(base+4):(base+4+attr_len)]
+        base = base + 4 + attr_len
+        len_remain = len_remain - (4 + attr_len)
+    return retVal
+
+
 def stun_test(sock, host, port, source_ip, source_port, send_data=""):
     retVal = {'Resp': False, 'ExternalIP': None, 'ExternalPort': None,
               'SourceIP': None, 'SourcePort': None, 'ChangedIP': None,
               'ChangedPort': None}
-    str_len = "%#04d" % (len(send_data) / 2)
     tranid = gen_tran_id()
-    str_data = ''.join([BindRequestMsg, str_len, tranid, send_data])
-    data = binascii.a2b_hex(str_data)
-    recvCorr = False
-    while not recvCorr:
+    data = build_request(tranid, send_data)
+    while True:
         recieved = False
         count = 3
         while not recieved:
@@ -153,54 +205,49 @@ def stun_test(sock, host, port, source_ip, source_port, send_data=""):
                 else:
                     retVal['Resp'] = False
                     return retVal
-        msgtype = binascii.b2a_hex(buf[0:2]).decode()
-        msgtranid = binascii.b2a_hex(buf[4:20]).decode()
-        bind_resp_msg = dictValToMsgType[msgtype] == "BindResponseMsg"
-        tranid_match = tranid.upper() == msgtranid.upper()
-        if bind_resp_msg and tranid_match:
-            recvCorr = True
-            retVal['Resp'] = True
-            len_message = int(binascii.b2a_hex(buf[2:4]), 16)
-            len_remain = len_message
-            base = 20
-            while len_remain:
-                attr_type = binascii.b2a_hex(buf[base:(base + 2)]).decode()
-                attr_len = int(binascii.b2a_hex(buf[(base + 2):(base + 4)]), 16)
-                if attr_type == MappedAddress:
-                    port = int(binascii.b2a_hex(buf[base + 6:base + 8]), 16)
-                    ip = ".".join([
-                        str(int(binascii.b2a_hex(buf[base + 8:base + 9]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 9:base + 10]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 10:base + 11]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 11:base + 12]), 16))
-                    ])
-                    retVal['ExternalIP'] = ip
-                    retVal['ExternalPort'] = port
-                if attr_type == SourceAddress:
-                    port = int(binascii.b2a_hex(buf[base + 6:base + 8]), 16)
-                    ip = ".".join([
-                        str(int(binascii.b2a_hex(buf[base + 8:base + 9]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 9:base + 10]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 10:base + 11]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 11:base + 12]), 16))
-                    ])
-                    retVal['SourceIP'] = ip
-                    retVal['SourcePort'] = port
-                if attr_type == ChangedAddress:
-                    port = int(binascii.b2a_hex(buf[base + 6:base + 8]), 16)
-                    ip = ".".join([
-                        str(int(binascii.b2a_hex(buf[base + 8:base + 9]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 9:base + 10]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 10:base + 11]), 16)),
-                        str(int(binascii.b2a_hex(buf[base + 11:base + 12]), 16))
-                    ])
-                    retVal['ChangedIP'] = ip
-                    retVal['ChangedPort'] = port
-                # if attr_type == ServerName:
-                    # serverName = buf[(base+4):(base+4+attr_len)]
-                base = base + 4 + attr_len
-                len_remain = len_remain - (4 + attr_len)
-    # s.close()
+        response = parse_response(buf, {tranid.upper()})
+        if response:
+            return response
+
+
+def race_stun_servers(sock, servers, timeout=STUN_TIMEOUT,
+                      retransmit_interval=STUN_RETRANSMIT_INTERVAL):
+    """ Sends binding requests to all servers at once and returns the first
+    response. Requests are retransmitted until the timeout elapses. """
+    retVal = {'Resp': False, 'ExternalIP': None, 'ExternalPort': None,
+              'SourceIP': None, 'SourcePort': None, 'ChangedIP': None,
+              'ChangedPort': None}
+    requests = {}
+    for host, port in servers:
+        try:
+            address = (socket.gethostbyname(host), port)
+        except (socket.gaierror, OSError) as exc:
+            log.debug("Cannot resolve %s: %r", host, exc)
+            continue
+        tranid = gen_tran_id().upper()
+        requests[tranid] = (build_request(tranid), address)
+
+    deadline = time.monotonic() + timeout
+    while requests and time.monotonic() < deadline:
+        for tranid, (data, address) in list(requests.items()):
+            log.debug("sendto: %s", address)
+            try:
+                sock.sendto(data, address)
+            except OSError as exc:
+                log.debug("Cannot send to %s: %r", address, exc)
+                del requests[tranid]
+
+        retransmit = min(deadline, time.monotonic() + retransmit_interval)
+        while requests and time.monotonic() < retransmit:
+            sock.settimeout(max(retransmit - time.monotonic(), 0.001))
+            try:
+                buf, addr = sock.recvfrom(2048)
+            except (socket.timeout, OSError):
+                continue
+            log.debug("recvfrom: %s", addr)
+            response = parse_response(buf, requests)
+            if response:
+                return response
     return retVal
 
 
@@ -208,20 +255,16 @@ def get_nat_type(s, source_ip, source_port, stun_host=None, stun_port=3478):
     _initialize()
     port = stun_port
     log.debug("Do Test1")
-    resp = False
     if stun_host:
         ret = stun_test(s, stun_host, port, source_ip, source_port)
-        resp = ret['Resp']
     else:
-        for stun_host in stun_servers_list:
-            log.debug('Trying STUN host: %s', stun_host)
-            ret = stun_test(s, stun_host, port, source_ip, source_port)
-            resp = ret['Resp']
-            if resp:
-                break
+        log.debug('Trying STUN hosts: %s', stun_servers_list)
+        ret = race_stun_servers(
+            s, [(stun_host, port) for stun_host in stun_servers_list])
     log.debug("stun test result: %s", ret)
     return ret
 
+
 def get_ip_info(source_ip="0.0.0.0", source_port=54320, stun_host=None,
                 stun_port=3478):
     socket.setdefaulttimeout(2)
@@ -234,3 +277,93 @@ def get_ip_info(source_ip="0.0.0.0", source_port=54320, stun_host=None,
     external_port = nat['ExternalPort']
     s.close()
     return (external_ip, external_port)
+
+
+class StunProbeProtocol(DatagramProtocol):
+    """ Sends binding requests to all STUN servers at once from a single
+    UDP port and fires `deferred` with (external ip, external port) of the
+    first response. Fires with (None, None) on timeout. """
+
+    def __init__(self, servers, timeout=STUN_TIMEOUT,
+                 retransmit_interval=STUN_RETRANSMIT_INTERVAL,
+                 reactor=None):
+        if reactor is None:
+            from twisted.internet import reactor
+        self.servers = list(servers)
+        self.timeout = timeout
+        self.retransmit_interval = retransmit_interval
+        self.reactor = reactor
+        self.deferred = Deferred()
+        self._requests = {}
+        self._calls = []
+
+    def startProtocol(self):
+        for host, port in self.servers:
+            deferred = self.reactor.resolve(host)
+            deferred.addCallbacks(self._resolved, self._not_resolved,
+                                  callbackArgs=(port,), errbackArgs=(host,))
+        self._calls.append(self.reactor.callLater(
+            self.timeout, self._finish, (None, None)))
+
+    def stopProtocol(self):
+        for call in self._calls:
+            if call.active():
+                call.cancel()
+
+    def _resolved(self, ip, port):
+        if self.deferred.called:
+            return
+        tranid = gen_tran_id().upper()
+        self._requests[tranid] = (ip, port)
+        self._send(build_request(tranid), (ip, port))
+
+    @staticmethod
+    def _not_resolved(failure, host):
+        log.debug("Cannot resolve %s: %r", host, failure.value)
+
+    def _send(self, data, address):
+        if self.deferred.called or self.transport is None:
+            return
+        log.debug("sendto: %s", address)
+        try:
+            self.transport.write(data, address)
+        except OSError as exc:
+            log.debug("Cannot send to %s: %r", address, exc)
+            return
+        self._calls.append(self.reactor.callLater(
+            self.retransmit_interval, self._send, data, address))
+
+    def datagramReceived(self, datagram, addr):
+        log.debug("recvfrom: %s", addr)
+        try:
+            response = parse_response(datagram, self._requests)
+        except (ValueError, IndexError):
+            response = None
+        if response:
+            self._finish((response['ExternalIP'], response['ExternalPort']))
+
+    def _finish(self, result):
+        if self.deferred.called:
+            return
+        log.debug("stun probe result: %s", result)
+        if self.transport is not None:
+            self.transport.stopListening()
+        self.stopProtocol()
+        self.deferred.callback(result)
+
+
+def get_ip_info_async(source_ip="0.0.0.0", source_port=0, servers=None,
+                      timeout=STUN_TIMEOUT, reactor=None):
+    """ Non-blocking counterpart of get_ip_info, which races all STUN
+    servers on the reactor.
+    :param servers: (host, port) pairs; stun_servers_list by default
+    :return: Deferred fired with (external ip, external port)
+    """
+    if reactor is None:
+        from twisted.internet import reactor
+    if servers is None:
+        servers = [(host, DEFAULTS['stun_port'])
+                   for host in stun_servers_list]
+    protocol = StunProbeProtocol(servers, timeout=timeout, reactor=reactor)
+    reactor.listenUDP(source_port, protocol, interface=source_ip)
+    return protocol.deferred
@@ -38,6 +38,21 @@ def put(
     db_model.save()
 
 
+def put_many(
+        messages: typing.Iterable[typing.Tuple[str, message.base.Message]],
+        timeout: typing.Optional[datetime.timedelta] = None
+) -> None:
+    """Saves (node_id, msg) pairs in a single transaction. Messages for
+    the same node are read back in the order given."""
+    deadline_utc = (default_now() + timeout) if timeout else None
+    with model.db.atomic():
+        for node_id, msg in messages:
+            assert not isinstance(msg, FORBIDDEN_CLASSES),\
+                "Disconnect message shouldn't be in a queue"
+            model.QueuedMessage.from_message(node_id, msg, deadline_utc)\
+                .save()
+
+
 def get(node_id: str) -> typing.Iterator['message.base.Base']:
     while True:
         with READ_LOCK:
@@ -45,7 +60,10 @@ def get(node_id: str) -> typing.Iterator['message.base.Base']:
                 db_model = model.QueuedMessage.select()\
                     .where(
                         model.QueuedMessage.node == node_id,
-                    ).order_by(model.QueuedMessage.created_date).get()
+                    ).order_by(
+                        model.QueuedMessage.created_date,
+                        model.QueuedMessage.id,
+                    ).get()
             except model.QueuedMessage.DoesNotExist:
                 return
 
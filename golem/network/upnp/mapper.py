@@ -1,5 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional, Tuple
 
 from copy import deepcopy
@@ -82,23 +83,42 @@ class PortMapperManager(IPortMapper):
         return deepcopy(self._mapping)
 
     def discover(self) -> str:
-        for mapper in self._mappers:
-            logger.info('%s: starting discovery', mapper.name)
-
-            try:
-                device = mapper.discover()
-                net = mapper.network
-            except Exception as exc:  # pylint: disable=broad-except
-                logger.warning('%s: discovery error: %s', mapper.name, exc)
-                continue
-
-            if mapper.available:
-                self._active_mapper = mapper
-                logger.info('%s: discovery complete: %s', mapper.name, device)
-                logger.info('%s: network configuration: %r', mapper.name, net)
-                return device
-
-            logger.warning('%s-compatible device was not found', mapper.name)
+        """ Runs discovery with all mappers at the same time. The first
+        mapper to find a compatible device becomes the active one. """
+        executor = ThreadPoolExecutor(max_workers=len(self._mappers))
+        futures = {
+            executor.submit(self._discover, mapper): mapper
+            for mapper in self._mappers
+        }
+        try:
+            for future in as_completed(futures):
+                available, device = future.result()
+                if available:
+                    self._active_mapper = futures[future]
+                    return device
+        finally:
+            # Do not wait for the slower mappers
+            executor.shutdown(wait=False)
+        return None
+
+    @staticmethod
+    def _discover(mapper: IPortMapper) -> Tuple[bool, Optional[str]]:
+        logger.info('%s: starting discovery', mapper.name)
+
+        try:
+            device = mapper.discover()
+            net = mapper.network
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning('%s: discovery error: %s', mapper.name, exc)
+            return False, None
+
+        if mapper.available:
+            logger.info('%s: discovery complete: %s', mapper.name, device)
+            logger.info('%s: network configuration: %r', mapper.name, net)
+            return True, device
+
+        logger.warning('%s-compatible device was not found', mapper.name)
+        return False, None
 
     def get_mapping(self,
                     external_port: int,
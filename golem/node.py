@@ -27,6 +27,7 @@ from golem.client import Client
 from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.config.active import EthereumConfig
 from golem.core.deferred import chain_function
+from golem.core.startupprofile import startup_profiler
 from golem.hardware.presets import HardwarePresets, HardwarePresetsMixin
 from golem.core.keysauth import KeysAuth, WrongPassword
 from golem.core import golem_async
@@ -48,7 +49,7 @@ from golem.rpc import utils as rpc_utils
 from golem.rpc.mapping import rpceventnames
 from golem.rpc.router import CrossbarRouter
 from golem.rpc.session import (
-    Publisher,
+    CoalescingPublisher,
     Session,
 )
 from golem import terms
@@ -127,7 +128,7 @@ class Node(HardwarePresetsMixin):
 
         self.rpc_router: Optional[CrossbarRouter] = None
         self.rpc_session: Optional[Session] = None
-        self._rpc_publisher: Optional[Publisher] = None
+        self._rpc_publisher: Optional[CoalescingPublisher] = None
 
         self._peers: List[SocketAddress] = peers or []
 
@@ -162,17 +163,21 @@ class Node(HardwarePresetsMixin):
                 raise Exception("Password incorrect")
 
     def start(self) -> None:
-        HardwarePresets.initialize(self._datadir)
-        HardwarePresets.update_config(self._config_desc.hardware_preset_name,
-                                      self._config_desc)
+        with startup_profiler.phase('hardware presets'):
+            HardwarePresets.initialize(self._datadir)
+            HardwarePresets.update_config(
+                self._config_desc.hardware_preset_name,
+                self._config_desc)
 
         try:
-            rpc = self._start_rpc()
+            rpc = startup_profiler.track('rpc', self._start_rpc())
 
             def on_rpc_ready() -> Deferred:
-                terms_ = self._check_terms()
-                keys = self._start_keys_auth()
-                docker = self._start_docker()
+                terms_ = startup_profiler.track('terms', self._check_terms())
+                keys = startup_profiler.track(
+                    'keys auth', self._start_keys_auth())
+                docker = startup_profiler.track(
+                    'docker', self._start_docker())
                 return gatherResults([terms_, keys, docker], consumeErrors=True)
 
             def on_start_error(failure: FirstError):
@@ -214,6 +219,14 @@ class Node(HardwarePresetsMixin):
         from threading import Thread
         Thread(target=_quit).start()
 
+    @rpc_utils.expose('comp.tasks.events.snapshot')
+    def get_task_events_snapshot(self) -> List[List]:
+        """ Latest task and subtask status events, for subscribers which
+        missed them """
+        if not self._rpc_publisher:
+            return []
+        return self._rpc_publisher.snapshot()
+
     @rpc_utils.expose('golem.password.set')
     def set_password(self, password: str) -> bool:
         logger.info("Got password")
@@ -315,7 +328,10 @@ class Node(HardwarePresetsMixin):
         def on_connect(*_):
             methods = self.get_rpc_mapping()
             self.rpc_session.add_procedures(methods)
-            self._rpc_publisher = Publisher(self.rpc_session)
+            self._rpc_publisher = CoalescingPublisher(
+                self.rpc_session, reactor=self._reactor)
+            self._reactor.addSystemEventTrigger(
+                "before", "shutdown", self._rpc_publisher.stop)
             EventPublisher.initialize(self._rpc_publisher)
             StatusPublisher.initialize(self._rpc_publisher)
 
@@ -518,7 +534,8 @@ class Node(HardwarePresetsMixin):
         from golem.tools.talkback import enable_sentry_logger
         enable_sentry_logger(self._use_talkback)
 
-        self.client = self._client_factory(self._keys_auth)
+        with startup_profiler.phase('client init'):
+            self.client = self._client_factory(self._keys_auth)
         self._reactor.addSystemEventTrigger("before", "shutdown",
                                             self.client.quit)
 
@@ -535,16 +552,19 @@ class Node(HardwarePresetsMixin):
             self._stop_on_error("client", "Client is not available")
             return
 
-        self._setup_apps()
-        self.client.sync()
+        with startup_profiler.phase('apps'):
+            self._setup_apps()
+        with startup_profiler.phase('client sync'):
+            self.client.sync()
 
         try:
-            if self._docker_manager:
-                # pylint: disable=no-member
-                with self._docker_manager.locked_config():
+            with startup_profiler.phase('client start'):
+                if self._docker_manager:
+                    # pylint: disable=no-member
+                    with self._docker_manager.locked_config():
+                        self.client.start()
+                else:
                     self.client.start()
-            else:
-                self.client.start()
 
             for peer in self._peers:
                 self.client.connect(peer)
@@ -559,8 +579,12 @@ class Node(HardwarePresetsMixin):
             self._rpc_publisher.publish(
                 rpceventnames.Golem.procedures_registered,
             )
+            startup_profiler.finish(self._datadir)
         # pylint: disable=no-member
-        self.rpc_session.add_procedures(methods).addCallback(  # type: ignore
+        startup_profiler.track(
+            'rpc procedures',
+            self.rpc_session.add_procedures(methods),  # type: ignore
+        ).addCallback(
             rpc_ready,
         ).addErrback(
             self._error('Registering RPC procedures failed')
@@ -0,0 +1,107 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from golem.ranking.helper.trust_const import MAX_TRUST, MIN_TRUST
+
+
+class NodeVector:
+    """
+    Mapping of node ids to fixed-shape float arrays, kept in a single NumPy
+    array so that values of all nodes can be processed at once.
+    """
+
+    def __init__(self, shape: Tuple[int, ...]) -> None:
+        self.shape = shape
+        self._index: Dict[str, int] = {}
+        self._node_ids: List[str] = []
+        self._data = np.zeros((0,) + shape)
+
+    @classmethod
+    def from_array(cls, node_ids: Sequence[str], data: np.ndarray) \
+            -> 'NodeVector':
+        vector = cls(data.shape[1:])
+        vector.add(node_ids, data)
+        return vector
+
+    def __len__(self) -> int:
+        return len(self._node_ids)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._node_ids)
+
+    def __getitem__(self, node_id: str) -> np.ndarray:
+        return self._data[self._index[node_id]]
+
+    def __setitem__(self, node_id: str, value) -> None:
+        index, = self._indices([node_id])
+        self._data[index] = value
+
+    def keys(self) -> List[str]:
+        return list(self._node_ids)
+
+    def values(self) -> np.ndarray:
+        return self.data
+
+    def items(self) -> Iterator[Tuple[str, np.ndarray]]:
+        return zip(self._node_ids, self.data)
+
+    @property
+    def node_ids(self) -> List[str]:
+        return self._node_ids
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data[:len(self._node_ids)]
+
+    def add(self, node_ids: Sequence[str], values: np.ndarray) -> None:
+        """ Add values to the given nodes; missing nodes start from zero """
+        indices = self._indices(node_ids)
+        np.add.at(self._data, indices, values)
+
+    def set(self, node_ids: Sequence[str], values: np.ndarray) -> None:
+        indices = self._indices(node_ids)
+        self._data[indices] = values
+
+    def get(self, node_ids: Sequence[str], default: float = 0.) \
+            -> np.ndarray:
+        """ Return values of the given nodes, `default` for unknown ones """
+        result = np.full((len(node_ids),) + self.shape, default)
+        positions = [i for i, node_id in enumerate(node_ids)
+                     if node_id in self._index]
+        result[positions] = self._data[
+            [self._index[node_ids[i]] for i in positions]]
+        return result
+
+    def _indices(self, node_ids: Sequence[str]) -> List[int]:
+        # May reallocate self._data, so call it before accessing the array
+        indices = []
+        for node_id in node_ids:
+            index = self._index.get(node_id)
+            if index is None:
+                index = len(self._node_ids)
+                self._index[node_id] = index
+                self._node_ids.append(node_id)
+            indices.append(index)
+
+        size = len(self._node_ids)
+        if size > len(self._data):
+            grown = np.zeros((max(size, 2 * len(self._data)),) + self.shape)
+            grown[:len(self._data)] = self._data
+            self._data = grown
+        return indices
+
+
+def vec_to_trust(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorised min_max_utility.vec_to_trust: converts (..., 2) arrays of
+    (trust, weight) pairs to clipped trust values
+    """
+    trust, weight = values[..., 0], values[..., 1]
+    valid = (trust != 0.) & (weight != 0.)
+    result = np.zeros(trust.shape)
+    np.divide(trust, weight, out=result, where=valid)
+    return np.clip(result, MIN_TRUST, MAX_TRUST)
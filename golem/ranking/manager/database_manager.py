@@ -1,5 +1,6 @@
 import datetime
 import logging
+from typing import Iterable, List, Sequence, Tuple
 
 from peewee import IntegrityError
 
@@ -13,6 +14,10 @@ logger = logging.getLogger(__name__)
 REQUESTOR_FORGETTING_FACTOR = 0.9
 PROVIDER_FORGETTING_FACTOR = 0.9
 
+# Rows per statement in batched upserts; keeps queries below SQLite's
+# host parameter limit
+UPSERT_BATCH_SIZE = 100
+
 
 def increase_positive_computed(node_id, trust_mod):
     logger.debug('increase_positive_computed. node_id=%r, trust_mod=%r',
@@ -258,6 +263,38 @@ def upsert_global_rank(node_id, comp_trust, req_trust, comp_weight, req_weight):
             .where(GlobalRank.node_id == node_id).execute()
 
 
+def upsert_global_ranks(
+        ranks: Iterable[Tuple[str, float, float, float, float]]) -> None:
+    """
+    Batched upsert_global_rank
+    :param ranks: (node_id, comp_trust, req_trust, comp_weight, req_weight)
+    """
+    rows = [
+        dict(node_id=node_id,
+             computing_trust_value=comp_trust,
+             requesting_trust_value=req_trust,
+             gossip_weight_computing=comp_weight,
+             gossip_weight_requesting=req_weight)
+        for node_id, comp_trust, req_trust, comp_weight, req_weight in ranks
+    ]
+    with db.atomic():
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            existing = {
+                rank.node_id for rank in GlobalRank
+                .select(GlobalRank.node_id)
+                .where(GlobalRank.node_id << [r['node_id'] for r in batch])
+            }
+            _insert_many(GlobalRank,
+                         [r for r in batch if r['node_id'] not in existing])
+            modified_date = str(datetime.datetime.now())
+            for row in batch:
+                if row['node_id'] in existing:
+                    GlobalRank.update(modified_date=modified_date, **row) \
+                        .where(GlobalRank.node_id == row['node_id']) \
+                        .execute()
+
+
 def get_local_rank(node_id):
     return LocalRank.select().where(LocalRank.node_id == node_id).first()
 
@@ -283,3 +320,50 @@ def upsert_neighbour_loc_rank(neighbour_id, about_id, loc_rank):
         NeighbourLocRank.update(requesting_trust_value=loc_rank[1], computing_trust_value=loc_rank[0]) \
             .where(
             (NeighbourLocRank.about_node_id == about_id) & (NeighbourLocRank.node_id == neighbour_id)).execute()
+
+
+def upsert_neighbour_loc_ranks(
+        loc_ranks: Iterable[Tuple[str, str, Sequence[float]]]) -> None:
+    """
+    Batched upsert_neighbour_loc_rank
+    :param loc_ranks: (neighbour_id, about_id, (comp_trust, req_trust))
+    """
+    rows = {}
+    for neighbour_id, about_id, loc_rank in loc_ranks:
+        if neighbour_id == about_id:
+            logger.warning("Removing {} self trust".format(about_id))
+            continue
+        rows[(neighbour_id, about_id)] = dict(
+            node_id=neighbour_id,
+            about_node_id=about_id,
+            computing_trust_value=loc_rank[0],
+            requesting_trust_value=loc_rank[1])
+
+    keys = list(rows)
+    with db.atomic():
+        for start in range(0, len(keys), UPSERT_BATCH_SIZE):
+            batch = keys[start:start + UPSERT_BATCH_SIZE]
+            existing = {
+                (rank.node_id, rank.about_node_id) for rank in NeighbourLocRank
+                .select(NeighbourLocRank.node_id,
+                        NeighbourLocRank.about_node_id)
+                .where(NeighbourLocRank.node_id << [k[0] for k in batch])
+                .where(NeighbourLocRank.about_node_id << [k[1] for k in batch])
+            }
+            _insert_many(NeighbourLocRank,
+                         [rows[k] for k in batch if k not in existing])
+            for key in batch:
+                if key in existing:
+                    row = rows[key]
+                    NeighbourLocRank.update(
+                        computing_trust_value=row['computing_trust_value'],
+                        requesting_trust_value=row['requesting_trust_value'],
+                    ).where(
+                        (NeighbourLocRank.node_id == key[0]) &
+                        (NeighbourLocRank.about_node_id == key[1])
+                    ).execute()
+
+
+def _insert_many(model, rows: List[dict]) -> None:
+    if rows:
+        model.insert_many(rows).execute()
@@ -4,10 +4,11 @@ import random
 
 from threading import Lock
 
+import numpy as np
 from twisted.internet.task import deferLater
 
-from golem.ranking.helper import min_max_utility as util
 from golem.ranking.helper.trust_const import UNKNOWN_TRUST
+from golem.ranking.helper.trust_vector import NodeVector, vec_to_trust
 from golem.ranking.manager import database_manager as dm
 from golem.ranking.manager import trust_manager as tm
 from golem.ranking.manager.time_manager import TimeManager
@@ -31,8 +32,10 @@ class Ranking(object):
         self.neighbours = []
         self.step = 0
         self.max_steps = max_steps
-        self.working_vec = {}
-        self.prevRank = {}
+        # node id -> [[computing trust, weight], [requesting trust, weight]]
+        self.working_vec = NodeVector((2, 2))
+        # node id -> [computing trust, requesting trust]
+        self.prevRank = NodeVector((2,))
         self.globRank = {}
         self.received_gossip = []
         self.finished = False
@@ -66,14 +69,17 @@ class Ranking(object):
 
     def __init_working_vec(self):
         with self.lock:
-            self.working_vec = {}
-            self.prevRank = {}
+            node_ids = []
+            trust = []
             for loc_rank in dm.get_local_rank_for_all():
-                comp_trust = tm.computed_trust_local(loc_rank)
-                req_trust = tm.requested_trust_local(loc_rank)
-                self.working_vec[loc_rank.node_id] = \
-                    [[comp_trust, 1.0], [req_trust, 1.0]]
-                self.prevRank[loc_rank.node_id] = [comp_trust, req_trust]
+                node_ids.append(loc_rank.node_id)
+                trust.append([tm.computed_trust_local(loc_rank),
+                              tm.requested_trust_local(loc_rank)])
+            trust = np.array(trust, dtype=float).reshape((-1, 2))
+            weight = np.ones(trust.shape)
+            self.working_vec = NodeVector.from_array(
+                node_ids, np.stack([trust, weight], axis=-1))
+            self.prevRank = NodeVector.from_array(node_ids, trust)
 
     def __new_round(self):
         logger.debug("New gossip round")
@@ -98,7 +104,7 @@ class Ranking(object):
             self.received_gossip = \
                 self.client.collect_gossip() + self.received_gossip
             self.__make_prev_rank()
-            self.working_vec = {}
+            self.working_vec = NodeVector((2, 2))
             self.__add_gossip()
             self.__check_finished()
         finally:
@@ -182,9 +188,8 @@ class Ranking(object):
 
     def sync_network(self):
         neighbours_loc_ranks = self.client.collect_neighbours_loc_ranks()
-        for [neighbour_id, about_id, loc_rank] in neighbours_loc_ranks:
-            with self.lock:
-                dm.upsert_neighbour_loc_rank(neighbour_id, about_id, loc_rank)
+        with self.lock:
+            dm.upsert_neighbour_loc_ranks(neighbours_loc_ranks)
 
     def __push_local_ranks(self):
         for loc_rank in dm.get_local_rank_for_all():
@@ -220,23 +225,9 @@ class Ranking(object):
                 set(self.neighbours) <= self.finished_neighbours
 
     def __compare_working_vec_and_prev_rank(self):
-        aggregated_trust = 0.0
-        for node_id, val in list(self.working_vec.items()):
-            try:
-                computing, requesting = val
-            except (TypeError, ValueError):
-                logger.warning("Wrong trust vector element {}".format(val))
-                break
-            comp_trust = util.vec_to_trust(computing)
-            req_trust = util.vec_to_trust(requesting)
-            if node_id in self.prevRank:
-                comp_trust_old = self.prevRank[node_id][0]
-                req_trust_old = self.prevRank[node_id][1]
-            else:
-                comp_trust_old, req_trust_old = 0, 0
-            aggregated_trust += abs(comp_trust - comp_trust_old)
-            aggregated_trust += abs(req_trust - req_trust_old)
-        return aggregated_trust
+        trust = vec_to_trust(self.working_vec.data)
+        prev_trust = self.prevRank.get(self.working_vec.node_ids)
+        return float(np.abs(trust - prev_trust).sum())
 
     def __set_k(self):
         degrees = self.__get_neighbours_degree()
@@ -254,63 +245,47 @@ class Ranking(object):
         return degrees
 
     def __make_prev_rank(self):
-        for node_id, val in list(self.working_vec.items()):
-            try:
-                computing, requesting = val
-            except (TypeError, ValueError):
-                logger.warning("Wrong trust vector element {}".format(val))
-                break
-            comp_trust = util.vec_to_trust(computing)
-            req_trust = util.vec_to_trust(requesting)
-            self.prevRank[node_id] = [comp_trust, req_trust]
+        self.prevRank.set(self.working_vec.node_ids,
+                          vec_to_trust(self.working_vec.data))
 
     def __save_working_vec(self):
-        for node_id, val in list(self.working_vec.items()):
-            try:
-                computing, requesting = val
-            except (TypeError, ValueError):
-                logger.warning("Wrong trust vector element {}".format(val))
-                break
-            comp_trust = util.vec_to_trust(computing)
-            req_trust = util.vec_to_trust(requesting)
-            dm.upsert_global_rank(node_id,
-                                  comp_trust,
-                                  req_trust,
-                                  computing[1],
-                                  requesting[1])
+        data = self.working_vec.data
+        trust = vec_to_trust(data)
+        dm.upsert_global_ranks(zip(
+            self.working_vec.node_ids,
+            trust[:, 0].tolist(),
+            trust[:, 1].tolist(),
+            data[:, 0, 1].tolist(),
+            data[:, 1, 1].tolist(),
+        ))
 
     def __prepare_gossip(self):
-        gossip_vec = []
-        for node_id, val in list(self.working_vec.items()):
-            comp_trust = list(map(self.__scale_gossip, val[0]))
-            req_trust = list(map(self.__scale_gossip, val[1]))
-            gossip_vec.append([node_id, [comp_trust, req_trust]])
-        return gossip_vec
-
-    def __scale_gossip(self, val):
-        return val / float(self.k + 1)
+        scaled = self.working_vec.data / float(self.k + 1)
+        return [[node_id, val]
+                for node_id, val in zip(self.working_vec.node_ids,
+                                        scaled.tolist())]
 
     def __add_gossip(self):
+        node_ids = []
+        values = []
         for gossip_group in self.received_gossip:
             for gossip in gossip_group:
                 try:
                     node_id, [comp, req] = gossip
-                    if node_id in self.working_vec:
-                        [prev_comp, prev_req] = self.working_vec[node_id]
-                        self.working_vec[node_id] = [
-                            self.__sum_gossip(comp, prev_comp),
-                            self.__sum_gossip(req, prev_req)]
-                    else:
-                        self.working_vec[node_id] = [comp, req]
-                except Exception as err:
+                    hash(node_id)
+                    val = np.array([comp, req], dtype=float)
+                    if val.shape != (2, 2):
+                        raise ValueError("Wrong shape {}".format(val.shape))
+                except Exception as err:  # pylint: disable=broad-except
                     logger.error("Wrong gossip {}, {}".format(gossip, err))
+                    continue
+                node_ids.append(node_id)
+                values.append(val)
 
+        if node_ids:
+            self.working_vec.add(node_ids, np.array(values))
         self.received_gossip = []
 
-    @staticmethod
-    def __sum_gossip(a, b):
-        return list(map(sum, zip(a, b)))
-
     def __send_finished(self):
         self.client.send_stop_gossip()
 
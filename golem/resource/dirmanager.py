@@ -4,6 +4,8 @@ import shutil
 import time
 from typing import Iterator
 
+from golem.resource.diskusage import ledger
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,7 +98,9 @@ class DirManager(object):
                     continue
 
             if os.path.isfile(path):
+                size = os.path.getsize(path)
                 os.remove(path)
+                ledger.path_removed(path, size)
             if os.path.isdir(path):
                 self.clear_dir(path)
                 if not os.listdir(path):
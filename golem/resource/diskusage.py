@@ -0,0 +1,109 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# How many directory entries should be scanned between reconciliation pauses?
+RECONCILE_BATCH_SIZE = 1000
+# How long should reconciliation pause to let other threads do their work?
+RECONCILE_PAUSE = 0.01
+
+
+class DiskUsageLedger:
+    """ Keeps track of the total size of files in tracked directories, so
+    that it can be read without walking them.
+
+    Code writing to or deleting from these directories records the change.
+    Files modified by other processes (e.g. hyperdrive, docker) are not
+    recorded, so sizes drift until the next `reconcile`. Size of a directory
+    is unknown (None) until it's reconciled for the first time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # root directory -> total size in bytes
+        self._sizes: Dict[str, Optional[int]] = {}
+
+    def track(self, root: str) -> None:
+        with self._lock:
+            self._sizes.setdefault(os.path.abspath(root), None)
+
+    def size(self, root: str) -> Optional[int]:
+        with self._lock:
+            return self._sizes.get(os.path.abspath(root))
+
+    def record(self, path: str, delta: int) -> None:
+        """ Add `delta` bytes to the size of the directory containing `path` """
+        if not self._sizes:
+            return
+        path = os.path.abspath(path)
+        with self._lock:
+            for root, size in list(self._sizes.items()):
+                if size is not None and path.startswith(root + os.sep):
+                    self._sizes[root] = max(0, size + delta)
+
+    def path_added(self, path: str) -> None:
+        """ Record a file or a directory tree created at `path` """
+        if self._sizes:
+            self.record(path, path_size(path))
+
+    def paths_added(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            self.path_added(path)
+
+    def path_removed(self, path: str, size: int) -> None:
+        self.record(path, -size)
+
+    def reconcile(self) -> None:
+        """ Walk the tracked directories and correct their recorded sizes.
+        Walking pauses every RECONCILE_BATCH_SIZE entries, so it's meant to
+        run in a background thread. """
+        with self._lock:
+            roots = list(self._sizes)
+        for root in roots:
+            size = _walk_size(root)
+            with self._lock:
+                previous = self._sizes.get(root)
+                self._sizes[root] = size
+            if previous is not None and previous != size:
+                logger.debug('Disk usage of %r drifted by %d bytes',
+                             root, size - previous)
+
+
+def path_size(path: str) -> int:
+    try:
+        if os.path.isdir(path):
+            return _walk_size(path, pause=False)
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _walk_size(root: str, pause: bool = True) -> int:
+    size = 0
+    scanned = 0
+    pending = [root]
+    while pending:
+        try:
+            entries = list(os.scandir(pending.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+        scanned += len(entries)
+        if pause and scanned >= RECONCILE_BATCH_SIZE:
+            scanned = 0
+            time.sleep(RECONCILE_PAUSE)
+    return size
+
+
+ledger = DiskUsageLedger()
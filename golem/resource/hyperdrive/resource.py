@@ -4,6 +4,7 @@ import shutil
 from threading import Lock
 from typing import List
 from golem.core.fileshelper import copy_file_tree, relative_path
+from golem.resource.diskusage import ledger, path_size
 
 
 def split_path(path):
@@ -169,6 +170,8 @@ class ResourceStorage(object):
         dst_path = self.get_path(dst_relative_path, res_id)
         src_path = norm_path(src_path)
 
+        if os.path.exists(dst_path):
+            ledger.path_removed(dst_path, path_size(dst_path))
         if os.path.isfile(dst_path):
             os.remove(dst_path)
         elif os.path.isdir(dst_path):
@@ -183,3 +186,4 @@ class ResourceStorage(object):
         else:
             raise ResourceError("Error reading source path: '{}'"
                                 .format(src_path))
+        ledger.path_added(dst_path)
@@ -9,6 +9,7 @@ from twisted.internet.defer import Deferred
 from golem.core.fileshelper import common_dir
 from golem.network.hyperdrive.client import HyperdriveAsyncClient
 from golem.resource.client import ClientHandler, DummyClient
+from golem.resource.diskusage import ledger
 from golem.resource.hyperdrive.resource import Resource, ResourceStorage, \
     ResourceError
 
@@ -302,6 +303,10 @@ class HyperdriveResourceManager(ClientHandler):
             files = self._parse_pull_response(response, res_id)
             success(entry, files, res_id)
 
+        def pulled_wrapper(response, **kwargs):
+            ledger.paths_added(self._pulled_paths(response, res_id))
+            success_wrapper(response, **kwargs)
+
         def error_wrapper(exception, **_):
             logger.warning("Error downloading resource. res_id=%s",
                            resource.res_id)
@@ -326,7 +331,7 @@ class HyperdriveResourceManager(ClientHandler):
                 error_wrapper(exc)
         else:
             self._pull(resource, res_id,
-                       success=success_wrapper,
+                       success=pulled_wrapper,
                        error=error_wrapper,
                        client=client,
                        client_options=client_options,
@@ -357,6 +362,10 @@ class HyperdriveResourceManager(ClientHandler):
             except Exception as e:
                 error(e)
 
+    def _pulled_paths(self, response: list, res_id: str) -> typing.List[str]:
+        return [self.storage.get_path(path, res_id)
+                for path in self._parse_pull_response(response, res_id)]
+
     def _parse_pull_response(self, response: list, res_id: str) -> list:
         # response -> [(path, hash, [file_1, file_2, ...])]
         relative = self.storage.relative_path
@@ -33,6 +33,7 @@ class Task:
 
 class Resources:
     evt_limit_exceeded = 'evt.res.limit.exceeded'
+    evt_restore_progress = 'evt.res.restore.progress'
 
 
 class Computation:
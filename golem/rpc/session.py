@@ -1,7 +1,9 @@
 import datetime
 import functools
 import logging
+import threading
 import typing
+from collections import OrderedDict
 
 from netaddr import IPAddress, valid_ipv4
 from autobahn.twisted import ApplicationSession
@@ -18,6 +20,7 @@ from twisted.internet.endpoints import (
 
 from golem.decorators import surge_detector
 from golem.rpc.common import X509_COMMON_NAME
+from golem.rpc.mapping.rpceventnames import Task
 from golem.rpc import utils as rpc_utils
 
 logger = logging.getLogger(__name__)
@@ -29,6 +32,15 @@ AUTO_PING_INTERVAL = 15.
 AUTO_PING_TIMEOUT = 12.
 BACKOFF_POLICY_FACTOR = 1.2
 
+# How often are coalesced events published (in seconds)?
+EVENT_FLUSH_INTERVAL = 0.25
+# Flush interval limit when the router doesn't keep up (in seconds)
+MAX_EVENT_FLUSH_INTERVAL = 4.
+# Maximum number of publications awaiting acknowledgement from the router
+MAX_EVENTS_IN_FLIGHT = 200
+# How many latest task and subtask states should be kept for late subscribers?
+EVENT_SNAPSHOT_SIZE = 10000
+
 
 class RPCAddress(object):
 
@@ -296,6 +308,10 @@ class Publisher:  # pylint: disable=too-few-public-methods
         :return: deferred autobahn.wamp.request.Publication on success or None
                  if session is closing or there's an error
         """
+        return self._publish(event_alias, *args, **kwargs)
+
+    def _publish(self, event_alias, *args, **kwargs) \
+            -> typing.Optional[Deferred]:
         if self.session.is_open():
             try:
                 return self.session.publish(str(event_alias), *args,
@@ -307,3 +323,127 @@ class Publisher:  # pylint: disable=too-few-public-methods
             logger.warning("RPC: Cannot publish '%s', session is not yet "
                            "established", event_alias)
         return None
+
+
+EventKey = typing.Tuple[str, ...]
+
+
+class CoalescingPublisher(Publisher):
+    """ Publishes task and subtask status events at most once per flush
+    interval. Only the latest status of each task and each subtask is sent,
+    other events are published immediately. Publications are acknowledged by
+    the router; when too many of them are in flight, the flush interval is
+    doubled until the router catches up. Latest statuses are kept in
+    a snapshot, so that late subscribers can fetch the current state. """
+
+    COALESCED_EVENTS = (Task.evt_task_status, Task.evt_subtask_status)
+
+    def __init__(self, session,
+                 interval: float = EVENT_FLUSH_INTERVAL,
+                 max_interval: float = MAX_EVENT_FLUSH_INTERVAL,
+                 max_in_flight: int = MAX_EVENTS_IN_FLIGHT,
+                 reactor=None) -> None:
+        super().__init__(session)
+        if reactor is None:
+            from twisted.internet import reactor
+        self._reactor = reactor
+        self.interval = interval
+        self.max_interval = max_interval
+        self.max_in_flight = max_in_flight
+        self.current_interval = interval
+        self.in_flight = 0
+        self.frames_sent = 0
+
+        self._lock = threading.Lock()
+        self._pending: 'OrderedDict[EventKey, tuple]' = OrderedDict()
+        self._snapshot: 'OrderedDict[EventKey, tuple]' = OrderedDict()
+        self._flush_scheduled = False
+        self._delayed_call = None
+
+    def publish(self, event_alias, *args, **kwargs) \
+            -> typing.Optional[Deferred]:
+        if event_alias not in self.COALESCED_EVENTS or kwargs:
+            return super().publish(event_alias, *args, **kwargs)
+
+        # task id for task events, task and subtask ids for subtask events
+        key_length = 2 if event_alias == Task.evt_subtask_status else 1
+        key = (event_alias, ) + tuple(args[:key_length])
+        with self._lock:
+            self._pending.pop(key, None)
+            self._pending[key] = args
+            self._snapshot.pop(key, None)
+            self._snapshot[key] = args
+            while len(self._snapshot) > EVENT_SNAPSHOT_SIZE:
+                self._snapshot.popitem(last=False)
+            if self._flush_scheduled:
+                return None
+            self._flush_scheduled = True
+        self._reactor.callFromThread(self._schedule_flush)
+        return None
+
+    def snapshot(self) -> typing.List[typing.List]:
+        """ Latest events of each task and subtask, oldest first """
+        with self._lock:
+            return [[key[0], list(args)]
+                    for key, args in self._snapshot.items()]
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """ Publish pending events, unless the router is lagging behind """
+        self._delayed_call = None
+        available = self.max_in_flight - self.in_flight
+        with self._lock:
+            events = []
+            while self._pending and len(events) < available:
+                key, args = self._pending.popitem(last=False)
+                events.append((key[0], args))
+            self._flush_scheduled = bool(self._pending)
+
+        if self._flush_scheduled:
+            self.current_interval = min(self.current_interval * 2,
+                                        self.max_interval)
+            logger.debug("RPC: Router is lagging behind, %d events in flight."
+                         " Next flush in %.2f s",
+                         self.in_flight, self.current_interval)
+        else:
+            self.current_interval = self.interval
+
+        for event_alias, args in events:
+            self._send(event_alias, *args)
+        if self._flush_scheduled:
+            self._schedule_flush()
+
+    def stop(self) -> None:
+        if self._delayed_call and self._delayed_call.active():
+            self._delayed_call.cancel()
+        self._delayed_call = None
+        with self._lock:
+            self._flush_scheduled = False
+
+    def _schedule_flush(self) -> None:
+        if self._delayed_call is None:
+            self._delayed_call = self._reactor.callLater(
+                self.current_interval, self.flush)
+
+    def _send(self, event_alias, *args) -> None:
+        deferred = self._publish(
+            event_alias, *args,
+            options=types.PublishOptions(acknowledge=True))
+        self.frames_sent += 1
+        if deferred is None:
+            return
+        self.in_flight += 1
+
+        def _acknowledged(result):
+            self.in_flight -= 1
+            return result
+
+        deferred.addBoth(_acknowledged)
+        deferred.addErrback(self._on_error)
+
+    def _on_error(self, err):
+        if not self.session.is_closing():
+            logger.error("RPC: Cannot publish event: %r", err)
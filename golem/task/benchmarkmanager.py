@@ -1,3 +1,4 @@
+import asyncio
 import shutil
 from copy import copy
 import hashlib
@@ -11,15 +12,15 @@ from golem_task_api import ProviderAppClient
 
 from apps.core.benchmark.benchmarkrunner import BenchmarkRunner
 from apps.core.task.coretaskstate import TaskDesc
+from golem import hardware
+from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.core.threads import callback_wrapper
 from golem.environments.environment import Environment as DefaultEnvironment
 
 from golem.envs import BenchmarkResult, EnvId
 from golem.model import Performance, AppBenchmark
 from golem.resource.dirmanager import DirManager
-from golem.task import ComputationType
 from golem.task.envmanager import EnvironmentManager
-from golem.task.exceptions import ComputationInProgress
 from golem.task.task_api import EnvironmentTaskApiService
 from golem.task.taskstate import TaskStatus
 
@@ -150,46 +151,110 @@ def hash_prereq_dict(dictionary: Dict[str, Any]) -> str:
 
 
 class AppBenchmarkManager:
+    """ Computes and stores benchmark scores of Task API environments.
+
+    Scores are keyed by the environment, its prerequisites and a hardware
+    fingerprint (see `golem.hardware.fingerprint`), so they remain valid
+    across restarts and come back into use when the config is changed back.
+    Callers asking for a score which is being computed await the same
+    computation. Benchmarks of distinct environments run concurrently as long
+    as the CPU cores they are assigned fit within the CPU budget. """
 
     def __init__(
             self,
             env_manager: EnvironmentManager,
             root_path: Path,
+            cpu_budget: Optional[int] = None,
     ) -> None:
         self._env_manager = env_manager
         self._root_path = root_path / 'benchmarks'
-        self._computing: Optional[str] = None
+        self._cpu_budget = cpu_budget or len(hardware.cpus())
+        self._num_cores = 1
+        # Arguments of `hardware.fingerprint`. The fingerprint itself is
+        # computed on first use, since reading the CPU model takes a while
+        self._hardware_config: Dict[str, int] = {}
+        self._fingerprint: Optional[Dict[str, Any]] = None
+        # benchmark key -> computation in progress
+        self._computing: Dict[str, asyncio.Future] = {}
+        self._env_locks: Dict[EnvId, asyncio.Lock] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_size = 0
+
+    def update_config(self, config_desc: ClientConfigDescriptor) -> None:
+        self._num_cores = max(1, config_desc.num_cores)
+        self._hardware_config = dict(
+            num_cores=config_desc.num_cores,
+            max_memory_size=config_desc.max_memory_size)
+        self._fingerprint = None
+
+    def _get_fingerprint(self) -> Dict[str, Any]:
+        if self._fingerprint is None:
+            self._fingerprint = hardware.fingerprint(**self._hardware_config) \
+                if self._hardware_config else {}
+        return self._fingerprint
+
+    def benchmark_key(
+            self,
+            env_id: EnvId,
+            env_prereq_dict: Dict[str, Any],
+    ) -> str:
+        return hash_prereq_dict({
+            'env_id': env_id,
+            'prerequisites': env_prereq_dict,
+            'hardware': self._get_fingerprint(),
+        })
 
     async def get(
             self,
             env_id: EnvId,
             env_prereq_dict: Dict[str, Any],
     ) -> AppBenchmark:
-        prereq_hash = hash_prereq_dict(env_prereq_dict)
+        key = self.benchmark_key(env_id, env_prereq_dict)
 
         try:
-            return AppBenchmark.get(hash=prereq_hash)
+            return AppBenchmark.get(hash=key)
         except AppBenchmark.DoesNotExist:
             pass
 
-        if self._computing:
-            raise ComputationInProgress(
-                comp_type=ComputationType.BENCHMARK,
-                comp_id=self._computing)
+        future = self._computing.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._compute(key, env_id, env_prereq_dict))
+            self._computing[key] = future
+            future.add_done_callback(lambda _: self._computing.pop(key, None))
+        else:
+            logger.debug('Awaiting benchmark in progress. env_id=%s', env_id)
+
+        # A cancelled caller must not cancel the computation for the others
+        return await asyncio.shield(future)
 
-        try:
-            self._computing = prereq_hash
+    @staticmethod
+    def remove_benchmark_scores() -> None:
+        AppBenchmark.delete().execute()
+
+    async def _compute(
+            self,
+            key: str,
+            env_id: EnvId,
+            env_prereq_dict: Dict[str, Any],
+    ) -> AppBenchmark:
+        env_lock = self._env_locks.setdefault(env_id, asyncio.Lock())
+        async with env_lock, self._cpu_slots():
+            logger.info('Running benchmark. env_id=%s', env_id)
             score = await self._run_benchmark(env_id, env_prereq_dict)
-        finally:
-            self._computing = None
 
-        benchmark = AppBenchmark(hash=prereq_hash, score=score)
+        benchmark = AppBenchmark(hash=key, score=score)
         benchmark.save()
         return benchmark
 
-    @staticmethod
-    def remove_benchmark_scores() -> None:
-        AppBenchmark.delete().execute()
+    def _cpu_slots(self) -> asyncio.Semaphore:
+        """ Limits the number of concurrent benchmarks, each of which uses
+        the configured number of cores, to fit within the CPU budget """
+        size = max(1, self._cpu_budget // self._num_cores)
+        if self._slots is None or self._slots_size != size:
+            self._slots = asyncio.Semaphore(size)
+            self._slots_size = size
+        return self._slots
 
     async def _run_benchmark(
             self,
@@ -197,9 +262,9 @@ class AppBenchmarkManager:
             env_prereq_dict: Dict[str, Any]
     ) -> float:
         env = self._env_manager.environment(env_id)
-        prereq_hash = hash_prereq_dict(env_prereq_dict)
+        key = self.benchmark_key(env_id, env_prereq_dict)
 
-        shared_dir = self._root_path / prereq_hash
+        shared_dir = self._root_path / key
         shared_dir.mkdir(parents=True, exist_ok=True)
 
         task_api_service = EnvironmentTaskApiService(
@@ -11,6 +11,7 @@ from golem.core.fileencrypt import AESFileEncryptor
 from golem.core.fileshelper import common_dir, relative_path
 from golem.core.printable_object import PrintableObject
 from golem.core.simplehash import SimpleHash
+from golem.resource.diskusage import ledger
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,7 @@ class Packager(object):
                 for file_path, file_name in disk_files.items():
                     self.write_disk_file(of, file_path, file_name)
 
+        ledger.path_added(output_path)
         pkg_sha1 = self.compute_sha1(output_path)
         return output_path, pkg_sha1
 
@@ -161,6 +163,7 @@ class EncryptingPackager(Packager):
 
         self.encryptor_class.encrypt(pkg_file_path, output_path,
                                      secret=self._secret)
+        ledger.path_added(output_path)
         return output_path, pkg_sha1
 
     def extract(self, input_path, output_dir=None):
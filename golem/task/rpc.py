@@ -14,7 +14,6 @@ from golem_messages.datastructures import masking
 from twisted.internet import defer
 
 from apps.core.task import coretask
-from apps.rendering.task.renderingtask import RenderingTask
 from golem.core import golem_async
 from golem.core import common
 from golem.core import simpleserializer
@@ -1165,6 +1164,9 @@ class ClientProvider:
         (along with an error message) if the task is not known or it is not a
         rendering task.
         """
+        # Imported here to avoid loading OpenCV on startup
+        from apps.rendering.task.renderingtask import RenderingTask
+
         self._assert_not_task_api_task(task_id)
         task = self.task_manager.tasks.get(task_id)
         if task is None:
@@ -11,12 +11,12 @@ def process_messages_received_from_concent(concent_service):
     # Process first 50 messages only in one sync
     for _ in range(50):
         try:
-            msg = concent_service.received_messages.get_nowait()
+            msg, response_to = concent_service.received_messages.get_nowait()
         except queue.Empty:
             break
 
         try:
-            library.interpret(msg)
+            library.interpret(msg, response_to=response_to)
         except Exception:  # pylint: disable=broad-except
             logger.exception('Problem interpreting: %r', msg)
 
@@ -1,16 +1,21 @@
 import datetime
 import logging
 import os
+import time
 from typing import (
+    Any,
     Dict,
     Iterable,
+    List,
     Optional,
     TYPE_CHECKING,
     Union,
 )
 import requests
 
+from dataclasses import dataclass, field, asdict
 from golem_messages import message
+from twisted.internet import defer
 
 from golem.core import common
 from golem.core import variables
@@ -19,8 +24,11 @@ from golem.core.hostaddress import ip_address_private
 from golem.network.hyperdrive.client import HyperdriveClientOptions, \
     to_hyperg_peer
 from golem.network.transport import msg_queue
+from golem.report import EventPublisher
 from golem.resource.hyperdrive import resource as hpd_resource
 from golem.resource.resourcehandshake import ResourceHandshake
+from golem.rpc import utils as rpc_utils
+from golem.rpc.mapping.rpceventnames import Resources
 
 
 if TYPE_CHECKING:
@@ -31,13 +39,60 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ResourcesRestoration:
+    """ Progress of restoring requested tasks' resources at startup """
+    total: int
+    restored: int = 0
+    failed: int = 0
+    skipped: int = 0
+    started: float = field(default_factory=time.monotonic)
+    # Seconds elapsed since the start
+    first_ready_after: Optional[float] = None
+    finished_after: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        self._update()
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.restored - self.failed - self.skipped
+
+    def task_restored(self) -> None:
+        self.restored += 1
+        if self.first_ready_after is None:
+            self.first_ready_after = time.monotonic() - self.started
+        self._update()
+
+    def task_failed(self) -> None:
+        self.failed += 1
+        self._update()
+
+    def task_skipped(self) -> None:
+        self.skipped += 1
+        self._update()
+
+    def _update(self) -> None:
+        if self.pending == 0 and self.finished_after is None:
+            self.finished_after = time.monotonic() - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        del result['started']
+        result['pending'] = self.pending
+        return result
+
+
 class TaskResourcesMixin:
     """Resource management functionality of TaskServer"""
 
     HANDSHAKE_TIMEOUT = 20  # s
     NONCE_TASK = 'nonce'
+    # Tasks with resources being restored in Hyperdrive at the same time
+    RESTORE_CONCURRENCY = 4
 
     resource_handshakes: Dict[str, ResourceHandshake]
+    resources_restoration: Optional[ResourcesRestoration] = None
     task_manager: 'taskmanager.TaskManager'
 
     @property
@@ -49,34 +104,78 @@ class TaskResourcesMixin:
         resources = self.resource_manager.get_resources(task_id)
         return self.resource_manager.to_wire(resources)
 
-    def restore_resources(self) -> None:
+    def restore_resources(self) -> defer.Deferred:
+        """ Restores resources of unfinished requested tasks in Hyperdrive,
+        closest deadlines first, at most RESTORE_CONCURRENCY tasks at a time.
+        A task is not offered to providers until its resources are restored.
+        Can be called from any thread; returns a Deferred fired on the reactor
+        thread when all tasks are handled. """
         task_manager = getattr(self, 'task_manager')
 
-        states = dict(task_manager.tasks_states)
-        tasks = dict(task_manager.tasks)
-
-        for task_id, task_state in states.items():
+        # Completed tasks aren't offered to providers, so their resources
+        # aren't needed. Unfinished tasks are never restored lazily, their
+        # headers are already loaded.
+        tasks = {
+            task_id: (task_manager.tasks[task_id],
+                      task_manager.tasks_states[task_id])
+            for task_id in task_manager.get_unfinished_task_ids()
+        }
+        task_ids = sorted(tasks, key=lambda t: tasks[t][0].header.deadline)
+
+        entries = []
+        for task_id in task_ids:
+            task, task_state = tasks[task_id]
             # 'package_path' does not exist in version pre 0.15.1
             package_path = getattr(task_state, 'package_path', None)
             # There is a single zip package to restore
             files = [package_path] if package_path else None
             # Calculate timeout
-            task = tasks[task_id]
             timeout = deadline_to_timeout(task.header.deadline)
+            entries.append((files, task_id, task_state.resource_hash, timeout))
+
+        task_manager.tasks_restoring_resources.update(task_ids)
+        self.resources_restoration = ResourcesRestoration(total=len(entries))
+
+        from twisted.internet import reactor
+        deferred = defer.Deferred()
 
+        def _restore():
+            self._restore_resources_concurrently(entries) \
+                .chainDeferred(deferred)
+
+        reactor.callFromThread(_restore)
+        return deferred
+
+    def _restore_resources_concurrently(self, entries: List) \
+            -> defer.Deferred:
+        semaphore = defer.DeferredSemaphore(self.RESTORE_CONCURRENCY)
+        deferreds = []
+
+        for files, task_id, resource_hash, timeout in entries:
             logger.info("Restoring task '%s' resources (timeout: %r s)",
                         task_id, timeout)
             logger.debug("%r", files)
 
-            self._restore_resources(files, task_id,
-                                    resource_hash=task_state.resource_hash,
-                                    timeout=timeout)
+            deferreds.append(semaphore.run(
+                self._restore_resources, files, task_id,
+                resource_hash=resource_hash, timeout=timeout))
+
+        def restored(_):
+            logger.info("Task resources restored. %r",
+                        self.resources_restoration)
+
+        def failed(failure):
+            logger.error("Error restoring task resources: %r", failure.value)
+
+        deferred = defer.gatherResults(deferreds, consumeErrors=True)
+        deferred.addCallbacks(restored, failed)
+        return deferred
 
     def _restore_resources(self,
                            files: Optional[Iterable[str]],
                            task_id: str,
                            resource_hash: Optional[str] = None,
-                           timeout: Optional[int] = None):
+                           timeout: Optional[int] = None) -> defer.Deferred:
 
         options = self.get_share_options(timeout=timeout)
         logger.debug(
@@ -89,28 +188,63 @@ class TaskResourcesMixin:
                 "Timeout negative, skipping resource restore. task_id=%s",
                 task_id
             )
-            return None
+            if self._restore_resources_finished(task_id):
+                self.resources_restoration.task_skipped()
+                self._publish_restoration_progress()
+            return defer.succeed(None)
 
-        try:
-            resource_hash, _ = self.resource_manager.add_resources(
-                files, task_id, resource_hash=resource_hash,
-                client_options=options, async_=False
-            )
-        except ConnectionError as exc:
-            self._restore_resources_error(task_id, exc)
-        except (hpd_resource.ResourceError, requests.HTTPError) as exc:
-            if resource_hash:
-                return self._restore_resources(files, task_id, timeout=timeout)
-            self._restore_resources_error(task_id, exc)
-        else:
+        def on_success(result):
+            if not self._restore_resources_finished(task_id):
+                return
             task_state = self.task_manager.tasks_states[task_id]
-            task_state.resource_hash = resource_hash
+            task_state.resource_hash, _ = result
+            self.resources_restoration.task_restored()
             self.task_manager.notify_update_task(task_id)
-        return None
+            self._publish_restoration_progress()
+
+        def on_error(failure):
+            if resource_hash and failure.check(hpd_resource.ResourceError,
+                                               requests.HTTPError):
+                return self._restore_resources(files, task_id, timeout=timeout)
+            self._restore_resources_error(task_id, failure.value)
+            return None
+
+        deferred = defer.maybeDeferred(
+            self.resource_manager.add_resources,
+            files, task_id, resource_hash=resource_hash,
+            client_options=options, async_=True
+        )
+        deferred.addCallbacks(on_success, on_error)
+        return deferred
+
+    def _restore_resources_finished(self, task_id: str) -> bool:
+        """ Makes the task available to providers. Returns False if the task
+        was deleted while its resources were being restored. """
+        self.task_manager.tasks_restoring_resources.discard(task_id)
+        if task_id in self.task_manager.tasks_states:
+            return True
+        self.resources_restoration.task_skipped()
+        self._publish_restoration_progress()
+        return False
 
     def _restore_resources_error(self, task_id, error):
         logger.error("Cannot restore task '%s' resources: %r", task_id, error)
+        if not self._restore_resources_finished(task_id):
+            return
+        self.resources_restoration.task_failed()
         self.task_manager.delete_task(task_id)
+        self._publish_restoration_progress()
+
+    def _publish_restoration_progress(self) -> None:
+        EventPublisher.publish(
+            Resources.evt_restore_progress,
+            self.resources_restoration.to_dict())
+
+    @rpc_utils.expose('comp.tasks.resources.restore.progress')
+    def get_resources_restoration(self) -> Optional[Dict[str, Any]]:
+        if self.resources_restoration is None:
+            return None
+        return self.resources_restoration.to_dict()
 
     def request_resource(
             self,
@@ -0,0 +1,173 @@
+import logging
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from golem_messages import message
+from golem_messages import utils as msg_utils
+from peewee import PeeweeException
+from twisted.internet import defer, threads
+
+from golem import model
+from golem.network import history
+from golem.network.transport import msg_queue
+
+if typing.TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from golem.core import keysauth
+
+logger = logging.getLogger(__name__)
+
+
+class Response(typing.NamedTuple):
+    node_id: str
+    provider_id: str
+    msg: message.base.Message
+
+
+class ResponsePipeline:
+    """ Accumulates responses to providers (SubtaskResultsAccepted and
+    SubtaskResultsRejected), signs them in a worker pool and saves them to the
+    message queue and the message history in a single transaction per flush.
+
+    Flushes run one at a time and keep the order in which responses were
+    added, so responses to a node are queued in order. """
+
+    # Seconds responses are accumulated for before being flushed
+    FLUSH_INTERVAL = 0.05
+    # Number of accumulated responses which are flushed right away
+    MAX_BATCH_SIZE = 500
+    SIGNING_WORKERS = 4
+
+    def __init__(self, keys_auth: 'keysauth.KeysAuth', reactor=None) -> None:
+        if reactor is None:
+            from twisted.internet import reactor
+        self._keys_auth = keys_auth
+        self._reactor = reactor
+        self._pending: typing.List[Response] = []
+        self._delayed_flush = None
+        self._flushing: typing.Optional[defer.Deferred] = None
+        self._executor: typing.Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(
+            self,
+            node_id: str,
+            provider_id: str,
+            msg: message.base.Message,
+    ) -> None:
+        """ Schedules an unsigned response to be sent to node_id """
+        self._pending.append(Response(node_id, provider_id, msg))
+        if len(self._pending) >= self.MAX_BATCH_SIZE:
+            self._schedule_flush(0)
+        else:
+            self._schedule_flush(self.FLUSH_INTERVAL)
+
+    def flush(self) -> defer.Deferred:
+        """ Returns a Deferred fired when all responses added so far have
+        been saved """
+        if self._delayed_flush is not None and self._delayed_flush.active():
+            self._delayed_flush.cancel()
+        self._delayed_flush = None
+
+        if self._flushing is not None:
+            # Responses added meanwhile are flushed after the running flush
+            deferred = defer.Deferred()
+            self._flushing.addBoth(lambda _: self.flush().chainDeferred(
+                deferred))
+            return deferred
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return defer.succeed(None)
+
+        self._flushing = threads.deferToThreadPool(
+            self._reactor,
+            self._reactor.getThreadPool(),
+            self._write,
+            batch,
+        )
+        self._flushing.addErrback(
+            lambda failure: logger.error(
+                'Cannot save %d response(s): %r', len(batch), failure.value))
+        self._flushing.addBoth(self._flushed)
+        return self._flushing
+
+    @defer.inlineCallbacks
+    def stop(self) -> defer.Deferred:
+        yield self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._flushing is not None:
+            # Rescheduled when the running flush is done
+            return
+        if self._delayed_flush is not None and self._delayed_flush.active():
+            if delay == 0:
+                self._delayed_flush.reset(0)
+            return
+        self._delayed_flush = self._reactor.callLater(delay, self.flush)
+
+    def _flushed(self, _) -> None:
+        self._flushing = None
+        if self._pending:
+            self._schedule_flush(0)
+
+    def _write(self, batch: typing.List[Response]) -> None:
+        """ Runs in a thread pool """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.SIGNING_WORKERS,
+                thread_name_prefix='ResponseSigning')
+        signed = list(self._executor.map(
+            self._sign, (response.msg for response in batch)))
+
+        history_models = []
+        if history.MessageHistoryService.instance is None:
+            logger.error("MessageHistoryService unavailable. "
+                         "Cannot log %d response(s)", len(batch))
+        else:
+            history_models = [
+                history.message_to_model(
+                    msg=signed_msg,
+                    node_id=response.provider_id,
+                    local_role=model.Actor.Requestor,
+                    remote_role=model.Actor.Provider,
+                ) for response, signed_msg in zip(batch, signed)
+            ]
+
+        try:
+            with model.db.atomic():
+                msg_queue.put_many(
+                    (response.node_id, response.msg) for response in batch)
+                history.MessageHistoryService.insert_many(history_models)
+        except PeeweeException as exc:
+            logger.warning("Batch save of %d response(s) failed, saving "
+                           "one by one: %r", len(batch), exc)
+            self._write_one_by_one(batch, signed)
+        else:
+            logger.debug('Saved %d response(s)', len(batch))
+
+    @staticmethod
+    def _write_one_by_one(
+            batch: typing.List[Response],
+            signed: typing.List[message.base.Message],
+    ) -> None:
+        for response, signed_msg in zip(batch, signed):
+            msg_queue.put(response.node_id, response.msg)
+            history.add(
+                signed_msg,
+                node_id=response.provider_id,
+                local_role=model.Actor.Requestor,
+                remote_role=model.Actor.Provider,
+            )
+
+    def _sign(self, msg: message.base.Message) -> message.base.Message:
+        return msg_utils.copy_and_sign(
+            msg=msg,
+            private_key=self._keys_auth._private_key,  # noqa pylint: disable=protected-access
+        )
@@ -5,17 +5,13 @@ import typing
 from ethereum.utils import denoms
 
 from golem_messages import message
-from golem_messages import utils as msg_utils
 from golem_messages.datastructures import p2p as dt_p2p
 from golem_task_api.enums import VerifyResult
 
 from apps.core.task.coretaskstate import RunVerification
 
-from golem import model
 from golem.core import common
 from golem.marketplace import RequestorMarketStrategy
-from golem.network import history
-from golem.network.transport import msg_queue
 from golem.task.taskbase import TaskResult
 
 if typing.TYPE_CHECKING:
@@ -23,6 +19,7 @@ if typing.TYPE_CHECKING:
     from golem.core import keysauth
     from golem.task import taskmanager, SubtaskId, TaskId
     from golem.task import requestedtaskmanager
+    from golem.task.server.responses import ResponsePipeline
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +28,7 @@ class VerificationMixin:
     keys_auth: 'keysauth.KeysAuth'
     task_manager: 'taskmanager.TaskManager'
     requested_task_manager: 'requestedtaskmanager.RequestedTaskManager'
+    response_pipeline: 'ResponsePipeline'
 
     def verify_results(
             self,
@@ -115,18 +113,11 @@ class VerificationMixin:
                 payment_ts=int(payment.created_date.timestamp()),
             )
 
-            signed_response_msg = msg_utils.copy_and_sign(
-                msg=response_msg,
-                private_key=self.keys_auth._private_key,  # noqa pylint: disable=protected-access
-            )
-
-            msg_queue.put(node.key, response_msg)
-
-            history.add(
-                signed_response_msg,
-                node_id=task_to_compute.provider_id,
-                local_role=model.Actor.Requestor,
-                remote_role=model.Actor.Provider,
+            # Signed, queued and recorded in history in batches
+            self.response_pipeline.add(
+                node.key,
+                task_to_compute.provider_id,
+                response_msg,
             )
 
         if self.requested_task_manager.task_exists(task_id):
@@ -220,16 +211,8 @@ class VerificationMixin:
             reason=reason,
         )
 
-        signed_response_msg = msg_utils.copy_and_sign(
-            msg=response_msg,
-            private_key=self.keys_auth._private_key,  # noqa pylint: disable=protected-access
-        )
-
-        msg_queue.put(node.key, response_msg)
-
-        history.add(
-            signed_response_msg,
-            node_id=report_computed_task.task_to_compute.provider_id,
-            local_role=model.Actor.Requestor,
-            remote_role=model.Actor.Provider,
+        self.response_pipeline.add(
+            node.key,
+            report_computed_task.task_to_compute.provider_id,
+            response_msg,
         )
@@ -1,4 +1,6 @@
 import datetime
+import heapq
+import itertools
 import threading
 import logging
 import pickle
@@ -11,7 +13,7 @@ from golem.core.common import get_timestamp_utc
 from golem.environments.environment import UnsupportReason
 from golem.core import golem_async
 from golem.appconfig import TASKARCHIVE_FILENAME, TASKARCHIVE_NUM_INTERVALS, \
-    TASKARCHIVE_MAX_TASKS
+    TASKARCHIVE_MAX_TASKS, TASKARCHIVE_JOURNAL_MAX_SIZE
 
 log = logging.getLogger('golem.task.taskarchiver')
 
@@ -19,33 +21,74 @@ log = logging.getLogger('golem.task.taskarchiver')
 class TaskArchiver(object):
     """Utility that archives information on unsupported task reasons and
     other related task statistics. See get_unsupport_reasons() function.
+
+    Changes are appended to a journal file on every maintenance run. The
+    journal is compacted into a snapshot of the whole archive once it grows
+    beyond `journal_max_size` bytes.
     :param datadir: Directory to save the archive to
     :param max_tasks: Maximum number of non-expired tasks stored in task
                       archive at any moment
+    :param journal_max_size: Size of the journal file (in bytes) which
+                             triggers compaction
     """
 
-    def __init__(self, datadir=None, max_tasks=TASKARCHIVE_MAX_TASKS):
+    def __init__(self, datadir=None, max_tasks=TASKARCHIVE_MAX_TASKS,
+                 journal_max_size=TASKARCHIVE_JOURNAL_MAX_SIZE):
         self._input_lock = threading.Lock()
         self._input_tasks = []
         self._input_statuses = []
         self._archive_lock = threading.Lock()
         self._file_lock = threading.Lock()
         self._archive = Archive()
+        self._journal_entries = []
         self._dump_file = None
+        self._journal_file = None
+        self._journal_max_size = journal_max_size
         self._max_tasks = max_tasks
         log.debug('Starting taskarchiver in dir: %r', datadir)
         if datadir:
-            try:
-                self._dump_file = os.path.join(datadir, TASKARCHIVE_FILENAME)
-                with open(self._dump_file, 'rb') as f:
-                    archive = pickle.load(f)
-                if archive.class_version == Archive.CLASS_VERSION:
-                    self._archive = archive
-                else:
-                    log.info("Task archive not loaded: unsupported version: "
-                             "%s", archive.class_version)
-            except (EOFError, IOError, pickle.UnpicklingError) as e:
-                log.info("Task archive not loaded: %s", str(e))
+            self._dump_file = os.path.join(datadir, TASKARCHIVE_FILENAME)
+            self._journal_file = self._dump_file + '.journal'
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self._dump_file, 'rb') as f:
+                archive = pickle.load(f)
+            if archive.class_version == Archive.CLASS_VERSION:
+                self._archive = archive
+            elif archive.class_version == 1:
+                self._archive = archive
+                self._upgrade_from_v1()
+            else:
+                log.info("Task archive not loaded: unsupported version: "
+                         "%s", archive.class_version)
+        except (EOFError, IOError, pickle.UnpicklingError) as e:
+            log.info("Task archive not loaded: %s", str(e))
+
+        try:
+            with open(self._journal_file, 'rb') as f:
+                while True:
+                    tasks, statuses = pickle.load(f)
+                    self._apply(tasks, statuses)
+        except EOFError:
+            pass
+        except (IOError, pickle.UnpicklingError) as e:
+            log.info("Task archive journal not loaded: %s", str(e))
+
+    def _upgrade_from_v1(self):
+        """Version 1 archives lack the aggregates and the deadline index of
+        tasks which have not expired yet; rebuilds them from the tasks."""
+        archive = self._archive
+        archive.live_intervals = {}
+        archive.deadlines = []
+        for tsk in archive.tasks.values():
+            self._live_interval(tsk).merge_task(tsk)
+            archive.deadlines.append((tsk.deadline, tsk.uuid))
+        heapq.heapify(archive.deadlines)
+        archive.class_version = Archive.CLASS_VERSION
+        log.info("Task archive upgraded from version 1. tasks=%d",
+                 len(archive.tasks))
 
     def add_task(self, task_header):
         """Schedule a task to be archived.
@@ -66,46 +109,96 @@ class TaskArchiver(object):
         """Updates information on unsupported task reasons and
         other related task statistics by consuming tasks and support statuses
         scheduled for processing by add_task() and add_support_status()
-        functions. Optimizes internal structures and, if needed, writes the
-        entire structure to a file.
+        functions. Expires tasks past their deadline and, if needed, appends
+        the changes to the journal file.
         """
         with self._input_lock:
             input_tasks, self._input_tasks = self._input_tasks, []
             input_statuses, self._input_statuses = self._input_statuses, []
+        statuses = [
+            (uuid, list(status.desc.keys()),
+             status.desc.get(UnsupportReason.REQUESTOR_TRUST))
+            for (uuid, status) in input_statuses
+        ]
         with self._archive_lock:
             ntasks_to_take = self._max_tasks - len(self._archive.tasks)
             if ntasks_to_take < len(input_tasks):
                 log.warning("Maximum number of current tasks exceeded.")
-            input_tasks = input_tasks[:ntasks_to_take]
-            for tsk in input_tasks:
-                self._archive.tasks[tsk.uuid] = tsk
-            for (uuid, status) in input_statuses:
-                if uuid in self._archive.tasks:
-                    if UnsupportReason.REQUESTOR_TRUST in status.desc:
-                        self._archive.tasks[uuid].requesting_trust = \
-                            status.desc[UnsupportReason.REQUESTOR_TRUST]
-                    self._archive.tasks[uuid].unsupport_reasons = \
-                        list(status.desc.keys())
-            cur_time = get_timestamp_utc()
-            for tsk in list(self._archive.tasks.values()):
-                if cur_time > tsk.deadline:
-                    self._merge_to_interval(tsk)
-                    del self._archive.tasks[tsk.uuid]
+            input_tasks = input_tasks[:max(ntasks_to_take, 0)]
+            self._apply(input_tasks, statuses)
+            self._expire_tasks(get_timestamp_utc())
             self._purge_old_intervals()
-            if self._dump_file:
-                request = golem_async.AsyncRequest(self._dump_archive)
-                golem_async.async_run(
-                    request,
-                    None,
-                    lambda e: log.info("Dumping archive failed: %s", e),
-                )
-
-    def _dump_archive(self):
-        with self._archive_lock:
-            data = pickle.dumps(self._archive)
+            if not self._dump_file or not (input_tasks or statuses):
+                return
+            self._journal_entries.append((input_tasks, statuses))
+        request = golem_async.AsyncRequest(self._write_journal)
+        golem_async.async_run(
+            request,
+            None,
+            lambda e: log.info("Dumping archive failed: %s", e),
+        )
+
+    def _apply(self, tasks, statuses):
+        archive = self._archive
+        for tsk in tasks:
+            old = archive.tasks.get(tsk.uuid)
+            if old is not None:
+                self._live_interval(old).unmerge_task(old)
+            archive.tasks[tsk.uuid] = tsk
+            self._live_interval(tsk).merge_task(tsk)
+            heapq.heappush(archive.deadlines, (tsk.deadline, tsk.uuid))
+        for (uuid, reasons, requesting_trust) in statuses:
+            tsk = archive.tasks.get(uuid)
+            if tsk is None:
+                continue
+            interval = self._live_interval(tsk)
+            interval.unmerge_task(tsk)
+            if requesting_trust is not None:
+                tsk.requesting_trust = requesting_trust
+            tsk.unsupport_reasons = reasons
+            interval.merge_task(tsk)
+
+    def _expire_tasks(self, cur_time):
+        archive = self._archive
+        while archive.deadlines and archive.deadlines[0][0] < cur_time:
+            deadline, uuid = heapq.heappop(archive.deadlines)
+            tsk = archive.tasks.get(uuid)
+            # Skip index entries of tasks that were re-added or expired
+            if tsk is None or tsk.deadline != deadline:
+                continue
+            self._live_interval(tsk).unmerge_task(tsk)
+            self._merge_to_interval(tsk)
+            del archive.tasks[uuid]
+
+    def _write_journal(self):
         with self._file_lock:
-            with open(self._dump_file, 'wb') as f:
+            with self._archive_lock:
+                entries, self._journal_entries = self._journal_entries, []
+                data = b''.join(pickle.dumps(entry) for entry in entries)
+            with open(self._journal_file, 'ab') as f:
                 f.write(data)
+                size = f.tell()
+            if size > self._journal_max_size:
+                self._compact()
+
+    def _compact(self):
+        """Write a snapshot of the whole archive and truncate the journal.
+        Must be called with the file lock held."""
+        with self._archive_lock:
+            data = pickle.dumps(self._archive)
+            self._journal_entries = []
+        tmp_file = self._dump_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self._dump_file)
+        # The journal is already included in the snapshot
+        open(self._journal_file, 'wb').close()
+
+    def _live_interval(self, tsk):
+        day = tsk.interval_start_date
+        if day not in self._archive.live_intervals:
+            self._archive.live_intervals[day] = TimeInterval(day)
+        return self._archive.live_intervals[day]
 
     def _merge_to_interval(self, tsk):
         day = tsk.interval_start_date
@@ -121,6 +214,9 @@ class TaskArchiver(object):
         for interval in list(self._archive.intervals.values()):
             if interval.start_date <= old:
                 del self._archive.intervals[interval.start_date]
+        for interval in list(self._archive.live_intervals.values()):
+            if interval.num_tasks == 0:
+                del self._archive.live_intervals[interval.start_date]
 
     def get_unsupport_reasons(self, last_n_days, today=None):
         """
@@ -153,12 +249,11 @@ class TaskArchiver(object):
         start_date = today - datetime.timedelta(days=last_n_days-1)
         result = TimeInterval(start_date)
         result.cnt_unsupport_reasons = Counter({r: 0 for r in UnsupportReason})
-        for interval in self._archive.intervals.values():
+        for interval in itertools.chain(
+                self._archive.intervals.values(),
+                self._archive.live_intervals.values()):
             if interval.start_date >= start_date:
                 result.merge_interval(interval)
-        for tsk in self._archive.tasks.values():
-            if tsk.interval_start_date >= start_date:
-                result.merge_task(tsk)
         ret = []
         for (reason, count) in result.cnt_unsupport_reasons.most_common():
             if reason == UnsupportReason.MAX_PRICE and result.num_tasks:
@@ -176,12 +271,17 @@ class TaskArchiver(object):
 
 
 class Archive(object):
-    CLASS_VERSION = 1
+    CLASS_VERSION = 2
 
     def __init__(self):
         self.class_version = Archive.CLASS_VERSION
         self.tasks = {}
+        # Aggregates of expired tasks
         self.intervals = {}
+        # Aggregates of tasks which have not expired yet
+        self.live_intervals = {}
+        # Heap of (deadline, uuid) of tasks which have not expired yet
+        self.deadlines = []
 
 
 class ArchTask(object):
@@ -217,6 +317,15 @@ class TimeInterval(object):
             self.sum_requesting_trust += tsk.requesting_trust
             self.num_requesting_trust += 1
 
+    def unmerge_task(self, tsk):
+        self.sum_max_price -= tsk.max_price
+        self.cnt_min_version -= Counter([tsk.min_version])
+        self.num_tasks -= 1
+        self.cnt_unsupport_reasons -= Counter(tsk.unsupport_reasons)
+        if tsk.requesting_trust:
+            self.sum_requesting_trust -= tsk.requesting_trust
+            self.num_requesting_trust -= 1
+
     def merge_interval(self, interval):
         self.sum_max_price += interval.sum_max_price
         self.cnt_min_version.update(interval.cnt_min_version)
@@ -265,6 +265,11 @@ class TaskComputerAdapter:
             config_desc=config_desc,
             in_background=in_background))
 
+    def set_limits(self, num_cores: int, max_memory_size: int) -> None:
+        """ Limits computations in the old (non Task API) environments.
+        Task API environments keep the limits from the config. """
+        self._old_computer.set_limits(num_cores, max_memory_size)
+
     def quit(self) -> None:
         self._new_computer.quit()
         self._old_computer.quit()
@@ -856,6 +861,12 @@ class TaskComputer:  # pylint: disable=too-many-instance-attributes
 
         return False
 
+    def set_limits(self, num_cores: int, max_memory_size: int) -> None:
+        """ Changes the number of cores and memory (in KiB) of subtasks
+        started from now on, without reconfiguring the VM """
+        self.max_num_cores = num_cores
+        self.docker_manager.set_container_limits(num_cores, max_memory_size)
+
     def start_computation(
             self,
             task_id: str,
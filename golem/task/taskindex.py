@@ -0,0 +1,125 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, MutableMapping, \
+    Optional, TYPE_CHECKING
+
+from golem.core.common import timeout_to_string, update_dict
+
+if TYPE_CHECKING:
+    # pylint:disable=unused-import
+    from golem.task.taskbase import Task
+    from golem.task.taskstate import TaskState
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SUFFIX = '.summary'
+# Summaries written by other versions are ignored and rewritten on startup
+SUMMARY_VERSION = 2
+
+
+def summary_path(dump_path: Path) -> Path:
+    """ Path of the summary stored alongside a task dump """
+    return dump_path.with_suffix(SUMMARY_SUFFIX)
+
+
+def task_summary(task: 'Task', state: 'TaskState') -> Dict[str, Any]:
+    """ Task as listed by `comp.tasks.summary` """
+    return update_dict(
+        {
+            'time_created': state.time_started,
+            'timeout': timeout_to_string(int(task.task_definition.timeout)),
+        },
+        task.to_dictionary(),
+        state.to_dictionary(),
+    )
+
+
+def write_summary(
+        dump_path: Path,
+        task: 'Task',
+        state: 'TaskState',
+) -> Dict[str, Any]:
+    """ Store and return a compact summary of a dumped task. It's enough to
+    register a completed task on startup and to list it without unpickling
+    it. """
+    header = task.header
+    summary = {
+        'version': SUMMARY_VERSION,
+        'task_id': header.task_id,
+        'status': state.status.value,
+        'deadline': header.deadline,
+        'owner': header.task_owner.key if header.task_owner else None,
+        'subtasks_count': state.subtasks_count,
+        'subtask_ids': list(state.subtask_states),
+        'task_summary': task_summary(task, state),
+    }
+    with summary_path(dump_path).open('w') as f:
+        json.dump(summary, f)
+    return summary
+
+
+def read_summary(dump_path: Path) -> Optional[Dict[str, Any]]:
+    """ Read the summary of a task dump. Returns None if it's missing,
+    broken, written by another version or older than the dump itself. """
+    path = summary_path(dump_path)
+    try:
+        if path.stat().st_mtime < dump_path.stat().st_mtime:
+            return None
+        with path.open('r') as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(summary, dict) \
+            or summary.get('version') != SUMMARY_VERSION:
+        return None
+    return summary
+
+
+class LazyMapping(MutableMapping):
+    """ Mapping with values loaded on first access. A lazy key is added with
+    a loader, which is expected to set the value, or to remove the key if the
+    value can't be loaded. """
+
+    def __init__(self) -> None:
+        self._data: Dict[Hashable, Any] = {}
+        self._loaders: Dict[Hashable, Callable[[], None]] = {}
+
+    def set_lazy(self, key: Hashable, loader: Callable[[], None]) -> None:
+        self._data.pop(key, None)
+        self._loaders[key] = loader
+
+    def __getitem__(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            pass
+        loader = self._loaders.pop(key, None)
+        if loader is None:
+            raise KeyError(key)
+        loader()
+        return self._data[key]
+
+    def __setitem__(self, key, value) -> None:
+        self._loaders.pop(key, None)
+        self._data[key] = value
+
+    def __delitem__(self, key) -> None:
+        if self._loaders.pop(key, None) is None:
+            del self._data[key]
+        else:
+            self._data.pop(key, None)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data or key in self._loaders
+
+    def __iter__(self) -> Iterator:
+        yield from list(self._data)
+        yield from list(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._loaders)
+
+    def __repr__(self) -> str:
+        return '<{} loaded={!r} lazy={!r}>'.format(
+            self.__class__.__name__, self._data, list(self._loaders))
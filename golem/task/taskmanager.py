@@ -15,7 +15,9 @@ from typing import (
     FrozenSet,
     Iterable,
     List,
+    MutableMapping,
     Optional,
+    Set,
     Type,
     TYPE_CHECKING,
 )
@@ -47,6 +49,8 @@ from golem.resource.hyperdrive.resourcesmanager import \
     HyperdriveResourceManager
 from golem.rpc import utils as rpc_utils
 from golem.task.result.resultmanager import EncryptedResultPackageManager
+from golem.task.taskindex import LazyMapping, read_summary, summary_path, \
+    task_summary, write_summary
 from golem.task.taskbase import TaskEventListener, Task, \
     TaskPurpose, AcceptClientVerdict, TaskResult
 from golem.task.helpers import calculate_subtask_payment
@@ -126,9 +130,15 @@ class TaskManager(TaskEventListener):
         self.node = node
         self.keys_auth = keys_auth
 
-        self.tasks: Dict[str, Task] = {}
-        self.tasks_states: Dict[str, TaskState] = {}
+        self.tasks: MutableMapping[str, Task] = LazyMapping()
+        self.tasks_states: MutableMapping[str, TaskState] = LazyMapping()
         self.subtask2task_mapping: Dict[str, str] = {}
+        # Completed tasks restored from summaries, not unpickled yet
+        self._lazy_task_ids: Set[str] = set()
+        # Tasks as listed by `comp.tasks.summary`, stored with their dumps
+        self._indexed_summaries: Dict[str, Dict] = {}
+        # Tasks not offered to providers until their resources are restored
+        self.tasks_restoring_resources: Set[str] = set()
 
         tasks_dir = Path(tasks_dir)
         self.tasks_dir = tasks_dir / "tmanager"
@@ -305,11 +315,22 @@ class TaskManager(TaskEventListener):
                 task_id, self.tasks.get(task_id, '<not found>'),
                 self.tasks_states.get(task_id, '<not found>'),
             )
-            if filepath.exists():
-                filepath.unlink()
+            self._remove_dump_files(filepath)
             raise
 
+        # The dump is restored without a summary, just not lazily
+        try:
+            self._index_summary(write_summary(filepath, *data))
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Couldn't write summary of task %s: %r",
+                           task_id, e)
+            try:
+                summary_path(filepath).unlink()
+            except OSError:
+                pass
+
     def remove_dump(self, task_id: str):
+        self._indexed_summaries.pop(task_id, None)
         filepath = self._dump_filepath(task_id)
         try:
             filepath.unlink()
@@ -317,6 +338,18 @@ class TaskManager(TaskEventListener):
                          task_id, filepath)
         except (FileNotFoundError, OSError) as e:
             logger.warning("Couldn't remove dump file: %s - %s", filepath, e)
+        try:
+            summary_path(filepath).unlink()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove_dump_files(filepath: Path) -> None:
+        for path in (filepath, summary_path(filepath)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
 
     def _create_task_output_dir(self, task_def: 'TaskDefinition'):
         """
@@ -354,43 +387,128 @@ class TaskManager(TaskEventListener):
         return Path(task_def.output_file).resolve().parent
 
     def restore_tasks(self) -> None:
+        """ Restore dumped tasks. Completed tasks with an up-to-date summary
+        are registered without unpickling and loaded on first access. """
         logger.debug('SEARCHING FOR TASKS TO RESTORE')
         broken_paths = set()
         for path in self.tasks_dir.iterdir():
             if not path.suffix == '.pickle':
                 continue
+
+            summary = read_summary(path)
+            if summary is not None and self._restore_lazily(path, summary):
+                continue
+
             logger.debug('RESTORE TASKS %r', path)
+            task_id = self._load_task(path)
+            if task_id is None:
+                broken_paths.add(path)
+                continue
 
-            task_id = None
-            with path.open('rb') as f:
-                try:
-                    task: Task
-                    state: TaskState
-                    task, state = pickle.load(f)
-                except Exception:  # pylint: disable=broad-except
-                    logger.exception('Problem restoring task from: %s', path)
-                    # On Windows, attempting to remove a file that is in use
-                    # causes an exception to be raised, therefore
-                    # we'll remove broken files later
-                    broken_paths.add(path)
-                else:
-                    task.register_listener(self)
+            if summary is None:
+                self._write_missing_summary(path, task_id)
+            else:
+                self._index_summary(summary)
+            self.notice_task_updated(task_id, op=TaskOp.RESTORED,
+                                     persist=False)
+
+        for path in broken_paths:
+            self._remove_dump_files(path)
+
+    def _load_task(self, path: Path) -> Optional[str]:
+        """ Unpickle and register a dumped task. Returns its id or None
+        if the dump is broken. """
+        # On Windows, attempting to remove a file that is in use
+        # causes an exception to be raised, therefore broken files
+        # should be removed by the caller
+        with path.open('rb') as f:
+            try:
+                task: Task
+                state: TaskState
+                task, state = pickle.load(f)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Problem restoring task from: %s', path)
+                return None
 
-                    task_id = task.header.task_id
-                    self.tasks[task_id] = task
-                    self.tasks_states[task_id] = state
+        task.register_listener(self)
 
-                    for sub in state.subtask_states.values():
-                        self.subtask2task_mapping[sub.subtask_id] = task_id
+        task_id = task.header.task_id
+        self.tasks[task_id] = task
+        self.tasks_states[task_id] = state
 
-                    logger.debug('TASK %s RESTORED from %r', task_id, path)
+        for sub in state.subtask_states.values():
+            self.subtask2task_mapping[sub.subtask_id] = task_id
 
-            if task_id is not None:
-                self.notice_task_updated(task_id, op=TaskOp.RESTORED,
-                                         persist=False)
+        logger.debug('TASK %s RESTORED from %r', task_id, path)
+        return task_id
 
-        for path in broken_paths:
-            path.unlink()
+    def _write_missing_summary(self, path: Path, task_id: str) -> None:
+        try:
+            self._index_summary(write_summary(
+                path, self.tasks[task_id], self.tasks_states[task_id]))
+        except (OSError, TypeError, ValueError, AttributeError) as e:
+            logger.warning("Couldn't write summary of task %s: %r",
+                           task_id, e)
+
+    def _index_summary(self, summary: Dict) -> None:
+        try:
+            self._indexed_summaries[summary['task_id']] = \
+                summary['task_summary']
+        except KeyError:
+            pass
+
+    def _restore_lazily(self, path: Path, summary: Dict) -> bool:
+        try:
+            if not TaskStatus(summary['status']).is_completed():
+                return False
+            task_id = summary['task_id']
+            subtask_ids = summary['subtask_ids']
+            self._indexed_summaries[task_id] = summary['task_summary']
+        except (KeyError, ValueError):
+            return False
+
+        loader = partial(self._load_lazy_task, task_id, path)
+        self.tasks.set_lazy(task_id, loader)  # type: ignore
+        self.tasks_states.set_lazy(task_id, loader)  # type: ignore
+        self._lazy_task_ids.add(task_id)
+
+        for subtask_id in subtask_ids:
+            self.subtask2task_mapping[subtask_id] = task_id
+
+        logger.debug('TASK %s REGISTERED from %r', task_id, path)
+        return True
+
+    def _load_lazy_task(self, task_id: str, path: Path) -> None:
+        self._lazy_task_ids.discard(task_id)
+        if self._load_task(path) is not None:
+            return
+
+        logger.warning('Removing task %s, which cannot be restored', task_id)
+        for mapping in (self.tasks, self.tasks_states):
+            if task_id in mapping:
+                del mapping[task_id]
+        for subtask_id, tid in list(self.subtask2task_mapping.items()):
+            if tid == task_id:
+                del self.subtask2task_mapping[subtask_id]
+        self._remove_dump_files(path)
+
+    def _loaded_tasks(self) -> List[Task]:
+        """ Tasks which are already unpickled. Lazily restored tasks are
+        completed, so there's no need to load them when looking for active
+        ones. """
+        return [
+            self.tasks[task_id] for task_id in list(self.tasks)
+            if task_id not in self._lazy_task_ids
+        ]
+
+    def get_unfinished_task_ids(self) -> List[str]:
+        """ Ids of tasks which are not completed; doesn't load lazily
+        restored tasks """
+        return [
+            task_id for task_id in list(self.tasks)
+            if task_id not in self._lazy_task_ids
+            and not self.tasks_states[task_id].status.is_completed()
+        ]
 
     def got_wants_to_compute(self,
                              task_id: str):
@@ -418,6 +536,9 @@ class TaskManager(TaskEventListener):
         return task_status.is_completed()
 
     def task_needs_computation(self, task_id: str) -> bool:
+        if task_id in self.tasks_restoring_resources:
+            logger.debug('task resources are being restored: %s', task_id)
+            return False
         if self.task_being_created(task_id) or self.task_finished(task_id):
             task_status = self.tasks_states[task_id].status
             logger.debug(
@@ -715,8 +836,11 @@ class TaskManager(TaskEventListener):
 
     def get_tasks_headers(self):
         ret = []
-        for tid, task in self.tasks.items():
-            status = self.tasks_states[tid].status
+        for task in self._loaded_tasks():
+            task_id = task.header.task_id
+            if task_id in self.tasks_restoring_resources:
+                continue
+            status = self.tasks_states[task_id].status
             if task.needs_computation() and status.is_active():
                 ret.append(task.header)
 
@@ -731,7 +855,8 @@ class TaskManager(TaskEventListener):
         return 0
 
     def update_task_signatures(self):
-        for task in list(self.tasks.values()):
+        # Headers of lazily restored tasks aren't offered to providers
+        for task in self._loaded_tasks():
             self.sign_task_header(task.header)
 
     def sign_task_header(self, task_header):
@@ -911,7 +1036,7 @@ class TaskManager(TaskEventListener):
     # CHANGE TO RETURN KEY_ID (check IF SUBTASK COMPUTER HAS KEY_ID
     def check_timeouts(self):
         nodes_with_timeouts = []
-        for t in list(self.tasks.values()):
+        for t in self._loaded_tasks():
             th = t.header
             if not self.tasks_states[th.task_id].status.is_active():
                 continue
@@ -943,7 +1068,7 @@ class TaskManager(TaskEventListener):
     def get_progresses(self):
         tasks_progresses = {}
 
-        for t in list(self.tasks.values()):
+        for t in self._loaded_tasks():
             task_id = t.header.task_id
             task_state = self.tasks_states[task_id]
             task_status = task_state.status
@@ -1059,6 +1184,7 @@ class TaskManager(TaskEventListener):
         self.tasks[task_id].unregister_listener(self)
         del self.tasks[task_id]
         del self.tasks_states[task_id]
+        self.tasks_restoring_resources.discard(task_id)
 
         self.dir_manager.clear_temporary(task_id)
         self.remove_dump(task_id)
@@ -1151,6 +1277,27 @@ class TaskManager(TaskEventListener):
                            state.to_dictionary(),
                            self.get_task_definition_dict(task))
 
+    def get_task_summary(self, task_id) -> Optional[Dict]:
+        """ Like get_task_dict, without the preview and task definition.
+        Summaries of lazily restored tasks are read from their dump summaries
+        without unpickling the tasks. """
+        if task_id in self._lazy_task_ids:
+            return self.get_indexed_task_summary(task_id)
+
+        task = self.tasks.get(task_id)
+        if not task:
+            return None
+
+        state = self.query_task_state(task.header.task_id)
+        return task_summary(task, state)
+
+    def get_indexed_task_summary(self, task_id) -> Optional[Dict]:
+        """ Summary stored with the last dump of the task. It's read without
+        unpickling the task, but it's outdated if the task has changed since
+        it was dumped. """
+        summary = self._indexed_summaries.get(task_id)
+        return dict(summary) if summary is not None else None
+
     def get_tasks_dict(self) -> List[Dict]:
         task_ids = list(self.tasks.keys())
         mapped = map(self.get_task_dict, task_ids)
@@ -60,6 +60,7 @@ from golem.envs.default import (
     register_environments,
     register_built_in_repositories,
 )
+from golem.hardware import autosize
 from golem.marketplace import ProviderPricing
 from golem.model import TaskPayment
 from golem.network.hyperdrive.client import HyperdriveAsyncClient
@@ -82,11 +83,11 @@ from golem.rpc import utils as rpc_utils
 from golem.task import helpers as task_helpers
 from golem.task import timer
 from golem.task.acl import get_acl, setup_acl, AclRule, _DenyAcl as DenyAcl
-from golem.task.exceptions import ComputationInProgress
 from golem.task.benchmarkmanager import AppBenchmarkManager, BenchmarkManager
 from golem.task.envmanager import EnvironmentManager
 from golem.task.helpers import calculate_subtask_payment
 from golem.task.requestedtaskmanager import RequestedTaskManager
+from golem.task.server.responses import ResponsePipeline
 from golem.task.server.whitelist import DockerWhitelistRPC
 from golem.task.taskbase import AcceptClientVerdict
 from golem.task.taskconnectionshelper import TaskConnectionsHelper
@@ -139,6 +140,7 @@ class TaskServer(
         self.client = client
         self.keys_auth = client.keys_auth
         self.config_desc = config_desc
+        self.response_pipeline = ResponsePipeline(self.keys_auth)
 
         Path(self.get_task_computer_root()).mkdir(parents=True, exist_ok=True)
 
@@ -194,6 +196,9 @@ class TaskServer(
             env_manager=new_env_manager,
             root_path=Path(self.get_task_computer_root()),
         )
+        self.app_benchmark_manager.update_config(config_desc)
+        # Cores and memory set by hardware autosizing, overriding config_desc
+        self.hardware_limits: Optional[autosize.Limits] = None
         self.task_computer = TaskComputerAdapter(
             task_server=self,
             env_manager=new_env_manager,
@@ -312,6 +317,7 @@ class TaskServer(
         except asyncio.TimeoutError:
             logger.error("RequestedTaskManager.stop has timed out")
 
+        yield self.response_pipeline.stop()
         self.task_computer.quit()
 
     def is_task_single_core(self, th: dt_tasks.TaskHeader) -> bool:
@@ -438,12 +444,6 @@ class TaskServer(
                             theader.environment_prerequisites),
                         loop=asyncio_main_loop())
                     app_benchmark = yield Deferred.fromFuture(future)
-                except ComputationInProgress as error:
-                    logger.debug(
-                        "Not requesting task_id=%s: %r",
-                        theader.task_id,
-                        error)
-                    return None
                 except Exception:  # pylint: disable=broad-except
                     logger.exception("Cannot retrieve benchmark score")
                     return None
@@ -486,7 +486,7 @@ class TaskServer(
                 cpu_usage=benchmark_cpu_usage,
                 price=price,
                 max_resource_size=self.config_desc.max_resource_size,
-                max_memory_size=self.config_desc.max_memory_size,
+                max_memory_size=self._max_memory_size(),
                 num_subtasks=num_subtasks,
                 concent_enabled=self.client.concent_service.enabled
                 if theader.concent_enabled else False,
@@ -790,6 +790,11 @@ class TaskServer(
 
     @inlineCallbacks
     def add_task_header(self, task_header: dt_tasks.TaskHeader):
+        known_header = self.task_keeper.task_headers.get(task_header.task_id)
+        if known_header is not None \
+                and known_header.signature == task_header.signature:
+            return True  # Already verified, nothing changed
+
         if not self._verify_header_sig(task_header):
             logger.info(
                 'Invalid signature. task_id=%r, signature=%r',
@@ -864,9 +869,13 @@ class TaskServer(
             run_benchmarks: bool,
     ) -> Deferred:
         config_changed = yield self.task_computer.change_config(config_desc)
+        # The task computer was given the limits from config_desc
+        self.hardware_limits = None
+        # App benchmark scores are keyed by a hardware fingerprint. Scores
+        # computed for other configs are kept for when they are restored.
+        self.app_benchmark_manager.update_config(config_desc)
         if config_changed:
             self._remove_env_performance_scores()
-            self.app_benchmark_manager.remove_benchmark_scores()
         elif not run_benchmarks:
             return
 
@@ -882,6 +891,28 @@ class TaskServer(
         for env_id in env_manager.environments():
             env_manager.remove_cached_performance(env_id)
 
+    def set_hardware_limits(
+            self,
+            limits: Optional[autosize.Limits],
+    ) -> None:
+        """ Overrides cores and memory from config_desc, used for computations
+        and advertised in offers. Limits set to None restore the config. """
+        self.hardware_limits = limits
+        if limits is None:
+            limits = autosize.Limits(
+                num_cores=self.config_desc.num_cores,
+                max_memory_size=self.config_desc.max_memory_size,
+            )
+        self.task_computer.set_limits(
+            num_cores=limits.num_cores,
+            max_memory_size=limits.max_memory_size,
+        )
+
+    def _max_memory_size(self) -> int:
+        if self.hardware_limits is not None:
+            return self.hardware_limits.max_memory_size
+        return self.config_desc.max_memory_size
+
     def get_task_computer_root(self):
         return os.path.join(self.client.datadir, "ComputerRes")
 
@@ -970,10 +1001,12 @@ class TaskServer(
         return payment
 
     def income_listener(self, event='default', node_id=None, **kwargs):
+        # Events are aggregated per node, `count` is the number of incomes
+        count = kwargs.get('count', 1)
         if event == 'confirmed':
-            self._increase_trust_payment(node_id, kwargs['amount'])
+            self._increase_trust_payment(node_id, kwargs['amount'], count)
         elif event == 'overdue_single':
-            self._decrease_trust_payment(node_id)
+            self._decrease_trust_payment(node_id, count)
 
     def finished_subtask_listener(self,  # pylint: disable=too-many-arguments
                                   event='default', subtask_id=None,
@@ -1028,12 +1061,13 @@ class TaskServer(
         if not self.requested_task_manager.has_unfinished_tasks():
             self.client.update_setting('accept_tasks', True, False)
 
-    def _increase_trust_payment(self, node_id: str, amount: int):
-        Trust.PAYMENT.increase(node_id, self.max_trust)
+    def _increase_trust_payment(self, node_id: str, amount: int,
+                                count: int = 1):
+        Trust.PAYMENT.increase(node_id, self.max_trust * count)
         update_requestor_paid_sum(node_id, amount)
 
-    def _decrease_trust_payment(self, node_id: str):
-        Trust.PAYMENT.decrease(node_id, self.max_trust)
+    def _decrease_trust_payment(self, node_id: str, count: int = 1):
+        Trust.PAYMENT.decrease(node_id, self.max_trust * count)
 
     def reject_result(self, subtask_id, key_id):
         mod = min(
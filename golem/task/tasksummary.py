@@ -0,0 +1,132 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pydispatch import dispatcher
+
+from golem.task.taskstate import TaskStatus
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class TaskSummaries:
+    """
+    In-memory projection of task summaries listed by `comp.tasks.summary`.
+
+    Summaries of completed tasks are read with `read_summary`, which returns
+    a cheap per-task record (e.g. the summary stored with a task dump) or
+    None. Other tasks are built with `build_summary`. Summaries are kept
+    until TaskManager reports a change of the task. Summaries of active tasks
+    are rebuilt when they are listed, since their progress and remaining time
+    keep changing.
+    Tasks are ordered by their creation time, which never changes, so sort
+    keys are kept for all known tasks and only the summaries of a requested
+    page are rebuilt.
+    """
+
+    def __init__(
+            self,
+            build_summary: Callable[[str], Optional[Dict]],
+            read_summary: Optional[Callable[[str], Optional[Dict]]] = None,
+    ) -> None:
+        self._build_summary = build_summary
+        self._read_summary = read_summary
+        self._summaries: Dict[str, Dict] = {}
+        self._sort_keys: Dict[str, Tuple[float, str]] = {}
+        dispatcher.connect(
+            self._on_task_updated,
+            signal='golem.taskmanager'
+        )
+
+    def _on_task_updated(self, event='default', task_id=None, **_kwargs):
+        if event == 'task_status_updated' and task_id:
+            self._summaries.pop(task_id, None)
+
+    def get_page(  # pylint: disable=too-many-arguments
+            self,
+            task_ids: Iterable[str],
+            cursor: Optional[str] = None,
+            limit: int = DEFAULT_PAGE_SIZE,
+            statuses: Optional[Iterable[str]] = None,
+            task_type: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Return summaries of tasks from `task_ids` ordered by creation time and
+        a cursor pointing at the next page, or None on the last page.
+        :param cursor: cursor returned with the previous page
+        :param statuses: only return tasks with one of these status values
+        :param task_type: only return tasks of this type
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if statuses is not None:
+            statuses = set(statuses)
+        after = _parse_cursor(cursor) if cursor else None
+
+        built = self._refresh(task_ids)
+        sort_keys = sorted(
+            sort_key for sort_key in self._sort_keys.values()
+            if after is None or sort_key > after
+        )
+
+        page: List[Dict] = []
+        for sort_key in sort_keys:
+            task_id = sort_key[1]
+            summary = built.get(task_id) or self._get_summary(task_id)
+            if not summary \
+                    or (statuses is not None
+                        and summary['status'] not in statuses) \
+                    or (task_type is not None
+                        and summary['type'] != task_type):
+                continue
+            if len(page) == limit:
+                return page, '{!r}/{}'.format(*_sort_key(page[-1]))
+            page.append(summary)
+        return page, None
+
+    def _refresh(self, task_ids: Iterable[str]) -> Dict[str, Dict]:
+        """ Forget removed tasks and build summaries of new ones, which are
+        returned """
+        task_ids = set(task_ids)
+        self._summaries = {
+            task_id: summary for task_id, summary in self._summaries.items()
+            if task_id in task_ids
+        }
+        self._sort_keys = {
+            task_id: sort_key for task_id, sort_key in self._sort_keys.items()
+            if task_id in task_ids
+        }
+
+        built: Dict[str, Dict] = {}
+        for task_id in task_ids - self._sort_keys.keys():
+            summary = self._get_summary(task_id)
+            if summary:
+                built[task_id] = summary
+        return built
+
+    def _get_summary(self, task_id: str) -> Optional[Dict]:
+        summary = self._summaries.get(task_id)
+        if summary is not None:
+            return summary
+
+        summary = self._read_summary(task_id) if self._read_summary else None
+        # Records may be outdated unless the task is completed
+        if not summary or not TaskStatus(summary['status']).is_completed():
+            summary = self._build_summary(task_id)
+        if not summary:
+            return None
+        self._sort_keys[task_id] = _sort_key(summary)
+        # Keep the ones which won't change anyway
+        if TaskStatus(summary['status']).is_completed():
+            self._summaries[task_id] = summary
+        return summary
+
+
+def _sort_key(summary: Dict) -> Tuple[float, str]:
+    return float(summary['time_created']), summary['id']
+
+
+def _parse_cursor(cursor: str) -> Tuple[float, str]:
+    time_created, _, task_id = cursor.partition('/')
+    try:
+        return float(time_created), task_id
+    except ValueError:
+        raise ValueError('Invalid cursor: {!r}'.format(cursor))
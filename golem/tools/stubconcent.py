@@ -0,0 +1,79 @@
+import http.server
+import socketserver
+import threading
+import time
+
+from golem import constants as gconst
+
+
+class StubConcentServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """ Local HTTP server accepting Concent API requests. Every request is
+    answered with an empty response after `delay` seconds. Used to test and
+    benchmark the Concent client transport.
+
+    with StubConcentServer(delay=0.1) as server:
+        variant = dict(variables.CONCENT_CHOICES['dev'], url=server.url)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0., status_code: int = 200) -> None:
+        super().__init__(('127.0.0.1', 0), _StubConcentHandler)
+        self.delay = delay
+        self.status_code = status_code
+        self.requests = 0
+        self.connections = 0
+        self.max_concurrent = 0
+        self._concurrent = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        return 'http://{}:{}'.format(*self.server_address)
+
+    def __enter__(self) -> 'StubConcentServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def handle_api_request(self, handler: http.server.BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests += 1
+            self._concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self._concurrent)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self._concurrent -= 1
+
+        handler.send_response(self.status_code)
+        handler.send_header('Concent-Golem-Messages-Version',
+                            str(gconst.GOLEM_MESSAGES_VERSION))
+        handler.send_header('Content-Length', '0')
+        handler.end_headers()
+
+
+class _StubConcentHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.server.handle_api_request(self)
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        pass
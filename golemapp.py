@@ -7,10 +7,6 @@ import logging
 from multiprocessing import freeze_support
 
 import click
-import humanize
-import psutil
-from cpuinfo import get_cpu_info
-from ethereum import slogging
 from portalocker import Lock, LockException
 
 # Export pbr version for peewee_migrate user
@@ -27,6 +23,7 @@ from golem.config.environments import set_environment  # noqa
 from golem.core import variables  # noqa
 from golem.core.common import install_reactor  # noqa
 from golem.core.simpleenv import get_local_datadir  # noqa
+from golem.core.startupprofile import startup_profiler  # noqa
 from golem.rpc import (  # noqa
     generate_rpc_certificate,
     WORKER_PROCESS_MODULE,
@@ -35,18 +32,20 @@ from golem.rpc import (  # noqa
 
 logger = logging.getLogger('golemapp')  # using __name__ gives '__main__' here
 
-# ethereum.slogging and logging compatibility patch
-orig_getLogger = slogging.SManager.getLogger
 
+def patch_slogging():
+    """ ethereum.slogging and logging compatibility patch. Importing
+    the ethereum stack is slow, so it's done only when starting the node. """
+    from ethereum import slogging
+    orig_getLogger = slogging.SManager.getLogger
 
-def monkey_patched_getLogger(*args, **kwargs):
-    orig_class = logging.getLoggerClass()
-    result = orig_getLogger(*args, **kwargs)
-    logging.setLoggerClass(orig_class)
-    return result
+    def monkey_patched_getLogger(*args, **kwargs):
+        orig_class = logging.getLoggerClass()
+        result = orig_getLogger(*args, **kwargs)
+        logging.setLoggerClass(orig_class)
+        return result
 
-
-slogging.SManager.getLogger = monkey_patched_getLogger
+    slogging.SManager.getLogger = monkey_patched_getLogger
 
 
 @click.command()
@@ -108,22 +107,30 @@ slogging.SManager.getLogger = monkey_patched_getLogger
 @click.option('--hyperdrive-rpc-port', type=int, help="Hyperdrive RPC port")
 @click.option('--task-api-dev', is_flag=True, default=False,
               help="Enable task-api developer mode")
+@click.option('--profile-startup', is_flag=True, default=False,
+              help="Save duration of startup phases and slow imports "
+                   "to startup_profile.json in the data directory")
 def start(  # pylint: disable=too-many-arguments, too-many-locals
         monitor, concent, datadir, node_address, rpc_address, peer, mainnet,
         net, geth_address, password, accept_terms, accept_concent_terms,
         accept_all_terms, version, log_level, enable_talkback: bool,
-        hyperdrive_port, hyperdrive_rpc_port, task_api_dev,
+        hyperdrive_port, hyperdrive_rpc_port, task_api_dev, profile_startup,
 ):
     if version:
         print("GOLEM version: {}".format(golem.__version__))
         return 0
 
+    if profile_startup:
+        startup_profiler.enable()
+
     set_environment('mainnet' if mainnet else net, concent)
 
     # These are done locally since they rely on golem.config.active to be set
-    from golem.config.active import EthereumConfig
-    from golem.appconfig import AppConfig
-    from golem.node import Node
+    with startup_profiler.phase('imports'):
+        patch_slogging()
+        from golem.config.active import EthereumConfig
+        from golem.appconfig import AppConfig
+        from golem.node import Node
 
     ethereum_config = EthereumConfig()
 
@@ -184,6 +191,7 @@ def start(  # pylint: disable=too-many-arguments, too-many-locals
                 )
                 os.environ[variables.ENV_TASK_API_DEV] = '0'
 
+        startup_profiler.start_phase('node init')
         node = Node(
             datadir=datadir,
             app_config=app_config,
@@ -195,6 +203,7 @@ def start(  # pylint: disable=too-many-arguments, too-many-locals
             geth_address=geth_address,
             password=password,
         )
+        startup_profiler.end_phase('node init')
 
         if accept_terms:
             node.accept_terms()
@@ -263,6 +272,10 @@ def log_golem_version():
 
 
 def log_platform_info():
+    import humanize
+    import psutil
+    from cpuinfo import get_cpu_info
+
     # platform
     logger.info("system: %s, release: %s, version: %s, machine: %s",
                 platform.system(), platform.release(), platform.version(),
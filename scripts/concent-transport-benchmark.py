@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Measures throughput and latency of sending messages to a local stub Concent
+server, one by one with a new connection per request (as Golem used to) and
+through the pooled, pipelined ConcentClientService transport.
+"""
+import statistics
+import time
+import types
+
+import click
+from golem_messages import cryptography
+from golem_messages.factories import concents as concent_factories
+
+from golem.core import variables
+from golem.network.concent import client
+from golem.tools.stubconcent import StubConcentServer
+
+
+class BenchmarkConcentClientService(client.ConcentClientService):
+    available = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = {}
+        self.latencies = []
+
+    def enqueue(self, msg):
+        self.submitted[id(msg)] = time.monotonic()
+        self._queue.put(msg)
+
+    def react_to_concent_message(self, data, response_to=None):
+        started = self.submitted.pop(id(response_to))
+        self.latencies.append(time.monotonic() - started)
+
+
+def bench_sequential(msgs, private_key, variant):
+    latencies = []
+    for msg in msgs:
+        started = time.monotonic()
+        client.send_to_concent(msg, private_key, concent_variant=variant)
+        latencies.append(time.monotonic() - started)
+    return latencies
+
+
+def bench_pooled(msgs, private_key, variant):
+    keys_auth = types.SimpleNamespace(_private_key=private_key)
+    service = BenchmarkConcentClientService(keys_auth, variant)
+    for msg in msgs:
+        service.enqueue(msg)
+    while service.submitted:
+        service._loop()  # pylint: disable=protected-access
+        time.sleep(0.001)
+    return service.latencies
+
+
+def report(name, latencies, elapsed):
+    click.echo(
+        '{:<10} {:>8.1f} msg/s   latency avg {:>7.1f} ms   '
+        'max {:>7.1f} ms'.format(
+            name,
+            len(latencies) / elapsed,
+            statistics.mean(latencies) * 1000,
+            max(latencies) * 1000,
+        )
+    )
+
+
+@click.command()
+@click.option('--messages', default=50, help='Number of messages to send')
+@click.option('--delay', default=0.05,
+              help='Stub Concent response time in seconds')
+def main(messages, delay):
+    private_key = cryptography.ECCx(None).raw_privkey
+    for name, bench in (('sequential', bench_sequential),
+                        ('pooled', bench_pooled)):
+        msgs = [concent_factories.ForceReportComputedTaskFactory()
+                for _ in range(messages)]
+        with StubConcentServer(delay=delay) as server:
+            variant = dict(variables.CONCENT_CHOICES['dev'], url=server.url)
+            started = time.monotonic()
+            latencies = bench(msgs, private_key, variant)
+            report(name, latencies, time.monotonic() - started)
+            click.echo('{:<10} {} connections, {} requests in parallel'.format(
+                '', server.connections, server.max_concurrent))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Replays statements typical for a busy node (message history, queued messages,
+payments) from concurrent threads against a temporary database, once for
+every SQLite tuning profile. Reports latency percentiles per workload,
+throughput and the number of statements retried because of lock contention.
+"""
+import datetime
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import click
+import semantic_version
+
+from golem import model
+from golem.database import Database
+from golem.database.database import DEFAULT_TUNING, LEGACY_TUNING
+
+PROFILES = {
+    'legacy': LEGACY_TUNING,
+    'tuned': DEFAULT_TUNING,
+}
+NODES = ['{:0128x}'.format(i) for i in range(16)]
+
+
+def network_message(i: int) -> None:
+    model.NetworkMessage.create(
+        local_role=model.Actor.Provider,
+        remote_role=model.Actor.Requestor,
+        node=NODES[i % len(NODES)],
+        task=str(uuid.uuid4()),
+        subtask=str(uuid.uuid4()),
+        msg_date=datetime.datetime.now(),
+        msg_cls='golem_messages.message.tasks.ReportComputedTask',
+        msg_data=os.urandom(512),
+    )
+
+
+def queued_message(i: int) -> None:
+    node = NODES[i % len(NODES)]
+    model.QueuedMessage.create(
+        node=node,
+        msg_version=semantic_version.Version('2.0.0'),
+        msg_cls='golem_messages.message.tasks.WantToComputeTask',
+        msg_data=os.urandom(256),
+    )
+    messages = model.QueuedMessage.select() \
+        .where(model.QueuedMessage.node == node) \
+        .limit(10)
+    model.QueuedMessage.delete() \
+        .where(model.QueuedMessage.id << [m.id for m in messages]) \
+        .execute()
+
+
+def payment(i: int) -> None:
+    with model.db.atomic():
+        operation = model.WalletOperation.create(
+            direction=model.WalletOperation.DIRECTION.incoming,
+            operation_type=model.WalletOperation.TYPE.task_payment,
+            status=model.WalletOperation.STATUS.awaiting,
+            sender_address='0x' + '0' * 40,
+            recipient_address='0x' + '1' * 40,
+            amount=10 ** 18,
+            currency=model.WalletOperation.CURRENCY.GNT,
+            gas_cost=0,
+        )
+        model.TaskPayment.create(
+            wallet_operation=operation,
+            node=NODES[i % len(NODES)],
+            task=str(uuid.uuid4()),
+            subtask=str(uuid.uuid4()),
+            expected_amount=10 ** 18,
+        )
+
+
+def payment_lookup(i: int) -> None:
+    list(model.TaskPayment.select()
+         .join(model.WalletOperation)
+         .where(model.TaskPayment.node == NODES[i % len(NODES)],
+                model.WalletOperation.status ==
+                model.WalletOperation.STATUS.awaiting)
+         .limit(50))
+
+
+WORKLOADS: Dict[str, Callable[[int], None]] = {
+    'network_message': network_message,
+    'queued_message': queued_message,
+    'payment': payment,
+    'payment_lookup': payment_lookup,
+}
+
+
+def worker(operations: int, latencies: Dict[str, List[float]]) -> None:
+    for i in range(operations):
+        for name, workload in WORKLOADS.items():
+            started = time.monotonic()
+            workload(i)
+            latencies[name].append(time.monotonic() - started)
+    model.db.close()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(profile: str, threads: int, operations: int) -> None:
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir,
+                            tuning=PROFILES[profile])
+        retries = model.db.retries
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        workers = [
+            threading.Thread(target=worker, args=(operations, latencies))
+            for _ in range(threads)
+        ]
+
+        started = time.monotonic()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.monotonic() - started
+        database.close()
+
+    click.echo('Profile: {}'.format(profile))
+    for name in WORKLOADS:
+        click.echo('  {:<16} p50 {:>8.2f} ms  p99 {:>8.2f} ms'.format(
+            name,
+            percentile(latencies[name], 0.5) * 1000,
+            percentile(latencies[name], 0.99) * 1000,
+        ))
+    total = sum(len(values) for values in latencies.values())
+    click.echo('  {} operations/s, {} retried statements'.format(
+        int(total / elapsed), model.db.retries - retries))
+
+
+@click.command()
+@click.option('--profile', type=click.Choice(list(PROFILES)), multiple=True,
+              help='Tuning profiles to compare (default: all)')
+@click.option('--threads', default=8, help='Number of concurrent threads')
+@click.option('--operations', default=200,
+              help='Number of operations of each workload per thread')
+def main(profile, threads, operations):
+    for name in profile or PROFILES:
+        run(name, threads, operations)
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
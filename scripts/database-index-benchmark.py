@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+"""
+Seeds a temporary database with a large number of message history, message
+queue, payment and requested subtask rows, then times hot queries with the
+indexes from schema version 50 and with the indexes used before it.
+"""
+import datetime
+import os
+import random
+import tempfile
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List
+
+import click
+import semantic_version
+
+from golem import model
+from golem.database import Database
+from golem.network.history import MessageHistoryService
+from golem.task.requestedtaskmanager import RequestedTaskManager
+from golem.task.taskstate import SubtaskStatus, TaskStatus
+
+# Indexes added in schema version 50
+INDEXES = [
+    'requestedsubtask_subtask_id',
+    'requestedsubtask_status',
+    'requestedsubtask_task_id_status',
+    'requestedsubtask_computing_node_id_task_id_status',
+    'queuedmessage_node_created_date',
+    'queuedmessage_deadline',
+    'networkmessage_subtask_msg_cls_node',
+    'walletoperation_tx_hash',
+    'walletoperation_sender_address_tx_hash',
+    'taskpayment_subtask_node',
+    'taskpayment_task',
+    'taskpayment_accepted_ts',
+]
+# Indexes removed in schema version 50
+LEGACY_INDEXES = {
+    'networkmessage_subtask': 'networkmessage (subtask)',
+    'queuedmessage_node': 'queuedmessage (node)',
+}
+MESSAGE_CLASSES = ['TaskToCompute', 'ReportComputedTask',
+                   'SubtaskResultsAccepted', 'ForceReportComputedTask']
+CHUNK_SIZE = 10000
+
+
+def insert(model_cls, rows: Iterator[Dict[str, Any]]) -> None:
+    """ Bulk insert bypassing model instances """
+    # pylint: disable=protected-access
+    rows = iter(rows)
+    first = next(rows)
+    defaults = {
+        field.name: field.default
+        for field in model_cls._meta.sorted_fields
+        if field.default is not None and field.name not in first
+    }
+    fields = [model_cls._meta.fields[name]
+              for name in list(first) + list(defaults)]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        model_cls._meta.db_table,
+        ', '.join(field.db_column for field in fields),
+        ', '.join('?' for _ in fields),
+    )
+
+    def values(row):
+        for name, default in defaults.items():
+            row[name] = default() if callable(default) else default
+        return [field.db_value(row[field.name]) for field in fields]
+
+    conn = model.db.get_conn()
+    chunk = [values(first)]
+    for row in rows:
+        chunk.append(values(row))
+        if len(chunk) >= CHUNK_SIZE:
+            conn.executemany(sql, chunk)
+            chunk = []
+    if chunk:
+        conn.executemany(sql, chunk)
+    conn.commit()
+
+
+class Dataset:
+    def __init__(self, rows: int) -> None:
+        self.rows = rows
+        self.nodes = [uuid.uuid4().hex * 4 for _ in range(100)]
+        self.tasks = [str(uuid.uuid4()) for _ in range(max(1, rows // 50))]
+        self.subtasks: List[str] = []
+        self.senders = ['0x' + os.urandom(20).hex() for _ in range(100)]
+        self.tx_hashes: List[str] = []
+
+    def seed(self) -> None:
+        now = datetime.datetime.now()
+        insert(model.ComputingNode, (
+            dict(node_id=node, name=node[:8]) for node in self.nodes))
+        insert(model.RequestedTask, (
+            dict(task_id=task, app_id='app', status=TaskStatus.computing,
+                 task_timeout=3600, subtask_timeout=600,
+                 max_price_per_hour=10 ** 18, max_subtasks=50,
+                 output_directory='/tmp')
+            for task in self.tasks))
+
+        self.subtasks = [str(uuid.uuid4()) for _ in range(self.rows)]
+        insert(model.RequestedSubtask, (
+            dict(task=self.tasks[i % len(self.tasks)], subtask_id=subtask,
+                 status=random.choice(list(SubtaskStatus)),
+                 computing_node=random.choice(self.nodes))
+            for i, subtask in enumerate(self.subtasks)))
+
+        insert(model.NetworkMessage, (
+            dict(local_role=model.Actor.Provider,
+                 remote_role=model.Actor.Requestor,
+                 node=random.choice(self.nodes),
+                 task=self.tasks[i % len(self.tasks)],
+                 subtask=random.choice(self.subtasks),
+                 msg_date=now - datetime.timedelta(seconds=i),
+                 msg_cls=random.choice(MESSAGE_CLASSES),
+                 msg_data=b'\0' * 64)
+            for i in range(self.rows)))
+
+        insert(model.QueuedMessage, (
+            dict(node=random.choice(self.nodes),
+                 msg_version=semantic_version.Version('2.0.0'),
+                 msg_cls='WantToComputeTask',
+                 msg_data=b'\0' * 64,
+                 deadline=now + datetime.timedelta(seconds=i),
+                 created_date=now + datetime.timedelta(seconds=i))
+            for i in range(self.rows)))
+
+        # Every tenth income is paid
+        self.tx_hashes = ['0x' + os.urandom(32).hex()
+                          for _ in range(self.rows // 10)]
+        insert(model.WalletOperation, (
+            dict(id=i + 1,
+                 tx_hash=self.tx_hashes[i // 10] if i % 10 == 0 else None,
+                 direction=model.WalletOperation.DIRECTION.incoming,
+                 operation_type=model.WalletOperation.TYPE.task_payment,
+                 status=model.WalletOperation.STATUS.awaiting,
+                 sender_address=random.choice(self.senders),
+                 recipient_address='0x' + '0' * 40,
+                 amount=10 ** 15,
+                 currency=model.WalletOperation.CURRENCY.GNT,
+                 gas_cost=0)
+            for i in range(self.rows)))
+        insert(model.TaskPayment, (
+            dict(wallet_operation=i + 1,
+                 node=random.choice(self.nodes),
+                 task=self.tasks[i % len(self.tasks)],
+                 subtask=self.subtasks[i],
+                 expected_amount=10 ** 15,
+                 accepted_ts=int(time.time()) - i)
+            for i in range(self.rows)))
+        model.db.execute_sql('ANALYZE')
+
+    def queries(self) -> Dict[str, Callable[[], Any]]:
+        # pylint: disable=protected-access
+        def subtask_by_id():
+            RequestedTaskManager.get_requested_subtask(
+                random.choice(self.subtasks))
+
+        def finished_subtasks():
+            RequestedTaskManager.count_finished_subtasks(
+                random.choice(self.tasks))
+
+        def unfinished_for_node():
+            RequestedTaskManager._get_unfinished_subtasks_for_node(
+                random.choice(self.tasks),
+                model.ComputingNode(node_id=random.choice(self.nodes)))
+
+        def queued_message():
+            model.QueuedMessage.select() \
+                .where(model.QueuedMessage.node == random.choice(self.nodes)) \
+                .order_by(model.QueuedMessage.created_date) \
+                .first()
+
+        def history_get():
+            MessageHistoryService.get_sync(
+                msg_cls=random.choice(MESSAGE_CLASSES),
+                subtask=random.choice(self.subtasks),
+                node=random.choice(self.nodes))
+
+        def expected_incomes():
+            closure_time = int(time.time()) - self.rows // 2
+            list(model.TaskPayment.incomes().where(
+                model.WalletOperation.sender_address ==
+                random.choice(self.senders),
+                model.TaskPayment.accepted_ts > 0,
+                model.TaskPayment.accepted_ts <= closure_time,
+                model.WalletOperation.tx_hash.is_null(),
+                model.TaskPayment.settled_ts.is_null(),
+            ))
+
+        def transfer_by_tx_hash():
+            model.WalletOperation.select() \
+                .where(model.WalletOperation.tx_hash ==
+                       random.choice(self.tx_hashes)) \
+                .first()
+
+        def payment_by_subtask():
+            model.TaskPayment.select() \
+                .where(model.TaskPayment.subtask ==
+                       random.choice(self.subtasks)) \
+                .first()
+
+        return {
+            'subtask by id': subtask_by_id,
+            'finished subtasks': finished_subtasks,
+            'unfinished for node': unfinished_for_node,
+            'queued message': queued_message,
+            'history get': history_get,
+            'expected incomes': expected_incomes,
+            'transfer by tx_hash': transfer_by_tx_hash,
+            'payment by subtask': payment_by_subtask,
+        }
+
+
+def measure(queries: Dict[str, Callable], repeat: int) -> Dict[str, float]:
+    results = {}
+    for name, query in queries.items():
+        started = time.monotonic()
+        for _ in range(repeat):
+            query()
+        results[name] = (time.monotonic() - started) / repeat
+    return results
+
+
+def use_legacy_indexes() -> Dict[str, str]:
+    cursor = model.db.execute_sql(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+        "AND name IN ({})".format(', '.join('?' for _ in INDEXES)),
+        INDEXES)
+    definitions = dict(cursor.fetchall())
+    for name in definitions:
+        model.db.execute_sql('DROP INDEX {}'.format(name))
+    for name, definition in LEGACY_INDEXES.items():
+        model.db.execute_sql('CREATE INDEX {} ON {}'.format(name, definition))
+    model.db.execute_sql('ANALYZE')
+    return definitions
+
+
+def use_new_indexes(definitions: Dict[str, str]) -> None:
+    for name in LEGACY_INDEXES:
+        model.db.execute_sql('DROP INDEX {}'.format(name))
+    for definition in definitions.values():
+        model.db.execute_sql(definition)
+    model.db.execute_sql('ANALYZE')
+
+
+@click.command()
+@click.option('--rows', default=250000,
+              help='Number of rows in each of the hot tables')
+@click.option('--repeat', default=20, help='Executions of each query')
+def main(rows, repeat):
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir)
+        dataset = Dataset(rows)
+        started = time.monotonic()
+        dataset.seed()
+        click.echo('Seeded {} rows in {:.1f} s'.format(
+            rows * 5, time.monotonic() - started))
+
+        definitions = use_legacy_indexes()
+        legacy = measure(dataset.queries(), repeat)
+        use_new_indexes(definitions)
+        indexed = measure(dataset.queries(), repeat)
+        database.close()
+
+    click.echo('{:<22} {:>12} {:>12} {:>9}'.format(
+        'query', 'legacy ms', 'indexed ms', 'speedup'))
+    for name, duration in indexed.items():
+        click.echo('{:<22} {:>12.3f} {:>12.3f} {:>8.1f}x'.format(
+            name, legacy[name] * 1000, duration * 1000,
+            legacy[name] / duration if duration else 0.))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
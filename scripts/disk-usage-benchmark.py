@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Builds a synthetic directory tree and compares reading its size with `du`,
+with a full walk done by the disk usage ledger and with a ledger lookup.
+"""
+import os
+import tempfile
+import time
+
+import click
+
+from golem.core.fileshelper import du
+from golem.resource.diskusage import DiskUsageLedger
+
+
+def build_tree(root, files, files_per_dir):
+    for index in range(files):
+        dir_path = os.path.join(root, str(index // files_per_dir))
+        if index % files_per_dir == 0:
+            os.makedirs(dir_path)
+        with open(os.path.join(dir_path, str(index)), 'wb') as f:
+            f.write(b'0' * (index % 512))
+
+
+def timed(name, func, *args):
+    started = time.monotonic()
+    result = func(*args)
+    click.echo('{:<12} {:>12.3f} ms  {}'.format(
+        name, (time.monotonic() - started) * 1000, result))
+    return result
+
+
+@click.command()
+@click.option('--files', default=1000000, help='Number of synthetic files')
+@click.option('--files-per-dir', default=1000, help='Files per directory')
+def main(files, files_per_dir):
+    with tempfile.TemporaryDirectory() as root:
+        timed('build tree', build_tree, root, files, files_per_dir)
+
+        ledger = DiskUsageLedger()
+        ledger.track(root)
+        timed('du', du, root)
+        timed('reconcile', ledger.reconcile)
+
+        path = os.path.join(root, 'new_file')
+        with open(path, 'wb') as f:
+            f.write(b'0' * 1024)
+        timed('record', ledger.path_added, path)
+        timed('ledger size', ledger.size, root)
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
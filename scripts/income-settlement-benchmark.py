@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Settles a batch transfer covering tens of thousands of expected incomes and
+marks as many incomes overdue, comparing the former per-row updates with the
+bulk updates done by IncomesKeeper.
+"""
+import tempfile
+import time
+
+import click
+from pydispatch import dispatcher
+
+from golem import model
+from golem.core.variables import PAYMENT_DEADLINE
+from golem.database import Database
+from golem.ethereum.incomeskeeper import IncomesKeeper
+
+SENDER = '0x' + '1' * 40
+TX_HASH = '0x' + 'a' * 64
+VALUE = 10 ** 15
+INSERT_CHUNK_SIZE = 50
+
+
+def seed(incomes: int, accepted_ts: int) -> None:
+    now = model.default_now()
+    with model.db.atomic():
+        for start in range(0, incomes, INSERT_CHUNK_SIZE):
+            count = min(INSERT_CHUNK_SIZE, incomes - start)
+            model.WalletOperation.insert_many([
+                dict(
+                    id=start + i + 1,
+                    direction=model.WalletOperation.DIRECTION.incoming,
+                    operation_type=model.WalletOperation.TYPE.task_payment,
+                    status=model.WalletOperation.STATUS.awaiting,
+                    sender_address=SENDER,
+                    recipient_address='0x' + '0' * 40,
+                    amount=0,
+                    currency=model.WalletOperation.CURRENCY.GNT,
+                    gas_cost=0,
+                    created_date=now,
+                    modified_date=now,
+                ) for i in range(count)
+            ]).execute()
+            model.TaskPayment.insert_many([
+                dict(
+                    wallet_operation=start + i + 1,
+                    node='{:0128x}'.format((start + i) % 100),
+                    task='task-{}'.format((start + i) // 100),
+                    subtask='subtask-{}'.format(start + i),
+                    expected_amount=VALUE,
+                    accepted_ts=accepted_ts,
+                    created_date=now,
+                    modified_date=now,
+                ) for i in range(count)
+            ]).execute()
+
+
+def per_row_batch_transfer(tx_hash, sender, amount, closure_time):
+    """ Settlement as implemented before bulk updates """
+    expected = model.TaskPayment.incomes().where(
+        model.WalletOperation.sender_address == sender,
+        model.TaskPayment.accepted_ts > 0,
+        model.TaskPayment.accepted_ts <= closure_time,
+        model.WalletOperation.tx_hash.is_null(),
+        model.TaskPayment.settled_ts.is_null(),
+    )
+    sum([e.missing_amount for e in expected])
+    amount_left = amount
+    for e in expected:
+        received = min(amount_left, e.expected_amount)
+        e.wallet_operation.amount += received
+        amount_left -= received
+        e.wallet_operation.tx_hash = tx_hash
+        e.wallet_operation.status = model.WalletOperation.STATUS.confirmed
+        e.wallet_operation.save()
+        e.charged_from_deposit = False
+        e.save()
+        if e.missing_amount == 0:
+            dispatcher.send(
+                signal='golem.income',
+                event='confirmed',
+                node_id=e.wallet_operation.sender_address,
+                amount=e.wallet_operation.amount,
+            )
+
+
+def per_row_overdue():
+    """ Overdue marking as implemented before bulk updates """
+    incomes = list(model.TaskPayment.incomes().where(
+        model.WalletOperation.status != model.WalletOperation.STATUS.overdue,
+        model.WalletOperation.tx_hash.is_null(True),
+        model.TaskPayment.accepted_ts < int(time.time()) - PAYMENT_DEADLINE,
+    ))
+    for income in incomes:
+        income.wallet_operation.status = model.WalletOperation.STATUS.overdue
+        income.wallet_operation.save()
+        dispatcher.send(
+            signal='golem.income',
+            event='overdue_single',
+            node_id=income.node,
+        )
+    dispatcher.send(signal='golem.income', event='overdue', incomes=incomes)
+
+
+def timed(incomes: int, accepted_ts: int, func, *args) -> float:
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir)
+        seed(incomes, accepted_ts)
+        started = time.monotonic()
+        func(*args)
+        duration = time.monotonic() - started
+        database.close()
+    return duration
+
+
+@click.command()
+@click.option('--incomes', default=50000, help='Number of expected incomes')
+def main(incomes):
+    batch_args = (TX_HASH, SENDER, incomes * VALUE, int(time.time()))
+    overdue_ts = int(time.time()) - 2 * PAYMENT_DEADLINE
+    results = [
+        ('batch transfer',
+         timed(incomes, 1, per_row_batch_transfer, *batch_args),
+         timed(incomes, 1, IncomesKeeper.received_batch_transfer,
+               *batch_args)),
+        ('overdue incomes',
+         timed(incomes, overdue_ts, per_row_overdue),
+         timed(incomes, overdue_ts, IncomesKeeper.update_overdue_incomes)),
+    ]
+
+    click.echo('{:<16} {:>12} {:>12} {:>9}'.format(
+        'operation', 'per row s', 'bulk s', 'speedup'))
+    for name, per_row, bulk in results:
+        click.echo('{:<16} {:>12.2f} {:>12.2f} {:>8.1f}x'.format(
+            name, per_row, bulk, per_row / bulk if bulk else 0.))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
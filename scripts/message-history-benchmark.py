@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Replays network messages through MessageHistoryService into a temporary
+SQLite database and reports how many messages per second are stored and
+how long it takes to read them back.
+"""
+import tempfile
+import time
+
+import click
+from golem_messages.factories import tasks as tasks_factories
+
+from golem.database import database
+from golem.model import Actor, DB_FIELDS, DB_MODELS, NetworkMessage, db
+from golem.network import history
+
+
+def build_messages(count):
+    msgs = []
+    for _ in range(count):
+        msg = tasks_factories.TaskToComputeFactory()
+        msg._fake_sign()  # pylint: disable=protected-access
+        msgs.append(msg)
+    return msgs
+
+
+@click.command()
+@click.option('--messages', default=5000, help='Number of messages to replay')
+def main(messages):
+    msgs = build_messages(messages)
+    with tempfile.TemporaryDirectory() as datadir:
+        _db = database.Database(
+            db,
+            fields=DB_FIELDS,
+            models=DB_MODELS,
+            db_dir=datadir,
+        )
+        service = history.MessageHistoryService()
+        service.start()
+
+        started = time.monotonic()
+        for msg in msgs:
+            history.add(
+                msg=msg,
+                node_id='node',
+                local_role=Actor.Requestor,
+                remote_role=Actor.Provider,
+            )
+        while NetworkMessage.select().count() < messages:
+            time.sleep(0.01)
+        elapsed = time.monotonic() - started
+        service.stop()
+        click.echo('write: {:.0f} msg/s'.format(messages / elapsed))
+
+        started = time.monotonic()
+        for msg in msgs:
+            history.get('TaskToCompute', msg.subtask_id, 'node')
+        elapsed = time.monotonic() - started
+        click.echo('read:  {:.3f} ms/msg'.format(elapsed * 1000 / messages))
+        _db.close()
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Compares percentile rank lookups over synthetic known hosts done with
+a linear scan of host metadata and with golem.network.p2p.PerformanceIndex.
+"""
+import random
+import time
+
+import click
+
+from golem.network.p2p.performanceindex import PerformanceIndex
+
+
+def linear_percentile_rank(hosts, perf, env_id):
+    hosts_perf = [
+        metadata['performance'].get(env_id, -1.0)
+        for _, metadata in hosts
+        if 'performance' in metadata
+    ]
+    return sum(1 for x in hosts_perf if x < perf) / len(hosts_perf)
+
+
+def timed(name, func, count):
+    started = time.monotonic()
+    for _ in range(count):
+        func()
+    click.echo('{:<8} {:>10.3f} ms/op'.format(
+        name, (time.monotonic() - started) * 1000 / count))
+
+
+@click.command()
+@click.option('--hosts', default=100000, help='Number of synthetic hosts')
+@click.option('--lookups', default=100, help='Number of rank lookups')
+def main(hosts, lookups):
+    envs = ['BLENDER', 'BLENDER_NVGPU', 'WASM', 'glambda']
+    host_list = [
+        ((str(i), 40102), {'performance': {
+            env_id: random.uniform(0, 1000)
+            for env_id in random.sample(envs, random.randint(1, len(envs)))
+        }})
+        for i in range(hosts)
+    ]
+
+    def perf_env():
+        return random.uniform(0, 1000), random.choice(envs)
+
+    timed('linear', lambda: linear_percentile_rank(host_list, *perf_env()),
+          lookups)
+
+    started = time.monotonic()
+    index = PerformanceIndex.from_hosts(host_list)
+    click.echo('{:<8} {:>10.3f} ms'.format(
+        'build', (time.monotonic() - started) * 1000))
+    timed('index', lambda: index.percentile_rank(*perf_env()), lookups)
+    timed('update', lambda: index.update(
+        random.choice(host_list)[0],
+        {'performance': {random.choice(envs): random.uniform(0, 1000)}},
+    ), lookups)
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
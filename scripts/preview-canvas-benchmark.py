@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Builds frame previews from rendered chunks, as a requestor does when results
+of a multi-frame rendering task arrive. Compares rebuilding the preview file
+for every chunk, as done before, with compositing chunks in PreviewCanvas by
+CPU time and the number of preview files written.
+"""
+import math
+import os
+import tempfile
+import time
+from unittest import mock
+
+import click
+
+from apps.rendering.resources.imgrepr import OpenCVImgRepr
+from apps.rendering.resources.previewcanvas import PreviewCanvas
+
+
+def chunks(directory: str, width: int, height: int, parts: int):
+    """ Writes one rendered chunk per part, returns their paths """
+    paths = []
+    for part in range(parts):
+        path = os.path.join(directory, 'chunk{}.png'.format(part))
+        OpenCVImgRepr.empty(width, height // parts,
+                            color=(part * 40 % 256, 128, 64)).save(path)
+        paths.append(path)
+    return paths
+
+
+def per_chunk(preview_path: str, chunk_paths, width: int, height: int,
+              scale: float) -> None:
+    """ Preview handling as implemented before PreviewCanvas: every chunk is
+    pasted into an empty image which is added to the preview read from its
+    file, then the preview file is written back """
+    preview_width = int(round(width * scale))
+    preview_height = int(round(height * scale))
+    for part, chunk_path in enumerate(chunk_paths, start=1):
+        img = OpenCVImgRepr.from_image_file(chunk_path)
+        img.resize(int(round(scale * img.get_width())),
+                   int(round(scale * img.get_height())))
+        img_offset = OpenCVImgRepr.empty(preview_width, preview_height)
+        offset = int(math.floor((part - 1) * preview_height
+                                / len(chunk_paths)))
+        img_offset.paste_image(img, 0, offset)
+        if os.path.exists(preview_path):
+            preview = OpenCVImgRepr.from_image_file(preview_path)
+            preview.add(img_offset)
+        else:
+            preview = img_offset
+        preview.save_with_extension(preview_path, 'PNG')
+
+
+def canvas(preview_path: str, chunk_paths, width: int, height: int,
+           scale: float) -> None:
+    preview = PreviewCanvas(preview_path,
+                            int(round(width * scale)),
+                            int(round(height * scale)))
+    for part, chunk_path in enumerate(chunk_paths, start=1):
+        img = OpenCVImgRepr.from_image_file(chunk_path)
+        img.resize(int(round(scale * img.get_width())),
+                   int(round(scale * img.get_height())))
+        offset = int(math.floor((part - 1) * preview.height
+                                / len(chunk_paths)))
+        preview.paste(img, 0, offset)
+        preview.save()
+    preview.release()
+
+
+def measure(handle, frames: int, chunk_paths, width: int, height: int,
+            scale: float):
+    saves = 0
+    save_with_extension = OpenCVImgRepr.save_with_extension
+
+    def counted_save(img, *args, **kwargs):
+        nonlocal saves
+        saves += 1
+        return save_with_extension(img, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as preview_dir, \
+            mock.patch.object(OpenCVImgRepr, 'save_with_extension',
+                              counted_save):
+        started = time.process_time()
+        for frame in range(frames):
+            preview_path = os.path.join(preview_dir,
+                                        'frame{}.png'.format(frame))
+            handle(preview_path, chunk_paths, width, height, scale)
+        return time.process_time() - started, saves
+
+
+@click.command()
+@click.option('--frames', default=20, help='Number of frames')
+@click.option('--parts', default=16, help='Number of chunks per frame')
+@click.option('--width', default=1920, help='Frame width in pixels')
+@click.option('--height', default=1080, help='Frame height in pixels')
+@click.option('--scale', default=0.4, help='Preview scale factor')
+def main(frames, parts, width, height, scale):
+    with tempfile.TemporaryDirectory() as chunk_dir:
+        chunk_paths = chunks(chunk_dir, width, height, parts)
+        click.echo('{:<10} {:>10} {:>14}'.format(
+            'mode', 'CPU s', 'files written'))
+        for name, handle in [('per chunk', per_chunk), ('canvas', canvas)]:
+            cpu, saves = measure(handle, frames, chunk_paths, width, height,
+                                 scale)
+            click.echo('{:<10} {:>10.2f} {:>14}'.format(name, cpu, saves))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
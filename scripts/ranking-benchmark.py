@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Simulates gossip rounds of golem.ranking.Ranking on a network of synthetic
+nodes and reports how long each phase of a stage takes.
+"""
+# pylint: disable=protected-access
+import random
+import tempfile
+import time
+from unittest import mock
+
+import click
+
+from golem.database import database
+from golem.model import DB_FIELDS, DB_MODELS, LocalRank, db
+from golem.ranking.ranking import Ranking
+
+
+def populate_local_ranks(node_ids):
+    rows = [
+        dict(node_id=node_id,
+             positive_computed=random.randint(0, 100),
+             negative_computed=random.randint(0, 10),
+             positive_payment=random.randint(0, 100),
+             negative_payment=random.randint(0, 10))
+        for node_id in node_ids
+    ]
+    with db.atomic():
+        for start in range(0, len(rows), 100):
+            LocalRank.insert_many(rows[start:start + 100]).execute()
+
+
+def build_gossip(node_ids, neighbours):
+    return [
+        [[node_id, [[random.uniform(-1, 1), random.random()],
+                    [random.uniform(-1, 1), random.random()]]]
+         for node_id in node_ids]
+        for _ in range(neighbours)
+    ]
+
+
+def timed(name, func, *args):
+    started = time.monotonic()
+    result = func(*args)
+    click.echo('{:<12} {:>9.1f} ms'.format(
+        name, (time.monotonic() - started) * 1000))
+    return result
+
+
+@click.command()
+@click.option('--nodes', default=10000, help='Number of synthetic nodes')
+@click.option('--neighbours', default=8, help='Number of gossiping neighbours')
+@click.option('--rounds', default=3, help='Number of gossip rounds')
+def main(nodes, neighbours, rounds):
+    node_ids = ['node{:05}'.format(i) for i in range(nodes)]
+    neighbour_ids = node_ids[:neighbours]
+    with tempfile.TemporaryDirectory() as datadir:
+        _db = database.Database(
+            db,
+            fields=DB_FIELDS,
+            models=DB_MODELS,
+            db_dir=datadir,
+        )
+        populate_local_ranks(node_ids)
+
+        client = mock.Mock()
+        client.get_neighbours_degree.return_value = {
+            node_id: neighbours for node_id in neighbour_ids}
+        client.collect_stopped_peers.return_value = set(neighbour_ids)
+        client.collect_neighbours_loc_ranks.return_value = [
+            [neighbour_id, node_id, [random.uniform(-1, 1)] * 2]
+            for neighbour_id in neighbour_ids for node_id in node_ids
+        ]
+        ranking = Ranking(client, max_steps=rounds)
+        ranking.reactor = mock.Mock()
+
+        timed('init stage', ranking._Ranking__init_stage)
+        for _ in range(rounds):
+            client.collect_gossip.return_value = \
+                build_gossip(node_ids, neighbours)
+            timed('new round', ranking._Ranking__new_round)
+            timed('end round', ranking._Ranking__end_round)
+        timed('save', ranking._Ranking__make_break)
+        timed('sync network', ranking.sync_network)
+        _db.close()
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Restores resources of many requested tasks against a fake Hyperdrive which
+answers every upload request after a random delay. Compares restoring one
+task at a time in arbitrary order, as done before, with the bounded,
+deadline-first restoration of TaskResourcesMixin by time to the first ready
+task, time to the closest deadline task being ready and total duration.
+"""
+import random
+import time
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import click
+from twisted.internet import defer, reactor, task
+
+from golem.task.server.resources import TaskResourcesMixin
+
+
+class FakeHyperdrive:
+    def __init__(self, latency: float, failure_rate: float) -> None:
+        self.latency = latency
+        self.failure_rate = failure_rate
+
+    # pylint: disable=unused-argument,too-many-arguments
+    def add_resources(self, files, res_id, resource_hash=None,
+                      client_options=None, async_=True):
+        delay = random.expovariate(1. / self.latency)
+        failed = random.random() < self.failure_rate
+        return task.deferLater(reactor, delay, self._uploaded, res_id, failed)
+
+    @staticmethod
+    def _uploaded(res_id: str, failed: bool):
+        if failed:
+            raise ConnectionError('Upload failed: {}'.format(res_id))
+        return 'hash-' + res_id, ['package.zip']
+
+
+class FakeTaskManager:
+    def __init__(self, count: int) -> None:
+        self.tasks: Dict[str, SimpleNamespace] = {}
+        self.tasks_states: Dict[str, SimpleNamespace] = {}
+        self.tasks_restoring_resources = set()
+        self.ready: Dict[str, float] = {}
+
+        now = int(time.time())
+        for i in range(count):
+            task_id = 'task-{}'.format(i)
+            header = SimpleNamespace(deadline=now + random.randint(600, 86400))
+            self.tasks[task_id] = SimpleNamespace(header=header)
+            self.tasks_states[task_id] = SimpleNamespace(
+                resource_hash=None,
+                package_path='/tmp/{}.zip'.format(task_id))
+
+    @property
+    def closest_deadline(self) -> str:
+        return min(self.tasks, key=lambda t: self.tasks[t].header.deadline)
+
+    def get_unfinished_task_ids(self):
+        return list(self.tasks)
+
+    def notify_update_task(self, task_id):
+        self.ready[task_id] = time.monotonic()
+
+    def delete_task(self, task_id):
+        del self.tasks[task_id]
+        del self.tasks_states[task_id]
+
+
+class Server(TaskResourcesMixin):
+    def __init__(self, task_manager: FakeTaskManager,
+                 hyperdrive: FakeHyperdrive) -> None:
+        self.task_manager = task_manager
+        self.hyperdrive = hyperdrive
+
+    @property
+    def resource_manager(self):
+        return self.hyperdrive
+
+    def get_share_options(self, address=None, timeout=None):
+        return None
+
+
+@defer.inlineCallbacks
+def sequential_restore(task_manager: FakeTaskManager,
+                       hyperdrive: FakeHyperdrive):
+    """ Restoration as implemented before, one task at a time """
+    for task_id in list(task_manager.tasks_states):
+        try:
+            result = yield hyperdrive.add_resources(
+                ['/tmp/{}.zip'.format(task_id)], task_id)
+        except ConnectionError:
+            task_manager.delete_task(task_id)
+        else:
+            task_manager.tasks_states[task_id].resource_hash = result[0]
+            task_manager.notify_update_task(task_id)
+
+
+def concurrent_restore(task_manager: FakeTaskManager,
+                       hyperdrive: FakeHyperdrive):
+    return Server(task_manager, hyperdrive).restore_resources()
+
+
+@defer.inlineCallbacks
+def measure(restore, count: int, hyperdrive: FakeHyperdrive):
+    random.seed(0)
+    task_manager = FakeTaskManager(count)
+    closest = task_manager.closest_deadline
+
+    started = time.monotonic()
+    yield restore(task_manager, hyperdrive)
+    total = time.monotonic() - started
+
+    def elapsed(ready: Optional[float]) -> str:
+        return '-' if ready is None else '{:.2f}'.format(ready - started)
+
+    return (
+        elapsed(min(task_manager.ready.values(), default=None)),
+        elapsed(task_manager.ready.get(closest)),
+        total,
+    )
+
+
+@defer.inlineCallbacks
+def compare(count: int, hyperdrive: FakeHyperdrive):
+    click.echo('{:<12} {:>14} {:>18} {:>10}'.format(
+        'mode', 'first ready s', 'closest deadline s', 'total s'))
+    modes = [
+        ('sequential', sequential_restore),
+        ('concurrent', concurrent_restore),
+    ]
+    for name, restore in modes:
+        first_ready, closest, total = \
+            yield measure(restore, count, hyperdrive)
+        click.echo('{:<12} {:>14} {:>18} {:>10.2f}'.format(
+            name, first_ready, closest, total))
+
+
+@click.command()
+@click.option('--tasks', default=200, help='Number of requested tasks')
+@click.option('--latency', default=0.2,
+              help='Mean Hyperdrive upload latency in seconds')
+@click.option('--failure-rate', default=0.05,
+              help='Fraction of failing uploads')
+@click.option('--concurrency', default=TaskResourcesMixin.RESTORE_CONCURRENCY,
+              help='Tasks restored at the same time')
+def main(tasks, latency, failure_rate, concurrency):
+    Server.RESTORE_CONCURRENCY = concurrency
+    hyperdrive = FakeHyperdrive(latency, failure_rate)
+
+    deferred = compare(tasks, hyperdrive)
+    deferred.addErrback(lambda failure: failure.printTraceback())
+    deferred.addBoth(lambda _: reactor.stop())
+    reactor.run()
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
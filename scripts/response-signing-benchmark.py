@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Accepts results of many subtasks at once, as a requestor does when a burst of
+results passes verification. Compares signing, queueing and recording each
+SubtaskResultsAccepted on the reactor, as done before, with ResponsePipeline
+by time the reactor thread is blocked for and time until all responses are
+saved.
+"""
+import tempfile
+import time
+from typing import List, Tuple
+
+import click
+from golem_messages import cryptography
+from golem_messages import factories
+from golem_messages import message
+from golem_messages import utils as msg_utils
+from twisted.internet import defer, reactor
+
+from golem import model
+from golem.database import Database
+from golem.network import history
+from golem.network.transport import msg_queue
+from golem.task.server.responses import ResponsePipeline
+
+Responses = List[Tuple[str, message.tasks.SubtaskResultsAccepted]]
+
+
+class KeysAuth:
+    def __init__(self) -> None:
+        self._private_key = cryptography.ECCx(None).raw_privkey
+
+
+def responses(count: int, nodes: int) -> Responses:
+    report_computed_task = factories.tasks.ReportComputedTaskFactory()
+    return [
+        ('{:0128x}'.format(i % nodes), message.tasks.SubtaskResultsAccepted(
+            report_computed_task=report_computed_task,
+            payment_ts=int(time.time()),
+        )) for i in range(count)
+    ]
+
+
+def per_response(keys_auth: KeysAuth, batch: Responses) -> defer.Deferred:
+    """ Responses handled as implemented before ResponsePipeline """
+    for node_id, msg in batch:
+        signed_msg = msg_utils.copy_and_sign(
+            msg=msg,
+            private_key=keys_auth._private_key,  # noqa pylint: disable=protected-access
+        )
+        msg_queue.put(node_id, msg)
+        history.add(
+            signed_msg,
+            node_id=node_id,
+            local_role=model.Actor.Requestor,
+            remote_role=model.Actor.Provider,
+        )
+    return defer.succeed(None)
+
+
+def pipelined(keys_auth: KeysAuth, batch: Responses) -> defer.Deferred:
+    pipeline = ResponsePipeline(keys_auth)
+    for node_id, msg in batch:
+        pipeline.add(node_id, node_id, msg)
+    return pipeline.stop()
+
+
+@defer.inlineCallbacks
+def measure(handle, keys_auth: KeysAuth, batch: Responses):
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir)
+        history_service = history.MessageHistoryService()
+        history_service.start()
+
+        started = time.monotonic()
+        deferred = handle(keys_auth, batch)
+        blocked = time.monotonic() - started
+        yield deferred
+        # Saves messages left in the history queue
+        history_service.stop()
+        history.MessageHistoryService.instance = None
+        saved = time.monotonic() - started
+
+        assert model.QueuedMessage.select().count() == len(batch)
+        assert model.NetworkMessage.select().count() == len(batch)
+        database.close()
+    return blocked, saved
+
+
+@defer.inlineCallbacks
+def compare(count: int, nodes: int):
+    keys_auth = KeysAuth()
+    batch = responses(count, nodes)
+    click.echo('{:<14} {:>18} {:>16}'.format(
+        'mode', 'reactor blocked s', 'all saved s'))
+    modes = [
+        ('per response', per_response),
+        ('pipelined', pipelined),
+    ]
+    for name, handle in modes:
+        blocked, saved = yield measure(handle, keys_auth, batch)
+        click.echo('{:<14} {:>18.2f} {:>16.2f}'.format(name, blocked, saved))
+
+
+@click.command()
+@click.option('--acceptances', default=10000,
+              help='Number of accepted subtasks')
+@click.option('--nodes', default=100, help='Number of distinct providers')
+def main(acceptances, nodes):
+    deferred = compare(acceptances, nodes)
+    deferred.addErrback(lambda failure: failure.printTraceback())
+    deferred.addBoth(lambda _: reactor.stop())
+    reactor.run()
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Drives subtask status transitions through the RPC publisher at a fixed rate,
+with a fake router session which serializes every frame on the reactor
+thread and acknowledges it after a delay. Compares publishing every event
+with CoalescingPublisher by frames sent and reactor lag.
+"""
+import json
+import random
+import statistics
+import time
+
+import click
+from twisted.internet import reactor, task
+from twisted.internet.defer import Deferred
+
+from golem.rpc.mapping.rpceventnames import Task
+from golem.rpc.session import CoalescingPublisher, Publisher
+
+TICK = 0.01
+
+
+class FakeSession:
+    def __init__(self, frame_cost: float, ack_delay: float) -> None:
+        self.frame_cost = frame_cost
+        self.ack_delay = ack_delay
+        self.frames = 0
+
+    @staticmethod
+    def is_open():
+        return True
+
+    @staticmethod
+    def is_closing():
+        return False
+
+    def publish(self, topic, *args, **kwargs):
+        self.frames += 1
+        options = kwargs.pop('options', None)
+        json.dumps([topic, args, kwargs])
+        # Stands in for WAMP serialization and the transport write
+        deadline = time.perf_counter() + self.frame_cost
+        while time.perf_counter() < deadline:
+            pass
+        if options is None:
+            return None
+        deferred = Deferred()
+        reactor.callLater(self.ack_delay, deferred.callback, None)
+        return deferred
+
+
+def run(publisher, rate: int, subtasks: int, duration: float) -> list:
+    """ Returns reactor lag samples in seconds """
+    per_tick = int(rate * TICK)
+    lags = []
+    expected = [time.monotonic() + TICK]
+
+    def measure_lag():
+        now = time.monotonic()
+        lags.append(max(0., now - expected[0]))
+        expected[0] = now + TICK
+
+    def transitions():
+        for _ in range(per_tick):
+            subtask = random.randrange(subtasks)
+            publisher.publish(
+                Task.evt_subtask_status,
+                'task-{}'.format(subtask // 100),
+                'subtask-{}'.format(subtask),
+                random.randrange(1, 10),
+            )
+
+    lag_probe = task.LoopingCall(measure_lag)
+    generator = task.LoopingCall(transitions)
+    lag_probe.start(TICK, now=False)
+    generator.start(TICK)
+
+    def stop():
+        lag_probe.stop()
+        generator.stop()
+        reactor.callLater(1., reactor.crash)
+
+    reactor.callLater(duration, stop)
+    reactor.run()
+    return lags
+
+
+@click.command()
+@click.option('--coalesce/--no-coalesce', default=True)
+@click.option('--rate', default=10000, help='Subtask transitions per second')
+@click.option('--subtasks', default=2000, help='Number of distinct subtasks')
+@click.option('--duration', default=10., help='Duration in seconds')
+@click.option('--frame-cost', default=50e-6,
+              help='CPU time spent on a single frame in seconds')
+@click.option('--ack-delay', default=0.05,
+              help='Router acknowledgement delay in seconds')
+def main(coalesce, rate, subtasks, duration, frame_cost, ack_delay):
+    # pylint: disable=too-many-arguments
+    session = FakeSession(frame_cost, ack_delay)
+    if coalesce:
+        publisher = CoalescingPublisher(session, reactor=reactor)
+    else:
+        publisher = Publisher(session)
+
+    lags = run(publisher, rate, subtasks, duration)
+    lags.sort()
+    click.echo('Publisher:       {}'.format(type(publisher).__name__))
+    click.echo('Transitions:     {}'.format(int(rate * duration)))
+    click.echo('Frames sent:     {}'.format(session.frames))
+    click.echo('Reactor lag p50: {:.2f} ms'.format(
+        statistics.median(lags) * 1000))
+    click.echo('Reactor lag p99: {:.2f} ms'.format(
+        lags[int(len(lags) * 0.99)] * 1000))
+    click.echo('Reactor lag max: {:.2f} ms'.format(lags[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
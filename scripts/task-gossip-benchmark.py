@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Simulates GetTasks / Tasks gossip in a random mesh of peers and compares
+sending a random sample of known task headers with sending only headers
+missing from the per-peer inventory. Reports transmitted headers, bytes and
+signature checks per round.
+"""
+import os
+import random
+import uuid
+from types import SimpleNamespace
+from typing import Dict, List
+
+import click
+
+from golem.core.variables import TASK_HEADERS_LIMIT
+from golem.network.p2p.headerinventory import HeaderInventory
+
+
+def new_header(task_id, timestamp):
+    return SimpleNamespace(
+        task_id=task_id,
+        timestamp=timestamp,
+        signature=os.urandom(65),
+    )
+
+
+class Peer:
+    def __init__(self, use_inventory: bool) -> None:
+        self.use_inventory = use_inventory
+        self.own: Dict[str, SimpleNamespace] = {}
+        self.known: Dict[str, SimpleNamespace] = {}
+        self.inventories: Dict[int, HeaderInventory] = {}
+
+    def headers_for(self, neighbour: int) -> List[SimpleNamespace]:
+        own = list(self.own.values())
+        others = list(self.known.values())
+        inventory = self.inventories.setdefault(neighbour, HeaderInventory())
+        if self.use_inventory:
+            own = inventory.missing(own)
+            others = inventory.missing(others)
+
+        to_send = random.sample(own, min(len(own), TASK_HEADERS_LIMIT // 2))
+        remaining = TASK_HEADERS_LIMIT - len(to_send)
+        to_send += random.sample(others, min(len(others), remaining))
+        if self.use_inventory:
+            inventory.update(to_send)
+        return to_send
+
+    def receive(self, sender: int, headers: List[SimpleNamespace]) -> int:
+        """ Returns the number of signature checks """
+        checks = 0
+        inventory = self.inventories.setdefault(sender, HeaderInventory())
+        for header in headers:
+            if self.use_inventory:
+                inventory.add(header)
+            if header.task_id in self.own:
+                checks += 1
+                continue
+            known = self.known.get(header.task_id)
+            if self.use_inventory and known is not None \
+                    and known.signature == header.signature:
+                continue
+            checks += 1
+            if known is None or known.timestamp <= header.timestamp:
+                self.known[header.task_id] = header
+        return checks
+
+
+def build_mesh(peers: int, degree: int) -> List[List[int]]:
+    neighbours: List[set] = [set() for _ in range(peers)]
+    for peer in range(peers):
+        while len(neighbours[peer]) < degree:
+            other = random.randrange(peers)
+            if other != peer:
+                neighbours[peer].add(other)
+                neighbours[other].add(peer)
+    return [sorted(n) for n in neighbours]
+
+
+def simulate(use_inventory, mesh, tasks, rounds, updates, seed):
+    random.seed(seed)
+    peers = [Peer(use_inventory) for _ in mesh]
+    for _ in range(tasks):
+        owner = random.choice(peers)
+        task_id = str(uuid.uuid4())
+        owner.own[task_id] = new_header(task_id, 0)
+
+    stats = []
+    for round_no in range(1, rounds + 1):
+        for peer in peers:
+            for task_id in list(peer.own):
+                if random.random() < updates:
+                    peer.own[task_id] = new_header(task_id, round_no)
+
+        sent = checks = 0
+        for peer_id, peer in enumerate(peers):
+            for neighbour in mesh[peer_id]:
+                headers = peers[neighbour].headers_for(peer_id)
+                sent += len(headers)
+                checks += peer.receive(neighbour, headers)
+        stats.append((sent, checks))
+    return stats
+
+
+@click.command()
+@click.option('--peers', default=300, help='Number of peers in the mesh')
+@click.option('--degree', default=4, help='Minimum number of neighbours')
+@click.option('--tasks', default=500, help='Number of tasks in the network')
+@click.option('--rounds', default=40, help='Number of GetTasks rounds')
+@click.option('--updates', default=0.01,
+              help='Fraction of tasks updated by their owners every round')
+@click.option('--header-size', default=700,
+              help='Size of a serialized task header in bytes')
+@click.option('--seed', default=0)
+def main(peers, degree, tasks, rounds, updates, header_size, seed):
+    # pylint: disable=too-many-arguments
+    mesh = build_mesh(peers, degree)
+    sample = simulate(False, mesh, tasks, rounds, updates, seed)
+    delta = simulate(True, mesh, tasks, rounds, updates, seed)
+
+    click.echo('{:>5} {:>12} {:>12} {:>10} {:>10} {:>9}'.format(
+        'round', 'sample kB', 'delta kB', 'sample sig', 'delta sig',
+        'saved'))
+    for round_no, ((sent, checks), (d_sent, d_checks)) in \
+            enumerate(zip(sample, delta), 1):
+        click.echo('{:>5} {:>12.1f} {:>12.1f} {:>10} {:>10} {:>8.1f}%'.format(
+            round_no,
+            sent * header_size / 1024,
+            d_sent * header_size / 1024,
+            checks,
+            d_checks,
+            100 * (1 - d_sent / sent) if sent else 0.,
+        ))
+
+    total_sent = sum(s for s, _ in sample)
+    total_delta = sum(s for s, _ in delta)
+    click.echo('Bytes saved: {:.1f} kB, signature checks saved: {}'.format(
+        (total_sent - total_delta) * header_size / 1024,
+        sum(c for _, c in sample) - sum(c for _, c in delta),
+    ))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
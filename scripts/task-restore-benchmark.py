@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Measures TaskManager startup restoring thousands of synthetic task dumps:
+unpickling every dump, as done before summaries were stored, compared with
+registering completed tasks from their summaries and loading them lazily.
+"""
+import os
+import pickle
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict
+
+import click
+
+from golem.task.taskindex import LazyMapping, summary_path, write_summary
+from golem.task.taskmanager import TaskManager
+from golem.task.taskstate import TaskState, TaskStatus
+
+
+class SyntheticTask:
+    def __init__(self, payload_size: int) -> None:
+        self.header = SimpleNamespace(
+            task_id=str(uuid.uuid4()),
+            deadline=int(time.time()) + 3600,
+            task_owner=SimpleNamespace(key='0' * 128),
+        )
+        # Stands in for task definitions, results and preview data
+        self.payload = os.urandom(payload_size)
+
+    def register_listener(self, _listener):
+        pass
+
+
+def populate(tasks_dir: Path, tasks: int, subtasks: int, active: int,
+             payload_size: int) -> None:
+    for i in range(tasks):
+        task = SyntheticTask(payload_size)
+        state = TaskState()
+        state.status = TaskStatus.computing if i < active \
+            else TaskStatus.finished
+        state.subtasks_count = subtasks
+        state.subtask_states: Dict = {}
+        for _ in range(subtasks):
+            subtask_id = str(uuid.uuid4())
+            state.subtask_states[subtask_id] = \
+                SimpleNamespace(subtask_id=subtask_id)
+
+        dump_path = tasks_dir / '{}.pickle'.format(task.header.task_id)
+        with dump_path.open('wb') as f:
+            pickle.dump((task, state), f, protocol=2)
+        write_summary(dump_path, task, state)
+
+
+def restore(tasks_dir: Path) -> TaskManager:
+    task_manager = TaskManager.__new__(TaskManager)
+    task_manager.tasks = LazyMapping()
+    task_manager.tasks_states = LazyMapping()
+    task_manager.subtask2task_mapping = {}
+    task_manager._lazy_task_ids = set()  # pylint: disable=protected-access
+    task_manager.tasks_dir = tasks_dir
+    task_manager.notice_task_updated = lambda *_, **__: None
+    task_manager.restore_tasks()
+    return task_manager
+
+
+def timed(name, func, *args):
+    started = time.monotonic()
+    result = func(*args)
+    click.echo('{:<28} {:>10.1f} ms'.format(
+        name, (time.monotonic() - started) * 1000))
+    return result
+
+
+@click.command()
+@click.option('--tasks', default=5000, help='Number of stored tasks')
+@click.option('--subtasks', default=50, help='Subtasks per task')
+@click.option('--active', default=10, help='Number of active tasks')
+@click.option('--payload-size', default=64 * 1024,
+              help='Size of pickled task data in bytes')
+def main(tasks, subtasks, active, payload_size):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tasks_dir = Path(tmpdir)
+        timed('populate', populate, tasks_dir, tasks, subtasks, active,
+              payload_size)
+
+        for path in tasks_dir.glob('*.pickle'):
+            summary_path(path).unlink()
+        timed('unpickle all (+summaries)', restore, tasks_dir)
+
+        task_manager = timed('summaries, lazy', restore, tasks_dir)
+        timed('load all lazy tasks',
+              lambda: [task_manager.tasks[tid] for tid in task_manager.tasks])
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Compares fetching payment totals task by task, as `comp.tasks` does, with
+the grouped query and in-memory projection used by `comp.tasks.summary`,
+on a temporary database with synthetic tasks and subtask payments.
+"""
+import random
+import tempfile
+import time
+import uuid
+
+import click
+
+from golem import model
+from golem.database import database
+from golem.ethereum.paymentskeeper import PaymentsDatabase
+from golem.model import DB_FIELDS, DB_MODELS, db
+from golem.task.taskstate import TaskStatus
+from golem.task.tasksummary import TaskSummaries
+
+BATCH_SIZE = 100
+
+
+def populate(tasks, subtasks_per_task):
+    task_subtasks = {
+        str(uuid.uuid4()): [str(uuid.uuid4()) for _ in range(subtasks_per_task)]
+        for _ in range(tasks)
+    }
+    operation = dict(
+        direction=model.WalletOperation.DIRECTION.outgoing,
+        operation_type=model.WalletOperation.TYPE.task_payment,
+        status=model.WalletOperation.STATUS.confirmed,
+        sender_address='0x' + '0' * 40,
+        recipient_address='0x' + '1' * 40,
+        currency=model.WalletOperation.CURRENCY.GNT,
+        gas_cost=random.randint(1, 10 ** 9),
+    )
+    payments = [
+        dict(task=task_id, subtask=subtask_id, node='node',
+             expected_amount=10 ** 18)
+        for task_id, subtask_ids in task_subtasks.items()
+        for subtask_id in subtask_ids
+    ]
+    with db.atomic():
+        for start in range(0, len(payments), BATCH_SIZE):
+            batch = payments[start:start + BATCH_SIZE]
+            model.WalletOperation.insert_many([
+                dict(operation, amount=random.randint(1, 10 ** 18))
+                for _ in batch
+            ]).execute()
+            for i, payment in enumerate(batch, start + 1):
+                payment['wallet_operation'] = i
+            model.TaskPayment.insert_many(batch).execute()
+    return task_subtasks
+
+
+def per_task_totals(task_subtasks, task_ids):
+    totals = {}
+    for task_id in task_ids:
+        payments = PaymentsDatabase.get_subtasks_payments(
+            task_subtasks[task_id])
+        totals[task_id] = (
+            sum(p.wallet_operation.amount for p in payments),
+            sum(p.wallet_operation.gas_cost for p in payments),
+        )
+    return totals
+
+
+def timed(name, func, *args):
+    started = time.monotonic()
+    result = func(*args)
+    click.echo('{:<28} {:>10.1f} ms'.format(
+        name, (time.monotonic() - started) * 1000))
+    return result
+
+
+@click.command()
+@click.option('--tasks', default=5000, help='Number of synthetic tasks')
+@click.option('--subtasks', default=500000, help='Total number of subtasks')
+@click.option('--page-size', default=100, help='Tasks per summary page')
+def main(tasks, subtasks, page_size):
+    with tempfile.TemporaryDirectory() as datadir:
+        _db = database.Database(
+            db,
+            fields=DB_FIELDS,
+            models=DB_MODELS,
+            db_dir=datadir,
+        )
+        task_subtasks = timed(
+            'populate', populate, tasks, subtasks // tasks)
+        summaries = {
+            task_id: {
+                'id': task_id,
+                'time_started': time.time() - i,
+                'status': TaskStatus.finished.value,
+                'type': 'Blender',
+            }
+            for i, task_id in enumerate(task_subtasks)
+        }
+        projection = TaskSummaries(summaries.get)
+        page = list(task_subtasks)[:page_size]
+
+        timed('per task, one page', per_task_totals, task_subtasks, page)
+        timed('grouped, one page',
+              PaymentsDatabase.get_tasks_payments_totals, page)
+
+        def _all_pages():
+            cursor = None
+            while True:
+                tasks_page, cursor = projection.get_page(
+                    summaries, cursor=cursor, limit=page_size)
+                PaymentsDatabase.get_tasks_payments_totals(
+                    summary['id'] for summary in tasks_page)
+                if cursor is None:
+                    break
+
+        timed('grouped, all pages (cold)', _all_pages)
+        timed('grouped, all pages (warm)', _all_pages)
+        _db.close()
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
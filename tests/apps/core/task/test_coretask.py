@@ -453,6 +453,24 @@ class TestCoreTask(LogTestCase, TestDirFixture):
         }
         c.accept_results("SUBTASK1", None)
 
+    def test_get_finishing_subtasks(self):
+        c = self._get_core_task()
+        c.subtasks_given = {
+            "SUBTASK1": {"status": SubtaskStatus.downloading,
+                         "node_id": "NODE_ID"},
+            "SUBTASK2": {"status": SubtaskStatus.starting,
+                         "node_id": "NODE_ID"},
+            "SUBTASK3": {"status": SubtaskStatus.verifying,
+                         "node_id": "OTHER_NODE_ID"},
+        }
+        assert c.get_finishing_subtasks("NODE_ID") == \
+            [c.subtasks_given["SUBTASK1"]]
+
+        c.subtasks_given["SUBTASK2"]["status"] = SubtaskStatus.verifying
+        c.subtasks_given["SUBTASK1"]["status"] = SubtaskStatus.finished
+        assert c.get_finishing_subtasks("NODE_ID") == \
+            [c.subtasks_given["SUBTASK2"]]
+
     def test_new_compute_task_def(self):
         c = self._get_core_task()
         c.header.subtask_timeout = 1
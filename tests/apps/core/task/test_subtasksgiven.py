@@ -0,0 +1,68 @@
+import copy
+import pickle
+from unittest import TestCase
+
+from apps.core.task.subtasksgiven import SubtaskInfo, SubtasksGiven
+from golem.task.taskstate import SubtaskStatus
+from golem.testutils import PEP8MixIn
+
+
+class TestSubtasksGiven(TestCase):
+    def setUp(self):
+        self.subtasks = SubtasksGiven()
+        self.subtasks['s1'] = {
+            'node_id': 'node1', 'status': SubtaskStatus.starting}
+        self.subtasks['s2'] = {
+            'node_id': 'node1', 'status': SubtaskStatus.downloading}
+        self.subtasks['s3'] = {
+            'node_id': 'node2', 'status': SubtaskStatus.downloading}
+
+    def test_subtask_ids(self):
+        self.assertCountEqual(
+            self.subtasks.subtask_ids('node1'), ['s1', 's2'])
+        self.assertEqual(
+            self.subtasks.subtask_ids('node1', [SubtaskStatus.downloading]),
+            ['s2'])
+        self.assertEqual(self.subtasks.subtask_ids('unknown'), [])
+
+    def test_status_transition(self):
+        self.subtasks['s1']['status'] = SubtaskStatus.verifying
+        self.assertEqual(
+            self.subtasks.subtask_ids('node1', [SubtaskStatus.starting]), [])
+        self.assertEqual(
+            self.subtasks.subtask_ids('node1', [SubtaskStatus.verifying]),
+            ['s1'])
+
+    def test_node_id_assigned_later(self):
+        self.subtasks['s4'] = {'status': SubtaskStatus.starting}
+        self.subtasks['s4']['node_id'] = 'node2'
+        self.assertCountEqual(
+            self.subtasks.subtask_ids('node2'), ['s3', 's4'])
+
+    def test_replace_and_delete(self):
+        old_info = self.subtasks['s2']
+        self.subtasks['s2'] = {
+            'node_id': 'node2', 'status': SubtaskStatus.finished}
+        # Stale entries do not affect the index
+        old_info['status'] = SubtaskStatus.failure
+        self.assertEqual(self.subtasks.subtask_ids('node1'), ['s1'])
+
+        del self.subtasks['s3']
+        self.assertEqual(self.subtasks.subtask_ids('node2'), ['s2'])
+
+    def test_pickle_and_copy(self):
+        for restored in (pickle.loads(pickle.dumps(self.subtasks)),
+                         copy.deepcopy(self.subtasks)):
+            self.assertIsInstance(restored, SubtasksGiven)
+            self.assertIsInstance(restored['s1'], SubtaskInfo)
+            self.assertEqual(restored, self.subtasks)
+            restored['s1']['status'] = SubtaskStatus.downloading
+            self.assertCountEqual(
+                restored.subtask_ids('node1', [SubtaskStatus.downloading]),
+                ['s1', 's2'])
+
+
+class TestSubtasksGivenStyle(TestCase, PEP8MixIn):
+    PEP8_FILES = [
+        "apps/core/task/subtasksgiven.py"
+    ]
@@ -0,0 +1,71 @@
+import os
+import pickle
+import unittest
+from unittest import mock
+
+from apps.rendering.resources.imgrepr import OpenCVImgRepr
+from apps.rendering.resources.previewcanvas import PreviewCanvas
+from golem import testutils
+from golem.testutils import TempDirFixture
+
+
+class TestPEP8(unittest.TestCase, testutils.PEP8MixIn):
+    PEP8_FILES = ['apps/rendering/resources/previewcanvas.py']
+
+
+class TestPreviewCanvas(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tempdir, 'preview.png')
+        self.canvas = PreviewCanvas(self.path, 10, 20, save_interval=10)
+
+    def _chunk(self, color, width=10, height=10):
+        return OpenCVImgRepr.empty(width, height, color=color)
+
+    def test_paste_and_save(self):
+        self.canvas.paste(self._chunk((0, 255, 0)), 0, 0)
+        self.canvas.save()
+        preview = OpenCVImgRepr.from_image_file(self.path)
+        assert preview.get_pixel((0, 0)) == (0, 255, 0)
+        assert preview.get_pixel((0, 10)) == (0, 0, 0)
+
+    def test_save_throttled(self):
+        self.canvas.paste(self._chunk((0, 255, 0)), 0, 0)
+        self.canvas.save()
+        self.canvas.paste(self._chunk((255, 0, 0)), 0, 10)
+        with mock.patch.object(OpenCVImgRepr, 'save_with_extension') as save:
+            self.canvas.save()
+            save.assert_not_called()
+            self.canvas.flush()
+            save.assert_called_once_with(self.path, 'PNG')
+            self.canvas.flush()
+            save.assert_called_once()
+
+    def test_paste_cropped(self):
+        self.canvas.paste(self._chunk((0, 0, 255), width=12), 0, 15)
+        self.canvas.flush()
+        preview = OpenCVImgRepr.from_image_file(self.path)
+        assert preview.get_width() == 10
+        assert preview.get_height() == 20
+        assert preview.get_pixel((9, 19)) == (0, 0, 255)
+
+    def test_restored_from_file(self):
+        self.canvas.paste(self._chunk((0, 255, 0)), 0, 0)
+        self.canvas.flush()
+        canvas = pickle.loads(pickle.dumps(self.canvas))
+        assert canvas.img.get_pixel((0, 0)) == (0, 255, 0)
+        canvas.paste(self._chunk((255, 0, 0)), 0, 10)
+        canvas.flush()
+        preview = OpenCVImgRepr.from_image_file(self.path)
+        assert preview.get_pixel((0, 0)) == (0, 255, 0)
+        assert preview.get_pixel((0, 10)) == (255, 0, 0)
+
+    def test_release(self):
+        self.canvas.paste(self._chunk((0, 255, 0)), 0, 0)
+        self.canvas.release()
+        assert not self.canvas.loaded
+        preview = OpenCVImgRepr.from_image_file(self.path)
+        assert preview.get_pixel((0, 0)) == (0, 255, 0)
+        assert self.canvas.img.get_pixel((0, 0)) == (0, 255, 0)
+        assert self.canvas.loaded
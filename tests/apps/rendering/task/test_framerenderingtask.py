@@ -2,6 +2,7 @@ import os
 import unittest
 import uuid
 from pathlib import Path
+from unittest import mock
 
 from golem_messages.factories.datastructures import p2p as dt_p2p_factory
 
@@ -139,37 +140,75 @@ class TestFrameRenderingTask(TestDirFixture, LogTestCase):
         frame_task._update_frame_preview(img_path, 7, 2)
         frame_task._update_frame_preview(img_path, 7, 1, True)
 
-    def test_paste_new_chunk(self):
-        task = self._get_frame_task()
+    def test_update_frame_preview_throttled(self):
+        task = self._get_frame_task(num_tasks=4)
         task.res_x = 10
         task.res_y = 20
+        task.frames = [5, 7]
         task.scale_factor = 1
-        preview_path = self.temp_file_name("image1.png")
-        with self.assertLogs(logger, level="ERROR") as l:
-            assert task._paste_new_chunk("not an image", preview_path, 1, 10) is None
-        assert any("Can't generate preview" in log for log in l.output)
-        with open(preview_path, 'w') as f:
-            f.write("not an image, again not an image")
-        with self.assertLogs(logger, level="ERROR") as l:
-            assert task._paste_new_chunk("not an image", preview_path, 1, 10) is None
-        assert any("Can't add new chunk to preview" in log for log in l.output)
-        assert any("Can't generate preview" in log for log in l.output)
-
-        img = OpenCVImgRepr.empty(10, 10, color=(0, 122, 0))
-        img.save(preview_path)
-        with self.assertLogs(logger, level="ERROR"):
-            new_img = task._paste_new_chunk("nota image", preview_path, 1, 10)
-        assert isinstance(new_img, OpenCVImgRepr)
+        preview_path = task._get_preview_file_path(0)
 
+        img_path = self.temp_file_name("image1.png")
+        OpenCVImgRepr.empty(10, 10, color=(0, 255, 0)).save(img_path)
+        task._update_frame_preview(img_path, 5)
+        preview = OpenCVImgRepr.from_image_file(preview_path)
+        assert preview.get_pixel((0, 0)) == (0, 255, 0)
+        assert preview.get_pixel((0, 15)) == (0, 0, 0)
+
+        # Written again only after the save interval or on flush
+        img_path = self.temp_file_name("image2.png")
+        OpenCVImgRepr.empty(10, 10, color=(255, 0, 0)).save(img_path)
+        task._update_frame_preview(img_path, 5, 2)
+        preview = OpenCVImgRepr.from_image_file(preview_path)
+        assert preview.get_pixel((0, 15)) == (0, 0, 0)
+
+        task.preview_canvases[0].flush()
+        preview = OpenCVImgRepr.from_image_file(preview_path)
+        assert preview.get_pixel((0, 0)) == (0, 255, 0)
+        assert preview.get_pixel((0, 15)) == (255, 0, 0)
+
+    @mock.patch('apps.rendering.task.framerenderingtask'
+                '.PREVIEW_CANVAS_CACHE_SIZE', 2)
+    def test_update_frame_preview_bounded_memory(self):
+        task = self._get_frame_task(num_tasks=6)
+        task.res_x = 10
+        task.res_y = 20
+        task.frames = [1, 2, 3]
+        task.scale_factor = 1
+        img_path = self.temp_file_name("image1.png")
+        OpenCVImgRepr.empty(10, 10, color=(0, 255, 0)).save(img_path)
+        red_path = self.temp_file_name("image2.png")
+        OpenCVImgRepr.empty(10, 10, color=(255, 0, 0)).save(red_path)
+
+        for frame in task.frames:
+            task._update_frame_preview(img_path, frame, 2)
+        # Not written yet, the preview of frame 1 was saved recently
+        task._update_frame_preview(red_path, 1, 1)
+        task._update_frame_preview(img_path, 2, 1)
+        task._update_frame_preview(img_path, 3, 1)
+
+        loaded = [num for num, canvas in task.preview_canvases.items()
+                  if canvas.loaded]
+        assert loaded == [1, 2]
+        # The released canvas wrote its pending changes
+        preview = OpenCVImgRepr.from_image_file(task._get_preview_file_path(0))
+        assert preview.get_pixel((0, 0)) == (255, 0, 0)
+        assert preview.get_pixel((0, 10)) == (0, 255, 0)
+
+        task._update_frame_preview(img_path, 3, 1, final=True)
+        assert not task.preview_canvases[2].loaded
+
+    def test_update_frame_preview_invalid_chunk(self):
+        task = self._get_frame_task()
+        task.res_x = 10
+        task.res_y = 20
+        task.scale_factor = 1
+        chunk_path = self.temp_file_name("chunk.png")
+        with open(chunk_path, 'w') as f:
+            f.write("not an image")
         with self.assertLogs(logger, level="ERROR"):
-            new_img = task._paste_new_chunk(img, preview_path, 1, 10)
-        assert isinstance(new_img, OpenCVImgRepr)
-
-        img = OpenCVImgRepr.empty(10, 20, color=(0, 122, 0))
-        img.save(preview_path)
-        with self.assertNoLogs(logger, level="ERROR"):
-            new_img = task._paste_new_chunk(img, preview_path, 1, 10)
-        assert isinstance(new_img, OpenCVImgRepr)
+            task._update_frame_preview(chunk_path, task.frames[0])
+        assert not os.path.exists(task._get_preview_file_path(0))
 
     def test_mark_task_area(self):
         task = self._get_frame_task(num_tasks=4)
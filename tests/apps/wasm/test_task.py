@@ -1,4 +1,5 @@
 from unittest import TestCase, mock
+import os
 from uuid import uuid4
 
 from ethereum.utils import denoms
@@ -7,6 +8,7 @@ from golem_messages.factories.datastructures import p2p
 from golem.testutils import TempDirFixture
 
 from apps.wasm.task import (
+    DigestedResult,
     WasmTask,
     WasmTaskBuilder,
     WasmTaskDefinition,
@@ -183,3 +185,39 @@ class WasmTaskTestCase(TempDirFixture):
             all([item in subt_extra_data.items()
                  for item in expected_dict.items()])
         )
+
+    def _write_result(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.tempdir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_cmp_results(self):
+        result_a = DigestedResult.from_files([
+            self._write_result('a1', b'first'),
+            self._write_result('a2', b'second'),
+        ])
+        result_b = DigestedResult.from_files([
+            self._write_result('b1', b'first'),
+            self._write_result('b2', b'second'),
+        ])
+        result_c = DigestedResult.from_files([
+            self._write_result('c1', b'first'),
+            self._write_result('c2', b'other'),
+        ])
+
+        self.assertTrue(WasmTask.cmp_results(result_a, result_b))
+        self.assertFalse(WasmTask.cmp_results(result_a, result_c))
+
+    def test_find_vbrsubtask_by_id(self):
+        with mock.patch.object(self.task, '_new_compute_task_def'):
+            self.task.query_extra_data(1.0, 'node_id')
+            self.task.query_extra_data(1.0, 'node_id')
+
+        for vbr_subtask in self.task.subtasks:
+            for s_id in vbr_subtask.get_instances():
+                self.assertIs(
+                    self.task._find_vbrsubtask_by_id(s_id), vbr_subtask)
+
+        with self.assertRaises(KeyError):
+            self.task._find_vbrsubtask_by_id('unknown')
@@ -0,0 +1,76 @@
+import builtins
+import json
+import os
+import sys
+import tempfile
+from unittest import TestCase, mock
+
+from golem.core import startupprofile
+from golem.core.startupprofile import StartupProfiler
+
+
+class TestStartupProfiler(TestCase):
+    def setUp(self):
+        self.profiler = StartupProfiler()
+        self.addCleanup(self.profiler.disable)
+
+    def test_disabled(self):
+        original_import = builtins.__import__
+        with self.profiler.phase('phase'):
+            pass
+        deferred = mock.Mock()
+        assert self.profiler.track('tracked', deferred) is deferred
+        deferred.addBoth.assert_not_called()
+        assert builtins.__import__ is original_import
+        assert self.profiler.report()['phases'] == []
+
+    def test_phases(self):
+        self.profiler.enable()
+        with self.profiler.phase('first'):
+            pass
+        self.profiler.start_phase('second')
+
+        first, second = self.profiler.report()['phases']
+        assert first['name'] == 'first'
+        assert first['duration'] >= 0
+        assert second['name'] == 'second'
+        assert second['duration'] is None
+
+    def test_track_deferred(self):
+        self.profiler.enable()
+        deferred = mock.Mock()
+        deferred.addBoth.side_effect = lambda callback: callback('result')
+
+        self.profiler.track('tracked', deferred)
+        phase, = self.profiler.report()['phases']
+        assert phase['name'] == 'tracked'
+        assert phase['duration'] is not None
+
+    @mock.patch.object(startupprofile, 'IMPORT_THRESHOLD', 0)
+    def test_imports(self):
+        sys.modules.pop('this', None)
+        self.profiler.enable()
+        with mock.patch('sys.stdout'):
+            import this  # noqa pylint: disable=unused-import,unused-variable
+        self.profiler.disable()
+
+        modules = [i['module'] for i in self.profiler.report()['imports']]
+        assert 'this' in modules
+        assert 'os' not in modules  # already imported
+
+    def test_finish(self):
+        original_import = builtins.__import__
+        self.profiler.enable()
+        with self.profiler.phase('phase'):
+            pass
+
+        with tempfile.TemporaryDirectory() as datadir:
+            self.profiler.finish(datadir)
+            path = os.path.join(datadir, startupprofile.PROFILE_FILENAME)
+            with open(path) as f:
+                report = json.load(f)
+
+        assert builtins.__import__ is original_import
+        assert not self.profiler.enabled
+        assert [p['name'] for p in report['phases']] == ['phase']
+        assert report['total'] >= 0
@@ -1,4 +1,7 @@
 from threading import Thread
+from unittest import mock
+
+from peewee import OperationalError
 
 from golem.core.statskeeper import IntStatsKeeper
 from golem.task.taskcomputer import CompStats
@@ -26,6 +29,7 @@ class TestStatsKeeper(TestWithDatabase):
         self._compare_stats(st, [2, 0, 0] * 2)
         st.increase_stat("computed_tasks")
         self._compare_stats(st, [3, 0, 0] * 2)
+        st.flush()
 
         st2 = IntStatsKeeper(CompStats)
         self._compare_stats(st2, [3] + [0] * 5)
@@ -33,9 +37,45 @@ class TestStatsKeeper(TestWithDatabase):
         self._compare_stats(st2, [4, 0, 0, 1, 0, 0])
         st2.increase_stat("computed_tasks")
         self._compare_stats(st2, [5, 0, 0, 2, 0, 0])
+        st2.flush()
         st.increase_stat("computed_tasks")
+        self._compare_stats(st, [4, 0, 0, 4, 0, 0])
+        st.flush()
         self._compare_stats(st, [6, 0, 0, 4, 0, 0])
 
+    def test_not_written_before_flush(self):
+        st = IntStatsKeeper(CompStats)
+        st.increase_stat("computed_tasks")
+        st.set_stat("tasks_with_errors", 5)
+        self._compare_stats(st, [1, 0, 5, 1, 0, 5])
+
+        self._compare_stats(IntStatsKeeper(CompStats), [0] * 6)
+
+        st.flush()
+        self._compare_stats(IntStatsKeeper(CompStats), [1, 0, 5, 0, 0, 0])
+
+    def test_increase_after_set(self):
+        st = IntStatsKeeper(CompStats)
+        st.set_stat("computed_tasks", 5)
+        st.increase_stat("computed_tasks")
+        st.flush()
+        self._compare_stats(IntStatsKeeper(CompStats), [6] + [0] * 5)
+
+    def test_failed_update_kept_pending(self):
+        st = IntStatsKeeper(CompStats)
+        st.increase_stat("computed_tasks")
+        st.flush()
+        st.increase_stat("computed_tasks")
+        st.set_stat("tasks_with_errors", 5)
+
+        with mock.patch('golem.core.statskeeper.Stats.update',
+                        side_effect=OperationalError):
+            st.flush()
+        self._compare_stats(IntStatsKeeper(CompStats), [1] + [0] * 5)
+
+        st.flush()
+        self._compare_stats(IntStatsKeeper(CompStats), [2, 0, 5, 0, 0, 0])
+
     def test_for_race_conditions(self):
         n_threads = 10
         n_updates = 5
@@ -58,3 +98,6 @@ class TestStatsKeeper(TestWithDatabase):
 
         self.assertEqual(sk.session_stats.computed_tasks, n_expected)
         self.assertEqual(sk.global_stats.computed_tasks, n_expected)
+        sk.flush()
+        self.assertEqual(
+            IntStatsKeeper(CompStats).global_stats.computed_tasks, n_expected)
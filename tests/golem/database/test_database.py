@@ -1,5 +1,9 @@
+from unittest import TestCase, mock
+
+import peewee
+
 from golem import model as m
-from golem.database import Database
+from golem.database import Database, GolemSqliteDatabase, TuningProfile
 from golem.testutils import DatabaseFixture, PEP8MixIn
 
 
@@ -25,3 +29,45 @@ class TestDatabase(DatabaseFixture, PEP8MixIn):
                             db_dir=self.path)
         self.assertEqual(database.get_user_version(), database.SCHEMA_VERSION)
         database.close()
+
+    def _pragma(self, name):
+        return self.database.db.execute_sql(
+            'PRAGMA {}'.format(name)).fetchone()[0]
+
+    def test_default_tuning(self):
+        self.assertEqual(self._pragma('journal_mode'), 'wal')
+        self.assertEqual(self._pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self._pragma('busy_timeout'), 10000)
+        self.assertEqual(self._pragma('temp_store'), 2)  # MEMORY
+        self.assertEqual(self._pragma('foreign_keys'), 1)
+
+    def test_custom_tuning(self):
+        self.database.close()
+        database = Database(m.db, fields=m.DB_FIELDS, models=m.DB_MODELS,
+                            db_dir=self.path,
+                            tuning=TuningProfile(busy_timeout=2500))
+        self.addCleanup(database.close)
+        self.assertEqual(self._pragma('busy_timeout'), 2500)
+
+    def test_maintain(self):
+        m.GenericKeyValue.create(key='key', value='value')
+        self.database.maintain()
+        self.assertEqual(m.GenericKeyValue.get().value, 'value')
+
+
+class TestGolemSqliteDatabaseRetries(TestCase):
+    @mock.patch('golem.database.database.time.sleep')
+    @mock.patch('peewee.SqliteDatabase.execute_sql')
+    def test_backoff(self, execute_sql, sleep):
+        db = GolemSqliteDatabase(':memory:')
+        db.MAX_RETRY_DELAY = db.RETRY_DELAY * 4
+        execute_sql.side_effect = [peewee.OperationalError('locked')] * 4 \
+            + ['result']
+
+        self.assertEqual(db.execute_sql('SELECT 1'), 'result')
+        self.assertEqual(db.retries, 4)
+        self.assertEqual(
+            [c[0][0] for c in sleep.call_args_list],
+            [db.RETRY_DELAY, db.RETRY_DELAY * 2, db.RETRY_DELAY * 4,
+             db.RETRY_DELAY * 4],
+        )
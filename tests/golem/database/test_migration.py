@@ -572,6 +572,43 @@ class TestSavedMigrations(TempDirFixture):
             database.db.RETRY_TIMEOUT = datetime.timedelta(seconds=0)
             database._migrate_schema(35, 36)
 
+    @patch('golem.database.Database._create_tables')
+    def test_50_hot_query_indexes(self, *_args):
+        expected = {
+            'requestedsubtask': {
+                'requestedsubtask_subtask_id',
+                'requestedsubtask_status',
+                'requestedsubtask_task_id_status',
+                'requestedsubtask_computing_node_id_task_id_status',
+            },
+            'queuedmessage': {
+                'queuedmessage_node_created_date',
+                'queuedmessage_deadline',
+            },
+            'networkmessage': {
+                'networkmessage_subtask_msg_cls_node',
+            },
+            'walletoperation': {
+                'walletoperation_tx_hash',
+                'walletoperation_sender_address_tx_hash',
+            },
+            'taskpayment': {
+                'taskpayment_subtask_node',
+                'taskpayment_task',
+                'taskpayment_accepted_ts',
+            },
+        }
+
+        with self.database_context() as database:
+            database._migrate_schema(6, 50)
+
+            for table, indexes in expected.items():
+                cursor = database.db.execute_sql(
+                    "PRAGMA index_list({})".format(table))
+                names = {row[1] for row in cursor.fetchall()}
+                assert indexes <= names, table
+                assert '{}_subtask'.format(table) not in names
+
 
 class TestDuplicateMigrations(DatabaseFixture):
 
@@ -0,0 +1,105 @@
+# pylint: disable=protected-access
+import re
+from typing import Callable, List, Tuple
+from unittest import mock
+
+from golem import model as m
+from golem.database import GolemSqliteDatabase
+from golem.ethereum.incomeskeeper import IncomesKeeper
+from golem.ethereum.paymentskeeper import PaymentsDatabase, PaymentsKeeper
+from golem.network import history
+from golem.network.transport import msg_queue
+from golem.task.requestedtaskmanager import RequestedTaskManager
+from golem.task.taskstate import SUBTASK_STATUS_ACTIVE
+from golem.testutils import DatabaseFixture
+
+# e.g. 'SCAN networkmessage' or 'SCAN TABLE networkmessage' in older SQLite
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+$')
+STATEMENTS = ('SELECT', 'UPDATE', 'DELETE')
+
+
+class TestHotQueryPlans(DatabaseFixture):
+    """ Runs EXPLAIN QUERY PLAN on statements issued by hot code paths
+    and fails if any of them requires a full table scan """
+
+    def _record(self, func: Callable, *args, **kwargs) \
+            -> List[Tuple[str, tuple]]:
+        statements = []
+        execute_sql = GolemSqliteDatabase.execute_sql
+
+        def record(db, sql, params=None, require_commit=True):
+            statements.append((sql, params))
+            return execute_sql(db, sql, params, require_commit)
+
+        with mock.patch.object(GolemSqliteDatabase, 'execute_sql', record):
+            result = func(*args, **kwargs)
+            if result is not None and hasattr(result, '__iter__'):
+                list(result)
+        return [
+            (sql, params) for sql, params in statements
+            if sql.lstrip().upper().startswith(STATEMENTS)
+        ]
+
+    def assertNoFullScans(self, func: Callable, *args, **kwargs):
+        statements = self._record(func, *args, **kwargs)
+        self.assertNotEqual(statements, [], 'No statements executed')
+        for sql, params in statements:
+            cursor = self.database.db.execute_sql(
+                'EXPLAIN QUERY PLAN ' + sql, params)
+            scans = [row[-1] for row in cursor.fetchall()
+                     if FULL_SCAN.match(row[-1])]
+            self.assertEqual(scans, [], sql)
+
+    def test_requested_subtasks(self):
+        node = m.ComputingNode(node_id='node', name='node')
+        self.assertNoFullScans(
+            RequestedTaskManager.subtask_exists, 'subtask')
+        self.assertNoFullScans(
+            RequestedTaskManager.get_requested_subtask, 'subtask')
+        self.assertNoFullScans(
+            RequestedTaskManager.get_requested_task_subtask_ids, 'task')
+        self.assertNoFullScans(
+            RequestedTaskManager.count_finished_subtasks, 'task')
+        self.assertNoFullScans(
+            RequestedTaskManager._get_pending_subtasks, 'task')
+        self.assertNoFullScans(
+            RequestedTaskManager._get_unfinished_subtasks_for_node,
+            'task', node)
+        # restore_tasks()
+        self.assertNoFullScans(
+            m.RequestedSubtask.select().where(
+                m.RequestedSubtask.status.in_(SUBTASK_STATUS_ACTIVE)
+            ).execute)
+
+    def test_message_queue(self):
+        self.assertNoFullScans(msg_queue.get, 'node')
+        self.assertNoFullScans(msg_queue.sweep)
+
+    def test_message_history(self):
+        service = history.MessageHistoryService()
+        self.addCleanup(
+            setattr, history.MessageHistoryService, 'instance', None)
+        self.assertNoFullScans(
+            service.get_sync,
+            msg_cls='ReportComputedTask', subtask='subtask', node='node')
+        self.assertNoFullScans(
+            service.get_sync,
+            msg_cls='ReportComputedTask', subtask='subtask', node='node',
+            task='task')
+        self.assertNoFullScans(service.remove_sync, 'task', subtask='subtask')
+
+    def test_incomes(self):
+        self.assertNoFullScans(
+            IncomesKeeper.received_batch_transfer,
+            '0x' + 'a' * 64, '0x' + 'b' * 40, 1, 2)
+        self.assertNoFullScans(IncomesKeeper.update_overdue_incomes)
+
+    def test_payments(self):
+        self.assertNoFullScans(
+            PaymentsDatabase.get_payment_for_subtask, 'subtask')
+        self.assertNoFullScans(
+            PaymentsDatabase.get_subtasks_payments, ['subtask'])
+        self.assertNoFullScans(
+            PaymentsDatabase.get_tasks_payments_totals, ['task'])
+        self.assertNoFullScans(
+            PaymentsKeeper.confirmed_transfer, '0x' + 'a' * 64, True, 0)
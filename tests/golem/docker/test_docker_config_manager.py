@@ -33,6 +33,15 @@ class TestDockerConfigManager(unittest.TestCase):
         assert cm._container_host_config['cpuset_cpus']
         assert cm._container_host_config['mem_limit']
 
+    def test_set_container_limits(self):
+        cm = DockerConfigManager()
+        cm.build_config(self.MockConfig(2, 2048, 2048))
+
+        cm.set_container_limits(1, 1024)
+
+        assert cm._container_host_config['cpuset_cpus'].count(',') == 0
+        assert cm._container_host_config['mem_limit'] == str(1024 * 1024)
+
     def test_failing_build_config(self):
 
         cm = DockerConfigManager()
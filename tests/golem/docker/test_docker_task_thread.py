@@ -1,16 +1,19 @@
 import time
 from threading import Thread
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.docker.image import DockerImage
 from golem.docker.task_thread import DockerTaskThread, EXIT_CODE_MESSAGE
 from golem.envs.docker.cpu import DockerCPUEnvironment
 from golem.task.taskcomputer import TaskComputer
+from golem.task.taskthread import JobException
+from golem.testutils import TempDirFixture
 from golem.tools.ci import ci_skip
 from golem.tools.testwithdatabase import TestWithDatabase
 from .test_docker_job import TestDockerJob
+from .test_logs import fake_container_output
 
 
 @ci_skip
@@ -91,3 +94,52 @@ class TestExitCodeMessage(TestCase):
         message = DockerTaskThread._exit_code_message(exit_code)
         assert message != EXIT_CODE_MESSAGE.format(exit_code)
         assert "CPU budget exceeded" in message
+
+
+@patch('golem.docker.task_thread.MemoryChecker')
+@patch('golem.docker.task_thread.EnvironmentsManager')
+@patch('golem.docker.task_thread.DockerImage.is_available', return_value=True)
+class TestRunDockerJob(TempDirFixture):
+
+    def _run(self, exit_code, progress):
+        dir_mapping = DockerTaskThread.generate_dir_mapping(
+            self.new_path / 'resources', self.new_path / 'temporary')
+        thread = DockerTaskThread(
+            [DockerImage('golemfactory/base', tag='1.4')],
+            dict(entrypoint='python3 /golem/work/job.py'),
+            dir_mapping,
+            timeout=30)
+        thread.docker_manager = Mock()
+        thread.docker_manager.get_host_config_for_task.return_value = {}
+
+        def follow_logs(stdout, stderr):
+            stdout.follow(fake_container_output(8 * 2 ** 20), name='stdout')
+            stderr.follow(iter([b'Traceback\n', b'Error\n']), name='stderr')
+            # Progress is reported while the job runs
+            stdout.join(10)
+            progress.append(thread.get_progress())
+
+        with patch('golem.docker.task_thread.DockerJob') as job_cls:
+            job = job_cls.return_value.__enter__.return_value
+            job.follow_logs.side_effect = follow_logs
+            job.wait.return_value = exit_code
+            return thread._run_docker_job()
+
+    def test_success(self, *_):
+        progress = []
+        self._run(exit_code=0, progress=progress)
+        assert progress == [1.]
+        logs = self.new_path / 'temporary' / 'output'
+        assert (logs / DockerTaskThread.STDOUT_FILE).exists()
+        assert (logs / DockerTaskThread.STDERR_FILE).read_bytes() == \
+            b'Traceback\nError\n'
+
+    def test_failure(self, *_):
+        with self.assertLogs('golem.docker.task_thread', 'WARNING') as logs:
+            with self.assertRaises(JobException):
+                self._run(exit_code=1, progress=[])
+        message = logs.output[0]
+        assert 'Traceback\nError' in message
+        assert 'last line' in message
+        # Only the tail of stdout is logged
+        assert len(message) < 10000
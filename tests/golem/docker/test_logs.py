@@ -0,0 +1,117 @@
+import tracemalloc
+from collections import deque
+from unittest import TestCase
+
+from golem.docker.logs import LogCapture, LogTail, RotatingLogFile, \
+    parse_progress
+from golem.testutils import TempDirFixture
+
+
+def fake_container_output(size, line=b'x' * 99 + b'\n', chunk_lines=100):
+    """ Yields `size` bytes of output in chunks, without keeping it around """
+    chunk = line * chunk_lines
+    for _ in range(size // len(chunk)):
+        yield chunk
+    yield b'PROGRESS: 100%\n'
+    yield b'last line'
+
+
+class TestRotatingLogFile(TempDirFixture):
+
+    def test_rotation(self):
+        path = self.new_path / 'stdout.log'
+        log_file = RotatingLogFile(path, max_size=10, backup_count=2)
+
+        log_file.write(b'a' * 8)
+        log_file.write(b'b' * 8)
+        log_file.write(b'c' * 8)
+        log_file.write(b'd' * 8)
+        log_file.close()
+
+        assert log_file.paths == [
+            path,
+            path.with_name('stdout.log.1'),
+            path.with_name('stdout.log.2'),
+        ]
+        assert path.read_bytes() == b'dd'
+        assert path.with_name('stdout.log.1').read_bytes() == b'ccccdddddd'
+        assert path.with_name('stdout.log.2').read_bytes() == b'bbbbbbcccc'
+
+    def test_no_backups(self):
+        path = self.new_path / 'stdout.log'
+        log_file = RotatingLogFile(path, max_size=4, backup_count=0)
+
+        log_file.write(b'abcdefghij')
+        log_file.close()
+
+        assert log_file.paths == [path]
+        assert path.read_bytes() == b'ij'
+
+
+class TestLogTail(TestCase):
+
+    def test_lines_split_across_chunks(self):
+        tail = LogTail(max_lines=2)
+        assert tail.feed(b'first\nsec') == ['first']
+        assert tail.feed(b'ond\r\nthird\nfou') == ['second', 'third']
+        assert tail.flush() == ['fou']
+        assert tail.lines() == ['third', 'fou']
+        assert tail.text() == 'third\nfou'
+
+    def test_long_lines(self):
+        tail = LogTail(max_lines=2, max_line_length=10)
+        for _ in range(100):
+            tail.feed(b'y' * 1000)
+        tail.flush()
+        assert tail.lines() == ['y' * 10]
+
+    def test_invalid_encoding(self):
+        tail = LogTail()
+        tail.feed(b'\xff\xfe\n')
+        assert tail.lines() == ['\ufffd\ufffd']
+
+
+class TestParseProgress(TestCase):
+
+    def test_parse_progress(self):
+        assert parse_progress('PROGRESS: 42.5%') == 0.425
+        assert parse_progress('  PROGRESS 10 %') == 0.1
+        assert parse_progress('PROGRESS 150%') == 1.
+        assert parse_progress('Rendering 42%') is None
+
+
+class TestLogCapture(TempDirFixture):
+
+    def test_follow_large_output(self):
+        path = self.new_path / 'stdout.log'
+        last_lines = deque(maxlen=2)
+        capture = LogCapture(path, on_line=last_lines.append,
+                             max_size=2 ** 20, tail_lines=21)
+
+        tracemalloc.start()
+        try:
+            capture.follow(fake_container_output(64 * 2 ** 20), name='test')
+            capture.join(timeout=60)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert list(last_lines) == ['PROGRESS: 100%', 'last line']
+        assert peak < 4 * 2 ** 20
+        assert len(capture.tail.lines()) == 21
+        assert capture.tail.lines()[-1] == 'last line'
+        assert all(p.stat().st_size <= 2 ** 20 for p in capture.file.paths)
+        assert len(capture.file.paths) == 2
+
+    def test_stream_error(self):
+        path = self.new_path / 'stderr.log'
+        capture = LogCapture(path)
+
+        def stream():
+            yield b'error\n'
+            raise ConnectionError()
+
+        capture.follow(stream(), name='test')
+        capture.join(timeout=10)
+        assert capture.tail.lines() == ['error']
+        assert path.read_bytes() == b'error\n'
@@ -199,6 +199,108 @@ class TestIncomesKeeper(TestWithDatabase):
         self.assertIncomeHash(sender_node1, subtask_id1, transaction_id1)
         self.assertIncomeHash(sender_node2, subtask_id2, transaction_id2)
 
+    def _expect_incomes(self, payer_address, values):
+        sender_node = random_eth_pub_key()
+        subtask_ids = []
+        for accepted_ts, value in enumerate(values, start=1):
+            subtask_ids.append(str(uuid.uuid4()))
+            self._test_expect_income(
+                sender_node=sender_node,
+                subtask_id=subtask_ids[-1],
+                payer_addr=payer_address,
+                value=value,
+                accepted_ts=accepted_ts,
+            )
+        return sender_node, subtask_ids
+
+    @mock.patch('golem.ethereum.incomeskeeper.dispatcher.send')
+    def test_received_batch_transfer_many_incomes(self, send):
+        payer_address = random_eth_address()
+        sender_node, subtask_ids = self._expect_incomes(
+            payer_address, [10, 20, 30])
+        tx_hash = '0x' + 64 * 'e'
+        send.reset_mock()
+
+        self.incomes_keeper.received_batch_transfer(
+            tx_hash, payer_address, 60, 3, charged_from_deposit=True)
+
+        for subtask_id, value in zip(subtask_ids, [10, 20, 30]):
+            income = self._get_income(
+                model.TaskPayment.node == sender_node,
+                model.TaskPayment.subtask == subtask_id,
+            )
+            self.assertEqual(income.wallet_operation.tx_hash, tx_hash)
+            self.assertEqual(income.wallet_operation.amount, value)
+            self.assertEqual(
+                income.wallet_operation.status,
+                model.WalletOperation.STATUS.confirmed,
+            )
+            self.assertTrue(income.charged_from_deposit)
+        send.assert_called_once_with(
+            signal='golem.income',
+            event='confirmed',
+            node_id=payer_address,
+            amount=60,
+            count=3,
+        )
+
+    @mock.patch('golem.ethereum.incomeskeeper.dispatcher.send')
+    def test_received_batch_transfer_partial_amount(self, send):
+        payer_address = random_eth_address()
+        sender_node, subtask_ids = self._expect_incomes(
+            payer_address, [10, 20, 30])
+        send.reset_mock()
+
+        self.incomes_keeper.received_batch_transfer(
+            '0x' + 64 * 'e', payer_address, 35, 3)
+
+        amounts = [
+            self._get_income(
+                model.TaskPayment.node == sender_node,
+                model.TaskPayment.subtask == subtask_id,
+            ).wallet_operation.amount
+            for subtask_id in subtask_ids
+        ]
+        self.assertEqual(amounts, [10, 20, 5])
+        send.assert_called_once_with(
+            signal='golem.income',
+            event='confirmed',
+            node_id=payer_address,
+            amount=30,
+            count=2,
+        )
+
+    @freeze_time()
+    @mock.patch('golem.ethereum.incomeskeeper.dispatcher.send')
+    def test_update_overdue_incomes_aggregated_events(self, send):
+        node = random_eth_pub_key()
+        incomes = [
+            self._create_income(
+                node=node,
+                accepted_ts=int(time.time()) - 2*PAYMENT_DEADLINE,
+                wallet_operation__status=model.WalletOperation.STATUS.awaiting,
+            )
+            for _ in range(3)
+        ]
+        self.incomes_keeper.update_overdue_incomes()
+
+        for income in incomes:
+            self.assertEqual(
+                income.wallet_operation.refresh().status,
+                model.WalletOperation.STATUS.overdue,
+            )
+        send.assert_any_call(
+            signal='golem.income',
+            event='overdue_single',
+            node_id=node,
+            count=3,
+        )
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(
+            len(send.call_args[1]['incomes']),
+            3,
+        )
+
     @staticmethod
     def _create_income(**kwargs):
         income = model_factories.TaskPayment(
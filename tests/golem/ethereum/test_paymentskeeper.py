@@ -40,3 +40,50 @@ class TestPaymentsDatabase(TestWithDatabase):
 
         payments = pd.get_subtasks_payments(['id1', 'id4', 'id2'])
         assert self._get_ids(payments) == ['id1', 'id2']
+
+    def test_tasks_payments_totals(self):
+        pd = PaymentsDatabase()
+        sent = model.WalletOperation.STATUS.sent
+        self._create_payment(
+            task='task1',
+            wallet_operation__status=sent,
+            wallet_operation__amount=10 ** 20,
+            wallet_operation__gas_cost=3,
+        )
+        self._create_payment(
+            task='task1',
+            wallet_operation__status=model.WalletOperation.STATUS.confirmed,
+            wallet_operation__amount=10 ** 20,
+        )
+        self._create_payment(
+            task='task2',
+            wallet_operation__status=sent,
+        )
+        self._create_payment(
+            task='task2',
+            wallet_operation__status=model.WalletOperation.STATUS.awaiting,
+        )
+        self._create_payment(task='task3')
+
+        totals = pd.get_tasks_payments_totals(['task1', 'task2', 'task4'])
+        assert totals == {
+            'task1': (2 * 10 ** 20, 3),
+            'task2': (None, None),
+        }
+        assert pd.get_tasks_payments_totals([]) == {}
+
+    def test_tasks_payments_totals_full_page(self):
+        pd = PaymentsDatabase()
+        task_ids = ['task{}'.format(i) for i in range(1000)]
+        for task_id in task_ids[::pd.STATEMENT_SIZE]:
+            self._create_payment(
+                task=task_id,
+                wallet_operation__status=model.WalletOperation.STATUS.sent,
+                wallet_operation__amount=10,
+                wallet_operation__gas_cost=1,
+            )
+
+        totals = pd.get_tasks_payments_totals(task_ids)
+        assert totals == {
+            task_id: (10, 1) for task_id in task_ids[::pd.STATEMENT_SIZE]
+        }
@@ -0,0 +1,127 @@
+import csv
+from pathlib import Path
+from typing import List, Tuple
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from golem.appconfig import MIN_CPU_CORES, MIN_MEMORY_SIZE
+from golem.hardware.autosize import Autosizer, Limits, LoadMonitor, \
+    LoadSample, MEMORY_HEADROOM
+
+GIB = 1024 * 1024  # in KiB
+TRACES_DIR = Path(__file__).parent / 'traces'
+
+# Recorded on a machine with 8 cores, one of them reserved for the system
+TOTAL_CORES = 7
+MAX_LIMITS = Limits(num_cores=6, max_memory_size=10 * GIB)
+
+
+def load_trace(name: str) -> List[Tuple[int, LoadSample]]:
+    """ Reads load samples taken every 30 seconds with no subtask computed """
+    with (TRACES_DIR / name).open() as trace:
+        return [(
+            int(row['seconds']),
+            LoadSample(
+                busy_cores=float(row['busy_cores']),
+                memory_available=int(row['memory_available']),
+                disk_busy=float(row['disk_busy']),
+            ),
+        ) for row in csv.DictReader(trace)]
+
+
+def simulate(trace: List[Tuple[int, LoadSample]], autosizer: Autosizer):
+    """ Returns limits in effect after each sample and the number of
+    changes """
+    limits = {}
+    changes = 0
+    for seconds, sample in trace:
+        if autosizer.update(sample) is not None:
+            changes += 1
+        limits[seconds] = autosizer.limits
+    return limits, changes
+
+
+class TestAutosizer(TestCase):
+
+    def assert_within_bounds(self, limits: Limits):
+        assert MIN_CPU_CORES <= limits.num_cores <= MAX_LIMITS.num_cores
+        assert MIN_MEMORY_SIZE <= limits.max_memory_size \
+            <= MAX_LIMITS.max_memory_size
+        assert limits.max_memory_size % 2 == 0
+
+    def test_workstation_trace(self):
+        # Idle until 7:30, a build until 17:30, idle again
+        autosizer = Autosizer(MAX_LIMITS, TOTAL_CORES)
+        limits, changes = simulate(load_trace('workstation.csv'), autosizer)
+
+        for value in limits.values():
+            self.assert_within_bounds(value)
+        # Idle machine, operator limits are used
+        assert limits[420] == MAX_LIMITS
+        # Shrinks under load
+        assert limits[1020].num_cores == 1
+        assert limits[1020].max_memory_size <= 4.5 * GIB * MEMORY_HEADROOM
+        # Recovers afterwards
+        assert limits[1770] == MAX_LIMITS
+        # Moving averages and memory steps prevent flapping
+        assert changes <= 15
+
+    def test_disk_bound_trace(self):
+        # The disk is saturated from 5:00 to 15:00, CPU and memory are not
+        autosizer = Autosizer(MAX_LIMITS, TOTAL_CORES)
+        limits, _ = simulate(load_trace('disk_bound.csv'), autosizer)
+
+        for value in limits.values():
+            self.assert_within_bounds(value)
+        assert limits[270] == MAX_LIMITS
+        assert limits[870].num_cores <= 2
+        assert limits[870].max_memory_size == MAX_LIMITS.max_memory_size
+        assert limits[1470] == MAX_LIMITS
+
+    def test_operator_limits_below_minimum(self):
+        max_limits = Limits(num_cores=1, max_memory_size=MIN_MEMORY_SIZE // 2)
+        autosizer = Autosizer(max_limits, TOTAL_CORES)
+
+        autosizer.update(LoadSample(TOTAL_CORES, 0, 1.))
+
+        assert autosizer.limits == max_limits
+
+    def test_small_memory_changes_skipped(self):
+        autosizer = Autosizer(MAX_LIMITS, TOTAL_CORES)
+        autosizer.update(LoadSample(0., 8 * GIB, 0.))
+        memory = autosizer.limits.max_memory_size
+
+        assert autosizer.update(LoadSample(0., int(8.5 * GIB), 0.)) is None
+        assert autosizer.limits.max_memory_size == memory
+
+
+@patch('golem.hardware.autosize.hardware')
+@patch('golem.hardware.autosize.time')
+@patch('golem.hardware.autosize.psutil')
+class TestLoadMonitor(TestCase):
+
+    def test_sample(self, psutil, time, hardware):
+        psutil.disk_io_counters.side_effect = [
+            {'sda': Mock(busy_time=1000), 'sdb': Mock(busy_time=0)},
+            {'sda': Mock(busy_time=4000), 'sdb': Mock(busy_time=9000)},
+        ]
+        time.monotonic.side_effect = [100., 110.]
+        psutil.cpu_percent.return_value = [100., 50., 25., 100.]
+        hardware.cpus.return_value = [1, 2, 3]
+        hardware.memory_available.return_value = 4 * GIB
+
+        monitor = LoadMonitor()
+        sample = monitor.sample()
+
+        # Core 0 is not used for computations
+        assert sample.busy_cores == 1.75
+        assert sample.memory_available == 4 * GIB
+        assert sample.disk_busy == 0.9
+
+    def test_sample_no_disk_busy_time(self, psutil, time, hardware):
+        psutil.disk_io_counters.return_value = {'C:': object()}
+        time.monotonic.side_effect = [100., 110.]
+        psutil.cpu_percent.return_value = [0.]
+        hardware.cpus.return_value = [0]
+
+        assert LoadMonitor().sample().disk_busy == 0.
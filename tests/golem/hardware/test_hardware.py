@@ -42,3 +42,12 @@ class TestHardware(TempDirFixture):
         assert hardware.cap_disk(1e7) == 1e7
         assert hardware.cap_disk(7e9) == 7e9
         assert hardware.cap_disk(9e19) == 7e9
+
+    @patch('golem.hardware.cpu_model', return_value='CPU')
+    def test_fingerprint(self, *_):
+        fingerprint = hardware.fingerprint(num_cores=2, max_memory_size=2 ** 20)
+        assert fingerprint['cpu_model'] == 'CPU'
+        assert fingerprint['num_cores'] == 2
+        assert fingerprint['max_memory_size'] == 2 ** 20
+        assert fingerprint != hardware.fingerprint(
+            num_cores=3, max_memory_size=2 ** 20)
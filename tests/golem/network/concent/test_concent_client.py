@@ -1,5 +1,6 @@
 # pylint: disable=protected-access, no-self-use
 import datetime
+from concurrent import futures
 import gc
 import logging
 import time
@@ -26,6 +27,7 @@ from golem.core import variables
 from golem.network import history
 from golem.network.concent import client
 from golem.network.concent import exceptions
+from golem.tools.stubconcent import StubConcentServer
 
 logger = logging.getLogger(__name__)
 
@@ -165,6 +167,22 @@ class TestSendToConcent(TestCase):
             future_aware.timestamp(),
         )
 
+    def test_session(self, post_mock):
+        session = mock.Mock()
+        with mock.patch('golem.network.concent.client.verify_response'):
+            client.send_to_concent(
+                msg=self.msg,
+                signing_key=self.private_key,
+                concent_variant=self.variant,
+                session=session,
+            )
+        session.post.assert_called_once_with(
+            mock.ANY,
+            data=mock.ANY,
+            headers=mock.ANY,
+        )
+        post_mock.assert_not_called()
+
 
 @mock.patch('requests.post')
 class TestReceiveFromConcent(TestCase):
@@ -285,6 +303,10 @@ class TestConcentClientService(testutils.TempDirFixture):
 
         assert 'key' not in self.concent_service._delayed
 
+    def _wait_for_sending(self):
+        futures.wait([future for future, _ in self.concent_service._sending])
+        self.concent_service._loop()
+
     def test_loop_exception(self, send_mock, *_):
         self.concent_service.submit(
             'key',
@@ -293,19 +315,69 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
         send_mock.side_effect = exceptions.ConcentRequestError
-        mock_path = ("golem.network.concent.client.ConcentClientService"
-                     "._grace_sleep")
-        with mock.patch(mock_path) as sleep_mock:
-            self.concent_service._loop()
-            sleep_mock.assert_called_once_with()
+        self.concent_service._loop()
+        self._wait_for_sending()
 
         send_mock.assert_called_once_with(
             self.msg,
             self.concent_service.keys_auth._private_key,
             concent_variant=self.concent_service.variant,
+            session=self.concent_service._session,
         )
 
         assert not self.concent_service._delayed
+        grace_time, _ = self.concent_service._backoff[self.msg.__class__]
+        assert grace_time == client.ConcentClientService.MIN_GRACE_TIME \
+            * client.ConcentClientService.GRACE_FACTOR
+
+    @mock.patch(
+        'golem.network.concent.client.ConcentClientService'
+        '.react_to_concent_message'
+    )
+    def test_loop_backoff_per_message_type(self, react_mock, send_mock, *_):
+        self.concent_service._back_off(self.msg.__class__)
+        other_msg = message.concents.ForcePayment()
+        self.concent_service.submit('key', self.msg,
+                                    delay=datetime.timedelta())
+        self.concent_service.submit('other', other_msg,
+                                    delay=datetime.timedelta())
+
+        self.concent_service._loop()
+        self._wait_for_sending()
+
+        send_mock.assert_called_once_with(
+            other_msg, mock.ANY, concent_variant=mock.ANY, session=mock.ANY)
+        react_mock.assert_called_once_with(
+            send_mock.return_value, response_to=other_msg)
+        assert list(self.concent_service._pending) == [self.msg]
+
+        with mock.patch('time.monotonic',
+                        return_value=time.monotonic() + 60):
+            self.concent_service._loop()
+        self._wait_for_sending()
+        assert send_mock.call_count == 2
+        assert self.msg.__class__ not in self.concent_service._backoff
+
+    def test_loop_max_in_flight(self, send_mock, *_):
+        in_flight = client.ConcentClientService.MAX_IN_FLIGHT
+        release = futures.Future()
+        send_mock.side_effect = lambda *_, **__: release.result()
+        for i in range(in_flight + 2):
+            self.concent_service.submit(
+                'key{}'.format(i),
+                message.concents.ForceReportComputedTask(),
+                delay=datetime.timedelta(),
+            )
+
+        self.concent_service._loop()
+        assert len(self.concent_service._sending) == in_flight
+        assert len(self.concent_service._pending) == 2
+
+        release.set_result(None)
+        self._wait_for_sending()
+        self._wait_for_sending()
+        assert send_mock.call_count == in_flight + 2
+        assert not self.concent_service._pending
 
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
@@ -321,10 +393,12 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
         self.concent_service._loop()
+        self._wait_for_sending()
         send_mock.assert_called_once_with(
             self.msg,
             self.concent_service.keys_auth._private_key,
             concent_variant=self.concent_service.variant,
+            session=self.concent_service._session,
         )
         react_mock.assert_called_once_with(data, response_to=self.msg)
 
@@ -339,7 +413,10 @@ class TestConcentClientService(testutils.TempDirFixture):
             signing_key=self.concent_service.keys_auth._private_key,
             public_key=self.concent_service.keys_auth.public_key,
             concent_variant=self.concent_service.variant,
+            session=self.concent_service._receive_session,
         )
+        assert self.concent_service._receive_session \
+            is not self.concent_service._session
         react_mock.assert_has_calls(
             (
                 mock.call(content),
@@ -366,6 +443,7 @@ class TestConcentClientService(testutils.TempDirFixture):
             signing_key=mock.ANY,
             public_key=mock.ANY,
             concent_variant=self.concent_service.variant,
+            session=mock.ANY,
         )
         sleep_mock.assert_called_once_with()
         react_mock.assert_not_called()
@@ -390,6 +468,7 @@ class TestConcentClientService(testutils.TempDirFixture):
             signing_key=mock.ANY,
             public_key=mock.ANY,
             concent_variant=mock.ANY,
+            session=mock.ANY,
         )
         sleep_mock.assert_called_once_with()
         react_mock.assert_not_called()
@@ -424,13 +503,61 @@ class TestConcentClientService(testutils.TempDirFixture):
         load_mock.return_value = msg = mock.Mock()
         result = self.concent_service.react_to_concent_message(data)
         self.assertIsNone(result)
-        self.concent_service.received_messages.put.assert_called_once_with(msg)
+        self.concent_service.received_messages.put.assert_called_once_with(
+            (msg, None))
         load_mock.assert_called_once_with(
             data,
             self.concent_service.keys_auth._private_key,
             self.concent_service.variant['pubkey'],
         )
 
+    @mock.patch('golem_messages.load')
+    def test_react_to_concent_message_response(self, load_mock, *_):
+        load_mock.return_value = msg = mock.Mock()
+        self.concent_service.react_to_concent_message(
+            object(), response_to=self.msg)
+        # Interpreted on the reactor thread, like received messages
+        self.assertEqual(
+            self.concent_service.received_messages.get_nowait(),
+            (msg, self.msg),
+        )
+
+
+@mock.patch('golem.network.concent.client.ConcentClientService.available',
+            new_callable=mock.PropertyMock, return_value=True)
+class TestConcentClientServiceTransport(testutils.TempDirFixture):
+    def setUp(self):
+        super().setUp()
+        self.keys_auth = keysauth.KeysAuth(
+            datadir=self.path,
+            private_key_name='priv_key',
+            password='password',
+        )
+
+    def test_pooled_pipelined_sending(self, *_):
+        in_flight = client.ConcentClientService.MAX_IN_FLIGHT
+        with StubConcentServer(delay=0.2) as server:
+            concent_service = client.ConcentClientService(
+                keys_auth=self.keys_auth,
+                variant=dict(variables.CONCENT_CHOICES['dev'],
+                             url=server.url),
+            )
+            for _ in range(in_flight * 2):
+                concent_service._queue.put(
+                    msg_factories.concents.ForceReportComputedTaskFactory())
+
+            deadline = time.monotonic() + 10
+            while concent_service._pending or concent_service._sending \
+                    or not concent_service._queue.empty():
+                self.assertLess(time.monotonic(), deadline)
+                concent_service._loop()
+                time.sleep(0.01)
+
+        assert server.requests == in_flight * 2
+        assert server.max_concurrent == in_flight
+        assert server.connections <= in_flight
+        assert not concent_service._backoff
+
 
 class ConcentCallLaterTestCase(testutils.TempDirFixture):
     def setUp(self):
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from golem.network.p2p.headerinventory import HeaderInventory
+
+
+def _header(task_id, timestamp=1, signature=b'sig'):
+    return SimpleNamespace(
+        task_id=task_id, timestamp=timestamp, signature=signature)
+
+
+class TestHeaderInventory(TestCase):
+    def setUp(self):
+        self.inventory = HeaderInventory()
+        self.header = _header('task')
+        self.inventory.add(self.header)
+
+    def test_unknown_header_missing(self):
+        other = _header('other')
+        assert self.inventory.missing([self.header, other]) == [other]
+
+    def test_newer_header_missing(self):
+        newer = _header('task', timestamp=2, signature=b'newer')
+        assert self.inventory.missing([newer]) == [newer]
+
+    def test_changed_header_missing(self):
+        changed = _header('task', signature=b'changed')
+        assert self.inventory.missing([changed]) == [changed]
+
+    def test_older_header_not_missing(self):
+        self.inventory.add(_header('task', timestamp=2, signature=b'newer'))
+        self.inventory.add(self.header)
+        assert self.inventory.missing([self.header]) == []
+
+    def test_discard(self):
+        self.inventory.discard('task')
+        assert self.inventory.missing([self.header]) == [self.header]
+
+    def test_max_size(self):
+        inventory = HeaderInventory(max_size=2)
+        headers = [_header(str(i)) for i in range(3)]
+        inventory.update(headers)
+        assert len(inventory) == 2
+        assert inventory.missing(headers) == headers[:1]
+
+    @patch('golem.network.p2p.headerinventory.time')
+    def test_ttl(self, time):
+        time.monotonic.return_value = 100.
+        inventory = HeaderInventory(ttl=60.)
+        inventory.add(self.header)
+
+        time.monotonic.return_value = 160.
+        assert inventory.missing([self.header]) == []
+        time.monotonic.return_value = 161.
+        assert inventory.missing([self.header]) == [self.header]
+        assert not inventory
+
+        inventory.add(self.header)
+        assert inventory.missing([self.header]) == []
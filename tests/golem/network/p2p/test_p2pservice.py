@@ -1,6 +1,7 @@
 # pylint: disable=protected-access
 from os import urandom
 import random
+import threading
 import time
 import unittest.mock as mock
 from unittest.mock import MagicMock, patch
@@ -11,9 +12,11 @@ import faker
 from golem_messages.datastructures import p2p as dt_p2p
 from golem_messages.factories.datastructures import p2p as dt_p2p_factory
 from golem_messages.message import Disconnect
+from twisted.internet import defer
 from twisted.internet.tcp import EISCONN
 
 from golem.clientconfigdescriptor import ClientConfigDescriptor
+from golem.core.deferred import sync_wait
 from golem.core.keysauth import KeysAuth
 from golem.diag.service import DiagnosticsOutputFormat
 from golem.model import KnownHosts
@@ -21,6 +24,7 @@ from golem.network.p2p import peersession
 from golem.network.p2p.p2pservice import HISTORY_LEN, P2PService, \
     RANDOM_DISCONNECT_FRACTION, MAX_STORED_HOSTS
 from golem.network.p2p.peersession import PeerSession
+from golem.network.p2p.seedresolver import SeedResolver
 from golem.network.transport.tcpnetwork import SocketAddress
 from golem.task.taskconnectionshelper import TaskConnectionsHelper
 from golem.tools.testwithreactor import TestDatabaseWithReactor
@@ -42,7 +46,7 @@ class TestSyncSeeds(TestDatabaseWithReactor):
         self.service.seeds = set()
 
     def test_P2P_SEEDS(self):
-        self.service._sync_seeds()
+        sync_wait(self.service._sync_seeds())
         self.assertGreater(len(self.service.bootstrap_seeds), 0)
         self.assertGreaterEqual(
             len(self.service.seeds),
@@ -53,23 +57,86 @@ class TestSyncSeeds(TestDatabaseWithReactor):
         self.service.bootstrap_seeds = frozenset()
         self.service.config_desc.seed_host = '127.0.0.1'
         self.service.config_desc.seed_port = 'l33t'
-        self.service._sync_seeds()
+        sync_wait(self.service._sync_seeds())
         self.assertEqual(self.service.seeds, set())
 
     def test_no_host(self):
         self.service.bootstrap_seeds = frozenset()
         self.service.config_desc.seed_host = ''
         self.service.config_desc.seed_port = '31337'
-        self.service._sync_seeds()
+        sync_wait(self.service._sync_seeds())
         self.assertEqual(self.service.seeds, set())
 
     def test_gaierror(self):
         self.service.bootstrap_seeds = frozenset()
         self.service.config_desc.seed_host = 'nosuchaddress'
         self.service.config_desc.seed_port = '31337'
-        self.service._sync_seeds()
+        sync_wait(self.service._sync_seeds())
         self.assertEqual(self.service.seeds, set())
 
+    def test_slow_resolver_does_not_block_reactor(self):
+        addresses = {
+            'seed{}.example.com'.format(i): '10.0.0.{}'.format(i)
+            for i in range(4)
+        }
+
+        def _getaddrinfo(host, port, **_kwargs):
+            time.sleep(1)
+            return [(None, None, None, '', (addresses[host], port))]
+
+        self.service._seed_resolver = SeedResolver(getaddrinfo=_getaddrinfo)
+        self.service.bootstrap_seeds = [
+            (host, 40102) for host in addresses]
+        reactor = self._get_reactor()
+
+        deferreds = []
+        started = time.monotonic()
+        reactor.callFromThread(
+            lambda: deferreds.append(self.service._sync_seeds()))
+
+        # the reactor keeps processing calls while seeds are being resolved
+        for _ in range(5):
+            called = threading.Event()
+            call_started = time.monotonic()
+            reactor.callFromThread(called.set)
+            self.assertTrue(called.wait(1))
+            self.assertLess(time.monotonic() - call_started, 0.2)
+        self.assertEqual(self.service.seeds, set())
+
+        # seeds are resolved concurrently
+        sync_wait(deferreds[0])
+        self.assertLess(time.monotonic() - started, 3)
+        self.assertEqual(
+            self.service.seeds,
+            {('10.0.0.{}'.format(i), 40102) for i in range(4)})
+
+    def test_resolved_seeds_connect(self):
+        self.service.connect_to_known_hosts = True
+        self.service.bootstrap_seeds = []
+        with patch.object(self.service, 'connect') as connect:
+            self.service.connect_to_seeds()
+            connect.assert_not_called()
+
+            sync_count = self.service._seeds_sync_count
+            self.service._add_seeds({('10.0.0.1', 40102)}, sync_count)
+            connect.assert_called_once_with(SocketAddress('10.0.0.1', 40102))
+
+            self.service._add_seeds({('10.0.0.2', 40102)}, sync_count)
+            connect.assert_called_once()
+
+    def test_newer_sync_is_not_overwritten(self):
+        pending = defer.Deferred()
+        resolved = defer.succeed({('10.0.0.2', 40102)})
+        self.service.bootstrap_seeds = [('seed.example.com', 40102)]
+        with patch.object(self.service._seed_resolver, 'resolve',
+                          side_effect=[pending, resolved]):
+            first = self.service._sync_seeds()
+            self.service._sync_seeds()
+            pending.callback({('10.0.0.1', 40102)})
+
+        sync_wait(first)
+        self.assertEqual(self.service.seeds, {('10.0.0.2', 40102)})
+
 
 class TestP2PService(TestDatabaseWithReactor):
 
@@ -561,6 +628,28 @@ class TestP2PService(TestDatabaseWithReactor):
             self.assertEqual(
                 self.service.get_performance_percentile_rank(1, 'env'), 1.0)
 
+    def test_get_performance_percentile_rank_after_add_known_peer(self):
+        KnownHosts.delete().execute()
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(1, 'env'), 1.0)
+
+        for i, perf in enumerate((1, 2, 3, 4)):
+            node = dt_p2p_factory.Node(
+                pub_addr='2.2.3.{}'.format(i),
+                pub_port=10000)
+            self.service.add_known_peer(
+                node, node.pub_addr, node.pub_port,
+                metadata={'performance': {'env': perf}})
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(3, 'env'), 0.5)
+
+        # performance of a known host changes
+        self.service.add_known_peer(
+            node, node.pub_addr, node.pub_port,
+            metadata={'performance': {'env': 0}})
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(3, 'env'), 0.75)
+
     def test_disconnect_random_peers_no_peers(self):
         self.service.config_desc.opt_peer_num = 10
         with mock.patch.object(self.service, 'remove_peer') as remove_mock:
@@ -8,6 +8,7 @@ from unittest.mock import patch, Mock, MagicMock, ANY
 
 from golem_messages import message
 from golem_messages.factories.datastructures import p2p as dt_p2p_factory
+from golem_messages.factories.datastructures import tasks as dt_tasks_factory
 
 import golem
 from golem import clientconfigdescriptor
@@ -287,80 +288,129 @@ class TestPeerSession(testutils.DatabaseFixture, LogTestCase,
         peer_session.interpret(msg)
         assert peer_session.p2p_service.set_last_message.called
 
-    def test_react_to_get_tasks(self):
+    def _get_tasks_session(self):
         conn = MagicMock()
         peer_session = PeerSession(conn)
         peer_session.p2p_service.get_own_tasks_headers = Mock()
         peer_session.p2p_service.get_others_tasks_headers = Mock()
         peer_session.send = MagicMock()
+        return peer_session
+
+    @staticmethod
+    def _headers(count):
+        return [dt_tasks_factory.TaskHeaderFactory() for _ in range(count)]
+
+    def test_react_to_get_tasks(self):
+        peer_session = self._get_tasks_session()
 
         peer_session.p2p_service.get_own_tasks_headers.return_value = []
         peer_session.p2p_service.get_others_tasks_headers.return_value = []
         peer_session._react_to_get_tasks(Mock())
         assert not peer_session.send.called
 
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, 100))
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            self._headers(100)
         peer_session.p2p_service.get_others_tasks_headers.return_value = list()
         peer_session._react_to_get_tasks(Mock())
 
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
-        assert len(sent_tasks) == len(set(sent_tasks))
+        assert len(sent_tasks) == len({t.task_id for t in sent_tasks})
 
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, TASK_HEADERS_LIMIT - 1))
-        peer_session.p2p_service.get_others_tasks_headers.return_value = list(
-            range(0, TASK_HEADERS_LIMIT - 1))
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            self._headers(TASK_HEADERS_LIMIT - 1)
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            self._headers(TASK_HEADERS_LIMIT - 1)
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
-        assert len(sent_tasks) == len(set(sent_tasks))
+        assert len(sent_tasks) == len({t.task_id for t in sent_tasks})
 
     def test_react_to_get_tasks_none_list(self):
-        conn = MagicMock()
-        peer_session = PeerSession(conn)
-        peer_session.p2p_service.get_own_tasks_headers = Mock()
-        peer_session.p2p_service.get_others_tasks_headers = Mock()
-        peer_session.send = MagicMock()
+        peer_session = self._get_tasks_session()
 
         peer_session.p2p_service.get_own_tasks_headers.return_value = None
-        peer_session.p2p_service.get_others_tasks_headers.return_value = list(
-            range(0, 10))
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            self._headers(10)
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
-        assert len(sent_tasks) == len(set(sent_tasks))
+        assert len(sent_tasks) == len({t.task_id for t in sent_tasks})
 
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, 10))
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            self._headers(10)
         peer_session.p2p_service.get_others_tasks_headers.return_value = None
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
-        assert len(sent_tasks) == len(set(sent_tasks))
+        assert len(sent_tasks) == len({t.task_id for t in sent_tasks})
 
     def test_react_to_get_tasks_ratio(self):
-        conn = MagicMock()
-        peer_session = PeerSession(conn)
-        peer_session.p2p_service.get_own_tasks_headers = Mock()
-        peer_session.p2p_service.get_others_tasks_headers = Mock()
-        peer_session.send = MagicMock()
-
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, 50))
-        peer_session.p2p_service.get_others_tasks_headers.return_value = list(
-            range(51, 100))
+        peer_session = self._get_tasks_session()
+        own_headers = self._headers(50)
+        other_headers = self._headers(50)
+
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            own_headers
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            other_headers
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
 
-        my_tasks = list(filter(lambda x: x in (0, 50), sent_tasks))
-        other_tasks = list(filter(lambda x: x in (50, 100), sent_tasks))
+        my_tasks = [t for t in sent_tasks if t in own_headers]
+        other_tasks = [t for t in sent_tasks if t in other_headers]
 
         assert len(my_tasks) <= int(TASK_HEADERS_LIMIT / 2)
         assert len(other_tasks) <= int(TASK_HEADERS_LIMIT / 2)
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
-        assert len(sent_tasks) == len(set(sent_tasks))
+        assert len(sent_tasks) == len({t.task_id for t in sent_tasks})
+
+    def test_react_to_get_tasks_skips_known_headers(self):
+        peer_session = self._get_tasks_session()
+        headers = self._headers(TASK_HEADERS_LIMIT // 2)
+        peer_session.p2p_service.get_own_tasks_headers.return_value = headers
+        peer_session.p2p_service.get_others_tasks_headers.return_value = []
+
+        peer_session._react_to_get_tasks(Mock())
+        assert len(peer_session.send.call_args[0][0].tasks) == len(headers)
+
+        peer_session.send.reset_mock()
+        peer_session._react_to_get_tasks(Mock())
+        assert not peer_session.send.called
+
+        updated = copy.copy(headers[0])
+        updated.timestamp += 1
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            [updated] + headers[1:]
+        peer_session._react_to_get_tasks(Mock())
+        assert peer_session.send.call_args[0][0].tasks == [updated]
+
+    def test_react_to_get_tasks_after_remove_task(self):
+        peer_session = self._get_tasks_session()
+        peer_session.p2p_service.task_server.task_keeper.get_owner \
+            .return_value = None
+        headers = self._headers(3)
+        peer_session.p2p_service.get_own_tasks_headers.return_value = headers
+        peer_session.p2p_service.get_others_tasks_headers.return_value = []
+        peer_session._react_to_get_tasks(Mock())
+
+        peer_session.send.reset_mock()
+        peer_session._react_to_remove_task(
+            message.p2p.RemoveTask(task_id=headers[0].task_id))
+        peer_session._react_to_get_tasks(Mock())
+        assert peer_session.send.call_args[0][0].tasks == headers[:1]
+
+    def test_react_to_get_tasks_skips_received_headers(self):
+        peer_session = self._get_tasks_session()
+        headers = self._headers(3)
+        peer_session._react_to_tasks(message.p2p.Tasks(tasks=headers))
+        assert peer_session.p2p_service.add_task_header.call_count == 3
+
+        peer_session.p2p_service.get_own_tasks_headers.return_value = []
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            headers
+        peer_session._react_to_get_tasks(Mock())
+        assert not peer_session.send.called
 
     @patch('golem.network.p2p.peersession.PeerSession._send_peers')
     def test_react_to_get_peers(self, send_mock):
@@ -0,0 +1,87 @@
+import random
+from unittest import TestCase
+
+from golem.network.p2p.performanceindex import PerformanceIndex
+from golem.testutils import PEP8MixIn
+
+
+def linear_percentile_rank(hosts, perf, env_id):
+    hosts_perf = [
+        metadata['performance'].get(env_id, -1.0)
+        for _, metadata in hosts
+        if 'performance' in metadata
+    ]
+    return sum(1 for x in hosts_perf if x < perf) / len(hosts_perf)
+
+
+class TestPerformanceIndex(TestCase, PEP8MixIn):
+    PEP8_FILES = ['golem/network/p2p/performanceindex.py']
+
+    def test_empty(self):
+        index = PerformanceIndex.from_hosts([
+            ('a', {}),
+            ('b', {'other': 'value'}),
+        ])
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.percentile_rank(1.0, 'env'))
+
+    def test_unsupported_env(self):
+        index = PerformanceIndex.from_hosts([
+            ('a', {'performance': {'env': 10.0}}),
+            ('b', {'performance': {'env': 30.0}}),
+            ('c', {'performance': {'other': 20.0}}),
+            ('d', {'performance': {}}),
+        ])
+        self.assertEqual(index.percentile_rank(-1.0, 'env'), 0.0)
+        self.assertEqual(index.percentile_rank(0.0, 'env'), 0.5)
+        self.assertEqual(index.percentile_rank(10.0, 'env'), 0.5)
+        self.assertEqual(index.percentile_rank(20.0, 'env'), 0.75)
+        self.assertEqual(index.percentile_rank(40.0, 'env'), 1.0)
+        self.assertEqual(index.percentile_rank(0.0, 'unknown'), 1.0)
+
+    def test_update(self):
+        index = PerformanceIndex()
+        index.update('a', {'performance': {'env': 10.0}})
+        index.update('b', {'performance': {'env': 20.0}})
+        self.assertEqual(index.percentile_rank(15.0, 'env'), 0.5)
+
+        index.update('a', {'performance': {'env': 30.0}})
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.percentile_rank(15.0, 'env'), 0.0)
+
+        index.update('b', {})
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.percentile_rank(40.0, 'env'), 1.0)
+
+    def test_remove(self):
+        index = PerformanceIndex.from_hosts([
+            ('a', {'performance': {'env': 10.0}}),
+            ('b', {'performance': {'env': 10.0, 'other': 5.0}}),
+        ])
+        index.remove('b')
+        index.remove('unknown')
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.percentile_rank(20.0, 'env'), 1.0)
+        self.assertEqual(index.percentile_rank(20.0, 'other'), 1.0)
+
+        index.remove('a')
+        self.assertIsNone(index.percentile_rank(20.0, 'env'))
+
+    def test_matches_linear_scan(self):
+        envs = ['a', 'b', 'c']
+        hosts = [
+            (i, {'performance': {
+                env_id: float(random.randint(0, 50))
+                for env_id in random.sample(envs, random.randint(0, 3))
+            }})
+            for i in range(200)
+        ]
+        index = PerformanceIndex()
+        for key, metadata in hosts:
+            index.update(key, metadata)
+
+        for perf in [-2.0, -1.0, 0.0, 0.5, 25.0, 50.0, 51.0]:
+            for env_id in envs + ['unknown']:
+                self.assertAlmostEqual(
+                    index.percentile_rank(perf, env_id),
+                    linear_percentile_rank(hosts, perf, env_id))
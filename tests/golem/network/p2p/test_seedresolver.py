@@ -0,0 +1,90 @@
+# pylint: disable=protected-access
+import socket
+import threading
+from unittest.mock import Mock, patch
+
+from golem.core.deferred import sync_wait
+from golem.network.p2p.seedresolver import SeedResolver
+from golem.testutils import PEP8MixIn
+from golem.tools.testwithreactor import TestWithReactor
+
+
+def _addrinfo(*addresses):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', address)
+            for address in addresses]
+
+
+class TestSeedResolver(TestWithReactor, PEP8MixIn):
+    PEP8_FILES = ['golem/network/p2p/seedresolver.py']
+
+    def setUp(self):
+        self.getaddrinfo = Mock(return_value=_addrinfo(('10.0.0.1', 40102)))
+        self.resolver = SeedResolver(
+            ttl=60, failed_ttl=10, getaddrinfo=self.getaddrinfo)
+
+    def test_ip_address(self):
+        resolver = SeedResolver()
+        with patch('golem.network.p2p.seedresolver.deferToThread') as defer_:
+            deferred = resolver.resolve('10.0.0.2', 40102)
+        defer_.assert_not_called()
+        self.assertTrue(deferred.called)
+        self.assertEqual(sync_wait(deferred), {('10.0.0.2', 40102)})
+
+    def test_cached(self):
+        self.assertEqual(
+            sync_wait(self.resolver.resolve('seed.example.com', 40102)),
+            {('10.0.0.1', 40102)})
+        deferred = self.resolver.resolve('seed.example.com', 40102)
+        self.assertTrue(deferred.called)
+        self.assertEqual(sync_wait(deferred), {('10.0.0.1', 40102)})
+        self.getaddrinfo.assert_called_once_with(
+            'seed.example.com', 40102, flags=0)
+
+    @patch('golem.network.p2p.seedresolver.time')
+    def test_expired(self, time_mock):
+        time_mock.monotonic.return_value = 0.
+        sync_wait(self.resolver.resolve('seed.example.com', 40102))
+        time_mock.monotonic.return_value = 61.
+        self.getaddrinfo.return_value = _addrinfo(('10.0.0.2', 40102))
+        self.assertEqual(
+            sync_wait(self.resolver.resolve('seed.example.com', 40102)),
+            {('10.0.0.2', 40102)})
+        self.assertEqual(self.getaddrinfo.call_count, 2)
+
+    @patch('golem.network.p2p.seedresolver.time')
+    def test_failed(self, time_mock):
+        time_mock.monotonic.return_value = 0.
+        self.getaddrinfo.side_effect = socket.gaierror('No address')
+        self.assertEqual(
+            sync_wait(self.resolver.resolve('seed.example.com', 40102)),
+            set())
+
+        # failed lookups are cached for a shorter time
+        time_mock.monotonic.return_value = 5.
+        self.assertEqual(
+            sync_wait(self.resolver.resolve('seed.example.com', 40102)),
+            set())
+        self.assertEqual(self.getaddrinfo.call_count, 1)
+
+        time_mock.monotonic.return_value = 11.
+        self.getaddrinfo.side_effect = None
+        self.assertEqual(
+            sync_wait(self.resolver.resolve('seed.example.com', 40102)),
+            {('10.0.0.1', 40102)})
+
+    def test_pending(self):
+        release = threading.Event()
+
+        def _getaddrinfo(*_args, **_kwargs):
+            release.wait(5)
+            return _addrinfo(('10.0.0.1', 40102))
+
+        self.getaddrinfo.side_effect = _getaddrinfo
+        first = self.resolver.resolve('seed.example.com', 40102)
+        second = self.resolver.resolve('seed.example.com', 40102)
+        self.assertFalse(first.called)
+        release.set()
+
+        self.assertEqual(sync_wait(first), {('10.0.0.1', 40102)})
+        self.assertEqual(sync_wait(second), {('10.0.0.1', 40102)})
+        self.getaddrinfo.assert_called_once()
@@ -0,0 +1,137 @@
+import binascii
+import socket
+import struct
+import threading
+import time
+from unittest import TestCase
+
+from twisted.internet import reactor
+from twisted.internet.protocol import DatagramProtocol
+from twisted.trial.unittest import TestCase as TwistedTestCase
+
+from golem.network.stun import pystun
+
+LOCALHOST = '127.0.0.1'
+
+
+def binding_response(request: bytes, ip: str, port: int) -> bytes:
+    mapped_address = binascii.a2b_hex(pystun.MappedAddress) \
+        + struct.pack('!HHH', 8, 1, port) + socket.inet_aton(ip)
+    return binascii.a2b_hex(pystun.BindResponseMsg) \
+        + struct.pack('!H', len(mapped_address)) \
+        + request[4:20] \
+        + mapped_address
+
+
+class StubStunServer(DatagramProtocol):
+    """ Answers binding requests with a fixed mapped address after a delay,
+    or never if the delay is None """
+
+    def __init__(self, ip, port, delay=0.):
+        self.ip = ip
+        self.port = port
+        self.delay = delay
+        self.requests = 0
+        self.calls = []
+
+    def datagramReceived(self, datagram, addr):
+        self.requests += 1
+        if self.delay is None:
+            return
+        response = binding_response(datagram, self.ip, self.port)
+        self.calls.append(reactor.callLater(
+            self.delay, self.transport.write, response, addr))
+
+    def stopProtocol(self):
+        for call in self.calls:
+            if call.active():
+                call.cancel()
+
+
+class TestResponse(TestCase):
+    def test_parse_response(self):
+        tranid = pystun.gen_tran_id()
+        request = pystun.build_request(tranid)
+        response = binding_response(request, '1.2.3.4', 40102)
+
+        result = pystun.parse_response(response, {tranid.upper()})
+        assert result['Resp']
+        assert result['ExternalIP'] == '1.2.3.4'
+        assert result['ExternalPort'] == 40102
+
+    def test_parse_response_other_transaction(self):
+        request = pystun.build_request(pystun.gen_tran_id())
+        response = binding_response(request, '1.2.3.4', 40102)
+
+        tranid = pystun.gen_tran_id()
+        assert pystun.parse_response(response, {tranid.upper()}) is None
+
+    def test_race_stun_servers(self):
+        silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for sock in (silent, server, client):
+            self.addCleanup(sock.close)
+            sock.bind((LOCALHOST, 0))
+
+        def respond():
+            request, addr = server.recvfrom(2048)
+            server.sendto(binding_response(request, '1.2.3.4', 40102), addr)
+
+        thread = threading.Thread(target=respond, daemon=True)
+        thread.start()
+
+        started = time.monotonic()
+        result = pystun.race_stun_servers(
+            client,
+            [silent.getsockname(), server.getsockname()],
+            timeout=5)
+        assert time.monotonic() - started < 1.
+        assert result['ExternalIP'] == '1.2.3.4'
+        assert result['ExternalPort'] == 40102
+
+
+class TestGetIpInfoAsync(TwistedTestCase):
+    def _server(self, *args, **kwargs):
+        server = StubStunServer(*args, **kwargs)
+        port = reactor.listenUDP(0, server, interface=LOCALHOST)
+        self.addCleanup(port.stopListening)
+        return server, (LOCALHOST, port.getHost().port)
+
+    def test_first_answer_wins(self):
+        _, silent = self._server('1.1.1.1', 1, delay=None)
+        _, slow = self._server('2.2.2.2', 2, delay=2.)
+        _, fast = self._server('3.3.3.3', 3, delay=0.05)
+        started = time.monotonic()
+
+        deferred = pystun.get_ip_info_async(
+            source_ip=LOCALHOST, servers=[silent, slow, fast], timeout=5)
+
+        def check(result):
+            assert result == ('3.3.3.3', 3)
+            # Time to discovery
+            assert time.monotonic() - started < 1.
+
+        return deferred.addCallback(check)
+
+    def test_retransmission(self):
+        server, address = self._server('1.2.3.4', 40102, delay=None)
+
+        def answer():
+            server.delay = 0.
+
+        reactor.callLater(1.2, answer)
+        deferred = pystun.get_ip_info_async(
+            source_ip=LOCALHOST, servers=[address], timeout=5)
+
+        def check(result):
+            assert result == ('1.2.3.4', 40102)
+            assert server.requests >= 3
+
+        return deferred.addCallback(check)
+
+    def test_timeout(self):
+        _, silent = self._server('1.1.1.1', 1, delay=None)
+        deferred = pystun.get_ip_info_async(
+            source_ip=LOCALHOST, servers=[silent], timeout=0.5)
+        return deferred.addCallback(self.assertEqual, (None, None))
@@ -0,0 +1,130 @@
+from unittest import TestCase, mock
+
+from twisted.internet import defer
+from twisted.internet.task import Clock
+
+from golem.network.connectivity import (
+    ConnectivityDiscovery,
+    ExternalAddress,
+    is_public_address,
+)
+
+
+class FakePortMapper:
+    def __init__(self, ip=None):
+        self.ip = ip
+        self.available = False
+        self.discover_calls = 0
+
+    def discover(self):
+        self.discover_calls += 1
+        self.available = self.ip is not None
+
+    @property
+    def network(self):
+        return {'external_ip_address': self.ip}
+
+
+@mock.patch('golem.network.connectivity.threads.deferToThreadPool',
+            lambda _reactor, _pool, fn: defer.maybeDeferred(fn))
+@mock.patch('golem.core.hostaddress.get_host_addresses',
+            return_value=['10.0.0.2'])
+class TestConnectivityDiscovery(TestCase):
+    def setUp(self):
+        self.reactor = Clock()
+        self.reactor.getThreadPool = mock.Mock()
+        self.stun = defer.Deferred()
+        patcher = mock.patch(
+            'golem.network.connectivity.pystun.get_ip_info_async',
+            return_value=self.stun)
+        self.get_ip_info = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.address_changed = mock.Mock()
+        self.discovery = ConnectivityDiscovery(
+            ttl=60, reactor=self.reactor,
+            address_changed=self.address_changed)
+
+    def _discover(self, **kwargs):
+        results = []
+        self.discovery.discover(**kwargs).addCallback(results.append)
+        return results
+
+    def test_stun(self, *_):
+        results = self._discover()
+        assert results == []
+        self.stun.callback(('1.2.3.4', 40102))
+        address = ExternalAddress('1.2.3.4', 40102, 'STUN')
+        assert results == [address]
+        self.address_changed.assert_called_once_with(address)
+
+    def test_port_mapper_first(self, *_):
+        self.discovery.port_mapper = FakePortMapper('1.2.3.4')
+        results = self._discover()
+        assert results == [ExternalAddress('1.2.3.4', None, 'UPnP')]
+        # Late STUN answers are ignored
+        self.stun.callback(('5.6.7.8', 40102))
+        assert self.discovery.address.ip == '1.2.3.4'
+
+    def test_private_addresses_ignored(self, *_):
+        self.discovery.port_mapper = FakePortMapper('192.168.1.1')
+        results = self._discover()
+        assert results == []
+        self.stun.callback(('1.2.3.4', 40102))
+        assert results == [ExternalAddress('1.2.3.4', 40102, 'STUN')]
+
+    def test_not_discovered(self, *_):
+        self.discovery.port_mapper = FakePortMapper()
+        results = self._discover()
+        self.stun.callback((None, None))
+        assert results == [None]
+        assert self.discovery.address is None
+        assert not self.address_changed.called
+
+    def test_concurrent_calls_share_probes(self, *_):
+        first = self._discover()
+        second = self._discover(force=True)
+        self.stun.callback(('1.2.3.4', 40102))
+        assert first == second
+        assert self.get_ip_info.call_count == 1
+
+    def test_cache(self, *_):
+        self._discover()
+        self.stun.callback(('1.2.3.4', 40102))
+
+        self.reactor.advance(59)
+        assert self._discover() == [ExternalAddress('1.2.3.4', 40102, 'STUN')]
+        assert self.get_ip_info.call_count == 1
+
+        self.reactor.advance(2)
+        assert self.discovery.address is None
+        self._discover()
+        assert self.get_ip_info.call_count == 2
+
+    def test_check_network(self, get_host_addresses, *_):
+        self.discovery.check_network()
+        self.stun.callback(('1.2.3.4', 40102))
+        assert self.get_ip_info.call_count == 1
+
+        # Up to date
+        assert self.discovery.check_network() is None
+
+        # Network change
+        stun = defer.Deferred()
+        self.get_ip_info.return_value = stun
+        get_host_addresses.return_value = ['10.0.1.3']
+        results = []
+        self.discovery.check_network().addCallback(results.append)
+        assert self.get_ip_info.call_count == 2
+
+        stun.callback(('5.6.7.8', 40102))
+        assert results == [ExternalAddress('5.6.7.8', 40102, 'STUN')]
+        assert self.address_changed.call_count == 2
+
+
+class TestIsPublicAddress(TestCase):
+    def test_is_public_address(self):
+        assert is_public_address('1.2.3.4')
+        assert not is_public_address(None)
+        assert not is_public_address('10.0.0.1')
+        assert not is_public_address('127.0.0.1')
+        assert not is_public_address('0.0.0.0')
@@ -1,5 +1,6 @@
 # pylint: disable=protected-access
 import datetime
+import pickle
 import queue
 import uuid
 import unittest
@@ -9,6 +10,7 @@ from faker import Faker
 from freezegun import freeze_time
 from peewee import DataError, PeeweeException, IntegrityError
 
+import golem_messages
 from golem_messages import factories as msg_factories
 
 from golem.model import NetworkMessage, Actor
@@ -212,50 +214,72 @@ class TestMessageHistoryService(MessageHistoryServiceTestBase):
         self.service._loop()
         assert not self.service._sweep.called
 
-    def test_loop_add_sync(self):
+    def test_loop_add(self):
         self.service._sweep = mock.Mock()
         self.service._queue_timeout = 0.1
-        self.service.add_sync = mock.Mock()
 
         # No message
         self.service._loop()
-        assert not self.service.add_sync.called
+        assert message_count() == 0
 
-        # Add message
-        msg = self._build_dict()
-        self.service._save_queue.put(msg)
+        # All queued messages are saved at once
+        for _ in range(3):
+            self.service._save_queue.put(self._build_dict())
+        with mock.patch('golem.network.history.NetworkMessage.insert_many',
+                        wraps=NetworkMessage.insert_many) as insert_many:
+            self.service._loop()
+        insert_many.assert_called_once()
+        assert message_count() == 3
+        assert self.service._save_queue.empty()
 
-        # With message
+    def test_loop_remove(self):
+        self.service._sweep = mock.Mock()
+        self.service._queue_timeout = 0.1
+        msgs = [self._build_dict() for _ in range(3)]
+        for msg in msgs:
+            self.service.add_sync(msg)
+
+        # No tuple
         self.service._loop()
-        assert self.service.add_sync.called
+        assert message_count() == 3
 
-        # No message again, since it was popped from the queue
-        self.service.add_sync.reset_mock()
+        self.service._remove_queue.put((msgs[0]['task'], {}))
+        self.service._remove_queue.put(
+            (msgs[1]['task'], dict(subtask=msgs[1]['subtask'])))
+        self.service._remove_queue.put(
+            (msgs[2]['task'], dict(subtask=str(uuid.uuid4()))))
         self.service._loop()
-        assert not self.service.add_sync.called
+        assert message_count() == 1
+        assert self.service._remove_queue.empty()
 
-    def test_loop_remove_sync(self):
+    def test_loop_invalid_message(self):
         self.service._sweep = mock.Mock()
         self.service._queue_timeout = 0.1
-        self.service.remove_sync = mock.Mock()
+        invalid = self._build_dict()
+        invalid['msg_data'] = None
+        self.service._save_queue.put(self._build_dict())
+        self.service._save_queue.put(invalid)
+        self.service._save_queue.put(self._build_dict())
 
-        # No tuple
+        # Valid messages are saved one by one when the batch fails
         self.service._loop()
-        assert not self.service.remove_sync.called
-
-        # Add tuple
-        task = str(uuid.uuid4())
-        props = dict(subtask=str(uuid.uuid4()))
-        self.service._remove_queue.put((task, props))
+        assert message_count() == 2
+        assert self.service._save_queue.empty()
 
-        # With tuple
-        self.service._loop()
-        assert self.service.remove_sync.called
+    def test_loop_temporary_error(self):
+        self.service._sweep = mock.Mock()
+        self.service._queue_timeout = 0.1
+        msg = self._build_dict()
+        removal = (str(uuid.uuid4()), {})
+        self.service._save_queue.put(msg)
+        self.service._remove_queue.put(removal)
 
-        # Not tuple again, since it was popped from the queue
-        self.service.remove_sync.reset_mock()
-        self.service._loop()
-        assert not self.service.remove_sync.called
+        with mock.patch('peewee.InsertQuery.execute',
+                        side_effect=PeeweeException):
+            self.service._loop()
+        assert message_count() == 0
+        assert self.service._save_queue.get(block=False) is msg
+        assert self.service._remove_queue.get(block=False) == removal
 
 
 class TestMessageHistoryGet(MessageHistoryServiceTestBase):
@@ -284,9 +308,11 @@ class TestMessageHistoryGet(MessageHistoryServiceTestBase):
 
         self.assertEqual(self.msg, msg_retrieved)
 
-    def test_get_pickle_fail(self):
-        with mock.patch('golem.model.pickle.loads',
-                        mock.Mock(side_effect=AttributeError)):
+    def test_get_load_fail(self):
+        with mock.patch(
+            'golem.model.golem_messages.load',
+            mock.Mock(side_effect=golem_messages.exceptions.MessageError),
+        ):
             msg_retrieved = history.get(
                 'TaskToCompute',
                 subtask_id=self.msg.subtask_id,
@@ -295,6 +321,55 @@ class TestMessageHistoryGet(MessageHistoryServiceTestBase):
 
         self.assertIsNone(msg_retrieved)
 
+    def test_get_cached(self):
+        with mock.patch('golem.model.golem_messages.load',
+                        wraps=golem_messages.load) as load_mock:
+            for _ in range(2):
+                msg_retrieved = history.get(
+                    'TaskToCompute',
+                    subtask_id=self.msg.subtask_id,
+                    node_id=self.node_id,
+                )
+                self.assertEqual(self.msg, msg_retrieved)
+        load_mock.assert_called_once()
+
+    def test_get_cached_nested_not_shared(self):
+        msg_retrieved = history.get(
+            'TaskToCompute',
+            subtask_id=self.msg.subtask_id,
+            node_id=self.node_id,
+        )
+        msg_retrieved.compute_task_def['subtask_id'] = 'modified'
+
+        msg_retrieved = history.get(
+            'TaskToCompute',
+            subtask_id=self.msg.subtask_id,
+            node_id=self.node_id,
+        )
+        self.assertEqual(self.msg, msg_retrieved)
+
+    def test_get_pickled(self):
+        msg = msg_factories.tasks.TaskToComputeFactory()
+        msg._fake_sign()
+        NetworkMessage.create(
+            task=msg.task_id,
+            subtask=msg.subtask_id,
+            node=self.node_id,
+            msg_date=datetime.datetime.now(),
+            msg_cls='TaskToCompute',
+            msg_data=pickle.dumps(msg),
+            local_role=self.local_role,
+            remote_role=self.remote_role,
+        )
+
+        msg_retrieved = history.get(
+            'TaskToCompute',
+            subtask_id=msg.subtask_id,
+            node_id=self.node_id,
+        )
+
+        self.assertEqual(msg, msg_retrieved)
+
 
 @mock.patch("golem.network.history.MessageHistoryService.add")
 class TestAdd(unittest.TestCase):
@@ -394,7 +469,8 @@ class TestMessageToModel(unittest.TestCase):
             'node': node_id,
             'msg_date': datetime.datetime.now(),
             'msg_cls': 'TaskToCompute',
-            'msg_data': mock.ANY,
+            'msg_data': golem_messages.dump(self.msg, None, None),
+            'msg_version': mock.ANY,
             'local_role': local_role,
             'remote_role': remote_role,
         }
@@ -43,6 +43,23 @@ class TestMsqQueue(testutils.DatabaseFixture):
         self.assertEqual(msg.slots(), self.msg.slots())
         self.assertEqual(len(list(msg_queue.get(self.node_id))), 0)
 
+    def test_put_many(self):
+        node_id2 = str(uuid.uuid4())
+        msgs = [tasks_factories.WantToComputeTaskFactory() for _ in range(3)]
+        msg_queue.put_many([
+            (self.node_id, msgs[0]),
+            (node_id2, msgs[1]),
+            (self.node_id, msgs[2]),
+        ])
+        self.assertEqual(
+            [msg.slots() for msg in msg_queue.get(self.node_id)],
+            [msgs[0].slots(), msgs[2].slots()],
+        )
+        self.assertEqual(
+            [msg.slots() for msg in msg_queue.get(node_id2)],
+            [msgs[1].slots()],
+        )
+
     @freeze_time()
     def test_get_timeout(self):
         timeout = datetime.timedelta(seconds=1)
@@ -1,3 +1,4 @@
+import threading
 from unittest import TestCase
 from unittest.mock import Mock
 
@@ -74,6 +75,22 @@ class TestPortMapperManagerDiscovery(TestCase):
         manager.discover()
         assert all(mapper.discover_calls == 1 for mapper in mappers)
 
+    def test_discover_first_available(self):
+        discovered = threading.Event()
+
+        class SlowPortMapper(MockPortMapper):
+            def discover(self):
+                discovered.wait(5)
+                return super().discover()
+
+        slow = SlowPortMapper(available=True)
+        fast = MockPortMapper(available=True)
+        manager = PortMapperManager(mappers=[slow, fast])
+
+        manager.discover()
+        discovered.set()
+        assert manager._active_mapper is fast
+
 
 class TestPortMapperManagerCreateMapping(TestCase):
 
@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+import numpy as np
+
+from golem.ranking.helper.min_max_utility import vec_to_trust
+from golem.ranking.helper import trust_vector
+
+
+class TestNodeVector(TestCase):
+    def test_add(self):
+        vector = trust_vector.NodeVector((2, 2))
+        vector.add(['a', 'b', 'a'], np.array([
+            [[0.1, 0.5], [0.2, 0.5]],
+            [[0.3, 1.0], [0.0, 1.0]],
+            [[0.1, 0.5], [0.2, 0.5]],
+        ]))
+        self.assertEqual(len(vector), 2)
+        self.assertEqual(vector.node_ids, ['a', 'b'])
+        np.testing.assert_allclose(vector['a'], [[0.2, 1.0], [0.4, 1.0]])
+        np.testing.assert_allclose(vector['b'], [[0.3, 1.0], [0.0, 1.0]])
+
+    def test_grow(self):
+        vector = trust_vector.NodeVector((2,))
+        for i in range(100):
+            vector[str(i)] = [i, -i]
+        self.assertEqual(len(vector), 100)
+        self.assertIn('99', vector)
+        np.testing.assert_allclose(vector['0'], [0, 0])
+        np.testing.assert_allclose(vector['99'], [99, -99])
+
+    def test_get(self):
+        vector = trust_vector.NodeVector.from_array(
+            ['a'], np.array([[0.5, 0.1]]))
+        np.testing.assert_allclose(
+            vector.get(['unknown', 'a']), [[0., 0.], [0.5, 0.1]])
+
+    def test_vec_to_trust(self):
+        values = np.array([
+            [0.3, 0.5], [0.0, 0.5], [0.3, 0.0], [2.0, 1.0], [-3.0, 1.0],
+        ])
+        expected = [vec_to_trust(list(value)) for value in values]
+        np.testing.assert_allclose(
+            trust_vector.vec_to_trust(values), expected)
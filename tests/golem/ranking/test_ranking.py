@@ -95,11 +95,42 @@ class TestRankingDatabase(TestWithDatabase):
         self.assertEqual(nr.computing_trust_value, 0.5)
         self.assertEqual(nr.requesting_trust_value, -0.2)
 
+    def test_global_ranks_batch(self):
+        dm.upsert_global_rank("ABC", 0.3, 0.2, 1.0, 1.0)
+        dm.upsert_global_ranks([
+            ("ABC", 0.4, 0.1, 0.8, 0.7),
+            ("DEF", -0.1, -0.2, 0.9, 0.8),
+        ])
+        gr = dm.get_global_rank("ABC")
+        self.assertEqual(gr.computing_trust_value, 0.4)
+        self.assertEqual(gr.requesting_trust_value, 0.1)
+        self.assertEqual(gr.gossip_weight_computing, 0.8)
+        self.assertEqual(gr.gossip_weight_requesting, 0.7)
+        gr = dm.get_global_rank("DEF")
+        self.assertEqual(gr.computing_trust_value, -0.1)
+        self.assertEqual(gr.gossip_weight_requesting, 0.8)
+
+    def test_neighbour_ranks_batch(self):
+        dm.upsert_neighbour_loc_rank("ABC", "DEF", (0.2, 0.3))
+        dm.upsert_neighbour_loc_ranks([
+            ["ABC", "DEF", [-0.3, 0.9]],
+            ["DEF", "ABC", [0.5, -0.2]],
+            ["ABC", "ABC", [1.0, 1.0]],
+        ])
+        nr = dm.get_neighbour_loc_rank("ABC", "DEF")
+        self.assertEqual(nr.computing_trust_value, -0.3)
+        self.assertEqual(nr.requesting_trust_value, 0.9)
+        nr = dm.get_neighbour_loc_rank("DEF", "ABC")
+        self.assertEqual(nr.computing_trust_value, 0.5)
+        self.assertEqual(nr.requesting_trust_value, -0.2)
+        self.assertIsNone(dm.get_neighbour_loc_rank("ABC", "ABC"))
+
 
 class TestRanking(TestWithDatabase, LogTestCase, PEP8MixIn):
     PEP8_FILES = [
         'golem/ranking/ranking.py',
         'golem/ranking/manager/trust_manager.py',
+        'golem/ranking/helper/trust_vector.py',
     ]
 
     def test_count_trust(self):
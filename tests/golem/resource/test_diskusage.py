@@ -0,0 +1,77 @@
+import os
+from unittest.mock import patch
+
+from golem.resource.diskusage import DiskUsageLedger, path_size
+from golem.resource.dirmanager import DirManager
+from golem.testutils import PEP8MixIn, TempDirFixture
+
+
+class TestDiskUsageLedger(TempDirFixture, PEP8MixIn):
+    PEP8_FILES = ['golem/resource/diskusage.py']
+
+    def setUp(self):
+        super().setUp()
+        self.root = os.path.join(self.path, 'root')
+        os.makedirs(os.path.join(self.root, 'a', 'b'))
+        self._write(os.path.join('a', 'file1'), 10)
+        self._write(os.path.join('a', 'b', 'file2'), 20)
+        self.ledger = DiskUsageLedger()
+        self.ledger.track(self.root)
+
+    def _write(self, relative_path, size):
+        path = os.path.join(self.root, relative_path)
+        with open(path, 'wb') as f:
+            f.write(b'0' * size)
+        return path
+
+    def test_unknown_until_reconciled(self):
+        self.assertIsNone(self.ledger.size(self.root))
+        self.ledger.record(os.path.join(self.root, 'a', 'file1'), 10)
+        self.assertIsNone(self.ledger.size(self.root))
+
+        self.ledger.reconcile()
+        self.assertEqual(self.ledger.size(self.root), 30)
+        self.assertIsNone(self.ledger.size(self.path))
+
+    def test_record(self):
+        self.ledger.reconcile()
+
+        path = self._write('file3', 5)
+        self.ledger.path_added(path)
+        self.assertEqual(self.ledger.size(self.root), 35)
+
+        self.ledger.path_removed(os.path.join(self.root, 'a'), 30)
+        self.assertEqual(self.ledger.size(self.root), 5)
+
+        # paths outside of tracked directories are ignored
+        self.ledger.path_added(self.root)
+        self.ledger.record(os.path.join(self.path, 'other'), 100)
+        self.assertEqual(self.ledger.size(self.root), 5)
+
+    def test_added_directory(self):
+        self.ledger.reconcile()
+        self.ledger.path_added(os.path.join(self.root, 'a'))
+        self.assertEqual(self.ledger.size(self.root), 60)
+
+    def test_reconcile_corrects_drift(self):
+        self.ledger.reconcile()
+        self._write('file3', 5)
+        os.remove(os.path.join(self.root, 'a', 'file1'))
+        self.assertEqual(self.ledger.size(self.root), 30)
+
+        with patch('golem.resource.diskusage.RECONCILE_BATCH_SIZE', 1), \
+                patch('golem.resource.diskusage.time.sleep') as sleep:
+            self.ledger.reconcile()
+        sleep.assert_called()
+        self.assertEqual(self.ledger.size(self.root), 25)
+
+    def test_path_size(self):
+        self.assertEqual(path_size(os.path.join(self.root, 'a')), 30)
+        self.assertEqual(path_size(os.path.join(self.root, 'a', 'file1')), 10)
+        self.assertEqual(path_size(os.path.join(self.root, 'missing')), 0)
+
+    def test_dir_manager_clear_dir(self):
+        self.ledger.reconcile()
+        with patch('golem.resource.dirmanager.ledger', self.ledger):
+            DirManager(self.path).clear_dir(os.path.join(self.root, 'a'))
+        self.assertEqual(self.ledger.size(self.root), 0)
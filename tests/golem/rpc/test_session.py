@@ -4,11 +4,14 @@ from unittest.mock import Mock, patch
 
 import autobahn
 from twisted.internet.defer import Deferred
+from twisted.internet.task import Clock
 
 from golem.rpc import session as rpc_session
 from golem.rpc import utils as rpc_utils
+from golem.rpc.mapping.rpceventnames import Task
 from golem.rpc.session import (
     logger,
+    CoalescingPublisher,
     Publisher,
     RPCAddress,
     Session,
@@ -99,6 +102,90 @@ class TestPublisher(LogTestCase):
         session.publish.assert_called_with('alias', 1234, kw='arg')
 
 
+class FakeReactor(Clock):
+    @staticmethod
+    def callFromThread(f, *args, **kwargs):  # noqa pylint: disable=invalid-name
+        f(*args, **kwargs)
+
+
+class TestCoalescingPublisher(unittest.TestCase):
+
+    def setUp(self):
+        self.reactor = FakeReactor()
+        self.session = Mock()
+        self.session.is_open.return_value = True
+        self.session.is_closing.return_value = False
+        self.acknowledgements = []
+
+        def publish(*_args, **_kwargs):
+            self.acknowledgements.append(Deferred())
+            return self.acknowledgements[-1]
+
+        self.session.publish.side_effect = publish
+        self.publisher = CoalescingPublisher(
+            self.session, interval=1., max_interval=4., max_in_flight=2,
+            reactor=self.reactor)
+
+    def published(self):
+        return [c[0] for c in self.session.publish.call_args_list]
+
+    def test_other_events_not_coalesced(self):
+        self.publisher.publish('alias', 1234, kw='arg')
+        self.session.publish.assert_called_once_with('alias', 1234, kw='arg')
+        assert self.publisher.pending() == 0
+
+    def test_last_value_wins(self):
+        self.publisher.publish(Task.evt_task_status, 't1', 'TaskOp', 1)
+        self.publisher.publish(Task.evt_subtask_status, 't1', 's1', 1)
+        self.publisher.publish(Task.evt_task_status, 't1', 'TaskOp', 2)
+        assert not self.session.publish.called
+
+        self.reactor.advance(1.)
+        assert self.published() == [
+            (Task.evt_subtask_status, 't1', 's1', 1),
+            (Task.evt_task_status, 't1', 'TaskOp', 2),
+        ]
+        assert self.publisher.frames_sent == 2
+
+    def test_backpressure(self):
+        for subtask_id in ('s1', 's2', 's3'):
+            self.publisher.publish(Task.evt_subtask_status, 't1', subtask_id, 1)
+
+        self.reactor.advance(1.)
+        assert len(self.published()) == 2
+        assert self.publisher.pending() == 1
+        assert self.publisher.current_interval == 2.
+
+        # Nothing acknowledged yet
+        self.reactor.advance(2.)
+        assert len(self.published()) == 2
+        assert self.publisher.current_interval == 4.
+
+        self.acknowledgements[0].callback(None)
+        self.reactor.advance(4.)
+        assert len(self.published()) == 3
+        assert self.publisher.pending() == 0
+        assert self.publisher.current_interval == 1.
+        assert self.publisher.in_flight == 2
+
+    def test_snapshot(self):
+        self.publisher.publish(Task.evt_task_status, 't1', 'TaskOp', 1)
+        self.publisher.publish(Task.evt_subtask_status, 't1', 's1', 1)
+        self.publisher.publish(Task.evt_task_status, 't1', 'TaskOp', 2)
+        self.reactor.advance(1.)
+
+        assert self.publisher.snapshot() == [
+            [Task.evt_subtask_status, ['t1', 's1', 1]],
+            [Task.evt_task_status, ['t1', 'TaskOp', 2]],
+        ]
+
+    def test_stop(self):
+        self.publisher.publish(Task.evt_task_status, 't1', 'TaskOp', 1)
+        self.publisher.stop()
+        self.reactor.advance(1.)
+        assert not self.session.publish.called
+
+
 def mock_report_calls(func):
     return func
 
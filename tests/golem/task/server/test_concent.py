@@ -0,0 +1,35 @@
+import queue
+import unittest
+from unittest import mock
+
+from golem.task.server import concent
+
+
+@mock.patch('golem.task.server.concent.library')
+class TestProcessMessagesReceivedFromConcent(unittest.TestCase):
+    def setUp(self):
+        self.concent_service = mock.Mock(received_messages=queue.Queue())
+
+    def test_received_and_responses(self, library_mock):
+        received, response, request = mock.Mock(), mock.Mock(), mock.Mock()
+        self.concent_service.received_messages.put((received, None))
+        self.concent_service.received_messages.put((response, request))
+
+        concent.process_messages_received_from_concent(self.concent_service)
+
+        library_mock.interpret.assert_has_calls([
+            mock.call(received, response_to=None),
+            mock.call(response, response_to=request),
+        ])
+        assert self.concent_service.received_messages.empty()
+
+    def test_interpret_error(self, library_mock):
+        library_mock.interpret.side_effect = Exception
+        for _ in range(2):
+            self.concent_service.received_messages.put((mock.Mock(), None))
+
+        concent.process_messages_received_from_concent(self.concent_service)
+
+        assert library_mock.interpret.call_count == 2
+        # Both messages are marked as done, so stop() doesn't hang
+        self.concent_service.received_messages.join()
@@ -1,4 +1,6 @@
 # pylint: disable=protected-access
+import time
+from collections import OrderedDict
 from unittest import mock
 
 from twisted.internet.defer import Deferred
@@ -9,6 +11,7 @@ from golem_messages.factories.datastructures import p2p as dt_p2p_factory
 from golem_messages.factories import helpers as msg_helpers
 
 from golem.network.p2p.local_node import LocalNode
+from golem.rpc.mapping.rpceventnames import Resources
 from golem.task.server.resources import TaskResourcesMixin
 from golem.task.tasksession import TaskSession
 from golem.testutils import TestWithClient
@@ -161,3 +164,106 @@ class TestResourceHandhsake(TestWithClient):
             timeout_seconds=mock.ANY,
             persist=False,
         )
+
+
+@mock.patch('twisted.internet.reactor.callFromThread',
+            side_effect=lambda fn, *args, **kwargs: fn(*args, **kwargs))
+@mock.patch('golem.task.server.resources.EventPublisher.publish')
+class TestRestoreResources(TestWithClient):
+    TASK_COUNT = 10
+
+    def setUp(self):
+        super().setUp()
+        self.server = TaskResourcesMixin()
+        self.server.client = self.client
+        self.server.get_share_options = mock.Mock()
+        self.server.task_manager = mock.Mock(
+            tasks={}, tasks_states={}, tasks_restoring_resources=set())
+        self.server.task_manager.delete_task.side_effect = self._delete_task
+        self.server.task_manager.get_unfinished_task_ids.side_effect = \
+            lambda: list(self.server.task_manager.tasks)
+        # Uploads in progress in a fake Hyperdrive
+        self.uploads = OrderedDict()
+        self.server.resource_manager.add_resources.side_effect = \
+            self._add_resources
+
+        # Task ids in the order of deadlines
+        self.task_ids = ['task-{}'.format(i) for i in range(self.TASK_COUNT)]
+        deadline = int(time.time()) + 3600
+        for i, task_id in reversed(list(enumerate(self.task_ids))):
+            task = mock.Mock()
+            task.header.deadline = deadline + i
+            self.server.task_manager.tasks[task_id] = task
+            self.server.task_manager.tasks_states[task_id] = \
+                mock.Mock(resource_hash=None)
+
+    def _add_resources(self, _files, task_id, **_kwargs):
+        self.uploads[task_id] = Deferred()
+        return self.uploads[task_id]
+
+    def _delete_task(self, task_id):
+        del self.server.task_manager.tasks[task_id]
+        del self.server.task_manager.tasks_states[task_id]
+
+    def _finish_upload(self, task_id, error=None):
+        deferred = self.uploads.pop(task_id)
+        if error:
+            deferred.errback(error)
+        else:
+            deferred.callback(('hash-' + task_id, []))
+
+    def test_bounded_concurrency(self, *_):
+        concurrency = TaskResourcesMixin.RESTORE_CONCURRENCY
+        result = self.server.restore_resources()
+
+        self.assertEqual(list(self.uploads),
+                         self.task_ids[:concurrency])
+        self.assertEqual(self.server.task_manager.tasks_restoring_resources,
+                         set(self.task_ids))
+
+        self._finish_upload(self.task_ids[0])
+        self.assertEqual(list(self.uploads),
+                         self.task_ids[1:concurrency + 1])
+        self.assertNotIn(self.task_ids[0],
+                         self.server.task_manager.tasks_restoring_resources)
+        self.assertEqual(
+            self.server.task_manager.tasks_states[self.task_ids[0]]
+            .resource_hash, 'hash-' + self.task_ids[0])
+
+        while self.uploads:
+            self._finish_upload(next(iter(self.uploads)))
+        self.assertTrue(result.called)
+        self.assertFalse(self.server.task_manager.tasks_restoring_resources)
+
+        progress = self.server.get_resources_restoration()
+        self.assertEqual(progress['restored'], self.TASK_COUNT)
+        self.assertEqual(progress['pending'], 0)
+        self.assertIsNotNone(progress['finished_after'])
+
+    def test_errors(self, publish, *_):
+        self.server.restore_resources()
+        self._finish_upload(self.task_ids[0], ConnectionError())
+        self._finish_upload(self.task_ids[1])
+        # Deleted while being restored
+        self._delete_task(self.task_ids[2])
+        self._finish_upload(self.task_ids[2])
+
+        self.server.task_manager.delete_task.assert_called_once_with(
+            self.task_ids[0])
+        progress = self.server.get_resources_restoration()
+        self.assertEqual(progress['failed'], 1)
+        self.assertEqual(progress['restored'], 1)
+        self.assertEqual(progress['skipped'], 1)
+        self.assertEqual(progress['pending'], self.TASK_COUNT - 3)
+        self.assertEqual(publish.call_count, 3)
+        publish.assert_called_with(Resources.evt_restore_progress, progress)
+
+    def test_no_tasks(self, *_):
+        self.server.task_manager.tasks.clear()
+        self.server.task_manager.tasks_states.clear()
+
+        result = self.server.restore_resources()
+        self.assertTrue(result.called)
+        self.assertEqual(self.server.get_resources_restoration()['total'], 0)
+        self.assertIsNotNone(
+            self.server.get_resources_restoration()['finished_after'])
@@ -0,0 +1,111 @@
+from unittest import mock
+
+from golem_messages import cryptography
+from golem_messages import factories
+from peewee import OperationalError
+from twisted.internet import defer
+from twisted.internet.task import Clock
+
+from golem import model
+from golem import testutils
+from golem.network import history
+from golem.network.transport import msg_queue
+from golem.task.server.responses import ResponsePipeline
+
+
+def run_in_place(_reactor, _pool, fn, *args):
+    return defer.maybeDeferred(fn, *args)
+
+
+@mock.patch('golem.task.server.responses.threads.deferToThreadPool',
+            run_in_place)
+class TestResponsePipeline(testutils.DatabaseFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.reactor = Clock()
+        self.reactor.getThreadPool = mock.Mock()
+        self.keys = cryptography.ECCx(None)
+        keys_auth = mock.Mock(_private_key=self.keys.raw_privkey)
+        self.history = history.MessageHistoryService()
+        self.addCleanup(
+            setattr, history.MessageHistoryService, 'instance', None)
+        self.pipeline = ResponsePipeline(keys_auth, reactor=self.reactor)
+
+    def _add(self, node_id, count=1):
+        msgs = []
+        for _ in range(count):
+            msg = factories.tasks.SubtaskResultsAcceptedFactory()
+            self.pipeline.add(node_id, 'provider', msg)
+            msgs.append(msg)
+        return msgs
+
+    def test_flush_after_interval(self):
+        msgs_a = self._add('node_a', 3)
+        msgs_b = self._add('node_b', 2)
+
+        assert not model.QueuedMessage.select().count()
+        self.reactor.advance(ResponsePipeline.FLUSH_INTERVAL)
+
+        assert self.pipeline.pending == 0
+        assert [m.subtask_id for m in msg_queue.get('node_a')] == \
+            [m.subtask_id for m in msgs_a]
+        assert [m.subtask_id for m in msg_queue.get('node_b')] == \
+            [m.subtask_id for m in msgs_b]
+
+        saved = model.NetworkMessage.select()
+        assert saved.count() == 5
+        for row in saved:
+            assert row.node == 'provider'
+            assert row.local_role == model.Actor.Requestor
+            assert row.as_message().verify_signature(self.keys.raw_pubkey)
+
+    @mock.patch.object(ResponsePipeline, 'MAX_BATCH_SIZE', 2)
+    def test_flush_full_batch(self):
+        self._add('node', 2)
+        self.reactor.advance(0)
+        assert model.QueuedMessage.select().count() == 2
+
+    def test_flushes_run_one_at_a_time(self):
+        writes = []
+
+        def write_later(_reactor, _pool, fn, batch):
+            deferred = defer.Deferred()
+            writes.append((deferred, fn, batch))
+            return deferred
+
+        with mock.patch('golem.task.server.responses.threads'
+                        '.deferToThreadPool', write_later):
+            first = self._add('node')
+            self.reactor.advance(ResponsePipeline.FLUSH_INTERVAL)
+            second = self._add('node', 2)
+            self.reactor.advance(ResponsePipeline.FLUSH_INTERVAL)
+            assert len(writes) == 1
+
+            deferred, fn, batch = writes.pop()
+            fn(batch)
+            deferred.callback(None)
+            self.reactor.advance(0)
+            assert len(writes) == 1
+
+            deferred, fn, batch = writes.pop()
+            fn(batch)
+            deferred.callback(None)
+
+        assert [m.subtask_id for m in msg_queue.get('node')] == \
+            [m.subtask_id for m in first + second]
+
+    def test_batch_write_failure(self):
+        with mock.patch('golem.task.server.responses.msg_queue.put_many',
+                        side_effect=OperationalError):
+            self._add('node', 2)
+            self.reactor.advance(ResponsePipeline.FLUSH_INTERVAL)
+
+        assert model.QueuedMessage.select().count() == 2
+        assert self.history._save_queue.qsize() == 2
+
+    def test_stop(self):
+        self._add('node', 2)
+        self.pipeline.stop()
+        assert model.QueuedMessage.select().count() == 2
+        assert not self.reactor.getDelayedCalls()
@@ -1,16 +1,17 @@
 # pylint: disable=unused-argument
 # pylint: disable=redefined-outer-name
 # ^^ Pytest fixtures in the same file require the same name
+import asyncio
 from pathlib import Path
 
 from mock import patch, MagicMock
 import pytest
 
+from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.envs import Environment, EnvMetadata
 from golem.model import AppBenchmark
 from golem.task.benchmarkmanager import AppBenchmarkManager
 from golem.task.envmanager import EnvironmentManager
-from golem.task.exceptions import ComputationInProgress
 from golem.task.task_api import TaskApiPayloadBuilder
 from golem.testutils import pytest_database_fixture  # noqa pylint: disable=unused-import
 from tests.utils.asyncio import AsyncMock
@@ -36,7 +37,8 @@ class TestAppBenchmarkManager:
         self.env_manager = EnvironmentManager(Path(tmpdir))
         self.app_benchmark_manager = AppBenchmarkManager(
             env_manager=self.env_manager,
-            root_path=Path(tmpdir))
+            root_path=Path(tmpdir),
+            cpu_budget=4)
         self.setup_env(ENV_ID)
 
     @pytest.mark.asyncio
@@ -70,16 +72,122 @@ class TestAppBenchmarkManager:
         assert benchmark.score == 10.
 
     @pytest.mark.asyncio
-    async def test_get_benchmark_score_exception(self):
+    async def test_get_benchmark_score_in_progress(self):
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        calls = []
+
+        async def run_benchmark(*args):
+            calls.append(args)
+            started.set()
+            await finish.wait()
+            return 10.
+
+        self.app_benchmark_manager._run_benchmark = run_benchmark
+
+        first = asyncio.ensure_future(self.app_benchmark_manager.get(
+            env_id=ENV_ID,
+            env_prereq_dict=PREREQ_DICT))
+        await started.wait()
+        second = asyncio.ensure_future(self.app_benchmark_manager.get(
+            env_id=ENV_ID,
+            env_prereq_dict=PREREQ_DICT))
+        await asyncio.sleep(0)
+        finish.set()
+
+        assert (await first).score == (await second).score == 10.
+        assert len(calls) == 1
+        assert not self.app_benchmark_manager._computing
+
+    @pytest.mark.asyncio
+    async def test_get_benchmark_score_concurrent_envs(self):
+        self.setup_env('other_env')
+        running = []
+        finish = asyncio.Event()
+
+        async def run_benchmark(env_id, _prereq):
+            running.append(env_id)
+            await finish.wait()
+            return 10.
+
+        self.app_benchmark_manager._run_benchmark = run_benchmark
+
+        results = asyncio.ensure_future(asyncio.gather(
+            self.app_benchmark_manager.get(ENV_ID, PREREQ_DICT),
+            self.app_benchmark_manager.get(ENV_ID, dict(key='other')),
+            self.app_benchmark_manager.get('other_env', PREREQ_DICT),
+        ))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        # Benchmarks of the same environment don't run concurrently
+        assert sorted(running) == [ENV_ID, 'other_env']
+
+        finish.set()
+        await results
+        assert sorted(running) == [ENV_ID, ENV_ID, 'other_env']
+
+    @pytest.mark.asyncio
+    async def test_get_benchmark_score_cpu_budget(self):
+        self.setup_env('other_env')
+        config_desc = ClientConfigDescriptor()
+        config_desc.num_cores = 4
+        running = []
+        finish = asyncio.Event()
+
+        async def run_benchmark(env_id, _prereq):
+            running.append(env_id)
+            await finish.wait()
+            return 10.
+
+        self.app_benchmark_manager._run_benchmark = run_benchmark
+
+        with patch('golem.hardware.cpu_model', return_value='CPU'):
+            self.app_benchmark_manager.update_config(config_desc)
+            results = asyncio.ensure_future(asyncio.gather(
+                self.app_benchmark_manager.get(ENV_ID, PREREQ_DICT),
+                self.app_benchmark_manager.get('other_env', PREREQ_DICT),
+            ))
+            for _ in range(3):
+                await asyncio.sleep(0)
+            assert len(running) == 1
+
+            finish.set()
+            await results
+            assert len(running) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_benchmark_score_config_change(self):
         self.app_benchmark_manager._run_benchmark = AsyncMock(return_value=10.)
-        self.app_benchmark_manager._computing = True
+        config_desc = ClientConfigDescriptor()
+        config_desc.num_cores = 1
 
-        with pytest.raises(ComputationInProgress):
-            await self.app_benchmark_manager.get(
-                env_id=ENV_ID,
-                env_prereq_dict=PREREQ_DICT)
+        async def get_with_cores(num_cores):
+            config_desc.num_cores = num_cores
+            self.app_benchmark_manager.update_config(config_desc)
+            return await self.app_benchmark_manager.get(ENV_ID, PREREQ_DICT)
 
-        assert not self.app_benchmark_manager._run_benchmark.called
+        with patch('golem.hardware.cpu_model', return_value='CPU'):
+            first = await get_with_cores(1)
+            second = await get_with_cores(2)
+            assert first.hash != second.hash
+            assert self.app_benchmark_manager._run_benchmark.call_count == 2
+
+            assert (await get_with_cores(1)).hash == first.hash
+            assert self.app_benchmark_manager._run_benchmark.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_on_first_get(self):
+        self.app_benchmark_manager._run_benchmark = AsyncMock(return_value=10.)
+        config_desc = ClientConfigDescriptor()
+
+        with patch('golem.hardware.cpu_model', return_value='CPU') as cpu_model:
+            self.app_benchmark_manager.update_config(config_desc)
+            assert not cpu_model.called
+
+            for _ in range(2):
+                await self.app_benchmark_manager.get(ENV_ID, PREREQ_DICT)
+            cpu_model.assert_called_once_with()
 
     @pytest.mark.asyncio
     async def test_run_benchmark(self):
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
-from unittest import TestCase
+import os
+import pickle
+from unittest import TestCase, mock
 from uuid import uuid4
 
 from freezegun import freeze_time
@@ -10,6 +12,7 @@ import pytz
 from golem.task.taskarchiver import TaskArchiver
 from golem.environments.environment import SupportStatus, UnsupportReason
 from golem.core.common import timeout_to_deadline
+from golem.testutils import TempDirFixture
 
 
 class TestTaskArchiver(TestCase):
@@ -191,3 +194,73 @@ class TestTaskArchiver(TestCase):
         ta.do_maintenance()
         rep = ta.get_unsupport_reasons(5)
         self.assertEqual(self.get_row(rep, UnsupportReason.MAX_PRICE), (2, 4))
+
+
+@mock.patch('golem.core.golem_async.async_run',
+            lambda request, *_: request.method())
+class TestTaskArchiverStorage(TempDirFixture):
+    def setUp(self):
+        super().setUp()
+        self.ssmp = SupportStatus.err({UnsupportReason.MAX_PRICE: "0"})
+
+    def _add_tasks(self, ta, prices, deadline=None):
+        for price in prices:
+            th = TestTaskArchiver.header(price, deadline=deadline)
+            ta.add_task(th)
+            ta.add_support_status(th.task_id, self.ssmp)
+        ta.do_maintenance()
+
+    def test_restore_from_journal(self):
+        ta = TaskArchiver(self.tempdir)
+        self._add_tasks(ta, [3, 5])
+        self._add_tasks(ta, [7], deadline=timeout_to_deadline(-10))
+        rep = ta.get_unsupport_reasons(5)
+
+        restored = TaskArchiver(self.tempdir)
+        self.assertEqual(restored.get_unsupport_reasons(5), rep)
+        self.assertEqual(len(restored._archive.tasks), 2)
+
+    def test_compaction(self):
+        ta = TaskArchiver(self.tempdir, journal_max_size=1)
+        self._add_tasks(ta, [3, 5])
+        journal = os.path.join(self.tempdir, 'task_archive.pickle.journal')
+        self.assertEqual(os.path.getsize(journal), 0)
+
+        restored = TaskArchiver(self.tempdir)
+        self.assertEqual(restored.get_unsupport_reasons(5),
+                         ta.get_unsupport_reasons(5))
+
+    def test_upgrade_from_v1(self):
+        ta = TaskArchiver()
+        self._add_tasks(ta, [3], deadline=timeout_to_deadline(-10))
+        self._add_tasks(ta, [5, 7])
+        rep = ta.get_unsupport_reasons(5)
+
+        # Version 1 archives had no live intervals nor deadline index
+        archive = ta._archive
+        del archive.live_intervals
+        del archive.deadlines
+        archive.class_version = 1
+        with open(os.path.join(self.tempdir, 'task_archive.pickle'),
+                  'wb') as f:
+            pickle.dump(archive, f)
+
+        restored = TaskArchiver(self.tempdir)
+        self.assertEqual(restored._archive.class_version, 2)
+        self.assertEqual(restored.get_unsupport_reasons(5), rep)
+        self.assertEqual(len(restored._archive.tasks), 2)
+        self.assertEqual(
+            sorted(restored._archive.deadlines),
+            sorted((t.deadline, t.uuid)
+                   for t in restored._archive.tasks.values()))
+
+    def test_expire_incrementally(self):
+        ta = TaskArchiver()
+        self._add_tasks(ta, [3], deadline=timeout_to_deadline(-10))
+        self._add_tasks(ta, [5, 7])
+
+        self.assertEqual(len(ta._archive.tasks), 2)
+        self.assertEqual(len(ta._archive.intervals), 1)
+        self.assertEqual(
+            [d for d, _ in ta._archive.deadlines],
+            sorted(t.deadline for t in ta._archive.tasks.values()))
@@ -563,6 +563,20 @@ class TestChangeConfig(TestTaskComputerBase):
         self.docker_manager.update_config.assert_called_once()
 
 
+class TestSetLimits(TestTaskComputerBase):
+
+    def test_set_limits(self):
+        self.docker_manager.hypervisor = mock.Mock()
+        self.task_computer.set_limits(num_cores=3, max_memory_size=2048)
+
+        self.assertEqual(self.task_computer.max_num_cores, 3)
+        self.docker_manager.set_container_limits.assert_called_once_with(
+            3, 2048)
+        self.docker_manager.build_config.assert_not_called()
+        self.docker_manager.update_config.assert_not_called()
+        self.docker_manager.hypervisor.assert_not_called()
+
+
 @mock.patch('golem.task.taskcomputer.ProviderTimer')
 class TestTaskGiven(TestTaskComputerBase):
 
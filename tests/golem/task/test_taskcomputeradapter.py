@@ -357,6 +357,13 @@ class TestTaskResourcesDir(TaskComputerAdapterTestBase):
         )
 
 
+class TestSetLimits(TaskComputerAdapterTestBase):
+
+    def test_set_limits(self):
+        self.adapter.set_limits(num_cores=3, max_memory_size=2048)
+        self.old_computer.set_limits.assert_called_once_with(3, 2048)
+
+
 class TestQuit(TaskComputerAdapterTestBase):
 
     def test_quit(self):
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock
+
+from golem.task.taskindex import LazyMapping, read_summary, summary_path, \
+    SUMMARY_VERSION, task_summary, write_summary
+from golem.task.taskstate import TaskState, TaskStatus
+
+
+class TestLazyMapping(TestCase):
+    def setUp(self):
+        self.mapping = LazyMapping()
+        self.loader = Mock(side_effect=lambda: self.mapping.update(a=1))
+        self.mapping['b'] = 2
+        self.mapping.set_lazy('a', self.loader)
+
+    def test_keys_without_loading(self):
+        assert 'a' in self.mapping
+        assert set(self.mapping) == {'a', 'b'}
+        assert len(self.mapping) == 2
+        self.loader.assert_not_called()
+
+    def test_load_on_access(self):
+        assert self.mapping['a'] == 1
+        assert self.mapping.get('a') == 1
+        self.loader.assert_called_once_with()
+
+    def test_delete_without_loading(self):
+        del self.mapping['a']
+        assert 'a' not in self.mapping
+        self.loader.assert_not_called()
+        with self.assertRaises(KeyError):
+            del self.mapping['a']
+
+    def test_set_replaces_loader(self):
+        self.mapping['a'] = 3
+        assert self.mapping['a'] == 3
+        self.loader.assert_not_called()
+
+    def test_failed_load(self):
+        self.loader.side_effect = None
+        with self.assertRaises(KeyError):
+            _ = self.mapping['a']
+        assert 'a' not in self.mapping
+        assert self.mapping.get('a') is None
+
+
+class TestSummary(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.dump_path = Path(self.dir.name) / 'task.pickle'
+        self.dump_path.write_bytes(b'pickle')
+
+        self.task = Mock()
+        self.task.header.task_id = 'task'
+        self.task.header.deadline = 123
+        self.task.header.task_owner.key = 'owner'
+        self.task.task_definition.timeout = 60
+        self.task.to_dictionary.return_value = {'id': 'task', 'progress': 1.}
+        self.state = TaskState()
+        self.state.status = TaskStatus.finished
+        self.state.subtasks_count = 2
+        self.state.subtask_states = {'sub1': Mock(), 'sub2': Mock()}
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_write_and_read(self):
+        write_summary(self.dump_path, self.task, self.state)
+        summary = read_summary(self.dump_path)
+        assert summary == {
+            'version': SUMMARY_VERSION,
+            'task_id': 'task',
+            'status': TaskStatus.finished.value,
+            'deadline': 123,
+            'owner': 'owner',
+            'subtasks_count': 2,
+            'subtask_ids': ['sub1', 'sub2'],
+            'task_summary': task_summary(self.task, self.state),
+        }
+        assert summary['task_summary']['id'] == 'task'
+        assert summary['task_summary']['timeout'] == '0:01:00'
+
+    def test_missing(self):
+        assert read_summary(self.dump_path) is None
+
+    def test_other_version(self):
+        summary_path(self.dump_path).write_text(
+            json.dumps({'task_id': 'task'}))
+        assert read_summary(self.dump_path) is None
+
+    def test_broken(self):
+        summary_path(self.dump_path).write_text('{not json')
+        assert read_summary(self.dump_path) is None
+
+    def test_outdated(self):
+        write_summary(self.dump_path, self.task, self.state)
+        mtime = summary_path(self.dump_path).stat().st_mtime
+        os.utime(str(self.dump_path), (mtime + 10, mtime + 10))
+        assert read_summary(self.dump_path) is None
@@ -37,6 +37,7 @@ from golem.resource import dirmanager
 from golem.task.taskbase import Task, \
     TaskEventListener, AcceptClientVerdict, TaskResult
 from golem.task.taskclient import TaskClient
+from golem.task.taskindex import summary_path
 from golem.task.taskmanager import TaskManager, logger
 from golem.task.taskstate import SubtaskStatus, SubtaskState, TaskState, \
     TaskStatus, TaskOp, SubtaskOp, OtherOp
@@ -272,6 +273,70 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
         self.tm.restore_tasks()
         assert not broken_pickle_file.is_file()
 
+    def test_restore_completed_task_lazily(self, *_):
+        task = self._get_test_dummy_task("xyz0")
+        self.tm.add_new_task(task)
+        self.tm.tasks_states["xyz0"].status = TaskStatus.finished
+        self.tm.dump_task("xyz0")
+
+        fresh_tm = TaskManager(
+            dt_p2p_factory.Node(),
+            keys_auth=Mock(),
+            root_path=self.path,
+            config_desc=ClientConfigDescriptor(),)
+
+        assert "xyz0" in fresh_tm.tasks
+        assert "xyz0" in fresh_tm._lazy_task_ids
+        assert not fresh_tm._loaded_tasks()
+        assert not fresh_tm.get_unfinished_task_ids()
+        assert fresh_tm.get_progresses() == {}
+        summary = fresh_tm.get_task_summary("xyz0")
+        assert summary['id'] == "xyz0"
+        assert summary['status'] == TaskStatus.finished.value
+        assert "xyz0" in fresh_tm._lazy_task_ids
+        assert summary['time_created'] == \
+            fresh_tm.tasks_states["xyz0"].time_started
+        assert fresh_tm.get_indexed_task_summary("xyz0") == summary
+
+        assert fresh_tm.tasks_states["xyz0"].status == TaskStatus.finished
+        assert fresh_tm.tasks["xyz0"].header.task_id == "xyz0"
+        assert "xyz0" not in fresh_tm._lazy_task_ids
+
+    def test_dump_task_summary_error(self, *_):
+        task = self._get_test_dummy_task("xyz0")
+        self.tm.add_new_task(task)
+        dump_path = self.tm._dump_filepath("xyz0")
+
+        with patch('golem.task.taskmanager.write_summary',
+                   side_effect=OSError):
+            self.tm.dump_task("xyz0")
+
+        assert dump_path.exists()
+        assert not summary_path(dump_path).exists()
+
+        self.tm.dump_task("xyz0")
+        assert self.tm.get_indexed_task_summary("xyz0")['id'] == "xyz0"
+        self.tm.delete_task("xyz0")
+        assert self.tm.get_indexed_task_summary("xyz0") is None
+
+    def test_remove_broken_lazy_task(self, *_):
+        task = self._get_test_dummy_task("xyz0")
+        self.tm.add_new_task(task)
+        self.tm.tasks_states["xyz0"].status = TaskStatus.finished
+        self.tm.dump_task("xyz0")
+
+        fresh_tm = TaskManager(
+            dt_p2p_factory.Node(),
+            keys_auth=Mock(),
+            root_path=self.path,
+            config_desc=ClientConfigDescriptor(),)
+        dump_path = fresh_tm._dump_filepath("xyz0")
+        dump_path.write_bytes(b"notapickle")
+
+        assert fresh_tm.tasks.get("xyz0") is None
+        assert "xyz0" not in fresh_tm.tasks_states
+        assert not dump_path.exists()
+
     def test_got_wants_to_compute(self, *_):
         task_mock = self._get_task_mock()
         self.tm.add_new_task(task_mock)
@@ -370,6 +435,22 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
         assert self.tm.tasks.get("xyz") is None
         assert self.tm.tasks_states.get("xyz") is None
 
+    def test_tasks_restoring_resources(self, *_):
+        task_mock = self._get_task_mock()
+        task_mock.needs_computation = Mock(return_value=True)
+        self.tm.add_new_task(task_mock)
+        self.tm.start_task("xyz")
+        assert self.tm.task_needs_computation("xyz")
+        assert self.tm.get_tasks_headers() == [task_mock.header]
+
+        self.tm.tasks_restoring_resources.add("xyz")
+        assert not self.tm.task_needs_computation("xyz")
+        assert self.tm.get_tasks_headers() == []
+        assert self.tm.get_next_subtask("DEF", "xyz", 1000, 10, 'oh') is None
+
+        self.tm.delete_task("xyz")
+        assert not self.tm.tasks_restoring_resources
+
     def test_check_next_subtask_not_my_task(self, *_):
         checked = self.tm.check_next_subtask("aaa", 1)
         assert not checked
@@ -924,6 +1005,13 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
         assert isinstance(one_task, dict)
         assert len(one_task)
 
+        summary = tm.get_task_summary(task_id)
+        assert summary
+        assert 'preview' not in summary
+        assert summary.pop('time_created') == one_task['time_started']
+        assert all(one_task[key] == value for key, value in summary.items())
+        assert tm.get_task_summary('unknown') is None
+
         all_tasks = tm.get_tasks_dict()
         assert all_tasks
         assert isinstance(all_tasks, list)
@@ -39,6 +39,7 @@ from golem.environments.environment import (
 )
 from golem.envs import BenchmarkResult, EnvSupportStatus
 from golem.envs import Environment as NewEnv
+from golem.hardware import autosize
 from golem.network.hyperdrive.client import HyperdriveClientOptions, \
     HyperdriveClient, to_hyperg_peer
 from golem.resource import resourcemanager
@@ -974,6 +975,24 @@ class TaskServerTaskHeaderTest(TaskServerTestBase):
         self.assertEqual(len(ts.get_others_tasks_headers()), 2)
         self.assertEqual(ts._docker_image_discovered.call_count, 1)
 
+    def test_add_known_task_header_without_verification(self):
+        keys_auth_2 = KeysAuth(
+            os.path.join(self.path, "2"),
+            'priv_key',
+            'password',
+        )
+
+        ts = self.ts
+        ts._docker_image_discovered = Mock()
+
+        task_header = get_example_task_header(keys_auth_2.public_key)
+        task_header.sign(private_key=keys_auth_2._private_key)  # noqa pylint:disable=no-value-for-parameter
+        assert sync_wait(ts.add_task_header(task_header))
+
+        with patch.object(ts, '_verify_header_sig') as verify:
+            assert sync_wait(ts.add_task_header(task_header))
+            verify.assert_not_called()
+
     def test_add_task_header_past_deadline(self):
         keys_auth_2 = KeysAuth(
             os.path.join(self.path, "2"),
@@ -1135,7 +1154,26 @@ class TestSubtask(TaskServerBase):
         self.ts.income_listener(event="overdue_single", node_id=node_id)
         mock_decrease.assert_called_once_with(node_id, self.ts.max_trust)
 
+    @patch('golem.task.taskserver.update_requestor_paid_sum')
+    @patch('golem.task.taskserver.Trust.PAYMENT.increase')
+    def test_income_listener_confirmed_aggregated(self, mock_increase,
+                                                  mock_update):
+        node_id = str(uuid.uuid4())
+        self.ts.income_listener(event="confirmed", node_id=node_id, amount=30,
+                                count=3)
+        mock_increase.assert_called_once_with(node_id, self.ts.max_trust * 3)
+        mock_update.assert_called_once_with(node_id, 30)
+
+    @patch('golem.task.taskserver.Trust.PAYMENT.decrease')
+    def test_income_listener_overdue_aggregated(self, mock_decrease):
+        node_id = str(uuid.uuid4())
+        self.ts.income_listener(event="overdue_single", node_id=node_id,
+                                count=2)
+        mock_decrease.assert_called_once_with(node_id, self.ts.max_trust * 2)
 
+
+@patch('twisted.internet.reactor.callFromThread',
+       side_effect=lambda fn, *args, **kwargs: fn(*args, **kwargs))
 class TestRestoreResources(LogTestCase, testutils.DatabaseFixture,
                            testutils.TestWithClient):
 
@@ -1244,6 +1282,58 @@ class TestRestoreResources(LogTestCase, testutils.DatabaseFixture,
         assert not self.ts.task_manager.delete_task.called
         assert self.ts.task_manager.notify_update_task.call_count == \
             self.task_count
+        assert not self.ts.task_manager.tasks_restoring_resources
+        assert self.ts.get_resources_restoration() == dict(
+            total=self.task_count, restored=self.task_count, failed=0,
+            skipped=0, pending=0, first_ready_after=ANY, finished_after=ANY)
+
+    def test_restore_resources_deadline_order(self, *_):
+        self._create_tasks(self.ts, self.task_count)
+        tasks = self.ts.task_manager.tasks
+        for i, task in enumerate(tasks.values()):
+            task.header.deadline -= i
+        expected = sorted(tasks, key=lambda t: tasks[t].header.deadline)
+
+        self.ts.restore_resources()
+        restored = [c[0][1] for c in
+                    self.resource_manager.add_resources.call_args_list]
+        assert restored == expected
+
+    def test_restore_resources_unfinished_only(self, *_):
+        self._create_tasks(self.ts, self.task_count)
+        task_manager = self.ts.task_manager
+        finished = next(iter(task_manager.tasks_states))
+        task_manager.tasks_states[finished].status = TaskStatus.finished
+
+        self.ts.restore_resources()
+        restored = {c[0][1] for c in
+                    self.resource_manager.add_resources.call_args_list}
+        assert restored == set(task_manager.tasks) - {finished}
+        assert self.ts.get_resources_restoration()['total'] == \
+            self.task_count - 1
+
+    def test_restore_resources_pending(self, *_):
+        self._create_tasks(self.ts, self.task_count)
+        deferreds = []
+
+        def add_resources(*_args, **_kwargs):
+            deferreds.append(defer.Deferred())
+            return deferreds[-1]
+
+        self.resource_manager.add_resources.side_effect = add_resources
+        self.ts.restore_resources()
+        task_manager = self.ts.task_manager
+        assert task_manager.tasks_restoring_resources == set(task_manager.tasks)
+        assert self.ts.get_resources_restoration()['pending'] == \
+            self.task_count
+
+        deferreds[0].callback(('a1b2c3', []))
+        assert len(task_manager.tasks_restoring_resources) == \
+            self.task_count - 1
+        progress = self.ts.get_resources_restoration()
+        assert progress['restored'] == 1
+        assert progress['first_ready_after'] is not None
+        assert progress['finished_after'] is None
 
     def test_restore_resources_call(self, *_):
         self._create_tasks(self.ts, 1)
@@ -1613,6 +1703,15 @@ class TestChangeConfig(TaskServerTestBase):
         change_tk_config.assert_called_once_with(config_desc)
         change_pcs_config.assert_called_once_with(self.ts, config_desc)
 
+    def test_app_benchmark_config_on_start(self):
+        app_benchmark_manager = self.ts.app_benchmark_manager
+        assert app_benchmark_manager._num_cores == max(1, self.ccd.num_cores)
+        assert app_benchmark_manager._hardware_config == dict(
+            num_cores=self.ccd.num_cores,
+            max_memory_size=self.ccd.max_memory_size)
+        # Reading the CPU model is left for the first benchmark
+        assert app_benchmark_manager._fingerprint is None
+
 
 @patch('golem.task.envmanager.EnvironmentManager.remove_cached_performance')
 class ChangeTaskComputerConfig(TaskServerTestBase):
@@ -1676,6 +1775,42 @@ class ChangeTaskComputerConfig(TaskServerTestBase):
         run_benchmarks.assert_called_once()
         remove_performance.assert_not_called()
 
+    @defer.inlineCallbacks
+    def test_config_changed_keeps_app_benchmarks(self, _):
+        task_computer = self._patch_ts_async('task_computer')
+        task_computer.change_config.return_value = defer.succeed(True)
+        self._patch_ts_async('benchmark_manager').run_all_benchmarks\
+            .side_effect = lambda callback, _: callback(None)
+        app_benchmark_manager = self._patch_ts_async('app_benchmark_manager')
+        config_desc = ClientConfigDescriptor()
+
+        yield self.ts._change_task_computer_config(config_desc, False)
+        app_benchmark_manager.update_config.assert_called_once_with(
+            config_desc)
+        app_benchmark_manager.remove_benchmark_scores.assert_not_called()
+
+
+class TestHardwareLimits(TaskServerBase):
+
+    def test_set_hardware_limits(self):
+        limits = autosize.Limits(num_cores=1, max_memory_size=512 * 1024)
+        self.ts.set_hardware_limits(limits)
+
+        assert self.ts.hardware_limits == limits
+        assert self.ts._max_memory_size() == 512 * 1024
+        self.ts.task_computer.set_limits.assert_called_once_with(
+            num_cores=1, max_memory_size=512 * 1024)
+
+    def test_restore_hardware_limits(self):
+        self.ts.set_hardware_limits(autosize.Limits(1, 512 * 1024))
+        self.ts.set_hardware_limits(None)
+
+        assert self.ts.hardware_limits is None
+        assert self.ts._max_memory_size() == self.ccd.max_memory_size
+        self.ts.task_computer.set_limits.assert_called_with(
+            num_cores=self.ccd.num_cores,
+            max_memory_size=self.ccd.max_memory_size)
+
 
 class TestTaskServerConcent(TaskServerTestBase):
 
@@ -0,0 +1,120 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from golem.task.taskstate import TaskStatus
+from golem.task.tasksummary import TaskSummaries
+
+
+def _summary(task_id, time_created, status=TaskStatus.finished):
+    return {
+        'id': task_id,
+        'time_created': time_created,
+        'status': status.value,
+        'type': 'Blender',
+    }
+
+
+class TestTaskSummaries(TestCase):
+    def setUp(self):
+        self.summaries = {
+            'a': _summary('a', 3.),
+            'b': _summary('b', 1.),
+            'c': _summary('c', 1.),
+            'd': _summary('d', 0., TaskStatus.creating),
+        }
+        self.build = Mock(side_effect=self.summaries.get)
+        self.projection = TaskSummaries(self.build)
+
+    def _ids(self, task_ids=('a', 'b', 'c', 'd'), **kwargs):
+        page, cursor = self.projection.get_page(task_ids, **kwargs)
+        return [summary['id'] for summary in page], cursor
+
+    def test_order(self):
+        ids, cursor = self._ids()
+        self.assertEqual(ids, ['d', 'b', 'c', 'a'])
+        self.assertIsNone(cursor)
+
+    def test_cursor(self):
+        ids, cursor = self._ids(limit=2)
+        self.assertEqual(ids, ['d', 'b'])
+        ids, cursor = self._ids(cursor=cursor, limit=2)
+        self.assertEqual(ids, ['c', 'a'])
+        self.assertIsNone(cursor)
+
+    def test_cursor_of_removed_task(self):
+        _, cursor = self._ids(limit=2)
+        ids, _ = self._ids(task_ids=['a', 'c', 'd'], cursor=cursor)
+        self.assertEqual(ids, ['c', 'a'])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self._ids(cursor='abc/a')
+
+    def test_filter(self):
+        ids, _ = self._ids(statuses=[TaskStatus.creating.value])
+        self.assertEqual(ids, ['d'])
+        ids, _ = self._ids(task_type='Blender', limit=1)
+        self.assertEqual(ids, ['d'])
+
+    def test_limit(self):
+        ids, cursor = self._ids(limit=0)
+        self.assertEqual(ids, ['d'])
+        self.assertIsNotNone(cursor)
+
+    def test_unknown_task(self):
+        ids, _ = self._ids(task_ids=['a', 'x'])
+        self.assertEqual(ids, ['a'])
+
+    def test_cache(self):
+        self._ids()
+        self.build.reset_mock()
+        self._ids()
+        self.build.assert_called_once_with('d')
+
+        self.build.reset_mock()
+        self.projection._on_task_updated(  # pylint: disable=protected-access
+            event='task_status_updated', task_id='a')
+        self._ids()
+        self.assertEqual(
+            sorted(call[0][0] for call in self.build.call_args_list),
+            ['a', 'd'])
+
+    def test_only_page_rebuilt(self):
+        for task_id in 'efgh':
+            self.summaries[task_id] = \
+                _summary(task_id, 10., TaskStatus.computing)
+        self._ids(task_ids='abcdefgh')
+        self.build.reset_mock()
+
+        ids, _ = self._ids(task_ids='abcdefgh', limit=1)
+        self.assertEqual(ids, ['d'])
+        self.assertEqual(
+            [call[0][0] for call in self.build.call_args_list],
+            ['d'],
+        )
+
+        self.build.reset_mock()
+        ids, _ = self._ids(task_ids='abcdefgh', limit=5)
+        self.assertEqual(ids, ['d', 'b', 'c', 'a', 'e'])
+        self.assertEqual(
+            [call[0][0] for call in self.build.call_args_list],
+            ['d', 'e', 'f'],
+        )
+
+    def test_read_summary(self):
+        records = {
+            'a': _summary('a', 3.),
+            'd': _summary('d', 0., TaskStatus.creating),
+        }
+        read = Mock(side_effect=records.get)
+        projection = TaskSummaries(self.build, read)
+
+        page, _ = projection.get_page(['a', 'b', 'c', 'd'])
+        self.assertEqual([summary['id'] for summary in page],
+                         ['d', 'b', 'c', 'a'])
+        self.assertIs(page[-1], records['a'])
+        # Records of active tasks may be outdated
+        self.assertEqual(
+            sorted(call[0][0] for call in self.build.call_args_list),
+            ['b', 'c', 'd'],
+        )
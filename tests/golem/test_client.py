@@ -1,7 +1,9 @@
 # pylint: disable=protected-access,too-many-lines,no-member
+import json
 import os
 import time
 import uuid
+from pathlib import Path
 from random import Random
 from unittest import TestCase
 from unittest.mock import (
@@ -26,7 +28,7 @@ from golem.appconfig import (
     DEFAULT_HYPERDRIVE_RPC_PORT, DEFAULT_HYPERDRIVE_RPC_ADDRESS
 )
 from golem.client import Client, ClientTaskComputerEventListener, \
-    DoWorkService, MonitoringPublisherService, \
+    DoWorkService, HardwareAutosizeService, MonitoringPublisherService, \
     NetworkConnectionPublisherService, \
     ResourceCleanerService, TaskArchiverService, \
     TaskCleanerService
@@ -36,6 +38,7 @@ from golem.core.common import datetime_to_timestamp_utc, timeout_to_string, \
     timestamp_to_datetime
 from golem.core.deferred import sync_wait
 from golem.core.variables import CONCENT_CHOICES
+from golem.hardware import autosize
 from golem.hardware.presets import HardwarePresets
 from golem.manager.nodestatesnapshot import ComputingSubtaskStateSnapshot
 from golem.network.p2p.peersession import PeerSessionInfo
@@ -47,6 +50,7 @@ from golem.task.acl import Acl
 from golem.task.requestedtaskmanager import RequestedTaskManager
 from golem.task.taskcomputer import TaskComputer
 from golem.task.taskserver import TaskServer
+from golem.task.taskindex import SUMMARY_VERSION, summary_path
 from golem.task.taskmanager import TaskManager
 from golem.task.taskstate import TaskStatus
 from golem.testutils import DatabaseFixture
@@ -58,6 +62,7 @@ from tests.factories.task import (
     taskstate as taskstate_factory,
     requestedtaskmanager as rtm_factory,
 )
+from tests.golem.hardware.test_autosize import load_trace
 
 random = Random(__name__)
 
@@ -327,9 +332,58 @@ class TestClient(TestClientBase):
 
         self.client.stop()
 
+    @patch('golem.environments.environmentsmanager.'
+           'EnvironmentsManager.load_config')
+    @patch('golem.client.SystemMonitor')
+    @patch('golem.task.taskserver.TaskServer.quit')
+    def test_start_and_summaries_keep_completed_tasks_unloaded(self, *_):
+        tasks_dir = Path(self.path) / 'tasks' / 'tmanager'
+        tasks_dir.mkdir(parents=True)
+        # Not a pickle, the task would be removed if it was loaded
+        dump_path = tasks_dir / 'xyz.pickle'
+        dump_path.write_bytes(b'notapickle')
+        summary_path(dump_path).write_text(json.dumps({
+            'version': SUMMARY_VERSION,
+            'task_id': 'xyz',
+            'status': TaskStatus.finished.value,
+            'subtask_ids': ['xyz-1'],
+            'task_summary': {
+                'id': 'xyz',
+                'status': TaskStatus.finished.value,
+                'time_created': time.time(),
+                'time_started': time.time(),
+                'timeout': timeout_to_string(60),
+                'type': 'Blender',
+            },
+        }))
+        self.client.config_desc.net_masking_enabled = 1
+        self.client.config_desc.mask_update_interval = 60
+        self.client.config_desc.cleaning_enabled = 1
+        self.client.config_desc.clean_tasks_older_than_seconds = 3600
+
+        self.client.transaction_system.get_tasks_payments_totals \
+            .return_value = {}
+
+        self.client.start()
+        page = self.client.get_tasks_summary()
+
+        assert [task['id'] for task in page['tasks']] == ['xyz']
+        task_manager = self.client.task_server.task_manager
+        assert 'xyz' in task_manager._lazy_task_ids
+        assert dump_path.exists()
+
+        self.client.stop()
+
+    def _mock_task_summaries(self, summaries):
+        self.client.task_server = Mock()
+        self.client._get_task_ids = Mock(
+            return_value={summary['id'] for summary in summaries})
+        self.client._get_task_summary = Mock(
+            side_effect={summary['id']: summary for summary in summaries}.get)
+
     @patch('golem.client.get_timestamp_utc')
     def test_clean_old_tasks_no_tasks(self, *_):
-        self.client.get_tasks = Mock(return_value=[])
+        self._mock_task_summaries([])
         self.client.delete_task = Mock()
         self.client.clean_old_tasks()
         self.client.delete_task.assert_not_called()
@@ -337,7 +391,7 @@ class TestClient(TestClientBase):
     @patch('golem.client.get_timestamp_utc')
     def test_clean_old_tasks_only_new(self, get_timestamp, *_):
         self.client.config_desc.clean_tasks_older_than_seconds = 5
-        self.client.get_tasks = Mock(return_value=[{
+        self._mock_task_summaries([{
             'time_started': 0,
             'timeout': timeout_to_string(5),
             'id': 'new_task'
@@ -350,7 +404,7 @@ class TestClient(TestClientBase):
     @patch('golem.client.get_timestamp_utc')
     def test_clean_old_tasks_old_and_new(self, get_timestamp, *_):
         self.client.config_desc.clean_tasks_older_than_seconds = 5
-        self.client.get_tasks = Mock(return_value=[{
+        self._mock_task_summaries([{
             'time_started': 0,
             'timeout': timeout_to_string(5),
             'id': 'old_task'
@@ -368,6 +422,7 @@ class TestClient(TestClientBase):
         tm = Mock()
         self.client.task_server = Mock(task_manager=tm)
         self.client.funds_locker = Mock()
+        tm.get_unfinished_task_ids.return_value = ['t2']
         tm.tasks_states = {
             "t1": Mock(status=taskstate.TaskStatus.finished),
             "t2": Mock(
@@ -485,6 +540,128 @@ class TestGetTasks(TestClientBase):
         assert not retrieved_tasks
 
 
+class TestGetTasksSummary(TestClientBase):
+
+    def setUp(self):
+        super().setUp()
+        statuses = [
+            TaskStatus.finished,
+            TaskStatus.computing,
+            TaskStatus.aborted,
+            TaskStatus.finished,
+            TaskStatus.waiting,
+        ]
+        self.summaries = {
+            'task_{}'.format(i): {
+                'id': 'task_{}'.format(i),
+                'status': status.value,
+                'time_created': 1000. - i,
+                'type': 'Blender',
+                'estimated_cost': 10 ** 20,
+            }
+            for i, status in enumerate(statuses)
+        }
+
+        self.client.task_server = Mock(task_manager=Mock())
+        tm = self.client.task_server.task_manager
+        tm.tasks = {'task_0': Mock(), 'task_1': Mock(), 'task_2': Mock()}
+        tm.get_task_summary.side_effect = self.summaries.get
+        tm.get_indexed_task_summary.return_value = None
+        self.client.task_server.requested_task_manager \
+            .get_requested_task_ids.return_value = ['task_3', 'task_4']
+        self.client.transaction_system.get_tasks_payments_totals \
+            .return_value = {'task_0': (10 ** 20, 5), 'task_2': (None, None)}
+
+    def test_no_task_server(self):
+        self.client.task_server = None
+        self.assertEqual(
+            self.client.get_tasks_summary(),
+            {'tasks': [], 'next_cursor': None},
+        )
+
+    def test_pages(self):
+        result = self.client.get_tasks_summary(limit=2)
+        self.assertEqual(
+            [task['id'] for task in result['tasks']], ['task_4', 'task_3'])
+        self.assertIsNotNone(result['next_cursor'])
+
+        result = self.client.get_tasks_summary(
+            cursor=result['next_cursor'], limit=2)
+        self.assertEqual(
+            [task['id'] for task in result['tasks']], ['task_2', 'task_1'])
+
+        result = self.client.get_tasks_summary(
+            cursor=result['next_cursor'], limit=2)
+        self.assertEqual(
+            [task['id'] for task in result['tasks']], ['task_0'])
+        self.assertIsNone(result['next_cursor'])
+
+    def test_filter(self):
+        result = self.client.get_tasks_summary(
+            statuses=[TaskStatus.finished.value])
+        self.assertEqual(
+            [task['id'] for task in result['tasks']], ['task_3', 'task_0'])
+
+        result = self.client.get_tasks_summary(task_type='Unknown')
+        self.assertEqual(result['tasks'], [])
+
+    def test_payments(self):
+        tasks = {
+            task['id']: task
+            for task in self.client.get_tasks_summary()['tasks']
+        }
+        self.client.transaction_system.get_tasks_payments_totals \
+            .assert_called_once()
+        self.assertEqual(tasks['task_0']['cost'], str(10 ** 20))
+        self.assertEqual(tasks['task_0']['fee'], '5')
+        self.assertEqual(tasks['task_0']['estimated_cost'], str(10 ** 20))
+        self.assertIsNone(tasks['task_1']['cost'])
+        self.assertIsNone(tasks['task_2']['fee'])
+        # cached summaries are not modified
+        self.assertEqual(self.summaries['task_0']['estimated_cost'], 10 ** 20)
+
+    def test_indexed_summaries(self):
+        tm = self.client.task_server.task_manager
+        tm.get_indexed_task_summary.side_effect = \
+            lambda task_id: dict(self.summaries[task_id], name='indexed') \
+            if task_id.startswith('task_') else None
+
+        tasks = {
+            task['id']: task
+            for task in self.client.get_tasks_summary()['tasks']
+        }
+        # Only summaries of active tasks are built
+        self.assertEqual(
+            sorted(call[0][0] for call in tm.get_task_summary.call_args_list),
+            ['task_1', 'task_4'],
+        )
+        self.assertEqual(tasks['task_0']['name'], 'indexed')
+        self.assertNotIn('name', tasks['task_1'])
+
+    def test_completed_tasks_cached(self):
+        tm = self.client.task_server.task_manager
+        self.client.get_tasks_summary()
+        tm.get_task_summary.reset_mock()
+
+        self.client.get_tasks_summary()
+        self.assertEqual(
+            sorted(call[0][0] for call in tm.get_task_summary.call_args_list),
+            ['task_1', 'task_4'],
+        )
+
+        tm.get_task_summary.reset_mock()
+        dispatcher.send(
+            signal='golem.taskmanager',
+            event='task_status_updated',
+            task_id='task_0',
+        )
+        self.client.get_tasks_summary()
+        self.assertEqual(
+            sorted(call[0][0] for call in tm.get_task_summary.call_args_list),
+            ['task_0', 'task_1', 'task_4'],
+        )
+
+
 class TestClientRestartSubtasks(TestClientBase):
 
     def setUp(self):
@@ -680,6 +857,81 @@ class TestTaskCleanerService(testwithreactor.TestWithReactor):
         self.client.clean_old_tasks.assert_called_once()
 
 
+@patch('golem.client.hardware.cpus', return_value=list(range(1, 8)))
+@patch('golem.client.autosize.LoadMonitor')
+class TestHardwareAutosizeService(testwithreactor.TestWithReactor):
+
+    def setUp(self):
+        config_desc = ClientConfigDescriptor()
+        config_desc.hardware_autosize = 1
+        config_desc.num_cores = 6
+        config_desc.max_memory_size = 10 * 1024 * 1024
+        self.max_limits = autosize.Limits(6, 10 * 1024 * 1024)
+
+        self.task_server = Mock(hardware_limits=None)
+        self.task_server.task_computer.has_assigned_task.return_value = False
+        self.applied = []
+
+        def set_hardware_limits(limits):
+            assert not self.task_server.task_computer.has_assigned_task()
+            self.task_server.hardware_limits = limits
+            self.applied.append(limits)
+
+        self.task_server.set_hardware_limits.side_effect = set_hardware_limits
+        self.client = Mock(config_desc=config_desc,
+                           task_server=self.task_server)
+        self.service = HardwareAutosizeService(self.client)
+
+    def test_disabled(self, load_monitor, _):
+        self.client.config_desc.hardware_autosize = 0
+        self.service._run()
+        load_monitor.assert_not_called()
+        self.task_server.set_hardware_limits.assert_not_called()
+
+    def test_disabled_restores_config(self, *_):
+        self.task_server.hardware_limits = autosize.Limits(1, 1024 * 1024)
+        self.client.config_desc.hardware_autosize = 0
+        self.service._run()
+        assert self.applied == [None]
+
+    def test_simulation(self, load_monitor, _):
+        # Replays a recorded trace, a subtask is computed every fourth run
+        trace = [sample for _, sample in load_trace('workstation.csv')]
+        load_monitor().sample.side_effect = trace
+        computing = [i % 4 == 1 for i in range(len(trace) + 1)]
+
+        for busy in computing:
+            self.task_server.task_computer.has_assigned_task.return_value = \
+                busy
+            self.service._run()
+            if busy:
+                # Load measured while computing is not used
+                dispatcher.send(signal='golem.taskcomputer',
+                                event='subtask_finished')
+
+        assert len(self.applied) >= 2
+        assert min(limits.num_cores for limits in self.applied) == 1
+        # Recovered after the load is gone
+        limits = self.task_server.hardware_limits
+        assert limits.num_cores == self.max_limits.num_cores
+        assert limits.max_memory_size >= \
+            self.max_limits.max_memory_size * (1 - autosize.MEMORY_STEP)
+
+    def test_config_changed(self, load_monitor, _):
+        load_monitor().sample.return_value = autosize.LoadSample(
+            busy_cores=7, memory_available=1024 * 1024, disk_busy=0.)
+        self.service._run()
+        self.service._run()
+        assert self.applied[-1].num_cores == 1
+
+        # Config changes reset the limits of the task computer
+        self.task_server.hardware_limits = None
+        self.client.config_desc.num_cores = 2
+        self.service._run()
+        assert self.applied[-1].num_cores == 1
+        assert self.service._autosizer.max_limits.num_cores == 2
+
+
 @patch('signal.signal')  # pylint: disable=too-many-ancestors
 @patch('golem.network.p2p.local_node.LocalNode.collect_network_info')
 class TestClientRPCMethods(TestClientBase, LogTestCase):
@@ -754,6 +1006,24 @@ class TestClientRPCMethods(TestClientBase, LogTestCase):
             self.assertIsInstance(value, str)
             self.assertTrue(key in res_dirs)
 
+    def test_res_dirs_sizes_from_ledger(self, *_):
+        c = self.client
+        c.get_res_dirs = Mock(return_value={
+            'received': '/received',
+            'distributed': '/distributed',
+        })
+        ledger = Mock()
+        ledger.size.side_effect = \
+            lambda d: 2048 if d == '/received' else None
+
+        with patch('golem.client.diskusage.ledger', ledger), \
+                patch('golem.client.diskusage.path_size',
+                      return_value=1024 ** 2) as path_size:
+            sizes = c.get_res_dirs_sizes()
+
+        assert sizes == {'received': '2.0 KiB', 'distributed': '1.0 MiB'}
+        path_size.assert_called_once_with('/distributed')
+
     def test_get_balance(self, *_):
         c = self.client
         ethconfig = EthereumConfig()
@@ -1,9 +1,13 @@
+import json
+import subprocess
 import sys
+import unittest
 import unittest.mock as mock
 
 from click.testing import CliRunner
 from portalocker import LockException
 
+from golem.core.common import get_golem_path
 from golem.rpc import WORKER_PROCESS_STANDALONE_ARGS
 from golem.testutils import TempDirFixture, PEP8MixIn
 from golem.tools.ci import ci_skip
@@ -154,3 +158,35 @@ class TestGolemApp(TempDirFixture, PEP8MixIn):
             catch_exceptions=False
         )
         node_cls().start.assert_called_once()
+
+
+# Heavy dependencies, which should only be imported by the subsystems
+# using them
+DEFERRED_IMPORTS = ('cpuinfo', 'cv2', 'docker', 'ethereum', 'golem_sci',
+                    'humanize', 'OpenEXR', 'psutil')
+
+COLD_START_SCRIPT = """
+import json, sys
+import {module}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+class TestColdStart(unittest.TestCase):
+
+    @staticmethod
+    def _import(module):
+        output = subprocess.check_output(
+            [sys.executable, '-c', COLD_START_SCRIPT.format(module=module)],
+            cwd=get_golem_path(),
+        )
+        return json.loads(output.decode().splitlines()[-1])
+
+    def test_golemapp_import_skips_deferred(self):
+        loaded = set(self._import('golemapp'))
+        assert not loaded.intersection(DEFERRED_IMPORTS)
+
+    def test_node_import_skips_opencv(self):
+        loaded = self._import('golem.node')
+        assert 'cv2' not in loaded
+        assert 'OpenEXR' not in loaded